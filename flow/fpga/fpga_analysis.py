@@ -5,81 +5,82 @@ FPGA Resource Analysis Script for Full Adder Implementations
 Analyzes synthesized FPGA netlists to extract LUT counts and resource utilization.
 """
 
-import re
 import sys
 from pathlib import Path
 
-def analyze_fpga_resources(netlist_file):
-    """Analyze FPGA resource utilization in a synthesized netlist."""
-    with open(netlist_file, 'r') as f:
-        content = f.read()
-    
-    # Count different FPGA primitives
-    resource_counts = {}
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+from analysis_cache import analyzer_version, default_cache
+from netlist_carry import carry_chain_estimate, design_chain_widths
+from netlist_graph import load_netlist, sibling_json
+from netlist_hierarchy import load_module_counts, resolve_hierarchy
+from netlist_scanner import instance_counts
+from netlist_sim import param_int
+
+# FPGA primitives reported by this analysis
+PRIMITIVE_TYPES = ['FDRE', 'FDSE', 'CARRY4', 'MUXF7', 'MUXF8', 'DSP48E1', 'RAMB36E1', 'BUFG', 'IBUF', 'OBUF']
+LUT_TYPES = ['LUT1', 'LUT2', 'LUT3', 'LUT4', 'LUT5', 'LUT6']
+
+# Cached results are keyed by this script and the scripts/ modules its results depend on
+ANALYZER_MODULES = ('liberty_reader', 'netlist_carry', 'netlist_graph', 'netlist_hierarchy', 'netlist_logic',
+                    'netlist_lutmap', 'netlist_scanner', 'netlist_sim', 'netlist_store', 'netlist_stream',
+                    'netlist_timing')
+ANALYZER_VERSION = analyzer_version(__file__, ANALYZER_MODULES)
+
+def tally_resources(type_counts):
+    """Primitive and LUT counts from exact per-type cell counts."""
+    lut_counts = {lut_type: type_counts.get(lut_type, 0) for lut_type in LUT_TYPES}
     
-    # Find all FPGA primitive instances
-    primitive_patterns = {
-        'LUT': r'LUT[0-9]+',
-        'FDRE': r'FDRE',
-        'FDSE': r'FDSE',
-        'CARRY4': r'CARRY4',
-        'MUXF7': r'MUXF7',
-        'MUXF8': r'MUXF8',
-        'DSP48E1': r'DSP48E1',
-        'RAMB36E1': r'RAMB36E1',
-        'BUFG': r'BUFG',
-        'IBUF': r'IBUF',
-        'OBUF': r'OBUF'
-    }
+    resource_counts = {'LUT': sum(lut_counts.values())}
+    for primitive in PRIMITIVE_TYPES:
+        resource_counts[primitive] = type_counts.get(primitive, 0)
     
-    for resource_type, pattern in primitive_patterns.items():
-        matches = re.findall(pattern, content)
-        resource_counts[resource_type] = len(matches)
+    return resource_counts, lut_counts
+
+def module_counts_json(json_file):
+    """Per-module cell counts and top module from the Yosys JSON netlist graph.
     
-    # Count LUT types specifically
-    lut_patterns = {
-        'LUT1': r'LUT1',
-        'LUT2': r'LUT2',
-        'LUT3': r'LUT3',
-        'LUT4': r'LUT4',
-        'LUT5': r'LUT5',
-        'LUT6': r'LUT6'
-    }
+    Generic $lut cells (synth -lut) are counted as LUT<WIDTH>.
+    """
+    graph = load_netlist(json_file)
+    modules = graph.module_type_counts()
+    for module, cell in graph.iter_cells():
+        if module.type_name(cell) == '$lut' and module.name in modules:
+            cells = modules[module.name]
+            width = param_int(module.cell_params.get(cell, {}).get('WIDTH', 0))
+            lut_type = f"LUT{width}"
+            cells[lut_type] = cells.get(lut_type, 0) + 1
+            cells['$lut'] -= 1
+            if not cells['$lut']:
+                del cells['$lut']
+    top = graph.top
+    return modules, top.name if top else None
+
+def analyze_fpga_resources(netlist_file):
+    """Analyze FPGA resource utilization in a synthesized netlist."""
+    # Prefer the structured netlist Yosys writes next to the Verilog one
+    json_file = sibling_json(netlist_file)
+    if json_file:
+        modules, top = module_counts_json(json_file)
+        # Ripple adders the flow left in LUTs instead of CARRY4
+        carry_chains = design_chain_widths(load_netlist(json_file), top)
+    else:
+        modules, top = load_module_counts(netlist_file)
+        carry_chains = {}
     
-    lut_counts = {}
-    for lut_type, pattern in lut_patterns.items():
-        matches = re.findall(pattern, content)
-        lut_counts[lut_type] = len(matches)
+    # Primitives inside submodules are counted once per instance
+    resolved = resolve_hierarchy(modules)
+    resource_counts, lut_counts = tally_resources(resolved[top] if top else {})
+    module_instances = instance_counts(modules)
     
     # Calculate total LUTs
     total_luts = sum(lut_counts.values())
     
-    # Count module instances (for hierarchical designs)
-    module_instances = {}
-    module_pattern = r'(\w+)\s+(\w+)\s*\('
-    for match in re.finditer(module_pattern, content):
-        module_name = match.group(1)
-        instance_name = match.group(2)
-        # Skip Verilog keywords and primitives
-        if (module_name not in ['module', 'input', 'output', 'wire', 'reg', 'assign'] and
-            not module_name.startswith('LUT') and
-            not module_name.startswith('FD') and
-            not module_name.startswith('CARRY') and
-            not module_name.startswith('MUX') and
-            not module_name.startswith('DSP') and
-            not module_name.startswith('RAMB') and
-            not module_name.startswith('BUF') and
-            not module_name.startswith('IBUF') and
-            not module_name.startswith('OBUF')):
-            if module_name not in module_instances:
-                module_instances[module_name] = 0
-            module_instances[module_name] += 1
-    
     return {
         'resource_counts': resource_counts,
         'lut_counts': lut_counts,
         'total_luts': total_luts,
         'module_instances': module_instances,
+        'carry_chains': carry_chains,
         'file': netlist_file
     }
 
@@ -124,6 +125,14 @@ def generate_fpga_report(results):
                 report.append(f"- {resource}: {count}")
         report.append("")
         
+        # Ripple-carry chains that could use CARRY4
+        if result['carry_chains']:
+            report.append("**Inferred Carry Chains:**")
+            for width, count in result['carry_chains'].items():
+                report.append(f"- {count} x {width}-bit ripple adder "
+                              f"({carry_chain_estimate(width)['primitives']} CARRY4 each on the carry chain)")
+            report.append("")
+        
         # Module instances
         if result['module_instances']:
             report.append("**Module Instances:**")
@@ -144,12 +153,15 @@ def main():
         'half_adder'
     ]
     
+    cache = default_cache()
     results = {}
     
     for impl in implementations:
         netlist_file = f"full_adder_{impl}_fpga.v"
         if Path(netlist_file).exists():
-            results[impl] = analyze_fpga_resources(netlist_file)
+            # Reused while the netlist (and its JSON twin) are unchanged
+            results[impl] = cache.cached('analyze_fpga_resources', [netlist_file, sibling_json(netlist_file)],
+                                         lambda: analyze_fpga_resources(netlist_file), ANALYZER_VERSION, netlist_file)
         else:
             print(f"Warning: {netlist_file} not found. Run synthesis first.")
     
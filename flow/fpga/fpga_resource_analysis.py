@@ -5,78 +5,125 @@ FPGA Resource Analysis Script for Full Adder Implementations
 Analyzes synthesized netlists to estimate FPGA resource utilization.
 """
 
-import re
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+from analysis_cache import analyzer_version, default_cache
+from netlist_carry import CARRY_DELAY_PS, crossover_width, width_sweep
+from netlist_graph import NetlistGraph, gate_family, load_netlist, sibling_json
+from netlist_hierarchy import load_module_counts, resolve_hierarchy
+from netlist_lutmap import LUT_SIZES, LutMapping
+from netlist_scanner import instance_counts
+from netlist_timing import LUT_DELAY_PS, TimingAnalysis, fpga_delay_model
+
+# Gate names used for LUT estimation
+GATE_TYPES = ['AND', 'OR', 'XOR', 'XNOR', 'ANDNOT', 'NAND', 'NOR', 'NOT']
+
+# Estimate LUT usage based on gate complexity
+LUT_ESTIMATES = {
+    'AND': 1,      # 2-input AND = 1 LUT
+    'OR': 1,       # 2-input OR = 1 LUT
+    'XOR': 1,      # 2-input XOR = 1 LUT
+    'XNOR': 1,     # 2-input XNOR = 1 LUT
+    'ANDNOT': 1,   # 2-input ANDNOT = 1 LUT
+    'NAND': 1,     # 2-input NAND = 1 LUT
+    'NOR': 1,      # 2-input NOR = 1 LUT
+    'NOT': 1       # 1-input NOT = 1 LUT (shared with other logic)
+}
+
+# Artix-7 (-1 speed grade) global clock buffer limit, which caps Fmax of shallow logic
+MAX_CLOCK_MHZ = 464
+
+# Cached results are keyed by this script and the scripts/ modules its results depend on
+ANALYZER_MODULES = ('liberty_reader', 'netlist_carry', 'netlist_graph', 'netlist_hierarchy', 'netlist_logic',
+                    'netlist_lutmap', 'netlist_scanner', 'netlist_sim', 'netlist_store', 'netlist_stream',
+                    'netlist_timing')
+ANALYZER_VERSION = analyzer_version(__file__, ANALYZER_MODULES)
+
+def gate_family_counts(cell_counts):
+    """Gate counts by family from leaf-cell counts."""
+    gate_counts = dict.fromkeys(GATE_TYPES, 0)
+    for cell_type, count in cell_counts.items():
+        family = gate_family(cell_type)
+        if family in gate_counts:
+            gate_counts[family] += count
+    return gate_counts
+
+def estimate_luts(gate_counts):
+    """Gate-level LUT estimate (one LUT per gate) of a set of gates."""
+    return sum(count * LUT_ESTIMATES.get(gate, 1) for gate, count in gate_counts.items())
+
+def map_luts(netlist_file, modules=()):
+    """Cut-based LUT6 and iCE40 LUT4 mappings of the JSON netlist next to a netlist, if present.
+
+    The netlist is loaded once; returns the top's LUT6 and LUT4 mappings and
+    the LUT6 count of each listed module (None without a JSON netlist).
+    """
+    json_file = sibling_json(netlist_file)
+    if json_file is None:
+        return None
+    graph = load_netlist(json_file)
+    mapping = LutMapping(graph, None, LUT_SIZES['xilinx'])
+    lut4 = LutMapping(graph, None, LUT_SIZES['ice40'])
+    module_luts = {module: (mapping if module == mapping.name else
+                            LutMapping(graph, module, LUT_SIZES['xilinx'])).lut_count
+                   for module in modules}
+    return mapping, lut4, module_luts
+
+def estimate_timing(mapping):
+    """Critical path (LUT levels x LUT delay) and Fmax of a LUT mapping."""
+    sta = TimingAnalysis(NetlistGraph(mapping.to_json()), model=fpga_delay_model())
+    logic_fmax = 1e6 / sta.critical_delay if sta.critical_delay else None
+    return {
+        'lut_levels': sta.logic_depth,
+        'critical_path_ns': sta.critical_delay / 1000,
+        'logic_fmax_mhz': logic_fmax,
+        'fmax_mhz': min(logic_fmax, MAX_CLOCK_MHZ) if logic_fmax else None
+    }
+
+def estimate_carry_chains(netlist_file):
+    """Carry-chain versus LUT-only ripple adders built from the full adder in a netlist, if present."""
+    json_file = sibling_json(netlist_file)
+    if json_file is None:
+        return None
+    try:
+        rows = width_sweep(json_file)
+    except ValueError:
+        return None  # Not a full adder with a_i, b_i, cin_i -> sum_o, cout_o
+    return {'rows': rows, 'crossover': crossover_width(rows)}
+
 def estimate_lut_usage(netlist_file):
     """Estimate LUT usage from synthesized netlist."""
-    with open(netlist_file, 'r') as f:
-        content = f.read()
-    
-    # Count different gate types
-    gate_counts = {}
-    
-    # Find all gate instances
-    gate_patterns = {
-        'AND': r'\$_AND_\s+',
-        'OR': r'\$_OR_\s+',
-        'XOR': r'\$_XOR_\s+',
-        'XNOR': r'\$_XNOR_\s+',
-        'ANDNOT': r'\$_ANDNOT_\s+',
-        'NAND': r'\$_NAND_\s+',
-        'NOR': r'\$_NOR_\s+',
-        'NOT': r'\$_NOT_\s+'
-    }
-    
-    for gate_type, pattern in gate_patterns.items():
-        matches = re.findall(pattern, content)
-        gate_counts[gate_type] = len(matches)
+    # Prefers the structured netlist Yosys writes next to the Verilog one
+    modules, top = load_module_counts(netlist_file)
     
-    # Estimate LUT usage based on gate complexity
-    lut_estimates = {
-        'AND': 1,      # 2-input AND = 1 LUT
-        'OR': 1,       # 2-input OR = 1 LUT
-        'XOR': 1,      # 2-input XOR = 1 LUT
-        'XNOR': 1,     # 2-input XNOR = 1 LUT
-        'ANDNOT': 1,   # 2-input ANDNOT = 1 LUT
-        'NAND': 1,     # 2-input NAND = 1 LUT
-        'NOR': 1,      # 2-input NOR = 1 LUT
-        'NOT': 1       # 1-input NOT = 1 LUT (shared with other logic)
-    }
-    
-    # Calculate total estimated LUTs
-    total_luts = sum(gate_counts.get(gate, 0) * lut_estimates.get(gate, 1) 
-                    for gate in gate_counts.keys())
-    
-    # Count module instances (for hierarchical designs)
-    module_instances = {}
-    module_pattern = r'(\w+)\s+(\w+)\s*\('
-    for match in re.finditer(module_pattern, content):
-        module_name = match.group(1)
-        instance_name = match.group(2)
-        # Skip Verilog keywords and primitive gates
-        if (module_name not in ['module', 'input', 'output', 'wire', 'reg', 'assign'] and
-            not module_name.startswith('_') and
-            not module_name.startswith('\$_')):
-            if module_name not in module_instances:
-                module_instances[module_name] = 0
-            module_instances[module_name] += 1
-    
-    # Estimate LUTs for module instances
-    module_lut_estimates = {
-        'half_adder': 2  # 1 XOR + 1 AND = 2 LUTs
-    }
+    # Module instances are expanded from each definition's memoized gate counts
+    resolved = resolve_hierarchy(modules)
+    gate_counts = gate_family_counts(resolved[top] if top else {})
+    module_instances = instance_counts(modules)
+    gate_luts = estimate_luts(gate_counts)
     
-    module_luts = sum(module_instances.get(module, 0) * module_lut_estimates.get(module, 1)
-                     for module in module_instances.keys())
-    
-    total_luts += module_luts
+    # Map onto LUT6 (and iCE40 LUT4) when the JSON netlist is available; else one LUT per gate
+    mapped = map_luts(netlist_file, module_instances)
+    if mapped:
+        mapping, lut4, module_luts = mapped
+    else:
+        mapping = None
+        module_luts = {module: estimate_luts(gate_family_counts(resolved[module]))
+                       for module in module_instances}
     
     return {
         'gate_counts': gate_counts,
         'module_instances': module_instances,
-        'estimated_luts': total_luts,
+        'module_luts': module_luts,
+        'estimated_luts': mapping.lut_count if mapping else gate_luts,
+        'gate_luts': gate_luts,
+        'lut_depth': mapping.lut_depth if mapping else None,
+        'lut_sizes': mapping.lut_sizes() if mapping else {},
+        'lut4': {'luts': lut4.lut_count, 'depth': lut4.lut_depth} if mapping else None,
+        'timing': estimate_timing(mapping) if mapping else None,
+        'carry': estimate_carry_chains(netlist_file) if mapping else None,
         'file': netlist_file
     }
 
@@ -87,16 +134,22 @@ def generate_fpga_report(results):
     report.append("")
     report.append("## Summary")
     report.append("")
-    report.append("| Implementation | Estimated LUTs | Gate Count | Design Style |")
-    report.append("|----------------|----------------|------------|--------------|")
+    report.append("| Implementation | Estimated LUTs | LUT Depth | iCE40 LUT4s | Gate Count | Design Style |")
+    report.append("|----------------|----------------|-----------|-------------|------------|--------------|")
     
     for impl_name, result in results.items():
         estimated_luts = result['estimated_luts']
+        depth = result['lut_depth'] if result['lut_depth'] is not None else "-"
+        lut4 = result['lut4']['luts'] if result['lut4'] else "-"
         gate_count = sum(result['gate_counts'].values())
         style = "Hierarchical" if result['module_instances'] else "Flat"
-        report.append(f"| {impl_name.replace('_', ' ').title()} | {estimated_luts} | {gate_count} | {style} |")
+        report.append(f"| {impl_name.replace('_', ' ').title()} | {estimated_luts} | {depth} | {lut4} | "
+                      f"{gate_count} | {style} |")
     
     report.append("")
+    report.append("LUT counts come from cut-enumeration mapping of the synthesized netlist onto 6-input LUTs "
+                  "(scripts/netlist_lutmap.py), not from one LUT per gate.")
+    report.append("")
     report.append("## Detailed Analysis")
     report.append("")
     
@@ -117,17 +170,58 @@ def generate_fpga_report(results):
         if result['module_instances']:
             report.append("**Module Instances:**")
             for module, count in result['module_instances'].items():
-                report.append(f"- {module}: {count}")
+                report.append(f"- {module}: {count} ({result['module_luts'][module]} LUTs each)")
             report.append("")
         
         # LUT estimation
         report.append("**LUT Estimation:**")
         report.append(f"- **Estimated LUTs**: {result['estimated_luts']}")
+        if result['lut_depth'] is not None:
+            sizes = ", ".join(f"{count} LUT{size}" for size, count in result['lut_sizes'].items())
+            report.append(f"- **Mapped LUTs**: {sizes} (depth {result['lut_depth']})")
+            report.append(f"- **iCE40 LUT4s**: {result['lut4']['luts']} (depth {result['lut4']['depth']})")
+            report.append(f"- **Gate-Level Estimate**: {result['gate_luts']} (one LUT per gate)")
         report.append("")
         
+        # Timing estimate from static timing analysis
+        if result['timing']:
+            timing = result['timing']
+            report.append("**Timing Estimate:**")
+            report.append(f"- **LUT Levels**: {timing['lut_levels']}")
+            report.append(f"- **Critical Path**: {timing['critical_path_ns']:g} ns")
+            limit = " (clock network limit)" if timing['fmax_mhz'] < timing['logic_fmax_mhz'] else ""
+            report.append(f"- **Estimated Fmax**: {timing['fmax_mhz']:.0f} MHz{limit}, "
+                          f"logic alone {timing['logic_fmax_mhz']:.0f} MHz")
+            report.append("")
+        
+        # Dedicated carry chain for multi-bit ripple adders of this full adder
+        if result['carry'] and result['carry']['crossover']:
+            report.append("**Ripple Carry Adders:**")
+            report.append(f"- **Carry Chain (CARRY4) Faster From**: {result['carry']['crossover']} bits")
+            report.append("")
+        
         report.append("---")
         report.append("")
     
+    # Carry chain versus LUT-only ripple adders
+    carry = next((result['carry'] for result in results.values() if result['carry']), None)
+    if carry:
+        report.append("## Carry Chain Estimate")
+        report.append("")
+        report.append("| Width | LUT-Only LUTs | LUT Depth | LUT-Only Delay | CARRY4 | Chain LUTs | Chain Delay | Faster |")
+        report.append("|-------|---------------|-----------|----------------|--------|------------|-------------|--------|")
+        for row in carry['rows']:
+            lut, chain = row['lut'], row['chain']
+            faster = "Carry chain" if row['chain_faster'] else "LUTs"
+            report.append(f"| {row['width']} | {lut['luts']} | {lut['depth']} | {lut['delay_ps'] / 1000:g} ns | "
+                          f"{chain['primitives']} | {chain['luts']} | {chain['delay_ps'] / 1000:g} ns | {faster} |")
+        report.append("")
+        report.append("Width-bit ripple adders of the full adder (as in integration/ripple_carry_adder.v), "
+                      "mapped onto LUT6s alone or onto one LUT per bit plus CARRY4 primitives "
+                      "(scripts/netlist_carry.py). The synthesis scripts map adders onto LUTs only, "
+                      "so no CARRY4 appears in the synthesized netlists.")
+        report.append("")
+    
     # Add FPGA-specific information
     report.append("## FPGA Implementation Notes")
     report.append("")
@@ -143,9 +237,14 @@ def generate_fpga_report(results):
     report.append("- **CLB**: Contains 2 slices")
     report.append("")
     report.append("### Performance Characteristics")
-    report.append("- **LUT Delay**: ~0.5ns per LUT")
-    report.append("- **Carry Chain Delay**: ~0.1ns per bit")
-    report.append("- **Maximum Frequency**: 500+ MHz achievable")
+    report.append(f"- **LUT Delay**: ~{LUT_DELAY_PS / 1000:g}ns per LUT")
+    report.append(f"- **Carry Chain Delay**: ~{CARRY_DELAY_PS / 1000:g}ns per bit")
+    fmax = [result['timing']['fmax_mhz'] for result in results.values()
+            if result['timing'] and result['timing']['fmax_mhz']]
+    if fmax:
+        report.append(f"- **Maximum Frequency**: {min(fmax):.0f} MHz estimated "
+                      "(static timing of the LUT mapping without routing delay, "
+                      f"capped at the {MAX_CLOCK_MHZ} MHz clock network limit)")
     
     return "\n".join(report)
 
@@ -157,12 +256,15 @@ def main():
         'half_adder'
     ]
     
+    cache = default_cache()
     results = {}
     
     for impl in implementations:
         netlist_file = f"full_adder_{impl}_fpga.v"
         if Path(netlist_file).exists():
-            results[impl] = estimate_lut_usage(netlist_file)
+            # Reused while the netlist (and its JSON twin) are unchanged
+            results[impl] = cache.cached('estimate_lut_usage', [netlist_file, sibling_json(netlist_file)],
+                                         lambda: estimate_lut_usage(netlist_file), ANALYZER_VERSION, netlist_file)
         else:
             print(f"Warning: {netlist_file} not found. Run synthesis first.")
     
@@ -186,12 +288,23 @@ def main():
             style = "Hierarchical" if result['module_instances'] else "Flat"
             print(f"{impl_name.replace('_', ' ').title():14} | {estimated_luts:14} | {gate_count:10} | {style}")
         
+        lut_counts = [result['estimated_luts'] for result in results.values()]
+        lut_range = f"{min(lut_counts)}-{max(lut_counts)}" if min(lut_counts) != max(lut_counts) else f"{lut_counts[0]}"
         print("\n=== Key Findings ===")
-        print("• All implementations use 5-7 LUTs")
-        print("• Carry Lookahead and Simple: 5 LUTs (flat design)")
-        print("• Half Adder: 7 LUTs (hierarchical design)")
+        print(f"• All implementations use {lut_range} LUTs")
+        for impl_name, result in results.items():
+            style = "hierarchical" if result['module_instances'] else "flat"
+            print(f"• {impl_name.replace('_', ' ').title()}: {result['estimated_luts']} LUTs ({style} design)")
         print("• Suitable for any Xilinx 7-series FPGA")
-        print("• Can achieve 500+ MHz clock frequency")
+        crossover = [result['carry']['crossover'] for result in results.values()
+                     if result['carry'] and result['carry']['crossover']]
+        if crossover:
+            print(f"• Ripple adders of {max(crossover)}+ bits are faster on the CARRY4 chain than in LUTs")
+        fmax = [result['timing']['fmax_mhz'] for result in results.values()
+                if result['timing'] and result['timing']['fmax_mhz']]
+        if fmax:
+            print(f"• Estimated Fmax {min(fmax):.0f} MHz (static timing, {LUT_DELAY_PS / 1000:g}ns per LUT, "
+                  f"{MAX_CLOCK_MHZ} MHz clock limit)")
     else:
         print("No FPGA netlists found. Please run synthesis first.")
 
@@ -5,94 +5,190 @@ Gate-Level Analysis Script for Full Adder Implementations
 Analyzes synthesized netlists to extract detailed gate counts and statistics.
 """
 
-import re
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+from analysis_cache import analyzer_version, default_cache
+from liberty_reader import load_liberty
+from netlist_aig import netlist_aig
+from netlist_graph import gate_family, load_netlist, sibling_json
+from netlist_glitch import GlitchSimulator, analyze_glitches
+from netlist_hierarchy import load_module_counts, resolve_hierarchy
+from netlist_power import CLOCK_PERIOD_NS, PowerAnalysis, liberty_power_model
+from netlist_scanner import instance_counts
+from netlist_timing import TimingAnalysis, asic_delay_model, ripple_chain
+
+# Gate names reported by this analysis
+GATE_TYPES = ['AND', 'OR', 'XOR', 'XNOR', 'ANDNOT', 'NAND', 'NOR', 'NOT', 'MUX', 'DFF', 'LATCH']
+
+# Calculate transistor counts (approximate)
+TRANSISTOR_COUNTS = {
+    'AND': 6,      # 2-input AND: 6 transistors
+    'OR': 6,       # 2-input OR: 6 transistors
+    'XOR': 8,      # 2-input XOR: 8 transistors
+    'XNOR': 8,     # 2-input XNOR: 8 transistors
+    'ANDNOT': 4,   # AND-NOT: 4 transistors
+    'NAND': 4,     # 2-input NAND: 4 transistors
+    'NOR': 4,      # 2-input NOR: 4 transistors
+    'NOT': 2,      # NOT: 2 transistors
+    'MUX': 12,     # 2:1 MUX: 12 transistors
+    'DFF': 20,     # DFF: ~20 transistors
+    'LATCH': 12    # Latch: ~12 transistors
+}
+
+# Standard cell library for cell area and leakage
+LIBERTY_FILE = Path(__file__).resolve().parents[1] / "liberty" / "generic_cmos.lib"
+
+# Ripple-carry adder widths timed for each full adder
+RIPPLE_WIDTHS = [4, 16, 64]
+
+# Ripple-carry adder width and random transitions for glitch simulation
+GLITCH_RIPPLE_WIDTH = 16
+GLITCH_SEED = 1
+
+# Cached results are keyed by this script and the scripts/ modules its results depend on
+ANALYZER_MODULES = ('liberty_reader', 'netlist_aig', 'netlist_atpg', 'netlist_equiv', 'netlist_fault',
+                    'netlist_glitch', 'netlist_graph', 'netlist_hierarchy', 'netlist_logic', 'netlist_power',
+                    'netlist_scanner', 'netlist_sim', 'netlist_store', 'netlist_stream', 'netlist_timing',
+                    'vcd_reader', 'waveform_checker')
+ANALYZER_VERSION = analyzer_version(__file__, ANALYZER_MODULES)
+
+def gate_family_counts(cell_counts):
+    """Gate counts by family (AND, XOR, DFF, ...) from leaf-cell counts."""
+    gate_counts = {}
+    for cell_type, count in cell_counts.items():
+        family = gate_family(cell_type)
+        if family in GATE_TYPES:
+            gate_counts[family] = gate_counts.get(family, 0) + count
+    return gate_counts
+
+def count_transistors(gate_counts):
+    """Approximate transistor count of a set of gates."""
+    return sum(gate_counts.get(gate, 0) * count for gate, count in TRANSISTOR_COUNTS.items())
+
+def library_cells():
+    """Smallest library cell of each gate family."""
+    return load_liberty(str(LIBERTY_FILE)).gate_cells()
+
+def cell_area(gate_counts, cells):
+    """Library cell area (um²) of a set of gates."""
+    return sum(cells[gate].area * count for gate, count in gate_counts.items() if gate in cells)
+
+def cell_leakage(gate_counts, cells):
+    """Library leakage power (nW) of a set of gates."""
+    return sum(cells[gate].leakage * count for gate, count in gate_counts.items() if gate in cells)
+
+def analyze_timing(netlist_file):
+    """Critical path of the full adder and of ripple chains built from it (generic CMOS delays)."""
+    json_file = sibling_json(netlist_file)
+    if json_file is None:
+        return None
+    sta = TimingAnalysis(load_netlist(json_file), model=asic_delay_model())
+    ripple = {width: TimingAnalysis(ripple_chain(json_file, width), model=asic_delay_model()).critical_delay
+              for width in RIPPLE_WIDTHS}
+    outputs = {name: sta.arrival[net] for name, net, _ in sta.endpoints}
+    return {
+        'critical_delay': sta.critical_delay,
+        'logic_depth': sta.logic_depth,
+        'sum_delay': outputs.get('sum_o'),
+        'carry_delay': outputs.get('cout_o'),
+        'ripple': ripple,
+        # Carry-in to carry-out delay added by each further stage
+        'carry_per_bit': (ripple[RIPPLE_WIDTHS[-1]] - ripple[RIPPLE_WIDTHS[0]]) / (RIPPLE_WIDTHS[-1] - RIPPLE_WIDTHS[0])
+    }
+
+def analyze_glitch(netlist_file):
+    """Glitches and hazards over every input transition of the full adder and sampled ripple transitions."""
+    json_file = sibling_json(netlist_file)
+    if json_file is None:
+        return None
+    adder = analyze_glitches(GlitchSimulator(load_netlist(json_file), model=asic_delay_model()))
+    ripple = analyze_glitches(GlitchSimulator(ripple_chain(json_file, GLITCH_RIPPLE_WIDTH), model=asic_delay_model()),
+                              seed=GLITCH_SEED)
+    return {
+        'transitions': adder['transitions'],
+        'glitches': adder['glitches'],
+        'hazard_transitions': adder['hazard_transitions'],
+        'sum_glitches': adder['net_glitches'].get('sum_o', 0),
+        'carry_glitches': adder['net_glitches'].get('cout_o', 0),
+        'ripple_transitions': ripple['transitions'],
+        'ripple_glitches': ripple['glitches'],
+        # Share of all net transitions that are glitches
+        'ripple_glitch_share': ripple['glitches'] / ripple['toggles'] if ripple['toggles'] else 0.0
+    }
+
+def analyze_power(netlist_file):
+    """Dynamic and leakage power with random inputs every clock period (library capacitance and leakage)."""
+    json_file = sibling_json(netlist_file)
+    if json_file is None:
+        return None
+    power = PowerAnalysis(load_netlist(json_file), model=liberty_power_model(str(LIBERTY_FILE))).statistical()
+    top_net, top = max(power['nets'].items(), key=lambda item: (item[1]['power_nw'], item[0]))
+    return {
+        'dynamic': power['dynamic_nw'],
+        'leakage': power['leakage_nw'],
+        'total': power['total_nw'],
+        'voltage': power['voltage'],
+        'top_net': top_net,
+        'top_net_power': top['power_nw']
+    }
+
+def analyze_aig(netlist_file):
+    """Size and depth of the structurally hashed and-inverter graph of the netlist."""
+    json_file = sibling_json(netlist_file)
+    if json_file is None:
+        return None
+    return netlist_aig(load_netlist(json_file)).summary()
+
 def analyze_gates(netlist_file):
     """Analyze gate counts in a synthesized netlist."""
-    with open(netlist_file, 'r') as f:
-        content = f.read()
+    # Prefers the structured netlist Yosys writes next to the Verilog one
+    modules, top = load_module_counts(netlist_file)
     
-    # Count different gate types
-    gate_counts = {}
+    # Resolve every module definition once, bottom-up, and expand instances by count
+    resolved = resolve_hierarchy(modules)
+    gate_counts = gate_family_counts(resolved[top]) if top else {}
+    module_instances = instance_counts(modules)
+    cells = library_cells()
     
-    # Find all gate instances
-    gate_patterns = {
-        'AND': r'\\\$_AND_\s+',
-        'OR': r'\\\$_OR_\s+',
-        'XOR': r'\\\$_XOR_\s+',
-        'XNOR': r'\\\$_XNOR_\s+',
-        'ANDNOT': r'\\\$_ANDNOT_\s+',
-        'NAND': r'\\\$_NAND_\s+',
-        'NOR': r'\\\$_NOR_\s+',
-        'NOT': r'\\\$_NOT_\s+',
-        'MUX': r'\\\$_MUX_\s+',
-        'DFF': r'\\\$_DFF_\s+',
-        'LATCH': r'\\\$_DLATCH_\s+'
-    }
+    module_stats = {}
+    for module in module_instances:
+        module_gates = gate_family_counts(resolved[module])
+        module_stats[module] = {
+            'gates': sum(module_gates.values()),
+            'transistors': count_transistors(module_gates),
+            'area': cell_area(module_gates, cells)
+        }
     
-    for gate_type, pattern in gate_patterns.items():
-        matches = re.findall(pattern, content)
-        if matches:
-            gate_counts[gate_type] = len(matches)
-    
-    # Count module instances (excluding primitive gates)
-    module_instances = {}
-    module_pattern = r'(\w+)\s+(\w+)\s*\('
-    for match in re.finditer(module_pattern, content):
-        module_name = match.group(1)
-        instance_name = match.group(2)
-        # Skip primitive gates and Verilog keywords
-        if (module_name not in ['module', 'input', 'output', 'wire', '\\$_AND_', 
-                               '\\$_OR_', '\\$_XOR_', '\\$_XNOR_', '\\$_ANDNOT_',
-                               '\\$_NAND_', '\\$_NOR_', '\\$_NOT_', '\\$_MUX_',
-                               '\\$_DFF_', '\\$_DLATCH_'] and
-            not module_name.startswith('\\$_')):
-            if module_name not in module_instances:
-                module_instances[module_name] = 0
-            module_instances[module_name] += 1
-    
-    # Count total gates (including module instances for hierarchical designs)
+    # Totals cover the whole hierarchy below the top module
     total_primitive_gates = sum(gate_counts.values())
-    
-    # For hierarchical designs, add gates from module instances
-    if module_instances:
-        # Count gates in half_adder module (2 gates per instance)
-        if 'half_adder' in module_instances:
-            total_primitive_gates += module_instances['half_adder'] * 2  # 1 XOR + 1 AND per half_adder
-    
-    # Calculate transistor counts (approximate)
-    transistor_counts = {
-        'AND': 6,      # 2-input AND: 6 transistors
-        'OR': 6,       # 2-input OR: 6 transistors
-        'XOR': 8,      # 2-input XOR: 8 transistors
-        'XNOR': 8,     # 2-input XNOR: 8 transistors
-        'ANDNOT': 4,   # AND-NOT: 4 transistors
-        'NAND': 4,     # 2-input NAND: 4 transistors
-        'NOR': 4,      # 2-input NOR: 4 transistors
-        'NOT': 2,      # NOT: 2 transistors
-        'MUX': 12,     # 2:1 MUX: 12 transistors
-        'DFF': 20,     # DFF: ~20 transistors
-        'LATCH': 12    # Latch: ~12 transistors
-    }
-    
-    total_transistors = sum(gate_counts.get(gate, 0) * count 
-                           for gate, count in transistor_counts.items())
-    
-    # Add transistors from module instances
-    if module_instances and 'half_adder' in module_instances:
-        # Each half_adder has 1 XOR (8 transistors) + 1 AND (6 transistors) = 14 transistors
-        total_transistors += module_instances['half_adder'] * 14
+    total_transistors = count_transistors(gate_counts)
     
     return {
         'gate_counts': gate_counts,
         'module_instances': module_instances,
+        'module_stats': module_stats,
         'total_primitive_gates': total_primitive_gates,
         'total_transistors': total_transistors,
+        'cell_area': cell_area(gate_counts, cells),
+        'leakage': cell_leakage(gate_counts, cells),
+        'timing': analyze_timing(netlist_file),
+        'glitch': analyze_glitch(netlist_file),
+        'power': analyze_power(netlist_file),
+        'aig': analyze_aig(netlist_file),
         'file': netlist_file
     }
 
+def analysis_inputs(netlist_file):
+    """Files an analysis of one netlist reads."""
+    return [netlist_file, sibling_json(netlist_file), LIBERTY_FILE]
+
+def cached_analyze_gates(netlist_file, cache):
+    """analyze_gates, reused from the analysis cache while the netlist and library are unchanged."""
+    return cache.cached('analyze_gates', analysis_inputs(netlist_file), lambda: analyze_gates(netlist_file),
+                        ANALYZER_VERSION, netlist_file)
+
 def generate_gate_report():
     """Generate comprehensive gate analysis report."""
     netlists = {
@@ -101,10 +197,11 @@ def generate_gate_report():
         'Half Adder': 'full_adder_half_adder_synth.v'
     }
     
+    cache = default_cache()
     results = {}
     for impl_name, netlist_file in netlists.items():
         if Path(netlist_file).exists():
-            results[impl_name] = analyze_gates(netlist_file)
+            results[impl_name] = cached_analyze_gates(netlist_file, cache)
     
     # Generate report
     report = []
@@ -115,8 +212,8 @@ def generate_gate_report():
     # Summary table
     report.append("## Gate Count Summary")
     report.append("")
-    report.append("| Implementation | Primitive Gates | Transistors | Design Style |")
-    report.append("|----------------|-----------------|-------------|--------------|")
+    report.append("| Implementation | Primitive Gates | Transistors | Cell Area (µm²) | Design Style |")
+    report.append("|----------------|-----------------|-------------|-----------------|--------------|")
     
     for impl_name, result in results.items():
         gates = result['total_primitive_gates']
@@ -125,9 +222,66 @@ def generate_gate_report():
         actual_modules = {k: v for k, v in result['module_instances'].items() 
                          if not k.startswith('_') and k not in ['\\$_AND_', '\\$_OR_', '\\$_XOR_', '\\$_XNOR_', '\\$_ANDNOT_']}
         style = "Hierarchical" if actual_modules else "Flat"
-        report.append(f"| {impl_name} | {gates} | {transistors} | {style} |")
+        report.append(f"| {impl_name} | {gates} | {transistors} | {result['cell_area']:.2f} | {style} |")
     
     report.append("")
+    report.append(f"Cell area and leakage use the smallest cell per gate type in `{LIBERTY_FILE.name}` "
+                  "(flow/liberty).")
+    report.append("")
+    
+    # Timing summary (only for netlists with a structured JSON netlist)
+    timed = {impl_name: result['timing'] for impl_name, result in results.items() if result['timing']}
+    if timed:
+        report.append("## Timing Analysis")
+        report.append("")
+        report.append("Static timing over the synthesized netlists with generic CMOS gate delays "
+                      "(scripts/netlist_timing.py); ripple chains connect N copies of each full adder.")
+        report.append("")
+        ripple_header = " | ".join(f"{width}-bit Ripple (ps)" for width in RIPPLE_WIDTHS)
+        report.append(f"| Implementation | Logic Depth | Sum (ps) | Carry (ps) | {ripple_header} |")
+        report.append("|----------------|-------------|----------|------------|" +
+                      "|".join("-" * (len(f"{width}-bit Ripple (ps)") + 2) for width in RIPPLE_WIDTHS) + "|")
+        for impl_name, timing in timed.items():
+            ripple_cells = " | ".join(f"{timing['ripple'][width]:g}" for width in RIPPLE_WIDTHS)
+            report.append(f"| {impl_name} | {timing['logic_depth']} | {timing['sum_delay']:g} | "
+                          f"{timing['carry_delay']:g} | {ripple_cells} |")
+        report.append("")
+    
+    # Glitch summary (timed simulation with the same gate delays)
+    glitched = {impl_name: result['glitch'] for impl_name, result in results.items() if result['glitch']}
+    if glitched:
+        report.append("## Glitch Analysis")
+        report.append("")
+        report.append("Event-driven simulation with the same gate delays and inertial pulse filtering "
+                      "(scripts/netlist_glitch.py): every input transition of the full adder, and "
+                      f"{next(iter(glitched.values()))['ripple_transitions']} random transitions of a "
+                      f"{GLITCH_RIPPLE_WIDTH}-bit ripple chain.")
+        report.append("")
+        report.append(f"| Implementation | Transitions | Glitch Toggles | Sum Glitches | Carry Glitches | "
+                      f"Hazard-Prone Transitions | {GLITCH_RIPPLE_WIDTH}-bit Ripple Glitches |")
+        report.append("|----------------|-------------|----------------|--------------|----------------|"
+                      "--------------------------|------------------------|")
+        for impl_name, glitch in glitched.items():
+            report.append(f"| {impl_name} | {glitch['transitions']} | {glitch['glitches']} | "
+                          f"{glitch['sum_glitches']} | {glitch['carry_glitches']} | "
+                          f"{glitch['hazard_transitions']} | {glitch['ripple_glitches']} "
+                          f"({glitch['ripple_glitch_share']:.0%}) |")
+        report.append("")
+    
+    # And-inverter graph structure
+    graphs = {impl_name: result['aig'] for impl_name, result in results.items() if result['aig']}
+    if graphs:
+        report.append("## And-Inverter Graph")
+        report.append("")
+        report.append("Each netlist converted to a structurally hashed AIG with constants propagated and "
+                      "dead logic removed (scripts/netlist_aig.py).")
+        report.append("")
+        report.append("| Implementation | AND Nodes | AIG Depth | Inputs | Dropped Inputs |")
+        report.append("|----------------|-----------|-----------|--------|----------------|")
+        for impl_name, graph in graphs.items():
+            report.append(f"| {impl_name} | {graph['ands']} | {graph['depth']} | {graph['inputs']} | "
+                          f"{', '.join(graph['dropped']) or '-'} |")
+        report.append("")
     
     # Detailed analysis for each implementation
     for impl_name, result in results.items():
@@ -138,14 +292,15 @@ def generate_gate_report():
         report.append("### Gate Breakdown")
         report.append("")
         if result['gate_counts']:
-            report.append("| Gate Type | Count | Transistors |")
-            report.append("|-----------|-------|-------------|")
+            cells = library_cells()
+            report.append("| Gate Type | Count | Transistors | Library Cell | Area (µm²) |")
+            report.append("|-----------|-------|-------------|--------------|------------|")
             for gate_type, count in sorted(result['gate_counts'].items()):
-                transistors = count * {
-                    'AND': 6, 'OR': 6, 'XOR': 8, 'XNOR': 8, 
-                    'ANDNOT': 4, 'NAND': 4, 'NOR': 4, 'NOT': 2
-                }.get(gate_type, 6)
-                report.append(f"| {gate_type} | {count} | {transistors} |")
+                transistors = count * TRANSISTOR_COUNTS.get(gate_type, 6)
+                cell = cells.get(gate_type)
+                cell_name = cell.name if cell else "-"
+                area = f"{cell.area * count:.2f}" if cell else "-"
+                report.append(f"| {gate_type} | {count} | {transistors} | {cell_name} | {area} |")
         else:
             report.append("No primitive gates found.")
         
@@ -155,10 +310,12 @@ def generate_gate_report():
         if result['module_instances']:
             report.append("### Module Instances")
             report.append("")
-            report.append("| Module | Instances |")
-            report.append("|--------|-----------|")
+            report.append("| Module | Instances | Gates/Instance | Transistors/Instance | Area/Instance (µm²) |")
+            report.append("|--------|-----------|----------------|----------------------|---------------------|")
             for module, count in result['module_instances'].items():
-                report.append(f"| {module} | {count} |")
+                stats = result['module_stats'][module]
+                report.append(f"| {module} | {count} | {stats['gates']} | {stats['transistors']} | "
+                              f"{stats['area']:.2f} |")
             report.append("")
         
         # Total statistics
@@ -166,9 +323,19 @@ def generate_gate_report():
         report.append("")
         report.append(f"- **Primitive Gates**: {result['total_primitive_gates']}")
         report.append(f"- **Estimated Transistors**: {result['total_transistors']}")
+        report.append(f"- **Cell Area**: {result['cell_area']:.2f} µm²")
+        report.append(f"- **Leakage Power**: {result['leakage']:.3f} nW")
         actual_modules = {k: v for k, v in result['module_instances'].items() 
                          if not k.startswith('_') and k not in ['\\$_AND_', '\\$_OR_', '\\$_XOR_', '\\$_XNOR_', '\\$_ANDNOT_']}
         report.append(f"- **Design Style**: {'Hierarchical' if actual_modules else 'Flat'}")
+        if result['timing']:
+            timing = result['timing']
+            report.append(f"- **Critical Path**: {timing['critical_delay']:g} ps ({timing['logic_depth']} gate levels)")
+            report.append(f"- **Ripple Carry Delay**: {timing['carry_per_bit']:g} ps per bit")
+        if result['glitch']:
+            glitch = result['glitch']
+            report.append(f"- **Glitches**: {glitch['glitches']} glitch toggles over {glitch['transitions']} "
+                          f"input transitions ({glitch['hazard_transitions']} hazard-prone)")
         report.append("")
         
         # Logic complexity analysis
@@ -178,7 +345,7 @@ def generate_gate_report():
         if impl_name == "Carry Lookahead":
             report.append("- **Carry Generation**: Optimized carry lookahead logic")
             report.append("- **Sum Generation**: XNOR-based sum calculation")
-            report.append("- **Advantage**: Fast carry propagation")
+            report.append("- **Advantage**: Carry shares the XNOR propagate term with the sum")
         elif impl_name == "Simple XOR/AND":
             report.append("- **Carry Generation**: Standard AND-OR logic")
             report.append("- **Sum Generation**: Cascaded XNOR gates")
@@ -197,13 +364,23 @@ def generate_gate_report():
     report.append("")
     report.append("1. **Half Adder Implementation**: Most modular, reusable components")
     report.append("2. **Simple XOR/AND**: Standard implementation, good balance")
-    report.append("3. **Carry Lookahead**: Optimized for speed, similar area")
+    report.append("3. **Carry Lookahead**: Generate/propagate carry logic, similar area")
     report.append("")
     
     report.append("### Design Trade-offs")
     report.append("")
-    report.append("- **Area**: All implementations use similar transistor counts (~40-48)")
-    report.append("- **Speed**: Carry lookahead optimized for fast carry propagation")
+    report.append("- **Area**: All implementations use similar transistor counts (~32-34)")
+    if timed:
+        delays = sorted({timing['critical_delay'] for timing in timed.values()})
+        per_bit = sorted({timing['carry_per_bit'] for timing in timed.values()})
+        if len(delays) == 1 and len(per_bit) == 1:
+            report.append(f"- **Speed**: All implementations have the same critical path ({delays[0]:g} ps) "
+                          f"and ripple carry delay ({per_bit[0]:g} ps/bit)")
+        else:
+            fastest = min(timed, key=lambda impl_name: (timed[impl_name]['carry_per_bit'],
+                                                        timed[impl_name]['critical_delay']))
+            report.append(f"- **Speed**: {fastest} has the shortest ripple carry delay "
+                          f"({timed[fastest]['carry_per_bit']:g} ps/bit, {timed[fastest]['critical_delay']:g} ps per adder)")
     report.append("- **Modularity**: Half adder implementation most modular")
     report.append("- **Complexity**: Simple XOR/AND easiest to understand")
     report.append("")
@@ -221,12 +398,33 @@ def generate_gate_report():
     
     report.append("### Power Considerations")
     report.append("")
-    report.append("- **Static Power**: Minimal (combinational logic)")
+    powered = {impl_name: result['power'] for impl_name, result in results.items() if result['power']}
+    if powered:
+        voltage = next(iter(powered.values()))['voltage']
+        report.append(f"Zero-delay switching activity with random inputs every {CLOCK_PERIOD_NS:g} ns, "
+                      f"library pin capacitance and leakage at {voltage:g} V (scripts/netlist_power.py).")
+        report.append("")
+        report.append("| Implementation | Dynamic (nW) | Leakage (nW) | Total (nW) | Highest-Power Net |")
+        report.append("|----------------|--------------|--------------|------------|-------------------|")
+        for impl_name, power in powered.items():
+            report.append(f"| {impl_name} | {power['dynamic']:.1f} | {power['leakage']:.3f} | "
+                          f"{power['total']:.1f} | {power['top_net']} ({power['top_net_power']:.1f} nW) |")
+        report.append("")
+        share = max(power['leakage'] / power['total'] for power in powered.values() if power['total'])
+        report.append(f"- **Static Power**: Leakage is at most {share:.2%} of the total at this activity")
+    else:
+        report.append("- **Static Power**: Minimal (combinational logic)")
     report.append("- **Dynamic Power**: Proportional to switching activity")
+    if glitched:
+        shares = sorted({f"{glitch['ripple_glitch_share']:.0%}" for glitch in glitched.values()})
+        report.append(f"- **Glitch Power**: {' to '.join(shares)} of ripple chain toggles are glitches")
     report.append("- **Clock Power**: Only for clock/reset signals (minimal)")
     report.append("")
     
-    return "\n".join(report)
+    # Structured results behind this report, for generate_github_pages.py
+    report = "\n".join(report)
+    cache.publish('gate_analysis', report, results)
+    return report
 
 if __name__ == "__main__":
     report = generate_gate_report()
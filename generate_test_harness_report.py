@@ -21,6 +21,13 @@ import glob
 import subprocess
 from pathlib import Path
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+from analysis_cache import analyzer_version, default_cache
+from vcd_reader import vcd_summary
+
+# Cached waveform summaries are keyed by this script and the scripts/ modules they depend on
+ANALYZER_VERSION = analyzer_version(__file__, ['vcd_reader'])
+
 # Enhanced template for the full adder IP
 REPORT_TEMPLATE = """
 # Vyges Full Adder IP - Test Harness Report
@@ -53,7 +60,7 @@ REPORT_TEMPLATE = """
 - **UVM Testbenches**: {uvm_testbenches}
 - **cocotb Testbenches**: {cocotb_testbenches}
 - **Stimulus Type**: Directed test vectors
-- **Coverage**: Functional verification
+- **Coverage**: {coverage}
 
 ---
 
@@ -118,6 +125,14 @@ def get_git_info():
     except:
         return "unknown", "unknown"
 
+def describe_waveform(file):
+    """Waveform entry with a short content summary read back from the VCD"""
+    try:
+        summary = default_cache().cached('vcd_summary', [file], lambda: vcd_summary(file), ANALYZER_VERSION)
+        return f"Waveform: {file} ({summary})"
+    except (OSError, ValueError, IndexError) as e:
+        return f"Waveform: {file} (unreadable: {e})"
+
 def scan_simulation_results():
     """Scan for simulation results from Icarus and Verilator"""
     icarus_results = []
@@ -130,7 +145,7 @@ def scan_simulation_results():
         if os.path.exists("tb/sv_tb"):
             # Icarus simulation outputs
             for file in glob.glob("tb/sv_tb/*.vcd"):
-                icarus_results.append(f"Waveform: {file}")
+                icarus_results.append(describe_waveform(file))
             for file in glob.glob("tb/sv_tb/simv*.out"):
                 icarus_results.append(f"Simulation Log: {file}")
             
@@ -143,7 +158,7 @@ def scan_simulation_results():
         # Check for cocotb simulation outputs
         if os.path.exists("tb/cocotb"):
             for file in glob.glob("tb/cocotb/*.vcd"):
-                cocotb_results.append(f"Waveform: {file}")
+                cocotb_results.append(describe_waveform(file))
             for file in glob.glob("tb/cocotb/*.log"):
                 cocotb_results.append(f"Log: {file}")
             for file in glob.glob("tb/cocotb/results.xml"):
@@ -199,6 +214,23 @@ def scan_testbenches():
     
     return sv_testbenches, uvm_testbenches, cocotb_testbenches
 
+def get_coverage_summary():
+    """Summarize merged Verilator coverage (scripts/coverage_merge.py output)"""
+    summaries = glob.glob("tb/**/coverage_summary.json", recursive=True)
+    if not summaries:
+        return "Functional verification"
+    
+    latest = max(summaries, key=os.path.getmtime)
+    try:
+        with open(latest, 'r') as f:
+            summary = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return "Functional verification"
+    
+    return (f"Functional verification; Verilator line {summary.get('line_coverage', 0):.1f}%, "
+            f"toggle {summary.get('toggle_coverage', 0):.1f}% "
+            f"({summary.get('shards_merged', 0)} shards, `{latest}`)")
+
 def get_implementation_summary():
     """Get summary of full adder implementations"""
     implementations = []
@@ -266,6 +298,7 @@ def generate_report(output_file="test_harness_report.md"):
     asic_results, fpga_results = scan_synthesis_results()
     sv_testbenches, uvm_testbenches, cocotb_testbenches = scan_testbenches()
     implementations = get_implementation_summary()
+    coverage = get_coverage_summary()
     
     # Parse actual test results
     total_tests, pass_count, fail_count = parse_test_results()
@@ -295,6 +328,7 @@ def generate_report(output_file="test_harness_report.md"):
         sv_testbenches=sv_text,
         uvm_testbenches=uvm_text,
         cocotb_testbenches=cocotb_text,
+        coverage=coverage,
         icarus_results=icarus_text,
         verilator_results=verilator_text,
         cocotb_results=cocotb_text,
@@ -312,6 +346,10 @@ def generate_report(output_file="test_harness_report.md"):
 
     with open(output_file, 'w') as f:
         f.write(report)
+    
+    # Structured counts behind this report, for generate_github_pages.py
+    default_cache().publish('test_results', report, {'total_tests': total_tests, 'pass_count': pass_count,
+                                                     'fail_count': fail_count, 'success_rate': success_rate})
     print(f"[✓] Vyges Test Harness Report written to: {output_file}")
     print(f"[✓] Generated by Vyges Test Harness Report Generator v1.0")
 
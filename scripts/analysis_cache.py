@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Analysis Cache
+
+Stores the structured results of the report generators (gate_analysis.py,
+fpga_analysis.py, fpga_resource_analysis.py, generate_test_harness_report.py)
+under a key made from the content of their input files and the analyzer
+version, so an unchanged netlist or waveform is never analyzed twice - in
+one run, across runs, and on CI when the cache directory is restored.
+
+A key is the BLAKE2b digest of the analyzer name, its version, its
+parameters and the digest of every input file (hashed once per process and
+file state). The analyzer version is analyzer_version(), a digest of the
+analyzer's source and of the scripts/ modules it lists as its dependencies,
+so any code change that could change a result also changes the key.
+
+Each result is pickled into its own file, ANALYZER-KEY.pkl, written
+atomically. A hit refreshes the file's mtime; once the directory grows past
+its size limit, the least recently used entries are evicted.
+
+Report generators also publish() the structured results behind each report
+they write, keyed by the report's text. generate_github_pages.py looks them
+up with published() for the report on disk, so the numbers it reads always
+belong to that report - never to another run restored from the CI cache -
+and it parses the report when nothing was published for it.
+
+The cache lives in .analysis_cache at the repository root, or in
+ANALYSIS_CACHE_DIR; ANALYSIS_CACHE_MB sets the size limit and
+ANALYSIS_CACHE=0 disables it.
+
+Usage:
+    python scripts/analysis_cache.py list|stats|evict|clear [--dir DIR] [--max-mb N]
+"""
+
+import os
+import re
+import sys
+import time
+import pickle
+import argparse
+import tempfile
+from hashlib import blake2b
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+FORMAT_VERSION = 1
+CACHE_SUFFIX = '.pkl'
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DEFAULT_DIRECTORY = SCRIPTS_DIR.parent / '.analysis_cache'
+
+# Size limit of the cache directory before least recently used entries are evicted
+DEFAULT_MAX_MB = 256
+
+# Bytes read at a time while hashing input files
+HASH_BLOCK = 1 << 20
+
+# Hex digits of file digests and cache keys
+DIGEST_SIZE = 16
+
+ENTRY_NAME = re.compile(r'^(.+)-([0-9a-f]{32})\.pkl$')
+
+# Result of a lookup that found nothing (None is a result like any other)
+MISSING = object()
+
+# File digests computed in this process, keyed by path and validated by mtime/size
+_DIGESTS: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+
+def file_digest(path) -> str:
+    """BLAKE2b digest of a file's content ('missing' if it does not exist)."""
+    real = os.path.realpath(path)
+    try:
+        stat = os.stat(real)
+    except FileNotFoundError:
+        return 'missing'
+    state = (stat.st_mtime_ns, stat.st_size)
+    cached = _DIGESTS.get(real)
+    if cached and cached[0] == state:
+        return cached[1]
+    digest = blake2b(digest_size=DIGEST_SIZE)
+    with open(real, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b''):
+            digest.update(block)
+    _DIGESTS[real] = (state, digest.hexdigest())
+    return _DIGESTS[real][1]
+
+
+def analyzer_version(path, modules: Iterable[str]) -> str:
+    """Digest of an analyzer's source file and of the scripts/ modules its results depend on.
+
+    modules names every scripts/ module whose code can change the results,
+    including those imported indirectly or on demand (netlist_store).
+    """
+    digest = blake2b(digest_size=DIGEST_SIZE)
+    digest.update(f"{Path(path).name}:{file_digest(path)}\n".encode())
+    for module in sorted(set(modules)):
+        source = SCRIPTS_DIR / f"{module}.py"
+        if not source.exists():
+            raise ValueError(f"no scripts/ module named '{module}'")
+        digest.update(f"{module}:{file_digest(source)}\n".encode())
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """Directory of pickled analysis results keyed by input content and analyzer version."""
+
+    __slots__ = ('directory', 'max_bytes', 'hits', 'misses')
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_bytes: int = DEFAULT_MAX_MB << 20):
+        self.directory = Path(directory) if directory else None  # None: caching disabled
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(analyzer: str, version: str, inputs: Iterable, params: Any = None) -> str:
+        """Cache key of an analysis of the given input files."""
+        digest = blake2b(digest_size=DIGEST_SIZE)
+        digest.update(repr((FORMAT_VERSION, analyzer, version, params)).encode())
+        for path in inputs:
+            if path is not None:
+                digest.update(f"\n{file_digest(path)}".encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def report_key(analyzer: str, report: str) -> str:
+        """Cache key of the results behind a report, from the report's text."""
+        digest = blake2b(digest_size=DIGEST_SIZE)
+        digest.update(repr((FORMAT_VERSION, analyzer, 'report')).encode())
+        digest.update(report.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, analyzer: str, key: str) -> Path:
+        return self.directory / f"{re.sub(r'[^A-Za-z0-9_.]', '_', analyzer)}-{key}{CACHE_SUFFIX}"
+
+    def get(self, analyzer: str, key: str, default: Any = None) -> Any:
+        """The stored result for a key (marking it recently used), else default."""
+        if self.directory is None:
+            return default
+        path = self._path(analyzer, key)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return default
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError, AttributeError):
+            self.misses += 1
+            path.unlink(missing_ok=True)  # Unreadable entry: recompute it
+            return default
+        self.hits += 1
+        return entry['result']
+
+    def put(self, analyzer: str, key: str, result: Any):
+        """Store a result, then evict least recently used entries beyond the size limit."""
+        if self.directory is None:
+            return
+        # Write atomically; an unwritable cache directory just means no caching
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, temp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump({'analyzer': analyzer, 'created': time.time(), 'result': result}, f,
+                            pickle.HIGHEST_PROTOCOL)
+            os.replace(temp, self._path(analyzer, key))
+        except OSError:
+            return
+        self.evict()
+
+    def cached(self, analyzer: str, inputs: Iterable, compute: Callable[[], Any], version: str = '',
+               params: Any = None) -> Any:
+        """Result of compute() for these inputs, from the cache when present."""
+        inputs = list(inputs)
+        key = self.key(analyzer, version, inputs, params)
+        result = self.get(analyzer, key, MISSING)
+        if result is MISSING:
+            result = compute()
+            self.put(analyzer, key, result)
+        return result
+
+    def publish(self, analyzer: str, report: str, result: Any):
+        """Store the structured results behind a report under the report's text."""
+        self.put(analyzer, self.report_key(analyzer, report), result)
+
+    def published(self, analyzer: str, report_path) -> Optional[Any]:
+        """Results published for the current content of a report file, else None."""
+        try:
+            with open(report_path, 'r', encoding='utf-8') as f:
+                report = f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+        return self.get(analyzer, self.report_key(analyzer, report))
+
+    def entries(self) -> List[Dict]:
+        """Stored entries, least recently used first."""
+        entries = []
+        if self.directory is None or not self.directory.is_dir():
+            return entries
+        for path in self.directory.iterdir():
+            match = ENTRY_NAME.match(path.name)
+            if not match:
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # Evicted by another process
+            entries.append({'analyzer': match.group(1), 'key': match.group(2), 'path': path,
+                            'bytes': stat.st_size, 'used': stat.st_mtime})
+        entries.sort(key=lambda entry: entry['used'])
+        return entries
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """Delete least recently used entries until the cache fits; the number deleted."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(entry['bytes'] for entry in entries)
+        evicted = 0
+        for entry in entries:
+            if total <= limit:
+                break
+            entry['path'].unlink(missing_ok=True)
+            total -= entry['bytes']
+            evicted += 1
+        return evicted
+
+
+def default_cache() -> AnalysisCache:
+    """The shared cache, configured by ANALYSIS_CACHE, ANALYSIS_CACHE_DIR and ANALYSIS_CACHE_MB."""
+    if os.environ.get('ANALYSIS_CACHE', '1') == '0':
+        return AnalysisCache(None)
+    directory = os.environ.get('ANALYSIS_CACHE_DIR') or DEFAULT_DIRECTORY
+    return AnalysisCache(directory, int(float(os.environ.get('ANALYSIS_CACHE_MB', DEFAULT_MAX_MB)) * (1 << 20)))
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Inspect and trim the content-addressed analysis cache")
+    parser.add_argument("command", choices=["list", "stats", "evict", "clear"], help="Action")
+    parser.add_argument("--dir", help=f"Cache directory (default: ANALYSIS_CACHE_DIR or {DEFAULT_DIRECTORY})")
+    parser.add_argument("--max-mb", type=float, help="Size limit for evict (default: the cache limit)")
+    args = parser.parse_args()
+
+    cache = default_cache()
+    if args.dir:
+        cache.directory = Path(args.dir)
+    if cache.directory is None:
+        print("Analysis cache disabled (ANALYSIS_CACHE=0)")
+        return
+
+    try:
+        if args.command == "list":
+            for entry in cache.entries():
+                print(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry['used']))}  "
+                      f"{entry['bytes']:>9}  {entry['analyzer']:28} {entry['key']}")
+        elif args.command == "stats":
+            entries = cache.entries()
+            analyzers: Dict[str, List[int]] = {}
+            for entry in entries:
+                analyzers.setdefault(entry['analyzer'], []).append(entry['bytes'])
+            print(f"{cache.directory}: {len(entries)} entries, {sum(e['bytes'] for e in entries)} bytes "
+                  f"(limit {cache.max_bytes})")
+            for analyzer, sizes in sorted(analyzers.items()):
+                print(f"   {analyzer:28} {len(sizes):>5} entries {sum(sizes):>10} bytes")
+        elif args.command == "evict":
+            limit = int(args.max_mb * (1 << 20)) if args.max_mb is not None else None
+            print(f"Evicted {cache.evict(limit)} entries")
+        else:
+            entries = cache.entries()
+            for entry in entries:
+                entry['path'].unlink(missing_ok=True)
+            print(f"Removed {len(entries)} entries")
+    except OSError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
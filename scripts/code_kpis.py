@@ -250,6 +250,8 @@ class VygesCodeKPIs:
                 "formal": 0
             },
             "coverage_files": 0,
+            "line_coverage": None,
+            "toggle_coverage": None,
             "test_vectors": 0
         }
         
@@ -270,12 +272,24 @@ class VygesCodeKPIs:
                         tests["test_types"][test_type] += 1
         
         # Coverage files
-        coverage_patterns = ["*.ucdb", "*.vdb", "coverage_*.html"]
+        coverage_patterns = ["*.ucdb", "*.vdb", "coverage_*.html", "coverage*.dat"]
         for pattern in coverage_patterns:
             for file_path in self.project_root.rglob(pattern):
                 if ".git" not in str(file_path):
                     tests["coverage_files"] += 1
         
+        # Merged Verilator coverage (scripts/coverage_merge.py), newest summary wins
+        summaries = [p for p in self.project_root.rglob("coverage_summary.json") if ".git" not in str(p)]
+        if summaries:
+            latest = max(summaries, key=lambda p: p.stat().st_mtime)
+            try:
+                with open(latest, 'r') as f:
+                    summary = json.load(f)
+                tests["line_coverage"] = summary.get("line_coverage")
+                tests["toggle_coverage"] = summary.get("toggle_coverage")
+            except (json.JSONDecodeError, OSError):
+                pass
+        
         # Test vectors
         test_vector_patterns = ["*.vec", "*.stim", "test_vectors/*"]
         for pattern in test_vector_patterns:
@@ -740,6 +754,9 @@ class VygesCodeKPIs:
         print(f"   Test Files: {test_metrics.get('test_files', 0)}")
         print(f"   Test Lines: {test_metrics.get('test_lines', 0)}")
         print(f"   Coverage Files: {test_metrics.get('coverage_files', 0)}")
+        if test_metrics.get("line_coverage") is not None:
+            print(f"   Line Coverage: {test_metrics['line_coverage']:.1f}%")
+            print(f"   Toggle Coverage: {test_metrics.get('toggle_coverage') or 0:.1f}%")
         
         # Quality
         quality_metrics = self.kpis.get("quality_metrics", {})
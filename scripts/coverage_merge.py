@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Verilator Coverage Merge Tool
+
+Merges Verilator coverage shards (coverage.dat files written by --coverage
+builds, one per simulation or worker thread) into a single coverage.dat and a
+JSON summary with per-type, per-line and toggle coverage.
+
+Shards are read line by line, so memory is bounded by the number of distinct
+coverage points rather than by the number or size of the input files. Shards
+are split into batches that are merged in parallel worker processes and then
+reduced into the final result.
+
+Usage:
+    python scripts/coverage_merge.py SHARD_OR_DIR [...] [--output merged.dat]
+                                     [--summary coverage_summary.json] [--jobs N]
+"""
+
+import os
+import sys
+import json
+import argparse
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+COVERAGE_HEADER = b"# SystemC::Coverage-3\n"
+
+# Verilator coverage key separators
+KEY_SEPARATOR = "\x01"
+VALUE_SEPARATOR = "\x02"
+
+
+def find_shards(paths: Iterable[str], exclude: Iterable[str] = ()) -> List[Path]:
+    """Expand files and directories into a sorted list of coverage shards."""
+    excluded = {Path(p).resolve() for p in exclude}
+    shards = set()
+    for path in map(Path, paths):
+        candidates = path.rglob("*.dat") if path.is_dir() else [path]
+        for candidate in candidates:
+            if candidate.is_file() and candidate.resolve() not in excluded:
+                shards.add(candidate)
+    return sorted(shards)
+
+
+def iter_points(shard: Path) -> Iterator[Tuple[bytes, int]]:
+    """Stream (key, count) pairs from one coverage.dat file."""
+    with open(shard, "rb") as f:
+        for line in f:
+            if not line.startswith(b"C '"):
+                continue
+            end = line.rfind(b"' ")
+            if end < 0:
+                continue
+            yield line[3:end], int(line[end + 2:])
+
+
+def merge_shards(shards: List[Path]) -> Dict[bytes, int]:
+    """Sum the counts of identical coverage points over a batch of shards."""
+    merged: Dict[bytes, int] = defaultdict(int)
+    for shard in shards:
+        for key, count in iter_points(shard):
+            merged[key] += count
+    return dict(merged)
+
+
+def parallel_merge(shards: List[Path], jobs: int) -> Dict[bytes, int]:
+    """Merge shards in parallel batches and reduce the partial results."""
+    jobs = max(1, min(jobs, len(shards)))
+    if jobs == 1:
+        return merge_shards(shards)
+
+    batches = [shards[i::jobs] for i in range(jobs)]
+    merged: Dict[bytes, int] = defaultdict(int)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for partial in pool.map(merge_shards, batches):
+            for key, count in partial.items():
+                merged[key] += count
+    return dict(merged)
+
+
+def write_coverage(merged: Dict[bytes, int], output: Path):
+    """Write merged points in Verilator coverage.dat format."""
+    with open(output, "wb") as f:
+        f.write(COVERAGE_HEADER)
+        for key in sorted(merged):
+            f.write(b"C '" + key + b"' " + str(merged[key]).encode() + b"\n")
+
+
+def decode_key(key: bytes) -> Dict[str, str]:
+    """Decode a coverage point key into its fields (f, l, page, h, o, S, ...)."""
+    fields = {}
+    for item in key.decode("utf-8", errors="replace").split(KEY_SEPARATOR):
+        if VALUE_SEPARATOR in item:
+            name, value = item.split(VALUE_SEPARATOR, 1)
+            fields[name] = value
+    return fields
+
+
+def point_type(fields: Dict[str, str]) -> str:
+    """Coverage type of a point: line, toggle, branch, expr or user."""
+    if "t" in fields:
+        return fields["t"]
+    page = fields.get("page", "")
+    if page.startswith("v_"):
+        return page[2:].split("/", 1)[0]
+    return "user"
+
+
+def expand_lines(fields: Dict[str, str]) -> List[int]:
+    """Source lines covered by a point ('S' line ranges, else its own line)."""
+    spec = fields.get("S")
+    if not spec:
+        return [int(fields["l"])] if fields.get("l", "").isdigit() else []
+    lines = []
+    for part in spec.split(","):
+        if "-" in part:
+            first, last = part.split("-", 1)
+            lines.extend(range(int(first), int(last) + 1))
+        elif part.isdigit():
+            lines.append(int(part))
+    return lines
+
+
+def summarize(merged: Dict[bytes, int], shard_count: int) -> Dict:
+    """Build the per-type, per-line and toggle coverage summary."""
+    types = defaultdict(lambda: {"points": 0, "covered": 0})
+    line_hits = defaultdict(dict)
+    toggles = defaultdict(lambda: {"points": 0, "covered": 0})
+    uncovered_toggles = []
+
+    for key, count in merged.items():
+        fields = decode_key(key)
+        kind = point_type(fields)
+        types[kind]["points"] += 1
+        types[kind]["covered"] += 1 if count > 0 else 0
+
+        if kind == "line":
+            hits = line_hits[fields.get("f", "unknown")]
+            for line in expand_lines(fields):
+                hits[line] = max(hits.get(line, 0), count)
+        elif kind == "toggle":
+            hier = fields.get("h", "unknown")
+            toggles[hier]["points"] += 1
+            if count > 0:
+                toggles[hier]["covered"] += 1
+            else:
+                uncovered_toggles.append(f"{hier}.{fields.get('o', '?')}")
+
+    def percent(covered, points):
+        return round(100.0 * covered / points, 2) if points else 0.0
+
+    files = {}
+    for filename, hits in sorted(line_hits.items()):
+        covered = sum(1 for count in hits.values() if count > 0)
+        files[filename] = {
+            "lines": len(hits),
+            "covered": covered,
+            "percent": percent(covered, len(hits)),
+            "hits": {str(line): hits[line] for line in sorted(hits)}
+        }
+
+    return {
+        "shards_merged": shard_count,
+        "points": len(merged),
+        "types": {kind: dict(stats, percent=percent(stats["covered"], stats["points"]))
+                  for kind, stats in sorted(types.items())},
+        "line_coverage": percent(sum(f["covered"] for f in files.values()),
+                                 sum(f["lines"] for f in files.values())),
+        "toggle_coverage": percent(types["toggle"]["covered"], types["toggle"]["points"])
+                           if "toggle" in types else 0.0,
+        "files": files,
+        "toggles": {hier: dict(stats, percent=percent(stats["covered"], stats["points"]))
+                    for hier, stats in sorted(toggles.items())},
+        "uncovered_toggles": sorted(uncovered_toggles)
+    }
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Merge Verilator coverage shards")
+    parser.add_argument("inputs", nargs="+", help="coverage.dat shards or directories containing them")
+    parser.add_argument("--output", default="coverage_merged.dat", help="Merged coverage.dat output")
+    parser.add_argument("--summary", default="coverage_summary.json", help="JSON summary output")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Parallel merge workers")
+    args = parser.parse_args()
+
+    shards = find_shards(args.inputs, exclude=[args.output])
+    if not shards:
+        print("No coverage shards found.")
+        sys.exit(1)
+
+    merged = parallel_merge(shards, args.jobs)
+    write_coverage(merged, Path(args.output))
+
+    summary = summarize(merged, len(shards))
+    with open(args.summary, "w") as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"Merged {len(shards)} shards ({summary['points']} points) into {args.output}")
+    for kind, stats in summary["types"].items():
+        print(f"   {kind:8} {stats['covered']:6}/{stats['points']:<6} {stats['percent']:6.2f}%")
+    print(f"Summary written to: {args.summary}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,37 @@ import json
 from datetime import datetime
 from pathlib import Path
 
+# Core utilization assumed when sizing the die from standard cell area (flow/openlane FP_CORE_UTIL)
+CORE_UTILIZATION = 0.5
+
+def format_die_size(die_size_mm2):
+    """Die size for display, in µm² below 0.01mm²."""
+    if die_size_mm2 < 0.01:
+        return f"{die_size_mm2 * 1e6:.0f}µm²"
+    if die_size_mm2 < 1:
+        return f"{die_size_mm2:.2f}mm²"
+    return f"{die_size_mm2:.1f}mm²"
+
+def estimate_die_size(content):
+    """Die size from the library cell area in a gate report, else from its transistor count."""
+    area_match = re.search(r'\*\*Cell Area\*\*:\s*([\d,.]+)\s*µm²', content)
+    if area_match:
+        return format_die_size(float(area_match.group(1).replace(',', '')) / CORE_UTILIZATION / 1e6)
+    transistors_match = re.search(r'\*\*Estimated Transistors\*\*:\s*([\d,]+)', content)
+    if transistors_match:
+        transistors = int(transistors_match.group(1).replace(',', ''))
+        # Rough die size estimation: 1K transistors ≈ 0.1mm² in 130nm
+        return format_die_size(transistors / 10000)
+    return 'N/A'
+
+def published_result(analyzer, report_path):
+    """Structured results an analysis script published for the current content of its report, if any."""
+    try:
+        from analysis_cache import default_cache
+    except ImportError:
+        return None
+    return default_cache().published(analyzer, report_path)
+
 def extract_ip_metadata():
     """Extract IP-specific information from vyges-metadata.json"""
     metadata = {
@@ -97,16 +128,22 @@ def extract_test_data():
         'success_rate': '100.0'
     }
     
-    if os.path.exists('test_harness_report.md'):
+    # Counts generate_test_harness_report.py published with its report, else scraped from the report
+    results = published_result('test_results', 'test_harness_report.md')
+    if results:
+        test_data['total_tests'] = str(results['total_tests'])
+        test_data['passed_tests'] = str(results['pass_count'])
+        test_data['success_rate'] = f"{results['success_rate']:.1f}"
+    elif os.path.exists('test_harness_report.md'):
         with open('test_harness_report.md', 'r') as f:
             content = f.read()
             
         # Extract test counts
-        test_cases_match = re.search(r'Test Cases:\s*(\d+)', content)
+        test_cases_match = re.search(r'Test Cases\**:\s*(\d+)', content)
         if test_cases_match:
             test_data['total_tests'] = test_cases_match.group(1)
             
-        passed_match = re.search(r'Passed:\s*(\d+)', content)
+        passed_match = re.search(r'Passed\**:\s*(\d+)', content)
         if passed_match:
             test_data['passed_tests'] = passed_match.group(1)
             
@@ -129,8 +166,16 @@ def extract_gate_analysis():
         'die_size': 'N/A'
     }
     
-    # Check for gate analysis report in flow/yosys
+    # Results flow/yosys/gate_analysis.py published with its report (first implementation), else scraped
     gate_report_path = 'flow/yosys/gate_analysis_report.md'
+    results = published_result('gate_analysis', gate_report_path)
+    if results:
+        result = next(iter(results.values()))
+        gate_data['total_gates'] = str(result['total_primitive_gates'])
+        gate_data['die_size'] = format_die_size(result['cell_area'] / CORE_UTILIZATION / 1e6)
+        return gate_data
+    
+    # Check for gate analysis report in flow/yosys
     if os.path.exists(gate_report_path):
         with open(gate_report_path, 'r') as f:
             content = f.read()
@@ -140,17 +185,8 @@ def extract_gate_analysis():
         if gates_match:
             gate_data['total_gates'] = gates_match.group(1)
             
-        # Extract transistor count for die size estimation
-        transistors_match = re.search(r'\*\*Estimated Transistors\*\*:\s*([\d,]+)', content)
-        if transistors_match:
-            transistors = int(transistors_match.group(1).replace(',', ''))
-            # Rough die size estimation: 1K transistors ≈ 0.1mm² in 130nm
-            # This is a very rough estimate - actual die size depends on technology node
-            die_size_mm2 = transistors / 10000  # Rough estimate
-            if die_size_mm2 < 1:
-                gate_data['die_size'] = f"{die_size_mm2:.2f}mm²"
-            else:
-                gate_data['die_size'] = f"{die_size_mm2:.1f}mm²"
+        # Die size from library cell area (or transistor count in older reports)
+        gate_data['die_size'] = estimate_die_size(content)
     
     # Also check for comprehensive report
     comp_report_path = 'flow/yosys/reports/comprehensive_report.md'
@@ -164,16 +200,9 @@ def extract_gate_analysis():
             if gates_match:
                 gate_data['total_gates'] = gates_match.group(1)
                 
-        # Extract transistor count if not found in main report
+        # Die size if not found in main report
         if gate_data['die_size'] == 'N/A':
-            transistors_match = re.search(r'\*\*Estimated Transistors\*\*:\s*([\d,]+)', content)
-            if transistors_match:
-                transistors = int(transistors_match.group(1).replace(',', ''))
-                die_size_mm2 = transistors / 10000  # Rough estimate
-                if die_size_mm2 < 1:
-                    gate_data['die_size'] = f"{die_size_mm2:.2f}mm²"
-                else:
-                    gate_data['die_size'] = f"{die_size_mm2:.1f}mm²"
+            gate_data['die_size'] = estimate_die_size(content)
     
     return gate_data
 
@@ -0,0 +1,562 @@
+#!/usr/bin/env python3
+"""
+Liberty Library Reader
+
+Parses Liberty (.lib) standard cell libraries into a compact index of the
+data the analyses need: cell area, leakage power, pin direction, capacitance
+and function, and the NLDM timing tables (cell_rise/cell_fall delays,
+rise/fall transitions and setup/hold constraints) of every timing arc.
+
+The file is tokenized with one regular expression and parsed into a generic
+group tree in a single pass; the index is then pickled next to the library
+(LIB + '.idx') and keyed by the library's mtime and size, so later runs and
+other tools load a multi-MB library without re-parsing it. Each process
+also keeps loaded libraries in memory.
+
+Library cells are matched to the Yosys gate families (AND, XOR, MUX, DFF,
+...) by evaluating their Liberty function over all input patterns, so area,
+delay and leakage of a synthesized netlist can be read from any library.
+flow/liberty/generic_cmos.lib is a small bundled library.
+
+Usage:
+    python scripts/liberty_reader.py LIBRARY.lib [--cell NAME ...] [--no-cache]
+"""
+
+import os
+import re
+import sys
+import pickle
+import argparse
+import tempfile
+import itertools
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from netlist_sim import GATE_EXPRESSIONS, exhaustive_words
+
+FORMAT_VERSION = 2
+CACHE_SUFFIX = '.idx'
+
+# The bundled generic library
+DEFAULT_LIBRARY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'flow', 'liberty',
+                               'generic_cmos.lib')
+
+# Quoted strings, punctuation and bare words; comments and line continuations are removed first
+_COMMENT = re.compile(r'/\*.*?\*/|//[^\n]*|\\\r?\n', re.S)
+_TOKEN = re.compile(r'"[^"]*"|[(){}:;,]|[^\s(){}:;,"]+')
+
+# Unit scale factors to picoseconds, picofarads and nanowatts
+TIME_UNITS = {'fs': 1e-3, 'ps': 1.0, 'ns': 1e3, 'us': 1e6}
+CAPACITANCE_UNITS = {'ff': 1e-3, 'pf': 1.0, 'nf': 1e3}
+POWER_UNITS = {'pw': 1e-3, 'nw': 1.0, 'uw': 1e3, 'mw': 1e6, 'w': 1e9}
+
+# Timing table groups kept in the index
+TABLE_GROUPS = ('cell_rise', 'cell_fall', 'rise_transition', 'fall_transition',
+                'rise_constraint', 'fall_constraint')
+
+# Gate family of the ff and latch cells
+SEQUENTIAL_FAMILIES = {'ff': 'DFF', 'latch': 'LATCH'}
+
+# Template variables that index output load (the second lookup axis)
+LOAD_VARIABLES = ('total_output_net_capacitance', 'output_net_length', 'output_net_wire_cap',
+                  'output_net_pin_cap')
+
+
+class LibertyGroup:
+    """One group statement: kind (name) { simple : attributes; complex (attributes); groups }."""
+
+    __slots__ = ('kind', 'args', 'attributes', 'complex', 'groups')
+
+    def __init__(self, kind: str, args: List[str]):
+        self.kind = kind
+        self.args = args
+        self.attributes: Dict[str, str] = {}
+        self.complex: Dict[str, List[str]] = {}
+        self.groups: List['LibertyGroup'] = []
+
+    def find(self, kind: str) -> List['LibertyGroup']:
+        return [group for group in self.groups if group.kind == kind]
+
+    def number(self, name: str, default: float = 0.0) -> float:
+        try:
+            return float(self.attributes[name])
+        except (KeyError, ValueError):
+            return default
+
+
+def _unquote(token: str) -> str:
+    return token[1:-1] if token.startswith('"') else token
+
+
+def parse_liberty(text: str) -> LibertyGroup:
+    """Parse Liberty text into a group tree; returns a root group holding the library group(s)."""
+    tokens = _TOKEN.findall(_COMMENT.sub(' ', text))
+    tokens.append(';')
+    root = LibertyGroup('', [])
+    stack = [root]
+    i, n = 0, len(tokens) - 1
+    while i < n:
+        token = tokens[i]
+        if token == '}':
+            if len(stack) == 1:
+                raise ValueError("unbalanced '}'")
+            stack.pop()
+            i += 1
+            continue
+        if token == ';':
+            i += 1
+            continue
+        following = tokens[i + 1]
+        if following == ':':
+            # Simple attribute; the ';' may be omitted at the end of a line
+            j = i + 2
+            parts = [tokens[j]]
+            j += 1
+            while j < n and tokens[j] not in (';', '}') and tokens[j + 1] not in (':', '('):
+                parts.append(tokens[j])
+                j += 1
+            stack[-1].attributes[token] = _unquote(' '.join(parts))
+            i = j
+        elif following == '(':
+            j = i + 2
+            args = []
+            while j < n and tokens[j] != ')':
+                if tokens[j] != ',':
+                    args.append(_unquote(tokens[j]))
+                j += 1
+            j += 1
+            if j < n and tokens[j] == '{':
+                group = LibertyGroup(token, args)
+                stack[-1].groups.append(group)
+                stack.append(group)
+                j += 1
+            else:
+                stack[-1].complex[token] = args
+            i = j
+        else:
+            raise ValueError(f"unexpected token '{token}'")
+    if len(stack) != 1:
+        raise ValueError(f"unterminated group '{stack[-1].kind}'")
+    return root
+
+
+def _numbers(args: List[str]) -> List[List[float]]:
+    """Rows of numbers from quoted, comma-separated complex attribute arguments."""
+    return [[float(value) for value in arg.replace(',', ' ').split()] for arg in args]
+
+
+def _scale(text: str, units: Dict[str, float], default: float) -> float:
+    """Scale factor of a unit such as '1ns' or '100ps'."""
+    match = re.fullmatch(r'\s*([\d.eE+-]*)\s*([A-Za-z]+)\s*', text or '')
+    if not match or match.group(2).lower() not in units:
+        return default
+    return float(match.group(1) or 1) * units[match.group(2).lower()]
+
+
+def _segment(index: List[float], x: float) -> Tuple[int, float]:
+    """Interpolation segment of x in an index and its fraction (extrapolating at the ends)."""
+    if len(index) < 2:
+        return 0, 0.0
+    i = min(max(bisect_right(index, x) - 1, 0), len(index) - 2)
+    return i, (x - index[i]) / (index[i + 1] - index[i])
+
+
+class LookupTable:
+    """NLDM table over input slew (rows) and output load (columns), values stored row-major."""
+
+    __slots__ = ('slews', 'loads', 'values')
+
+    def __init__(self, slews: Tuple[float, ...], loads: Tuple[float, ...], values: array):
+        self.slews = slews
+        self.loads = loads
+        self.values = values
+
+    def __reduce__(self):
+        return LookupTable, (self.slews, self.loads, self.values)
+
+    def lookup(self, slew: float, load: float) -> float:
+        """Bilinear interpolation, linear extrapolation outside the table."""
+        values = self.values
+        width = len(self.loads) or 1
+        rows = len(values) // width
+        i, s = _segment(self.slews, slew) if rows > 1 else (0, 0.0)
+        j, t = _segment(self.loads, load) if width > 1 else (0, 0.0)
+        k = i * width + j
+        low = values[k] + (values[k + 1] - values[k]) * t if width > 1 else values[k]
+        if rows == 1:
+            return low
+        k += width
+        high = values[k] + (values[k + 1] - values[k]) * t if width > 1 else values[k]
+        return low + (high - low) * s
+
+
+class TimingArc:
+    """Timing arc from a related pin, with its lookup tables by group name."""
+
+    __slots__ = ('related_pin', 'timing_type', 'timing_sense', 'tables')
+
+    def __init__(self, related_pin: str, timing_type: str, timing_sense: str,
+                 tables: Dict[str, LookupTable]):
+        self.related_pin = related_pin
+        self.timing_type = timing_type
+        self.timing_sense = timing_sense
+        self.tables = tables
+
+    def __reduce__(self):
+        return TimingArc, (self.related_pin, self.timing_type, self.timing_sense, self.tables)
+
+    @property
+    def is_constraint(self) -> bool:
+        return self.timing_type.startswith(('setup', 'hold', 'recovery', 'removal'))
+
+    def _worst(self, names: Tuple[str, str], slew: float, load: float) -> float:
+        return max((self.tables[name].lookup(slew, load) for name in names if name in self.tables),
+                   default=0.0)
+
+    def delay(self, slew: float, load: float) -> float:
+        return self._worst(('cell_rise', 'cell_fall'), slew, load)
+
+    def transition(self, slew: float, load: float) -> float:
+        return self._worst(('rise_transition', 'fall_transition'), slew, load)
+
+    def constraint(self, slew: float) -> float:
+        return self._worst(('rise_constraint', 'fall_constraint'), slew, slew)
+
+
+class LibertyPin:
+    """Pin of a library cell."""
+
+    __slots__ = ('name', 'direction', 'capacitance', 'function', 'clock', 'arcs')
+
+    def __init__(self, name: str, direction: str, capacitance: float, function: str, clock: bool,
+                 arcs: List[TimingArc]):
+        self.name = name
+        self.direction = direction
+        self.capacitance = capacitance
+        self.function = function
+        self.clock = clock
+        self.arcs = arcs
+
+    def __reduce__(self):
+        return LibertyPin, (self.name, self.direction, self.capacitance, self.function, self.clock, self.arcs)
+
+
+class LibertyCell:
+    """Area, leakage and pins of a library cell."""
+
+    __slots__ = ('name', 'area', 'leakage', 'pins', 'sequential')
+
+    def __init__(self, name: str, area: float, leakage: float, pins: Dict[str, LibertyPin], sequential: str):
+        self.name = name
+        self.area = area
+        self.leakage = leakage
+        self.pins = pins
+        self.sequential = sequential  # '', 'ff' or 'latch'
+
+    def __reduce__(self):
+        return LibertyCell, (self.name, self.area, self.leakage, self.pins, self.sequential)
+
+    @property
+    def inputs(self) -> List[LibertyPin]:
+        return [pin for pin in self.pins.values() if pin.direction == 'input']
+
+    @property
+    def outputs(self) -> List[LibertyPin]:
+        return [pin for pin in self.pins.values() if pin.direction in ('output', 'inout')]
+
+    def delay(self, slew: float, load: float) -> float:
+        """Worst delay to any output (clock-to-Q for flip-flops), in library time units."""
+        return max((arc.delay(slew, load) for pin in self.outputs for arc in pin.arcs
+                    if not arc.is_constraint), default=0.0)
+
+    def setup(self, slew: float) -> float:
+        """Worst setup constraint of any input, in library time units."""
+        return max((arc.constraint(slew) for pin in self.inputs for arc in pin.arcs
+                    if arc.timing_type.startswith('setup')), default=0.0)
+
+
+class Library:
+    """Cell index of one Liberty library, with its units."""
+
+    __slots__ = ('name', 'path', 'time_ps', 'capacitance_pf', 'leakage_nw', 'voltage', 'default_slew', 'cells')
+
+    def __init__(self, name: str, path: str, time_ps: float, capacitance_pf: float, leakage_nw: float,
+                 voltage: float, default_slew: float, cells: Dict[str, LibertyCell]):
+        self.name = name
+        self.path = path
+        self.time_ps = time_ps
+        self.capacitance_pf = capacitance_pf
+        self.leakage_nw = leakage_nw
+        self.voltage = voltage  # nom_voltage in volts (0 if not given)
+        self.default_slew = default_slew
+        self.cells = cells
+
+    def __reduce__(self):
+        return Library, (self.name, self.path, self.time_ps, self.capacitance_pf, self.leakage_nw,
+                         self.voltage, self.default_slew, self.cells)
+
+    def average_input_capacitance(self) -> float:
+        """Mean input pin capacitance of the combinational cells (a fanout's load)."""
+        caps = [pin.capacitance for cell in self.cells.values() if not cell.sequential
+                for pin in cell.inputs]
+        return sum(caps) / len(caps) if caps else 0.0
+
+    def gate_cells(self) -> Dict[str, LibertyCell]:
+        """Smallest cell implementing each gate family (AND, XOR, MUX, ..., DFF, LATCH)."""
+        candidates: Dict[str, List[LibertyCell]] = {}
+        for cell in self.cells.values():
+            family = SEQUENTIAL_FAMILIES.get(cell.sequential) or function_family(cell)
+            if family:
+                candidates.setdefault(family, []).append(cell)
+        return {family: min(cells, key=lambda cell: (cell.area, cell.name))
+                for family, cells in candidates.items()}
+
+
+def _build_library(root: LibertyGroup, path: str) -> Library:
+    """The cell index of the first library group in a parse tree."""
+    libraries = root.find('library')
+    if not libraries:
+        raise ValueError("no library group")
+    lib = libraries[0]
+    templates = {group.args[0]: group for group in lib.groups
+                 if group.kind.endswith('_template') and group.args}
+
+    def table(group: LibertyGroup) -> LookupTable:
+        template = templates.get(group.args[0] if group.args else '')
+        index_1 = group.complex.get('index_1') or (template.complex.get('index_1') if template else None)
+        index_2 = group.complex.get('index_2') or (template.complex.get('index_2') if template else None)
+        slews = _numbers(index_1)[0] if index_1 else []
+        loads = _numbers(index_2)[0] if index_2 else []
+        values = _numbers(group.complex.get('values', ['0']))
+        if template and template.attributes.get('variable_1') in LOAD_VARIABLES:
+            # Load-major template: transpose to slew rows
+            slews, loads = loads, slews
+            values = [list(column) for column in zip(*values)] if len(values) > 1 else \
+                [[value] for value in values[0]]
+        elif len(values) == 1 and not loads:
+            # One-dimensional table over slew
+            values = [[value] for value in values[0]]
+        return LookupTable(tuple(slews), tuple(loads), array('d', [v for row in values for v in row]))
+
+    cells: Dict[str, LibertyCell] = {}
+    for group in lib.find('cell'):
+        pins: Dict[str, LibertyPin] = {}
+        for pin_group in group.find('pin') + [p for bus in group.find('bus') for p in bus.find('pin')]:
+            arcs = [TimingArc(timing.attributes.get('related_pin', ''),
+                              timing.attributes.get('timing_type', 'combinational'),
+                              timing.attributes.get('timing_sense', ''),
+                              {sub.kind: table(sub) for sub in timing.groups if sub.kind in TABLE_GROUPS})
+                    for timing in pin_group.find('timing')]
+            direction = pin_group.attributes.get('direction', '')
+            default_cap = lib.number('default_input_pin_cap') if direction == 'input' else 0.0
+            pin = LibertyPin('', direction, pin_group.number('capacitance', default_cap),
+                             pin_group.attributes.get('function', ''),
+                             pin_group.attributes.get('clock') == 'true', arcs)
+            for name in pin_group.args:
+                pins[name] = LibertyPin(name, pin.direction, pin.capacitance, pin.function, pin.clock, pin.arcs)
+        sequential = 'ff' if group.find('ff') else 'latch' if group.find('latch') else ''
+        name = group.args[0] if group.args else ''
+        cells[name] = LibertyCell(name, group.number('area'), group.number('cell_leakage_power'), pins, sequential)
+
+    # Default input slew: the middle of the first delay template's slew index
+    default_slew = 0.0
+    for template in templates.values():
+        for axis in ('index_1', 'index_2'):
+            variable = template.attributes.get(f'variable_{axis[-1]}', '')
+            if variable == 'input_net_transition' and template.complex.get(axis):
+                index = _numbers(template.complex[axis])[0]
+                default_slew = index[len(index) // 2]
+                break
+        if default_slew:
+            break
+
+    capacitance = lib.complex.get('capacitive_load_unit', ['1', 'pf'])
+    return Library(
+        lib.args[0] if lib.args else '', path,
+        _scale(lib.attributes.get('time_unit', '1ns'), TIME_UNITS, 1e3),
+        float(capacitance[0]) * CAPACITANCE_UNITS.get(capacitance[-1].lower(), 1.0),
+        _scale(lib.attributes.get('leakage_power_unit', '1nW'), POWER_UNITS, 1.0),
+        lib.number('nom_voltage'), default_slew, cells)
+
+
+class _FunctionParser:
+    """Evaluates a Liberty function over pattern words (| + or, & * space and, ^ xor, ! ' not)."""
+
+    _TOKEN = re.compile(r"\s*([A-Za-z_][\w\[\]\.]*|[01]|[!'()&*|+^])")
+
+    def __init__(self, text: str, words: Dict[str, int], mask: int):
+        self.tokens = self._TOKEN.findall(text)
+        self.pos = 0
+        self.words = words
+        self.mask = mask
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def parse(self) -> int:
+        value = self.or_()
+        if self.peek() is not None:
+            raise ValueError(f"unexpected '{self.peek()}' in function")
+        return value
+
+    def or_(self) -> int:
+        value = self.and_()
+        while self.peek() in ('|', '+'):
+            self.pos += 1
+            value |= self.and_()
+        return value
+
+    def and_(self) -> int:
+        value = self.xor()
+        while self.peek() is not None and self.peek() not in ('|', '+', ')'):
+            if self.peek() in ('&', '*'):
+                self.pos += 1
+            value &= self.xor()
+        return value
+
+    def xor(self) -> int:
+        value = self.unary()
+        while self.peek() == '^':
+            self.pos += 1
+            value ^= self.unary()
+        return value
+
+    def unary(self) -> int:
+        token = self.peek()
+        self.pos += 1
+        if token == '!':
+            value = self.unary() ^ self.mask
+        elif token == '(':
+            value = self.or_()
+            if self.peek() != ')':
+                raise ValueError("unbalanced '(' in function")
+            self.pos += 1
+        elif token in ('0', '1'):
+            value = self.mask if token == '1' else 0
+        elif token in self.words:
+            value = self.words[token]
+        else:
+            raise ValueError(f"unknown pin '{token}' in function")
+        while self.peek() == "'":
+            self.pos += 1
+            value ^= self.mask
+        return value
+
+
+def evaluate_function(function: str, pins: List[str]) -> Tuple[int, int]:
+    """Truth table of a Liberty function over the given input pins (pins[0] is the LSB), and its mask."""
+    words, mask = exhaustive_words(len(pins))
+    return _FunctionParser(function, dict(zip(pins, words)), mask).parse(), mask
+
+
+def _family_tables() -> Dict[Tuple[int, int], str]:
+    """Gate family of each (input count, truth table) under any ordering of the family's pins."""
+    tables: Dict[Tuple[int, int], str] = {}
+    for family, expression in GATE_EXPRESSIONS.items():
+        pins = sorted(set(re.findall(r'\{(\w)\}', expression)))
+        for order in itertools.permutations(pins):
+            words, mask = exhaustive_words(len(pins))
+            names = dict(zip(order, (f'w[{i}]' for i in range(len(pins)))))
+            table = eval(expression.format(**names), {'w': words, 'm': mask})
+            tables.setdefault((len(pins), table), family)
+    return tables
+
+
+_FAMILY_TABLES: Optional[Dict[Tuple[int, int], str]] = None
+
+
+def function_family(cell: LibertyCell) -> Optional[str]:
+    """Gate family (AND, XOR, AOI3, ...) of a single-output combinational cell, if any."""
+    global _FAMILY_TABLES
+    outputs = cell.outputs
+    if cell.sequential or len(outputs) != 1 or not outputs[0].function:
+        return None
+    if _FAMILY_TABLES is None:
+        _FAMILY_TABLES = _family_tables()
+    pins = [pin.name for pin in cell.inputs]
+    try:
+        table, _ = evaluate_function(outputs[0].function, pins)
+    except ValueError:
+        return None
+    return _FAMILY_TABLES.get((len(pins), table))
+
+
+# Libraries loaded in this process, keyed by path and validated by mtime/size
+_LIBRARY_CACHE: Dict[str, Tuple[Tuple[int, int, int], Library]] = {}
+
+
+def load_liberty(path: str = DEFAULT_LIBRARY, cache: bool = True) -> Library:
+    """Load a Liberty library through the in-process and on-disk index caches."""
+    real = os.path.realpath(path)
+    stat = os.stat(real)
+    key = (FORMAT_VERSION, stat.st_mtime_ns, stat.st_size)
+    cached = _LIBRARY_CACHE.get(real)
+    if cache and cached and cached[0] == key:
+        return cached[1]
+
+    index_path = real + CACHE_SUFFIX
+    library = None
+    if cache:
+        try:
+            with open(index_path, 'rb') as f:
+                stored_key, stored = pickle.load(f)
+            if stored_key == key:
+                library = stored
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError, AttributeError):
+            pass
+    if library is None:
+        with open(real, 'r', encoding='utf-8', errors='replace') as f:
+            library = _build_library(parse_liberty(f.read()), path)
+        if cache:
+            # Write atomically; a read-only library directory just means no cache
+            try:
+                fd, temp = tempfile.mkstemp(dir=os.path.dirname(real), suffix=CACHE_SUFFIX)
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump((key, library), f, pickle.HIGHEST_PROTOCOL)
+                os.replace(temp, index_path)
+            except OSError:
+                pass
+    _LIBRARY_CACHE[real] = (key, library)
+    return library
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Index Liberty standard cell libraries")
+    parser.add_argument("library", nargs="?", default=DEFAULT_LIBRARY, help="Liberty .lib file")
+    parser.add_argument("--cell", action="append", default=[], help="Show the pins and arcs of a cell")
+    parser.add_argument("--no-cache", action="store_true", help="Re-parse instead of using the index")
+    args = parser.parse_args()
+
+    # Load through the module so the pickled index names liberty_reader, not __main__
+    import liberty_reader
+    try:
+        library = liberty_reader.load_liberty(args.library, cache=not args.no_cache)
+    except (OSError, ValueError) as e:
+        print(f"Error: {args.library}: {e}")
+        sys.exit(1)
+
+    print(f"{args.library}: library {library.name}, {len(library.cells)} cells")
+    print(f"   units: time {library.time_ps:g} ps, capacitance {library.capacitance_pf:g} pF, "
+          f"leakage {library.leakage_nw:g} nW; default slew {library.default_slew:g}; "
+          f"nominal voltage {library.voltage:g} V")
+    load = library.average_input_capacitance()
+    for family, cell in sorted(library.gate_cells().items()):
+        print(f"   {family:8} {cell.name:16} area {cell.area:<8g} leakage {cell.leakage:<8g} "
+              f"delay {cell.delay(library.default_slew, load) * library.time_ps:.1f} ps")
+    for name in args.cell:
+        cell = library.cells.get(name)
+        if cell is None:
+            print(f"Error: no cell '{name}'")
+            sys.exit(1)
+        print(f"   cell {name}: area {cell.area:g}, leakage {cell.leakage:g}")
+        for pin in cell.pins.values():
+            print(f"      {pin.direction:6} {pin.name:8} cap {pin.capacitance:<8g} {pin.function}")
+            for arc in pin.arcs:
+                print(f"         from {arc.related_pin:6} {arc.timing_type or 'combinational':16} "
+                      f"{arc.timing_sense:16} {' '.join(sorted(arc.tables))}")
+
+
+if __name__ == "__main__":
+    main()
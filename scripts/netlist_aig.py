@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+And-Inverter Graph Conversion
+
+Converts a Yosys JSON netlist into an and-inverter graph (AIG): every cell
+is built from two-input ANDs and inverted edges through the shared cell
+definitions of netlist_logic, so netlists from different implementations,
+flows and synthesis runs end up in one structural form that can be compared,
+simulated and handed to other engines.
+
+The graph is built with:
+
+- Structural hashing: an AND of the same two literals is created once.
+- Constant propagation: ANDs with a constant, a repeated or a complemented
+  input fold to a constant or an existing literal.
+- Dead-logic removal: only logic in the fanin cones of the outputs is kept
+  (compact), and unused inputs such as clk_i and reset_n_i in a
+  combinational design are dropped unless asked for.
+
+Literals follow AIGER: node n has literal 2n, its complement 2n + 1, and
+node 0 is constant false. The fanins of the AND nodes are stored in two
+integer arrays. Flip-flops and latches are cut as in full scan (as in
+netlist_fault): their outputs become inputs named CELL.PIN and their data
+and control inputs become outputs named CELL.PIN.
+
+A design can be written as AIGER (binary .aig or ASCII .aag, with a symbol
+table), simulated bit-parallel, or replayed into any netlist_logic
+LogicBuilder (SAT encodings, BDDs, word-level simulation).
+
+Usage:
+    python scripts/netlist_aig.py NETLIST.json [...] [--top NAME] [--out-dir DIR] [--ascii] [--keep-inputs]
+"""
+
+import os
+import sys
+import time
+import argparse
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from netlist_graph import NetlistGraph, is_sequential, load_netlist
+from netlist_logic import LogicBuilder, cell_outputs
+from netlist_sim import flatten, levelize
+from netlist_timing import CLOCK_PINS
+
+# Fanin marker of input nodes
+INPUT = 0xFFFFFFFF
+
+
+class Aig(LogicBuilder):
+    """Structurally hashed and-inverter graph over AIGER literals."""
+
+    __slots__ = ('left', 'right', 'inputs', 'table')
+
+    zero = 0
+    one = 1
+
+    def __init__(self):
+        self.left = array('I', [0])
+        self.right = array('I', [0])
+        self.inputs: List[int] = []  # Input nodes in creation order
+        self.table: Dict[Tuple[int, int], int] = {}
+
+    @property
+    def node_count(self) -> int:
+        return len(self.left)
+
+    @property
+    def and_count(self) -> int:
+        return len(self.left) - 1 - len(self.inputs)
+
+    def is_and(self, node: int) -> bool:
+        return node > 0 and self.left[node] != INPUT
+
+    def new_input(self) -> int:
+        node = len(self.left)
+        self.left.append(INPUT)
+        self.right.append(INPUT)
+        self.inputs.append(node)
+        return 2 * node
+
+    def not_(self, a: int) -> int:
+        return a ^ 1
+
+    def and_(self, a: int, b: int) -> int:
+        if a < b:
+            a, b = b, a
+        if b == 0 or a == b ^ 1:
+            return 0
+        if b == 1 or a == b:
+            return a
+        literal = self.table.get((a, b))
+        if literal is None:
+            literal = self.table[(a, b)] = 2 * len(self.left)
+            self.left.append(a)
+            self.right.append(b)
+        return literal
+
+    def xor(self, a: int, b: int) -> int:
+        if a < b:
+            a, b = b, a
+        if b < 2:
+            return a ^ b  # Constant: a or not(a)
+        if a >> 1 == b >> 1:
+            return (a ^ b) & 1  # Same node: 0, or 1 if complemented
+        return self.or_(self.and_(a, b ^ 1), self.and_(a ^ 1, b))
+
+    def levels(self) -> array:
+        """Logic level of every node (inputs and constant at 0)."""
+        level = array('I', bytes(4 * len(self.left)))
+        left, right = self.left, self.right
+        for node in range(1, len(left)):
+            if left[node] != INPUT:
+                level[node] = 1 + max(level[left[node] >> 1], level[right[node] >> 1])
+        return level
+
+    def simulate(self, input_words: Sequence[int], mask: int) -> List[int]:
+        """Word of every node for one word per input (in input order); literal l is word[l >> 1] ^ mask*(l & 1)."""
+        words = [0] * len(self.left)
+        for node, word in zip(self.inputs, input_words):
+            words[node] = word
+        left, right = self.left, self.right
+        for node in range(1, len(left)):
+            a = left[node]
+            if a == INPUT:
+                continue
+            b = right[node]
+            x = words[a >> 1] ^ mask if a & 1 else words[a >> 1]
+            y = words[b >> 1] ^ mask if b & 1 else words[b >> 1]
+            words[node] = x & y
+        return words
+
+    def replay(self, builder: LogicBuilder, inputs: Sequence) -> List:
+        """Signal of every node built with another builder, given signals for the inputs."""
+        signals: List = [builder.zero] * len(self.left)
+        for node, signal in zip(self.inputs, inputs):
+            signals[node] = signal
+        left, right = self.left, self.right
+
+        def literal(lit: int):
+            return builder.not_(signals[lit >> 1]) if lit & 1 else signals[lit >> 1]
+
+        for node in range(1, len(left)):
+            if left[node] != INPUT:
+                signals[node] = builder.and_(literal(left[node]), literal(right[node]))
+        return signals
+
+    def compact(self, outputs: Sequence[int], keep_inputs: bool = True) -> Tuple['Aig', List[int], List[int]]:
+        """Copy with only the logic in the output cones; new output literals and the kept input positions.
+
+        Inputs come first in the copy, then the ANDs in topological order, as AIGER requires.
+        """
+        used = bytearray(len(self.left))
+        for lit in outputs:
+            used[lit >> 1] = 1
+        left, right = self.left, self.right
+        for node in range(len(left) - 1, 0, -1):
+            if used[node] and left[node] != INPUT:
+                used[left[node] >> 1] = 1
+                used[right[node] >> 1] = 1
+
+        copy = Aig()
+        mapped = [0] * len(left)
+        kept = []
+        for position, node in enumerate(self.inputs):
+            if keep_inputs or used[node]:
+                mapped[node] = copy.new_input()
+                kept.append(position)
+        for node in range(1, len(left)):
+            if used[node] and left[node] != INPUT:
+                a, b = left[node], right[node]
+                mapped[node] = copy.and_(mapped[a >> 1] ^ (a & 1), mapped[b >> 1] ^ (b & 1))
+        return copy, [mapped[lit >> 1] ^ (lit & 1) for lit in outputs], kept
+
+
+class AigDesign:
+    """A netlist converted to a compacted AIG, with its input and output names."""
+
+    __slots__ = ('name', 'aig', 'input_names', 'output_names', 'outputs', 'dropped')
+
+    def __init__(self, name: str, aig: Aig, input_names: List[str], output_names: List[str],
+                 outputs: List[int], dropped: List[str]):
+        self.name = name
+        self.aig = aig
+        self.input_names = input_names
+        self.output_names = output_names
+        self.outputs = outputs  # Output literals
+        self.dropped = dropped  # Input bits without fanout, removed
+
+    @property
+    def depth(self) -> int:
+        levels = self.aig.levels()
+        return max((levels[lit >> 1] for lit in self.outputs), default=0)
+
+    def summary(self) -> Dict:
+        return {
+            'module': self.name,
+            'inputs': len(self.input_names),
+            'outputs': len(self.outputs),
+            'ands': self.aig.and_count,
+            'depth': self.depth,
+            'dropped': self.dropped,
+        }
+
+    def to_aiger(self, binary: bool = True) -> bytes:
+        """AIGER text (aag) or binary (aig) with a symbol table; the graph must be compacted."""
+        aig = self.aig
+        count = len(aig.inputs)
+        header = f"{'aig' if binary else 'aag'} {aig.node_count - 1} {count} 0 {len(self.outputs)} {aig.and_count}\n"
+        out = bytearray(header.encode())
+        if not binary:
+            out += ''.join(f"{2 * node}\n" for node in aig.inputs).encode()
+        out += ''.join(f"{lit}\n" for lit in self.outputs).encode()
+        for node in range(count + 1, aig.node_count):
+            a, b = aig.left[node], aig.right[node]
+            if not binary:
+                out += f"{2 * node} {a} {b}\n".encode()
+                continue
+            # Delta-encoded fanins, 7 bits per byte
+            for delta in (2 * node - a, a - b):
+                while delta >= 0x80:
+                    out.append(delta & 0x7F | 0x80)
+                    delta >>= 7
+                out.append(delta)
+        out += ''.join(f"i{i} {name}\n" for i, name in enumerate(self.input_names)).encode()
+        out += ''.join(f"o{i} {name}\n" for i, name in enumerate(self.output_names)).encode()
+        out += f"c\n{self.name}\n".encode()
+        return bytes(out)
+
+
+def _bit_names(name: str, width: int) -> List[str]:
+    return [name] if width == 1 else [f"{name}[{i}]" for i in range(width)]
+
+
+def netlist_aig(graph: NetlistGraph, top: Optional[str] = None, keep_inputs: bool = False) -> AigDesign:
+    """Convert a design to a compacted AIG (unused input bits are dropped unless keep_inputs)."""
+    module = graph.modules[top] if top else graph.top
+    if module is None:
+        raise ValueError("netlist has no modules")
+    cell_names: List[str] = []
+    cells, net_count = flatten(graph, module, cell_names)
+    order, _ = levelize(cells, net_count, module.name)
+    aig = Aig()
+
+    values: List[Optional[int]] = [None] * net_count
+    values[0], values[1], values[2], values[3] = 0, 1, 0, 0
+    input_names: List[str] = []
+    for port, nets in module.port_nets('input').items():
+        for net, name in zip(nets, _bit_names(port, len(nets))):
+            values[net] = aig.new_input()
+            input_names.append(name)
+
+    # Full scan: state-holding cell outputs are inputs, their other inputs outputs
+    scan: List[Tuple[str, List[int]]] = []
+    for index, (type_name, _, inputs, outputs) in enumerate(cells):
+        if not is_sequential(type_name):
+            continue
+        for pin, nets in outputs.items():
+            for net, name in zip(nets, _bit_names(f"{cell_names[index]}.{pin}", len(nets))):
+                values[net] = aig.new_input()
+                input_names.append(name)
+        scan.extend((f"{cell_names[index]}.{pin}", nets) for pin, nets in inputs.items() if pin not in CLOCK_PINS)
+
+    def read(nets: List[int]) -> List[int]:
+        return [0 if values[net] is None else values[net] for net in nets]
+
+    for index in order:
+        type_name, params, inputs, outputs = cells[index]
+        results = cell_outputs(aig, type_name, params, {pin: read(nets) for pin, nets in inputs.items()})
+        for pin, nets in outputs.items():
+            for net, literal in zip(nets, results.get(pin, [])):
+                values[net] = literal
+
+    output_names: List[str] = []
+    literals: List[int] = []
+    for name, nets in list(module.port_nets('output').items()) + scan:
+        output_names.extend(_bit_names(name, len(nets)))
+        literals.extend(read(nets))
+    compacted, outputs, kept = aig.compact(literals, keep_inputs)
+    kept_set = set(kept)
+    dropped = [name for position, name in enumerate(input_names) if position not in kept_set]
+    return AigDesign(module.name, compacted, [input_names[position] for position in kept], output_names,
+                     outputs, dropped)
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Convert Yosys JSON netlists to and-inverter graphs (AIGER)")
+    parser.add_argument("netlists", nargs="+", help="Yosys write_json netlists")
+    parser.add_argument("--top", help="Module to convert (default: the netlist top)")
+    parser.add_argument("--out-dir", help="Write MODULE.aig (or .aag) files to this directory")
+    parser.add_argument("--ascii", action="store_true", help="Write ASCII AIGER (.aag)")
+    parser.add_argument("--keep-inputs", action="store_true", help="Keep input bits without fanout")
+    args = parser.parse_args()
+
+    for path in args.netlists:
+        start = time.perf_counter()
+        try:
+            design = netlist_aig(load_netlist(path), args.top, args.keep_inputs)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error: {path}: {e}")
+            sys.exit(1)
+        elapsed = time.perf_counter() - start
+        summary = design.summary()
+        dropped = f" (dropped {', '.join(summary['dropped'])})" if summary['dropped'] else ""
+        print(f"{path}: {design.name}, {summary['inputs']} inputs{dropped}, {summary['outputs']} outputs, "
+              f"{summary['ands']} ANDs, depth {summary['depth']} in {elapsed * 1e3:.1f} ms")
+        if args.out_dir:
+            os.makedirs(args.out_dir, exist_ok=True)
+            out = os.path.join(args.out_dir, f"{design.name}.{'aag' if args.ascii else 'aig'}")
+            with open(out, 'wb') as f:
+                f.write(design.to_aiger(not args.ascii))
+            print(f"AIGER written to {out}")
+
+
+if __name__ == "__main__":
+    main()
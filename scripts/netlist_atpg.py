@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+SAT-Based ATPG with Test Compaction
+
+Generates a compact set of test vectors that detects every testable
+stuck-at fault of a synthesized Yosys JSON netlist, in the vector file
+format the SV testbenches replay (+TEST=vectors +VECTORS=..., or
+make test_atpg in tb/sv_tb).
+
+The collapsed fault list and all fault simulation come from netlist_fault.
+Each vector is generated by a fresh CDCL SAT solver holding a structurally
+hashed Tseitin encoding of the fault-free design (netlist_equiv's SatSolver
+and CnfBuilder). For the target fault, the fanout cone of the fault site is
+encoded a second time with the site stuck, and the solver looks for an
+input assignment under which some observed net differs between the two
+copies; unsatisfiable faults are redundant (no test exists), and faults
+past the conflict budget are aborted.
+
+Compaction is done twice:
+
+- Dynamic: once a vector is found for the target fault, further faults it
+  does not detect yet are added to the same SAT query, one at a time, and
+  kept whenever the query stays satisfiable, so one vector is built to
+  detect many faults.
+  Each new vector is then fault simulated and every fault it detects is
+  dropped.
+- Static: the finished set is fault simulated in reverse order, keeping only
+  vectors that detect a fault no earlier vector detects, until no vector can
+  be dropped.
+
+Inputs outside the exported columns (clk_i, reset_n_i) are held at constant
+values (HELD_INPUTS, else 0) during generation, so the exported vectors give
+the reported coverage when replayed.
+
+Usage:
+    python scripts/netlist_atpg.py NETLIST.json [...] [--out-dir DIR] [--columns a_i b_i cin_i]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from typing import Dict, List, Optional, Sequence
+
+from netlist_equiv import CnfBuilder, SatSolver
+from netlist_fault import DEFAULT_COLUMNS, Fault, FaultSimulator
+from netlist_graph import FIRST_NET, load_netlist
+from netlist_logic import cell_outputs
+
+# Conflicts allowed per SAT query before a fault is aborted
+CONFLICT_LIMIT = 1000
+
+# Secondary faults tried per vector during dynamic compaction
+DYNAMIC_ATTEMPTS = 16
+
+# Values of inputs that are not exported, as the benches drive them
+HELD_INPUTS = {'reset_n_i': 1}
+
+
+class Atpg:
+    """SAT-based test generation for the collapsed stuck-at faults of one design."""
+
+    __slots__ = ('sim', 'columns', 'held', 'conflict_limit', 'solver', 'builder', 'good', 'input_lits',
+                 'targets')
+
+    def __init__(self, sim: FaultSimulator, columns: Optional[Sequence[str]] = None,
+                 conflict_limit: int = CONFLICT_LIMIT):
+        self.sim = sim
+        if columns is None:
+            columns = DEFAULT_COLUMNS if set(DEFAULT_COLUMNS) <= sim.inputs.keys() else list(sim.inputs)
+        missing = [port for port in columns if port not in sim.inputs]
+        if missing:
+            raise ValueError(f"{sim.name} has no input port {', '.join(missing)}")
+        self.columns = list(columns)
+        self.conflict_limit = conflict_limit
+
+        # Input bits (in port order) held constant because they are not exported
+        self.held: Dict[int, int] = {}
+        position = 0
+        for port, nets in sim.inputs.items():
+            value = HELD_INPUTS.get(port, 0)
+            for i in range(len(nets)):
+                if port not in self.columns:
+                    self.held[position] = (value >> i) & 1
+                position += 1
+        self._reset()
+
+    def _reset(self):
+        """A fresh solver holding the fault-free design; flip-flop outputs are 0."""
+        self.solver = SatSolver()
+        self.builder = b = CnfBuilder(self.solver)
+        self.good: List[int] = [b.zero] * self.sim.net_count
+        self.good[1] = b.one
+        self.input_lits: List[int] = []
+        for position, net in enumerate(net for nets in self.sim.inputs.values() for net in nets):
+            held = self.held.get(position)
+            lit = b.new_input() if held is None else (b.one if held else b.zero)
+            self.input_lits.append(lit)
+            if net >= FIRST_NET:
+                self.good[net] = lit
+        for values in self._cone_values(range(len(self.sim.cells)), self.good.__getitem__):
+            for net, lit in values.items():
+                self.good[net] = lit
+        self.targets: Dict[Fault, int] = {}
+
+    def _cone_values(self, positions, read):
+        for position in positions:
+            type_name, params, inputs, outputs = self.sim.cells[position]
+            results = cell_outputs(self.builder, type_name, params,
+                                   {pin: [read(net) for net in nets] for pin, nets in inputs.items()})
+            yield {net: lit for pin, nets in outputs.items() for net, lit in zip(nets, results.get(pin, []))}
+
+    def target(self, fault: Fault) -> int:
+        """Literal that is true exactly for inputs that detect a fault (zero if none can)."""
+        lit = self.targets.get(fault)
+        if lit is not None:
+            return lit
+        b = self.builder
+        site, value = fault
+        faulty = {site: b.one if value else b.zero}
+        read = lambda net: faulty.get(net, self.good[net])
+        cone = set()
+        frontier = [site]
+        while frontier:
+            for position in self.sim.sinks.get(frontier.pop(), ()):
+                if position not in cone:
+                    cone.add(position)
+                    for nets in self.sim.cells[position][3].values():
+                        frontier.extend(nets)
+        for values in self._cone_values(sorted(cone), read):
+            for net, lit in values.items():
+                if net != site and lit != self.good[net]:
+                    faulty[net] = lit
+        differences = [b.xor(self.good[net], lit) for net, lit in faulty.items() if net in self.sim.observed]
+        lit = self.targets[fault] = b.reduce_or(differences)
+        return lit
+
+    def _model(self) -> int:
+        pattern = 0
+        for i, lit in enumerate(self.input_lits):
+            if self.solver.model_value(lit) == 1:
+                pattern |= 1 << i
+        return pattern
+
+    def generate(self, dynamic: bool = True) -> Dict:
+        """Test vectors for the collapsed faults with dynamic compaction, before static compaction."""
+        sim = self.sim
+        remaining = list(sim.faults)
+        patterns: List[int] = []
+        detected: Dict[Fault, int] = {}
+        redundant: List[Fault] = []
+        aborted: List[Fault] = []
+        while remaining:
+            fault = remaining.pop(0)
+            self._reset()
+            lit = self.target(fault)
+            result = False if lit == self.builder.zero else self.solver.solve((lit,), self.conflict_limit)
+            if not result:
+                (aborted if result is None else redundant).append(fault)
+                continue
+            pattern = self._model()
+
+            # Dynamic compaction: extend the vector to faults it does not detect yet
+            if dynamic:
+                assumptions = (lit,)
+                hits = sim.simulate([pattern], remaining)
+                attempts = 0
+                for secondary in remaining:
+                    if attempts == DYNAMIC_ATTEMPTS:
+                        break
+                    if secondary in hits:
+                        continue
+                    extra = self.target(secondary)
+                    if extra == self.builder.zero:
+                        continue
+                    attempts += 1
+                    if self.solver.solve(assumptions + (extra,), self.conflict_limit):
+                        assumptions += (extra,)
+                        pattern = self._model()
+
+            # Drop every fault the new vector detects
+            index = len(patterns)
+            patterns.append(pattern)
+            detected[fault] = index
+            hits = sim.simulate([pattern], remaining)
+            for hit in hits:
+                detected[hit] = index
+            remaining = [other for other in remaining if other not in hits]
+        return {'patterns': patterns, 'detected': detected, 'redundant': redundant, 'aborted': aborted}
+
+
+def static_compaction(sim: FaultSimulator, patterns: List[int], faults: Sequence[Fault]) -> List[int]:
+    """Reverse-order fault simulation, keeping vectors that first detect some fault, until stable."""
+    while True:
+        reverse = patterns[::-1]
+        first = sim.simulate(reverse, faults)
+        kept = [reverse[index] for index in sorted(set(first.values()))]
+        if len(kept) == len(patterns):
+            return kept
+        patterns = kept
+
+
+def run_atpg(sim: FaultSimulator, columns: Optional[Sequence[str]] = None, dynamic: bool = True,
+             static: bool = True, conflict_limit: int = CONFLICT_LIMIT) -> Dict:
+    """Compacted test set and coverage of a design."""
+    atpg = Atpg(sim, columns, conflict_limit)
+    result = atpg.generate(dynamic)
+    generated = len(result['patterns'])
+    patterns = result['patterns']
+    if static and patterns:
+        patterns = static_compaction(sim, patterns, list(result['detected']))
+    coverage = sim.coverage(sim.simulate(patterns))
+    testable = coverage['faults'] - sum(1 for root in sim.representative.values() if root in result['redundant'])
+    return {
+        'module': sim.name,
+        'columns': atpg.columns,
+        'patterns': patterns,
+        'generated': generated,
+        'redundant': [sim.fault_name(fault) for fault in result['redundant']],
+        'aborted': [sim.fault_name(fault) for fault in result['aborted']],
+        'test_coverage': 100.0 * coverage['detected'] / testable if testable else 100.0,
+        **coverage,
+    }
+
+
+def format_vectors(sim: FaultSimulator, result: Dict) -> str:
+    """Vector file text: one line per vector with a binary value per column ("a b cin")."""
+    offsets = {}
+    position = 0
+    for port, nets in sim.inputs.items():
+        offsets[port] = (position, len(nets))
+        position += len(nets)
+    lines = [f"# ATPG vectors for {sim.name}: {len(result['patterns'])} vectors, "
+             f"{result['coverage']:.1f}% stuck-at fault coverage",
+             f"# {' '.join(result['columns'])}"]
+    for pattern in result['patterns']:
+        fields = []
+        for port in result['columns']:
+            offset, width = offsets[port]
+            fields.append(format((pattern >> offset) & ((1 << width) - 1), f'0{width}b'))
+        lines.append(' '.join(fields))
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="SAT-based ATPG with compaction for Yosys JSON netlists")
+    parser.add_argument("netlists", nargs="+", help="Yosys write_json netlists")
+    parser.add_argument("--top", help="Module to test (default: the netlist top)")
+    parser.add_argument("--columns", nargs="+", help=f"Exported input ports (default: {' '.join(DEFAULT_COLUMNS)})")
+    parser.add_argument("--out-dir", help="Write MODULE_atpg.txt vector files to this directory")
+    parser.add_argument("--no-dynamic", action="store_true", help="Disable dynamic compaction")
+    parser.add_argument("--no-static", action="store_true", help="Disable static compaction")
+    parser.add_argument("--conflicts", type=int, default=CONFLICT_LIMIT, help="Conflict limit per SAT query")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = []
+    for path in args.netlists:
+        start = time.perf_counter()
+        try:
+            sim = FaultSimulator(load_netlist(path), args.top)
+            result = run_atpg(sim, args.columns, not args.no_dynamic, not args.no_static, args.conflicts)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error: {path}: {e}")
+            sys.exit(1)
+        elapsed = time.perf_counter() - start
+        print(f"{path}: {sim.name}, {result['faults']} faults ({result['collapsed_faults']} collapsed) -> "
+              f"{len(result['patterns'])} vectors ({result['generated']} before static compaction), "
+              f"{result['coverage']:.1f}% fault coverage, {len(result['redundant'])} redundant, "
+              f"{len(result['aborted'])} aborted in {elapsed * 1e3:.1f} ms")
+        if args.out_dir:
+            os.makedirs(args.out_dir, exist_ok=True)
+            out = os.path.join(args.out_dir, f"{sim.name}_atpg.txt")
+            with open(out, 'w') as f:
+                f.write(format_vectors(sim, result))
+            print(f"Vectors written to {out}")
+        results.append({'netlist': path, 'seconds': elapsed, **result})
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Carry-Chain Inference
+
+Finds ripple-carry adders in a hierarchical Yosys JSON netlist and estimates
+what they cost on an FPGA's dedicated carry chain compared with plain LUTs.
+Our FPGA flows map every adder onto generic LUTs, so no CARRY4 ever shows
+up in the resource counts; this analysis tells us when it should.
+
+A module is a full adder if it is combinational, has at most
+MAX_ADDER_INPUT_BITS input bits, and two of its output bits compute the XOR
+and the majority of the same three input bits (checked by exhaustive
+bit-parallel simulation, so any implementation style is recognized). A
+ripple chain is a run of full adder instances in one module where the carry
+output of each stage drives an operand of the next, as in
+integration/ripple_carry_adder.v. Chains found in submodules are counted
+once per instance of the module (netlist_hierarchy).
+
+For an adder of a given width, the carry-chain estimate is one LUT per bit
+plus the carry primitives (Xilinx CARRY4, 4 bits each; iCE40 SB_CARRY, 1
+bit each), with a delay of one LUT level (propagate on Xilinx, sum on
+iCE40) plus CARRY_DELAY_PS per bit. The LUT-only estimate maps a width-bit
+ripple of the netlist's full adder onto K-input LUTs (netlist_lutmap) and
+charges one LUT delay per level.
+
+Usage:
+    python scripts/netlist_carry.py NETLIST.json [--top NAME] [--arch xilinx|ice40] [--widths 4 16 64]
+"""
+
+import sys
+import argparse
+import itertools
+from typing import Dict, List, Optional, Tuple
+
+from netlist_graph import Module, NetlistGraph, load_netlist
+from netlist_hierarchy import resolve_hierarchy
+from netlist_lutmap import LUT_SIZES, LutMapping
+from netlist_sim import NetlistSimulator, assign_inputs, cell_pins, exhaustive_words
+from netlist_timing import LUT_DELAY_PS, ripple_chain, ripple_chain_name
+
+# Carry primitive and the adder bits it covers, per architecture
+CARRY_PRIMITIVES = {'xilinx': ('CARRY4', 4), 'ice40': ('SB_CARRY', 1)}
+
+# Carry propagation through the dedicated chain (~0.1ns per bit)
+CARRY_DELAY_PS = 100
+
+# Largest module simulated exhaustively when looking for full adders
+MAX_ADDER_INPUT_BITS = 8
+
+# Shortest run of full adders reported as a carry chain
+MIN_CHAIN_BITS = 2
+
+# Adder widths compared by default
+CARRY_WIDTHS = [1, 2, 4, 8, 16, 32, 64]
+
+# A port bit: (port name, bit index)
+PortBit = Tuple[str, int]
+
+# Full adder pins: (three operand bits, sum bit, carry bit)
+AdderPins = Tuple[Tuple[PortBit, PortBit, PortBit], PortBit, PortBit]
+
+
+def full_adder_pins(graph: NetlistGraph, module: Module) -> Optional[AdderPins]:
+    """Operand, sum and carry port bits of a full adder module, or None."""
+    inputs = [(port, i) for port, nets in module.port_nets('input').items() for i in range(len(nets))]
+    outputs = [(port, i) for port, nets in module.port_nets('output').items() for i in range(len(nets))]
+    if len(inputs) < 3 or len(inputs) > MAX_ADDER_INPUT_BITS or len(outputs) < 2:
+        return None
+    try:
+        sim = NetlistSimulator(graph, module.name)
+    except (ValueError, KeyError):
+        return None
+    if sim.state_nets:
+        return None
+
+    words, mask = exhaustive_words(len(inputs))
+    values = sim.evaluate(assign_inputs(sim.inputs, words), mask)
+    functions = {values[port][i]: (port, i) for port, i in outputs}
+    for a, b, c in itertools.combinations(range(len(inputs)), 3):
+        x, y, z = words[a], words[b], words[c]
+        total = functions.get(x ^ y ^ z)
+        carry = functions.get((x & y) | (x & z) | (y & z))
+        if total and carry:
+            return (inputs[a], inputs[b], inputs[c]), total, carry
+    return None
+
+
+def find_adders(graph: NetlistGraph) -> Dict[str, AdderPins]:
+    """Full adder modules of a netlist, by name."""
+    adders = {}
+    for name, module in graph.modules.items():
+        if not module.is_blackbox:
+            pins = full_adder_pins(graph, module)
+            if pins:
+                adders[name] = pins
+    return adders
+
+
+def module_chains(module: Module, adders: Dict[str, AdderPins]) -> List[List[int]]:
+    """Ripple chains of full adder instances in a module, each listed from the carry-in stage."""
+    stages: Dict[int, List[int]] = {}
+    driver: Dict[int, int] = {}
+    for cell in range(module.cell_count):
+        pins = adders.get(module.type_name(cell))
+        if pins is None:
+            continue
+        operands, _, (carry_port, carry_bit) = pins
+        inputs, outputs = cell_pins(module, cell)
+        try:
+            stages[cell] = [inputs[port][i] for port, i in operands]
+            driver[outputs[carry_port][carry_bit]] = cell
+        except (KeyError, IndexError):
+            stages.pop(cell, None)  # Unconnected operand or carry
+
+    # Link each carry output to one stage reading it as an operand
+    successor: Dict[int, int] = {}
+    predecessor: Dict[int, int] = {}
+    for cell, operands in stages.items():
+        for net in operands:
+            source = driver.get(net)
+            if source is not None and source != cell and source not in successor and cell not in predecessor:
+                successor[source] = cell
+                predecessor[cell] = source
+
+    chains = []
+    for cell in stages:
+        if cell in predecessor:
+            continue
+        chain = [cell]
+        while chain[-1] in successor:
+            chain.append(successor[chain[-1]])
+        chains.append(chain)
+    return chains
+
+
+def find_carry_chains(graph: NetlistGraph) -> Dict[str, List[List[str]]]:
+    """Ripple chains of MIN_CHAIN_BITS or more stages in each module definition, by instance name."""
+    adders = find_adders(graph)
+    found = {}
+    for name, module in graph.modules.items():
+        if module.is_blackbox:
+            continue
+        chains = [[module.cell_names[cell] for cell in chain]
+                  for chain in module_chains(module, adders) if len(chain) >= MIN_CHAIN_BITS]
+        if chains:
+            found[name] = chains
+    return found
+
+
+def design_chain_widths(graph: NetlistGraph, top: Optional[str] = None) -> Dict[int, int]:
+    """Number of ripple chains of each width in the design rooted at top (default: the netlist top)."""
+    module = graph.modules[top] if top else graph.top
+    if module is None:
+        return {}
+    chains = find_carry_chains(graph)
+    counts = {}
+    for name, definition in graph.modules.items():
+        if definition.is_blackbox:
+            continue
+        cells = {type_name: count for type_name, count in definition.type_counts().items()
+                 if type_name in graph.modules}
+        for chain in chains.get(name, []):
+            cells[len(chain)] = cells.get(len(chain), 0) + 1
+        counts[name] = cells
+    widths = resolve_hierarchy(counts)[module.name]
+    return {width: count for width, count in sorted(widths.items()) if isinstance(width, int)}
+
+
+def carry_chain_estimate(width: int, arch: str = 'xilinx') -> Dict:
+    """LUTs, carry primitives and delay of a width-bit adder on the dedicated carry chain."""
+    primitive, bits = CARRY_PRIMITIVES[arch]
+    return {
+        'primitive': primitive,
+        'primitives': -(-width // bits),
+        'luts': width,
+        'delay_ps': LUT_DELAY_PS + width * CARRY_DELAY_PS,
+    }
+
+
+def lut_only_estimate(path: str, width: int, arch: str = 'xilinx', adder: Optional[str] = None) -> Dict:
+    """LUTs, LUT depth and delay of a width-bit ripple of the netlist's full adder mapped onto LUTs."""
+    if adder is None:
+        top = load_netlist(path).top
+        if top is None:
+            raise ValueError("netlist has no modules")
+        adder = top.name
+    # Map the chain by name: a netlist may already mark its own design as top
+    mapping = LutMapping(ripple_chain(path, width, adder), ripple_chain_name(adder, width), k=LUT_SIZES[arch])
+    return {
+        'luts': mapping.lut_count,
+        'depth': mapping.lut_depth,
+        'delay_ps': mapping.lut_depth * LUT_DELAY_PS,
+    }
+
+
+def width_sweep(path: str, widths: List[int] = CARRY_WIDTHS, arch: str = 'xilinx',
+                adder: Optional[str] = None) -> List[Dict]:
+    """Carry-chain and LUT-only estimates of ripple adders of each width."""
+    rows = []
+    for width in widths:
+        chain = carry_chain_estimate(width, arch)
+        lut = lut_only_estimate(path, width, arch, adder)
+        rows.append({'width': width, 'lut': lut, 'chain': chain,
+                     'chain_faster': chain['delay_ps'] < lut['delay_ps']})
+    return rows
+
+
+def crossover_width(rows: List[Dict]) -> Optional[int]:
+    """Smallest width from which the carry chain is faster at every larger width of a sweep."""
+    crossover = None
+    for row in reversed(rows):
+        if not row['chain_faster']:
+            break
+        crossover = row['width']
+    return crossover
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Find ripple-carry chains and estimate FPGA carry-chain use")
+    parser.add_argument("netlist", help="Yosys write_json netlist")
+    parser.add_argument("--top", help="Design top module (default: the netlist top)")
+    parser.add_argument("--arch", choices=sorted(CARRY_PRIMITIVES), default='xilinx', help="Target FPGA family")
+    parser.add_argument("--widths", type=int, nargs="+", default=CARRY_WIDTHS, help="Adder widths to compare")
+    args = parser.parse_args()
+
+    try:
+        graph = load_netlist(args.netlist)
+        adders = find_adders(graph)
+        chains = find_carry_chains(graph)
+        widths = design_chain_widths(graph, args.top)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {args.netlist}: {e}")
+        sys.exit(1)
+
+    print(f"Full adders: {', '.join(adders) or 'none'}")
+    for module, module_chains_ in chains.items():
+        for chain in module_chains_:
+            print(f"{module}: {len(chain)}-bit ripple chain {chain[0]} -> {chain[-1]}")
+    primitive, _ = CARRY_PRIMITIVES[args.arch]
+    for width, count in widths.items():
+        estimate = carry_chain_estimate(width, args.arch)
+        print(f"Design: {count} x {width}-bit chain -> {estimate['primitives']} {primitive}, "
+              f"{estimate['luts']} LUTs each")
+    if not adders:
+        return
+
+    # Carry chain versus LUT-only ripple adders built from the first full adder
+    adder = args.top if args.top in adders else next(iter(adders))
+    try:
+        rows = width_sweep(args.netlist, args.widths, args.arch, adder)
+    except ValueError as e:
+        print(f"Error: {args.netlist}: {e}")
+        sys.exit(1)
+    print(f"\nRipple adders of {adder} ({args.arch}):")
+    print(f"{'Width':>5} | {'LUTs':>5} | {'Depth':>5} | {'LUT-only':>9} | {primitive:>8} | {'Chain':>9} | Faster")
+    for row in rows:
+        lut, chain = row['lut'], row['chain']
+        faster = "chain" if row['chain_faster'] else "LUTs"
+        print(f"{row['width']:5} | {lut['luts']:5} | {lut['depth']:5} | {lut['delay_ps'] / 1000:7.1f}ns | "
+              f"{chain['primitives']:8} | {chain['delay_ps'] / 1000:7.1f}ns | {faster}")
+    crossover = crossover_width(rows)
+    if crossover:
+        print(f"Carry chain is faster from {crossover} bits")
+
+
+if __name__ == "__main__":
+    main()
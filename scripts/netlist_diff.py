@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Structural Netlist Diff
+
+Compares two Yosys JSON netlists of the same design (e.g. before and after a
+change to the RTL, the synthesis script or the tool version) and reports
+which logic actually changed, independent of the cell and net names that
+differ from run to run.
+
+Every net gets a canonical hash of the logic cone driving it, computed in one
+pass in topological order: an input bit hashes by port name and bit, a
+constant by its value, and a cell output by the cell type, its parameters,
+the output pin and bit, and the hashes on its input pins. Inputs of
+commutative gates (AND, OR, XOR, their inversions, and the symmetric pins of
+AOI3/OAI3/AOI4/OAI4) are sorted first, so swapped operands hash the same.
+Flip-flop and latch outputs hash by the cell type and the cone at their
+inputs one register stage back (a second pass), so a register and everything
+behind it match across runs however the cells are named.
+
+The designs are then compared as:
+
+- Output cones: output bits matched by name; equal hashes are unchanged,
+  different hashes changed, and bits of only one design added or removed.
+- Register cones: the inputs of each flip-flop, matched by hash.
+- Cells: the multisets of cell hashes; cells left over in the new design are
+  added logic, in the old design removed logic.
+
+Hashing and comparison are linear in the netlist size. The report ends with
+the QoR delta: cell counts per type, logic depth, AIG AND count and depth
+(netlist_aig) and the critical path delay (netlist_timing, asic model).
+
+Exits 0 if the designs are structurally identical, 1 if the structure
+changed and 2 on errors, so CI can flag real changes to synthesized logic.
+
+Usage:
+    python scripts/netlist_diff.py OLD.json NEW.json [--top-old NAME] [--top-new NAME] [--json FILE]
+"""
+
+import sys
+import json
+import argparse
+from collections import Counter
+from hashlib import blake2b
+from typing import Dict, List, Optional
+
+from netlist_aig import netlist_aig
+from netlist_graph import FIRST_NET, NetlistGraph, gate_family, is_sequential, load_netlist
+from netlist_sim import flatten, levelize
+from netlist_timing import CLOCK_PINS, TimingAnalysis
+
+# Bytes per cone hash
+DIGEST_SIZE = 16
+
+# Pin groups whose inputs may be swapped, per gate family
+SYMMETRIC_PINS = {
+    'AND': (('A', 'B'),), 'NAND': (('A', 'B'),), 'OR': (('A', 'B'),), 'NOR': (('A', 'B'),),
+    'XOR': (('A', 'B'),), 'XNOR': (('A', 'B'),), 'AOI3': (('A', 'B'),), 'OAI3': (('A', 'B'),),
+    'AOI4': (('A', 'B'), ('C', 'D')), 'OAI4': (('A', 'B'), ('C', 'D')),
+}
+
+# Families whose two symmetric pin groups may also be swapped as a whole
+SYMMETRIC_GROUPS = frozenset(('AOI4', 'OAI4'))
+
+# Added and removed cells listed per report
+LIST_LIMIT = 10
+
+
+def _digest(*parts) -> bytes:
+    return blake2b(repr(parts).encode(), digest_size=DIGEST_SIZE).digest()
+
+
+def _bit_name(name: str, width: int, bit: int) -> str:
+    return name if width == 1 else f"{name}[{bit}]"
+
+
+class NetlistSignature:
+    """Canonical cone hashes of the nets, cells and endpoints of one design."""
+
+    __slots__ = ('name', 'cells', 'cell_names', 'net_hash', 'cell_hash', 'outputs', 'registers')
+
+    def __init__(self, graph: NetlistGraph, top: Optional[str] = None):
+        module = graph.modules[top] if top else graph.top
+        if module is None:
+            raise ValueError("netlist has no modules")
+        self.name = module.name
+        self.cell_names: List[str] = []
+        self.cells, net_count = flatten(graph, module, self.cell_names)
+        order, _ = levelize(self.cells, net_count, module.name)
+
+        undriven = _digest('undriven')
+        self.net_hash: List[bytes] = [undriven] * net_count
+        for net, value in zip(range(FIRST_NET), '01xz'):
+            self.net_hash[net] = _digest('constant', value)
+        for port, nets in module.port_nets('input').items():
+            for bit, net in enumerate(nets):
+                if net >= FIRST_NET:
+                    self.net_hash[net] = _digest('input', port, bit)
+
+        # State cells hash by type first, then by the cones at their inputs
+        sequential = [index for index, cell in enumerate(self.cells) if is_sequential(cell[0])]
+        self.cell_hash: List[bytes] = [b''] * len(self.cells)
+        for index in sequential:
+            self.cell_hash[index] = _digest('state', self.cells[index][0])
+        self._propagate(sequential, order)
+        if sequential:
+            for index in sequential:
+                self.cell_hash[index] = self._cell_key(index)
+            self._propagate(sequential, order)
+
+        # Endpoints: output bits by name, register inputs (other than clocks) by hash
+        self.outputs: Dict[str, bytes] = {}
+        for port, nets in module.port_nets('output').items():
+            for bit, net in enumerate(nets):
+                self.outputs[_bit_name(port, len(nets), bit)] = self.net_hash[net]
+        self.registers: Counter = Counter(
+            _digest('register', self.cells[index][0], self._pin_hashes(index, CLOCK_PINS))
+            for index in sequential)
+
+    def _pin_hashes(self, index: int, skip=()) -> tuple:
+        type_name, _, inputs, _ = self.cells[index]
+        pins = {pin: tuple(self.net_hash[net] for net in nets) for pin, nets in inputs.items() if pin not in skip}
+        family = gate_family(type_name)
+        for group in SYMMETRIC_PINS.get(family, ()):
+            if all(pin in pins for pin in group):
+                for pin, value in zip(group, sorted(pins[pin] for pin in group)):
+                    pins[pin] = value
+        if family in SYMMETRIC_GROUPS and all(pin in pins for pin in 'ABCD'):
+            (pins['A'], pins['B']), (pins['C'], pins['D']) = sorted(((pins['A'], pins['B']),
+                                                                     (pins['C'], pins['D'])))
+        return tuple(sorted(pins.items()))
+
+    def _cell_key(self, index: int) -> bytes:
+        type_name, params, _, _ = self.cells[index]
+        return _digest('cell', type_name, tuple(sorted((name, str(value)) for name, value in params.items())),
+                       self._pin_hashes(index))
+
+    def _propagate(self, sequential: List[int], order: List[int]):
+        for index in sequential:
+            self._drive(index)
+        for index in order:
+            self.cell_hash[index] = self._cell_key(index)
+            self._drive(index)
+
+    def _drive(self, index: int):
+        key = self.cell_hash[index]
+        for pin, nets in self.cells[index][3].items():
+            for bit, net in enumerate(nets):
+                self.net_hash[net] = _digest(key, pin, bit)
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the whole structure: the output cones by name and the cell multiset."""
+        return blake2b(repr((sorted(self.outputs.items()), sorted(self.cell_hash))).encode(),
+                       digest_size=DIGEST_SIZE).hexdigest()
+
+
+def design_qor(graph: NetlistGraph, top: Optional[str] = None) -> Dict:
+    """Cell counts, logic depth, AIG size and critical path delay of a design."""
+    timing = TimingAnalysis(graph, top)
+    aig = netlist_aig(graph, top)
+    return {
+        'cells': len(timing.cells),
+        'cell_types': dict(sorted(Counter(cell[0] for cell in timing.cells).items())),
+        'logic_depth': timing.logic_depth,
+        'aig_ands': aig.aig.and_count,
+        'aig_depth': aig.depth,
+        'critical_delay_ps': timing.critical_delay,
+    }
+
+
+def _cell_list(signature: NetlistSignature, surplus: Counter) -> List[Dict]:
+    """Cells of a design whose hashes are in the surplus multiset, in netlist order."""
+    surplus = Counter(surplus)
+    cells = []
+    for index, key in enumerate(signature.cell_hash):
+        if surplus[key] > 0:
+            surplus[key] -= 1
+            cells.append({'type': signature.cells[index][0], 'name': signature.cell_names[index]})
+    return cells
+
+
+def diff_signatures(old: NetlistSignature, new: NetlistSignature) -> Dict:
+    """Changed, added and removed output cones, register cones and cells between two designs."""
+    old_cells, new_cells = Counter(old.cell_hash), Counter(new.cell_hash)
+    changed = [name for name, key in old.outputs.items() if name in new.outputs and new.outputs[name] != key]
+    result = {
+        'old': old.name,
+        'new': new.name,
+        'old_fingerprint': old.fingerprint,
+        'new_fingerprint': new.fingerprint,
+        'outputs': len(old.outputs.keys() & new.outputs.keys()),
+        'changed_outputs': changed,
+        'added_outputs': [name for name in new.outputs if name not in old.outputs],
+        'removed_outputs': [name for name in old.outputs if name not in new.outputs],
+        'registers': sum((old.registers & new.registers).values()),
+        'added_registers': sum((new.registers - old.registers).values()),
+        'removed_registers': sum((old.registers - new.registers).values()),
+        'matched_cells': sum((old_cells & new_cells).values()),
+        'added_cells': _cell_list(new, new_cells - old_cells),
+        'removed_cells': _cell_list(old, old_cells - new_cells),
+    }
+    result['identical'] = not (changed or result['added_outputs'] or result['removed_outputs']
+                               or result['added_registers'] or result['removed_registers']
+                               or result['added_cells'] or result['removed_cells'])
+    return result
+
+
+def qor_delta(old: Dict, new: Dict) -> List[str]:
+    """One line per QoR metric and per cell type whose count changed."""
+    def line(label: str, a, b, unit: str = '') -> str:
+        delta = b - a
+        return f"{label}: {a:g}{unit} -> {b:g}{unit} ({'+' if delta >= 0 else ''}{delta:g})"
+
+    lines = [line('cells', old['cells'], new['cells']),
+             line('logic depth', old['logic_depth'], new['logic_depth']),
+             line('AIG ANDs', old['aig_ands'], new['aig_ands']),
+             line('AIG depth', old['aig_depth'], new['aig_depth']),
+             line('critical path', old['critical_delay_ps'], new['critical_delay_ps'], ' ps')]
+    for type_name in sorted(old['cell_types'].keys() | new['cell_types'].keys()):
+        a, b = old['cell_types'].get(type_name, 0), new['cell_types'].get(type_name, 0)
+        if a != b:
+            lines.append(line(type_name, a, b))
+    return lines
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Structural diff of two Yosys JSON netlists")
+    parser.add_argument("old", help="Baseline Yosys write_json netlist")
+    parser.add_argument("new", help="Yosys write_json netlist to compare against the baseline")
+    parser.add_argument("--top-old", help="Top module of the old netlist")
+    parser.add_argument("--top-new", help="Top module of the new netlist")
+    parser.add_argument("--json", help="Write the diff to this JSON file")
+    args = parser.parse_args()
+
+    try:
+        old_graph, new_graph = load_netlist(args.old), load_netlist(args.new)
+        result = diff_signatures(NetlistSignature(old_graph, args.top_old), NetlistSignature(new_graph, args.top_new))
+        result['old_qor'] = design_qor(old_graph, args.top_old)
+        result['new_qor'] = design_qor(new_graph, args.top_new)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}")
+        sys.exit(2)
+
+    print(f"{args.old} ({result['old']}) -> {args.new} ({result['new']})")
+    print(f"   fingerprint: {result['old_fingerprint']} -> {result['new_fingerprint']}")
+    print(f"   output cones: {result['outputs'] - len(result['changed_outputs'])} unchanged, "
+          f"{len(result['changed_outputs'])} changed, {len(result['added_outputs'])} added, "
+          f"{len(result['removed_outputs'])} removed")
+    if result['registers'] or result['added_registers'] or result['removed_registers']:
+        print(f"   register cones: {result['registers']} unchanged, {result['added_registers']} added, "
+              f"{result['removed_registers']} removed")
+    print(f"   cells: {result['matched_cells']} matched, {len(result['added_cells'])} added, "
+          f"{len(result['removed_cells'])} removed")
+    for label, names in (('changed', result['changed_outputs']), ('added', result['added_outputs']),
+                         ('removed', result['removed_outputs'])):
+        if names:
+            print(f"   {label} outputs: {', '.join(names)}")
+    for label, cells in (('+', result['added_cells']), ('-', result['removed_cells'])):
+        for cell in cells[:LIST_LIMIT]:
+            print(f"   {label} {cell['type']} {cell['name']}")
+        if len(cells) > LIST_LIMIT:
+            print(f"   {label} ... {len(cells) - LIST_LIMIT} more")
+    print("   QoR " + "\n   QoR ".join(qor_delta(result['old_qor'], result['new_qor'])))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(result, f, indent=2)
+
+    if result['identical']:
+        print("STRUCTURALLY IDENTICAL")
+        return
+    print("STRUCTURE CHANGED")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
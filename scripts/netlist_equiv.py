@@ -0,0 +1,619 @@
+#!/usr/bin/env python3
+"""
+Combinational Equivalence Checker
+
+Proves or disproves that two Yosys JSON netlists compute the same outputs,
+e.g. an RTL netlist (yosys prep; write_json) against its synthesized
+netlists, or the flow/yosys and flow/fpga netlists against each other.
+
+Inputs are matched by port name and bit, outputs are compared bit by bit on
+the ports both designs have. The check runs in three stages:
+
+1. Bit-parallel random simulation of both netlists finds most mismatches
+   in milliseconds.
+2. Both designs are built into one reduced ordered BDD with the input bits
+   interleaved by bit position (a[0], b[0], a[1], b[1], ...), an order under
+   which adders and other bit-sliced datapaths stay linear in size. Two
+   outputs are equivalent iff their BDD nodes are identical.
+3. If the BDD exceeds its node limit, a miter per output bit is handed to a
+   small CDCL SAT solver (two watched literals, 1UIP learning, VSIDS,
+   phase saving, Luby restarts) over a structurally hashed Tseitin
+   encoding; learnt clauses are kept across the outputs.
+
+A mismatch is reported with a counterexample input assignment. The check is
+combinational: flip-flop and latch outputs are free inputs in each design.
+
+Usage:
+    python scripts/netlist_equiv.py NETLIST_A.json NETLIST_B.json [--method auto|bdd|sat]
+"""
+
+import sys
+import heapq
+import random
+import argparse
+from typing import Dict, List, Optional, Tuple
+
+from netlist_graph import NetlistGraph, load_netlist
+from netlist_logic import LogicBuilder, WordBuilder, build_design
+from netlist_sim import pattern_values
+
+# Default BDD size limit before falling back to SAT
+BDD_NODE_LIMIT = 1_000_000
+
+# Random patterns simulated before the formal stages
+SIMULATION_PATTERNS = 4096
+
+# Conflicts between restarts are this unit times the Luby sequence
+RESTART_UNIT = 100
+
+
+class BddLimitExceeded(Exception):
+    """Raised when a BDD grows past its node limit."""
+
+
+class BddManager(LogicBuilder):
+    """Reduced ordered BDDs with a unique table and an ITE cache.
+
+    Nodes are integers: 0 and 1 are the terminals, variables are ordered by
+    creation.
+    """
+
+    __slots__ = ('var', 'low', 'high', 'unique', 'cache', 'node_limit', '_variables')
+
+    zero = 0
+    one = 1
+
+    def __init__(self, node_limit: int = BDD_NODE_LIMIT):
+        terminal = sys.maxsize
+        self.var: List[int] = [terminal, terminal]
+        self.low: List[int] = [0, 1]
+        self.high: List[int] = [0, 1]
+        self.unique: Dict[Tuple[int, int, int], int] = {}
+        self.cache: Dict[Tuple[int, int, int], int] = {}
+        self.node_limit = node_limit
+        self._variables = 0
+
+    @property
+    def node_count(self) -> int:
+        return len(self.var)
+
+    def _node(self, var: int, low: int, high: int) -> int:
+        if low == high:
+            return low
+        key = (var, low, high)
+        node = self.unique.get(key)
+        if node is None:
+            if len(self.var) >= self.node_limit:
+                raise BddLimitExceeded(f"BDD exceeded {self.node_limit} nodes")
+            node = self.unique[key] = len(self.var)
+            self.var.append(var)
+            self.low.append(low)
+            self.high.append(high)
+        return node
+
+    def new_input(self) -> int:
+        self._variables += 1
+        return self._node(self._variables - 1, 0, 1)
+
+    def ite(self, f: int, g: int, h: int) -> int:
+        """if f then g else h"""
+        if f == 1:
+            return g
+        if f == 0:
+            return h
+        if g == h:
+            return g
+        if g == 1 and h == 0:
+            return f
+        key = (f, g, h)
+        result = self.cache.get(key)
+        if result is not None:
+            return result
+        var = min(self.var[f], self.var[g], self.var[h])
+        f0, f1 = (self.low[f], self.high[f]) if self.var[f] == var else (f, f)
+        g0, g1 = (self.low[g], self.high[g]) if self.var[g] == var else (g, g)
+        h0, h1 = (self.low[h], self.high[h]) if self.var[h] == var else (h, h)
+        result = self._node(var, self.ite(f0, g0, h0), self.ite(f1, g1, h1))
+        self.cache[key] = result
+        return result
+
+    def not_(self, a: int) -> int:
+        return self.ite(a, 0, 1)
+
+    def and_(self, a: int, b: int) -> int:
+        return self.ite(a, b, 0)
+
+    def or_(self, a: int, b: int) -> int:
+        return self.ite(a, 1, b)
+
+    def xor(self, a: int, b: int) -> int:
+        return self.ite(a, self.not_(b), b)
+
+    def mux(self, select: int, high: int, low: int) -> int:
+        return self.ite(select, high, low)
+
+    def satisfying_assignment(self, f: int) -> Optional[Dict[int, int]]:
+        """Variable values on one path to the 1 terminal (unlisted variables are free)."""
+        if f == 0:
+            return None
+        assignment = {}
+        while f > 1:
+            if self.low[f] != 0:
+                assignment[self.var[f]] = 0
+                f = self.low[f]
+            else:
+                assignment[self.var[f]] = 1
+                f = self.high[f]
+        return assignment
+
+
+class SatSolver:
+    """Conflict-driven clause learning SAT solver.
+
+    Variables are integers from 0; literal 2v is v and 2v+1 is not v.
+    Clauses may be added between solve() calls; learnt clauses are kept.
+    """
+
+    __slots__ = ('clauses', 'watches', 'assigns', 'level', 'reason', 'trail', 'trail_lim',
+                 'qhead', 'activity', 'var_inc', 'heap', 'polarity', 'seen', 'ok', 'conflicts')
+
+    def __init__(self):
+        self.clauses: List[List[int]] = []
+        self.watches: List[List[int]] = []
+        self.assigns: List[int] = []      # -1 unassigned, else 0/1
+        self.level: List[int] = []
+        self.reason: List[int] = []       # Clause index, -1 for decisions and units
+        self.trail: List[int] = []
+        self.trail_lim: List[int] = []
+        self.qhead = 0
+        self.activity: List[float] = []
+        self.var_inc = 1.0
+        self.heap: List[Tuple[float, int]] = []
+        self.polarity: List[int] = []     # Saved phase: 1 means try the negative literal
+        self.seen: List[int] = []
+        self.ok = True
+        self.conflicts = 0
+
+    @property
+    def var_count(self) -> int:
+        return len(self.assigns)
+
+    def new_var(self) -> int:
+        var = len(self.assigns)
+        self.assigns.append(-1)
+        self.level.append(0)
+        self.reason.append(-1)
+        self.activity.append(0.0)
+        self.polarity.append(1)
+        self.seen.append(0)
+        self.watches.append([])
+        self.watches.append([])
+        heapq.heappush(self.heap, (0.0, var))
+        return var
+
+    def value(self, lit: int) -> int:
+        """1 true, 0 false, -1 unassigned"""
+        value = self.assigns[lit >> 1]
+        return value if value < 0 else value ^ (lit & 1)
+
+    def _enqueue(self, lit: int, reason: int):
+        var = lit >> 1
+        self.assigns[var] = 1 - (lit & 1)
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(lit)
+
+    def add_clause(self, lits: List[int]) -> bool:
+        """Add a clause at decision level 0; False once the formula is unsatisfiable."""
+        if not self.ok:
+            return False
+        self._cancel_until(0)
+        clause = []
+        for lit in sorted(set(lits)):
+            value = self.value(lit)
+            if value == 1 or lit ^ 1 in clause:
+                return True  # Satisfied or tautology
+            if value == -1:
+                clause.append(lit)
+        if not clause:
+            self.ok = False
+        elif len(clause) == 1:
+            self._enqueue(clause[0], -1)
+            self.ok = self._propagate() < 0
+        else:
+            self._attach(clause)
+        return self.ok
+
+    def _attach(self, clause: List[int]) -> int:
+        index = len(self.clauses)
+        self.clauses.append(clause)
+        self.watches[clause[0] ^ 1].append(index)
+        self.watches[clause[1] ^ 1].append(index)
+        return index
+
+    def _propagate(self) -> int:
+        """Unit propagation; returns a conflicting clause index or -1."""
+        clauses, watches, assigns = self.clauses, self.watches, self.assigns
+        while self.qhead < len(self.trail):
+            p = self.trail[self.qhead]
+            self.qhead += 1
+            false_lit = p ^ 1
+            watching = watches[p]
+            kept = []
+            i = 0
+            count = len(watching)
+            while i < count:
+                index = watching[i]
+                i += 1
+                clause = clauses[index]
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], false_lit
+                first = clause[0]
+                value = assigns[first >> 1]
+                if value >= 0 and value ^ (first & 1) == 1:
+                    kept.append(index)
+                    continue
+                for k in range(2, len(clause)):
+                    lit = clause[k]
+                    value = assigns[lit >> 1]
+                    if value < 0 or value ^ (lit & 1) == 1:
+                        clause[1], clause[k] = lit, false_lit
+                        watches[lit ^ 1].append(index)
+                        break
+                else:
+                    kept.append(index)
+                    value = assigns[first >> 1]
+                    if value >= 0:  # First literal false: conflict
+                        kept.extend(watching[i:])
+                        watches[p] = kept
+                        self.qhead = len(self.trail)
+                        return index
+                    self._enqueue(first, index)
+            watches[p] = kept
+        return -1
+
+    def _bump(self, var: int):
+        self.activity[var] += self.var_inc
+        if self.activity[var] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.var_inc *= 1e-100
+            self.heap = [(-self.activity[v], v) for v in range(self.var_count) if self.assigns[v] < 0]
+            heapq.heapify(self.heap)
+        elif self.assigns[var] < 0:
+            heapq.heappush(self.heap, (-self.activity[var], var))
+
+    def _analyze(self, conflict: int) -> Tuple[List[int], int]:
+        """First-UIP learnt clause (asserting literal first) and backjump level."""
+        seen, level, reason = self.seen, self.level, self.reason
+        current = len(self.trail_lim)
+        learnt = [0]
+        pending = 0
+        p = -1
+        index = len(self.trail) - 1
+        while True:
+            clause = self.clauses[conflict]
+            for lit in (clause if p < 0 else clause[1:]):
+                var = lit >> 1
+                if not seen[var] and level[var] > 0:
+                    seen[var] = 1
+                    self._bump(var)
+                    if level[var] >= current:
+                        pending += 1
+                    else:
+                        learnt.append(lit)
+            while not seen[self.trail[index] >> 1]:
+                index -= 1
+            p = self.trail[index]
+            index -= 1
+            seen[p >> 1] = 0
+            pending -= 1
+            if pending == 0:
+                break
+            conflict = reason[p >> 1]
+        learnt[0] = p ^ 1
+
+        backjump = 0
+        if len(learnt) > 1:
+            best = max(range(1, len(learnt)), key=lambda i: level[learnt[i] >> 1])
+            learnt[1], learnt[best] = learnt[best], learnt[1]
+            backjump = level[learnt[1] >> 1]
+        for lit in learnt:
+            seen[lit >> 1] = 0
+        self.var_inc /= 0.95
+        return learnt, backjump
+
+    def _cancel_until(self, target: int):
+        if len(self.trail_lim) <= target:
+            return
+        for position in range(len(self.trail) - 1, self.trail_lim[target] - 1, -1):
+            var = self.trail[position] >> 1
+            self.polarity[var] = self.trail[position] & 1
+            self.assigns[var] = -1
+            heapq.heappush(self.heap, (-self.activity[var], var))
+        del self.trail[self.trail_lim[target]:]
+        del self.trail_lim[target:]
+        self.qhead = len(self.trail)
+
+    def _pick_branch(self) -> int:
+        while self.heap:
+            _, var = heapq.heappop(self.heap)
+            if self.assigns[var] < 0:
+                return 2 * var + self.polarity[var]
+        return -1
+
+    def solve(self, assumptions: Tuple[int, ...] = (), max_conflicts: Optional[int] = None) -> Optional[bool]:
+        """True if satisfiable under the assumptions, False if not, None past max_conflicts."""
+        if not self.ok:
+            return False
+        self._cancel_until(0)
+        if self._propagate() >= 0:
+            self.ok = False
+            return False
+        budget = None if max_conflicts is None else self.conflicts + max_conflicts
+        restart = 0
+        while True:
+            restart += 1
+            limit = self.conflicts + RESTART_UNIT * _luby(restart - 1)
+            result = self._search(assumptions, limit, budget)
+            if result is not None or (budget is not None and self.conflicts >= budget):
+                return result
+            self._cancel_until(0)
+
+    def _search(self, assumptions: Tuple[int, ...], limit: int, budget: Optional[int]) -> Optional[bool]:
+        while True:
+            conflict = self._propagate()
+            if conflict >= 0:
+                self.conflicts += 1
+                if not self.trail_lim:
+                    self.ok = False
+                    return False
+                learnt, backjump = self._analyze(conflict)
+                self._cancel_until(backjump)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], -1)
+                else:
+                    self._enqueue(learnt[0], self._attach(learnt))
+                if self.conflicts >= limit or (budget is not None and self.conflicts >= budget):
+                    return None
+                continue
+
+            decision = -1
+            while len(self.trail_lim) < len(assumptions):
+                lit = assumptions[len(self.trail_lim)]
+                value = self.value(lit)
+                if value == 1:
+                    self.trail_lim.append(len(self.trail))  # Already true: empty level
+                elif value == 0:
+                    return False  # Assumption contradicted
+                else:
+                    decision = lit
+                    break
+            if decision < 0:
+                decision = self._pick_branch()
+                if decision < 0:
+                    return True  # All variables assigned
+            self.trail_lim.append(len(self.trail))
+            self._enqueue(decision, -1)
+
+    def model_value(self, lit: int) -> int:
+        """Value of a literal in the last satisfying assignment."""
+        return self.value(lit)
+
+
+def _luby(i: int) -> int:
+    """i-th element (from 0) of the Luby restart sequence 1 1 2 1 1 2 4 ..."""
+    size, exponent = 1, 0
+    while size < i + 1:
+        size, exponent = 2 * size + 1, exponent + 1
+    while size - 1 != i:
+        size = (size - 1) >> 1
+        exponent -= 1
+        i = i % size
+    return 1 << exponent
+
+
+class CnfBuilder(LogicBuilder):
+    """Structurally hashed Tseitin encoding of logic into a SatSolver.
+
+    Signals are literals; the constants fold away before reaching clauses.
+    """
+
+    __slots__ = ('solver', 'and_table', 'xor_table')
+
+    def __init__(self, solver: SatSolver):
+        self.solver = solver
+        self.and_table: Dict[Tuple[int, int], int] = {}
+        self.xor_table: Dict[Tuple[int, int], int] = {}
+        constant = solver.new_var()
+        solver.add_clause([2 * constant + 1])
+        self.zero = 2 * constant
+        self.one = self.zero ^ 1
+
+    def new_input(self) -> int:
+        return 2 * self.solver.new_var()
+
+    def not_(self, a: int) -> int:
+        return a ^ 1
+
+    def and_(self, a: int, b: int) -> int:
+        if a == self.zero or b == self.zero or a == b ^ 1:
+            return self.zero
+        if a == self.one or a == b:
+            return b
+        if b == self.one:
+            return a
+        key = (a, b) if a < b else (b, a)
+        y = self.and_table.get(key)
+        if y is None:
+            y = self.and_table[key] = self.new_input()
+            self.solver.add_clause([y ^ 1, a])
+            self.solver.add_clause([y ^ 1, b])
+            self.solver.add_clause([y, a ^ 1, b ^ 1])
+        return y
+
+    def xor(self, a: int, b: int) -> int:
+        # Literal polarities move to the output: not(a) ^ b = not(a ^ b)
+        invert = (a ^ b) & 1
+        a, b = a & ~1, b & ~1
+        if a == b:
+            return self.zero ^ invert
+        if a == self.zero:
+            return b ^ invert
+        if b == self.zero:
+            return a ^ invert
+        key = (a, b) if a < b else (b, a)
+        y = self.xor_table.get(key)
+        if y is None:
+            y = self.xor_table[key] = self.new_input()
+            self.solver.add_clause([y ^ 1, a, b])
+            self.solver.add_clause([y ^ 1, a ^ 1, b ^ 1])
+            self.solver.add_clause([y, a ^ 1, b])
+            self.solver.add_clause([y, a, b ^ 1])
+        return y ^ invert
+
+
+def _interleaved_inputs(builder: LogicBuilder, *modules) -> Dict[str, List]:
+    """Builder inputs for the union of the designs' input ports, created bit position by bit position."""
+    widths: Dict[str, int] = {}
+    for module in modules:
+        for port, nets in module.port_nets('input').items():
+            widths[port] = max(widths.get(port, 0), len(nets))
+    signals: Dict[str, List] = {port: [] for port in widths}
+    for bit in range(max(widths.values(), default=0)):
+        for port, width in widths.items():
+            if bit < width:
+                signals[port].append(builder.new_input())
+    return signals
+
+
+def _compared_outputs(first, second) -> List[Tuple[str, int]]:
+    """(port, bit) pairs compared between two modules."""
+    first_outputs, second_outputs = first.port_nets('output'), second.port_nets('output')
+    pairs = []
+    for port, nets in first_outputs.items():
+        if port not in second_outputs:
+            continue
+        if len(nets) != len(second_outputs[port]):
+            raise ValueError(f"output '{port}' is {len(nets)} bits in {first.name} "
+                             f"but {len(second_outputs[port])} bits in {second.name}")
+        pairs.extend((port, bit) for bit in range(len(nets)))
+    if not pairs:
+        raise ValueError(f"{first.name} and {second.name} have no common output ports")
+    return pairs
+
+
+def _simulate(graphs: Tuple[NetlistGraph, NetlistGraph], modules: List, pairs: List[Tuple[str, int]],
+              patterns: int, seed: int) -> Optional[Tuple[Dict[str, int], str]]:
+    """Counterexample and failing output bit from random simulation, if one is found."""
+    sim = WordBuilder((1 << patterns) - 1, random.Random(seed))
+    inputs = _interleaved_inputs(sim, *modules)
+    _, first_outputs = build_design(sim, graphs[0], modules[0].name, inputs)
+    _, second_outputs = build_design(sim, graphs[1], modules[1].name, inputs)
+    for port, bit in pairs:
+        diff = first_outputs[port][bit] ^ second_outputs[port][bit]
+        if diff:
+            pattern = (diff & -diff).bit_length() - 1
+            return pattern_values(inputs, pattern), f"{port}[{bit}]"
+    return None
+
+
+def check_equivalence(first: NetlistGraph, second: NetlistGraph, first_top: Optional[str] = None,
+                      second_top: Optional[str] = None, method: str = 'auto',
+                      bdd_node_limit: int = BDD_NODE_LIMIT,
+                      simulation_patterns: int = SIMULATION_PATTERNS, seed: int = 1) -> Dict:
+    """Prove or disprove equivalence of two netlists on their common outputs.
+
+    method is 'auto' (BDD, then SAT if the BDD grows too large), 'bdd' or
+    'sat'. Returns a dict with 'equivalent', 'method', 'outputs' (bits
+    compared), 'output' (first mismatching bit) and 'counterexample'
+    (input port values) on mismatch.
+    """
+    modules = [first.modules[first_top] if first_top else first.top,
+               second.modules[second_top] if second_top else second.top]
+    if None in modules:
+        raise ValueError("netlist has no modules")
+    pairs = _compared_outputs(*modules)
+    result = {'equivalent': True, 'method': method, 'outputs': len(pairs), 'output': None,
+              'counterexample': None}
+
+    if simulation_patterns:
+        found = _simulate((first, second), modules, pairs, simulation_patterns, seed)
+        if found:
+            result.update(equivalent=False, method='simulation', counterexample=found[0], output=found[1])
+            return result
+
+    if method in ('auto', 'bdd'):
+        bdd = BddManager(bdd_node_limit)
+        limit = sys.getrecursionlimit()
+        try:
+            inputs = _interleaved_inputs(bdd, *modules)
+            sys.setrecursionlimit(max(limit, 4 * sum(len(bits) for bits in inputs.values()) + 1000))
+            _, first_outputs = build_design(bdd, first, modules[0].name, inputs)
+            _, second_outputs = build_design(bdd, second, modules[1].name, inputs)
+            for port, bit in pairs:
+                a, b = first_outputs[port][bit], second_outputs[port][bit]
+                if a != b:
+                    assignment = bdd.satisfying_assignment(bdd.xor(a, b))
+                    counterexample = {p: sum(assignment.get(bdd.var[node], 0) << i for i, node in enumerate(nodes))
+                                      for p, nodes in inputs.items()}
+                    result.update(equivalent=False, method='bdd', counterexample=counterexample,
+                                  output=f"{port}[{bit}]")
+                    return result
+            result['method'] = 'bdd'
+            return result
+        except BddLimitExceeded:
+            if method == 'bdd':
+                raise ValueError(f"BDD exceeded {bdd_node_limit} nodes; try --method sat") from None
+        finally:
+            sys.setrecursionlimit(limit)
+
+    solver = SatSolver()
+    cnf = CnfBuilder(solver)
+    inputs = _interleaved_inputs(cnf, *modules)
+    _, first_outputs = build_design(cnf, first, modules[0].name, inputs)
+    _, second_outputs = build_design(cnf, second, modules[1].name, inputs)
+    result['method'] = 'sat'
+    for port, bit in pairs:
+        miter = cnf.xor(first_outputs[port][bit], second_outputs[port][bit])
+        if miter == cnf.zero:
+            continue  # Structurally identical after hashing
+        if solver.solve((miter,)):
+            counterexample = {p: sum((solver.model_value(lit) == 1) << i for i, lit in enumerate(lits))
+                              for p, lits in inputs.items()}
+            result.update(equivalent=False, counterexample=counterexample, output=f"{port}[{bit}]")
+            return result
+    return result
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Combinational equivalence check of two Yosys JSON netlists")
+    parser.add_argument("first", help="Yosys write_json netlist (e.g. RTL after prep)")
+    parser.add_argument("second", help="Yosys write_json netlist to compare against")
+    parser.add_argument("--top-first", help="Top module of the first netlist")
+    parser.add_argument("--top-second", help="Top module of the second netlist")
+    parser.add_argument("--method", choices=["auto", "bdd", "sat"], default="auto", help="Proof engine")
+    parser.add_argument("--bdd-limit", type=int, default=BDD_NODE_LIMIT, help="BDD node limit")
+    parser.add_argument("--sim-patterns", type=int, default=SIMULATION_PATTERNS,
+                        help="Random patterns simulated first (0 to skip)")
+    args = parser.parse_args()
+
+    try:
+        result = check_equivalence(load_netlist(args.first), load_netlist(args.second),
+                                   args.top_first, args.top_second, args.method,
+                                   args.bdd_limit, args.sim_patterns)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}")
+        sys.exit(2)
+
+    if result['equivalent']:
+        print(f"EQUIVALENT: {result['outputs']} output bits proven by {result['method']}")
+        return
+    inputs = ", ".join(f"{port}={value}" for port, value in result['counterexample'].items())
+    print(f"NOT EQUIVALENT: {result['output']} differs ({result['method']})")
+    print(f"   counterexample: {inputs}")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Stuck-At Fault Simulator
+
+Measures how many manufacturing defects a set of test vectors would detect
+in a synthesized Yosys JSON netlist. The fault list has a stuck-at-0 and a
+stuck-at-1 fault on every net of the flattened design that is read by a cell
+or is an output: primary inputs, gate outputs and flip-flop outputs.
+Flip-flops are treated as scanned (full scan): their outputs are controlled
+like inputs (0 unless given) and their data inputs are observed like outputs.
+
+The list is collapsed by structural equivalence before simulation: on a net
+with a single reader, a stuck-at at the controlling value of an AND/OR-type
+gate input is equivalent to the corresponding stuck-at on its output, and
+both faults of a buffer or inverter input are equivalent to output faults.
+Only one fault per equivalence class is simulated.
+
+Simulation is parallel-pattern single-fault propagation: the good machine is
+evaluated over WORD_PATTERNS patterns at once (one bit per pattern in Python
+integers), then each fault still undetected is injected alone and propagated
+event-driven through its fanout cone only, re-evaluating a cell only when
+one of its inputs differs from the good machine. A fault is detected by the
+patterns on which an observed net differs, and detected faults are dropped
+from the following words.
+
+Stimulus comes from the testbenches: VCD dumps of the SV (make regress
+WAVES=1) or cocotb benches, sampled at every time step, or vector files in
+the SV bench format ("a b cin" per line, as read by +VECTORS=). Without a
+stimulus, every input combination is applied, as the exhaustive tests of
+both benches do.
+
+Usage:
+    python scripts/netlist_fault.py NETLIST.json [...] [--stimulus WAVE.vcd|VECTORS.txt ...]
+                                    [--columns a_i b_i cin_i] [--undetected] [--json OUT.json]
+"""
+
+import sys
+import json
+import time
+import heapq
+import argparse
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from netlist_graph import FIRST_NET, NetlistGraph, gate_family, load_netlist
+from netlist_logic import WordBuilder, cell_outputs
+from netlist_sim import GATE_EXPRESSIONS, VENDOR_BUFFERS, VENDOR_INVERTERS, flatten, levelize
+from vcd_reader import VCDFile, vcd_value_to_int
+from waveform_checker import resolve_scope
+
+# Patterns simulated per word (bits per Python integer)
+WORD_PATTERNS = 256
+
+# Largest input width simulated exhaustively when no stimulus is given
+MAX_EXHAUSTIVE_INPUTS = 16
+
+# Ports of the SV bench vector files ("a b cin" per line)
+DEFAULT_COLUMNS = ['a_i', 'b_i', 'cin_i']
+
+# Equivalent input and output faults per gate family: pin -> ((input value, output value), ...)
+EQUIVALENT_FAULTS = {
+    'BUF': {'A': ((0, 0), (1, 1))},
+    'NOT': {'A': ((0, 1), (1, 0))},
+    'AND': {'A': ((0, 0),), 'B': ((0, 0),)},
+    'NAND': {'A': ((0, 1),), 'B': ((0, 1),)},
+    'OR': {'A': ((1, 1),), 'B': ((1, 1),)},
+    'NOR': {'A': ((1, 0),), 'B': ((1, 0),)},
+    'ANDNOT': {'A': ((0, 0),), 'B': ((1, 0),)},
+    'ORNOT': {'A': ((1, 1),), 'B': ((0, 1),)},
+}
+
+# A stuck-at fault: (net, stuck value)
+Fault = Tuple[int, int]
+
+# Gate pins in the argument order of the compiled gate functions
+GATE_PINS = ('A', 'B', 'C', 'D', 'S')
+
+# Word-level gate functions of the pin words and the all-ones mask m
+GATE_FUNCTIONS = {
+    family: eval(f"lambda A, B, C, D, S, m: {expression.format(**{pin: pin for pin in GATE_PINS})}")
+    for family, expression in GATE_EXPRESSIONS.items()
+}
+
+
+def _collapse_family(type_name: str) -> Optional[str]:
+    if type_name in VENDOR_BUFFERS:
+        return 'BUF'
+    if type_name in VENDOR_INVERTERS:
+        return 'NOT'
+    return gate_family(type_name)
+
+
+class CompiledNetlist:
+    """A flattened netlist in combinational order, compiled for word-parallel evaluation.
+
+    Shared by the fault and glitch simulators: single-output gates become
+    compiled word functions, sinks lists the readers of each net by position
+    in the combinational order, and observed holds the output nets and the
+    inputs of flip-flops and latches.
+    """
+
+    __slots__ = ('name', 'inputs', 'outputs', 'cells', 'state_cells', 'gates', 'sinks', 'observed',
+                 'state_nets', 'net_count', 'net_names')
+
+    def __init__(self, graph: NetlistGraph, top: Optional[str] = None):
+        module = graph.modules[top] if top else graph.top
+        if module is None:
+            raise ValueError("netlist has no modules")
+        self.name = module.name
+        self.inputs: Dict[str, List[int]] = module.port_nets('input')
+        self.outputs: Dict[str, List[int]] = module.port_nets('output')
+        self.net_names: Dict[int, str] = {}
+        cells, self.net_count = flatten(graph, module, net_names=self.net_names)
+        order, self.state_nets = levelize(cells, self.net_count, self.name)
+        self.cells = [cells[index] for index in order]
+        comb = set(order)
+        self.state_cells = [cell for index, cell in enumerate(cells) if index not in comb]
+
+        # Single-output gates evaluate through a compiled function of their pin nets
+        self.gates: List[Optional[Tuple]] = []
+        for type_name, _, inputs, outputs in self.cells:
+            function = GATE_FUNCTIONS.get(gate_family(type_name))
+            out_nets = [net for nets in outputs.values() for net in nets]
+            if function is None or len(out_nets) != 1:
+                self.gates.append(None)
+                continue
+            pins = tuple(inputs[pin][0] if inputs.get(pin) else 0 for pin in GATE_PINS)
+            self.gates.append((function, pins, out_nets[0]))
+
+        # Readers of each net by position in the combinational order; observed nets
+        self.sinks: Dict[int, List[int]] = {}
+        for position, (_, _, inputs, _) in enumerate(self.cells):
+            for nets in inputs.values():
+                for net in nets:
+                    readers = self.sinks.setdefault(net, [])
+                    if not readers or readers[-1] != position:
+                        readers.append(position)
+        self.observed = {net for nets in self.outputs.values() for net in nets if net >= FIRST_NET}
+        for _, _, inputs, _ in self.state_cells:
+            self.observed.update(net for nets in inputs.values() for net in nets if net >= FIRST_NET)
+
+    def net_name(self, net: int) -> str:
+        return self.net_names.get(net, f'n{net}')
+
+    def _evaluate(self, builder: WordBuilder, position: int, read) -> Dict[int, int]:
+        """Output net words of the cell at a combinational position, reading input nets with read."""
+        gate = self.gates[position]
+        if gate is not None:
+            function, (a, b, c, d, s), net = gate
+            return {net: function(read(a), read(b), read(c), read(d), read(s), builder.one)}
+        type_name, params, inputs, outputs = self.cells[position]
+        results = cell_outputs(builder, type_name, params,
+                               {pin: [read(net) for net in nets] for pin, nets in inputs.items()})
+        return {net: word for pin, nets in outputs.items() for net, word in zip(nets, results.get(pin, []))}
+
+
+class FaultSimulator(CompiledNetlist):
+    """A flattened netlist with its collapsed stuck-at fault list."""
+
+    __slots__ = ('faults', 'representative')
+
+    def __init__(self, graph: NetlistGraph, top: Optional[str] = None):
+        super().__init__(graph, top)
+
+        # Fault sites: every read or observed net driven by an input, a cell or a flip-flop
+        sites = [net for nets in self.inputs.values() for net in nets]
+        sites += self.state_nets
+        sites += [net for _, _, _, outputs in self.cells for nets in outputs.values() for net in nets]
+        sites = [net for net in dict.fromkeys(sites)
+                 if net >= FIRST_NET and (net in self.sinks or net in self.observed)]
+        self.representative: Dict[Fault, Fault] = {}
+        for net in sites:
+            for value in (0, 1):
+                self.representative[(net, value)] = (net, value)
+        self._collapse()
+        self.faults: List[Fault] = [fault for fault, root in self.representative.items() if fault == root]
+
+    def _find(self, fault: Fault) -> Fault:
+        root = fault
+        while self.representative[root] != root:
+            root = self.representative[root]
+        while self.representative[fault] != root:
+            self.representative[fault], fault = root, self.representative[fault]
+        return root
+
+    def _collapse(self):
+        """Merge structurally equivalent faults; the output-side fault represents each class."""
+        pin_reads: Dict[int, int] = {}
+        for _, _, inputs, _ in self.cells:
+            for nets in inputs.values():
+                for net in nets:
+                    pin_reads[net] = pin_reads.get(net, 0) + 1
+        for type_name, _, inputs, outputs in reversed(self.cells):
+            rules = EQUIVALENT_FAULTS.get(_collapse_family(type_name))
+            out_nets = [net for nets in outputs.values() for net in nets]
+            if rules is None or len(out_nets) != 1 or (out_nets[0], 0) not in self.representative:
+                continue
+            for pin, nets in inputs.items():
+                pairs = rules.get(pin) or (rules.get('A') if len(rules) == 1 else None)
+                if not pairs or len(nets) != 1:
+                    continue
+                net = nets[0]
+                if pin_reads.get(net) != 1 or net in self.observed or (net, 0) not in self.representative:
+                    continue
+                for in_value, out_value in pairs:
+                    self.representative[self._find((net, in_value))] = self._find((out_nets[0], out_value))
+        for fault in self.representative:
+            self._find(fault)
+
+    @property
+    def fault_count(self) -> int:
+        """Uncollapsed faults (two per fault site)."""
+        return len(self.representative)
+
+    @property
+    def input_bits(self) -> int:
+        return sum(len(nets) for nets in self.inputs.values())
+
+    def fault_name(self, fault: Fault) -> str:
+        net, value = fault
+        return f"{self.net_name(net)}/SA{value}"
+
+    def patterns(self, vectors: Iterable[Dict[str, int]], unique: bool = True) -> List[int]:
+        """Input patterns (input bit i in port order at bit i) of port-value vectors, duplicates removed if unique."""
+        offsets = []
+        position = 0
+        for port, nets in self.inputs.items():
+            offsets.append((port, position, (1 << len(nets)) - 1))
+            position += len(nets)
+        patterns = []
+        for vector in vectors:
+            pattern = 0
+            for port, offset, mask in offsets:
+                pattern |= (vector.get(port, 0) & mask) << offset
+            patterns.append(pattern)
+        return list(dict.fromkeys(patterns)) if unique else patterns
+
+    def _input_words(self, patterns: Sequence[int]) -> List[int]:
+        words = []
+        for bit in range(self.input_bits):
+            word = 0
+            for p, pattern in enumerate(patterns):
+                if (pattern >> bit) & 1:
+                    word |= 1 << p
+            words.append(word)
+        return words
+
+    def evaluate_words(self, input_words: Sequence[int], mask: int) -> List[int]:
+        """Net words of the fault-free design for input bit words in port order."""
+        builder = WordBuilder(mask)
+        values = [0] * self.net_count
+        values[1] = mask
+        input_nets = [net for nets in self.inputs.values() for net in nets]
+        for net, word in zip(input_nets, input_words):
+            if net >= FIRST_NET:
+                values[net] = word
+        read = values.__getitem__
+        for position in range(len(self.cells)):
+            for net, word in self._evaluate(builder, position, read).items():
+                values[net] = word
+        return values
+
+    def good_values(self, patterns: Sequence[int]) -> Tuple[List[int], int]:
+        """Net words of the fault-free design for up to one word of patterns, and the mask."""
+        mask = (1 << len(patterns)) - 1
+        return self.evaluate_words(self._input_words(patterns), mask), mask
+
+    def detect(self, fault: Fault, good: List[int], mask: int) -> int:
+        """Patterns of the word (as a bit mask) on which a fault is observed."""
+        site, value = fault
+        stuck = mask if value else 0
+        if good[site] == stuck:
+            return 0  # Not activated by any pattern
+        faulty = {site: stuck}
+        builder = WordBuilder(mask)
+        read = lambda net: faulty.get(net, good[net])
+        queue = list(self.sinks.get(site, ()))
+        heapq.heapify(queue)
+        scheduled = set(queue)
+        while queue:
+            position = heapq.heappop(queue)
+            for net, word in self._evaluate(builder, position, read).items():
+                if word == good[net] or net == site:
+                    continue
+                faulty[net] = word
+                for sink in self.sinks.get(net, ()):
+                    if sink not in scheduled:
+                        scheduled.add(sink)
+                        heapq.heappush(queue, sink)
+        detected = 0
+        for net, word in faulty.items():
+            if net in self.observed:
+                detected |= word ^ good[net]
+        return detected
+
+    def simulate(self, patterns: Sequence[int], faults: Optional[Iterable[Fault]] = None,
+                 word_patterns: int = WORD_PATTERNS) -> Dict[Fault, int]:
+        """First detecting pattern of each detected fault (default: the collapsed fault list).
+
+        Faults are dropped once detected, so later words only simulate the rest.
+        """
+        remaining = list(self.faults if faults is None else faults)
+        detected: Dict[Fault, int] = {}
+        for start in range(0, len(patterns), word_patterns):
+            if not remaining:
+                break
+            good, mask = self.good_values(patterns[start:start + word_patterns])
+            undetected = []
+            for fault in remaining:
+                hits = self.detect(fault, good, mask)
+                if hits:
+                    detected[fault] = start + (hits & -hits).bit_length() - 1
+                else:
+                    undetected.append(fault)
+            remaining = undetected
+        return detected
+
+    def coverage(self, detected: Dict[Fault, int]) -> Dict:
+        """Collapsed and uncollapsed fault coverage of a simulation result."""
+        covered = sum(1 for root in self.representative.values() if root in detected)
+        return {
+            'faults': self.fault_count,
+            'collapsed_faults': len(self.faults),
+            'detected': covered,
+            'detected_collapsed': sum(1 for fault in self.faults if fault in detected),
+            'coverage': 100.0 * covered / self.fault_count if self.fault_count else 100.0,
+            'undetected': [self.fault_name(fault) for fault in self.faults if fault not in detected],
+        }
+
+
+def exhaustive_patterns(sim: FaultSimulator) -> List[int]:
+    """Every input combination, as the benches' exhaustive tests apply."""
+    if sim.input_bits > MAX_EXHAUSTIVE_INPUTS:
+        raise ValueError(f"{sim.name} has {sim.input_bits} input bits; give a stimulus "
+                         f"(exhaustive limit {MAX_EXHAUSTIVE_INPUTS})")
+    return list(range(1 << sim.input_bits))
+
+
+def vcd_steps(path: str, ports: Sequence[str], scope: Optional[str] = None) -> Iterator[Tuple[int, Dict[str, int]]]:
+    """Time and input port values at the end of every time step of a VCD dump, streamed; x/z steps are skipped."""
+    with VCDFile(path) as vcd:
+        scope = scope or resolve_scope(vcd, ports)
+        if scope is None:
+            raise KeyError(f"no scope in {path} declares all of {', '.join(ports)}")
+        id_ports: Dict[str, List[str]] = {}
+        for port in ports:
+            id_ports.setdefault(vcd.find(f"{scope}.{port}").id_code, []).append(port)
+        values: Dict[str, Optional[int]] = dict.fromkeys(ports)
+        current = None
+        for step, id_code, value in vcd.iter_changes(f"{scope}.{port}" for port in ports):
+            if step != current:
+                if current is not None and None not in values.values():
+                    yield current, dict(values)
+                current = step
+            for port in id_ports[id_code]:
+                values[port] = vcd_value_to_int(value)
+        if current is not None and None not in values.values():
+            yield current, dict(values)
+
+
+def vcd_vectors(path: str, ports: Sequence[str], scope: Optional[str] = None) -> List[Dict[str, int]]:
+    """Input port values at the end of every time step of a VCD dump; steps with x/z are skipped."""
+    return [vector for _, vector in vcd_steps(path, ports, scope)]
+
+
+def vector_file(path: str, columns: Sequence[str]) -> List[Dict[str, int]]:
+    """Port values from a vector file with one binary value per column per line.
+
+    Lines that do not parse (e.g. '#' comments) are skipped, as the SV bench does.
+    """
+    vectors = []
+    with open(path, 'r') as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) < len(columns):
+                continue
+            try:
+                vectors.append({port: int(field, 2) for port, field in zip(columns, fields)})
+            except ValueError:
+                continue
+    return vectors
+
+
+def load_stimulus(paths: Sequence[str], ports: Sequence[str], columns: Sequence[str] = DEFAULT_COLUMNS,
+                  scope: Optional[str] = None) -> List[Dict[str, int]]:
+    """Input vectors from VCD dumps and vector files, in order."""
+    vectors = []
+    for path in paths:
+        if path.endswith('.vcd'):
+            vectors.extend(vcd_vectors(path, ports, scope))
+        else:
+            vectors.extend(vector_file(path, columns))
+    return vectors
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Stuck-at fault simulation of Yosys JSON netlists")
+    parser.add_argument("netlists", nargs="+", help="Yosys write_json netlists")
+    parser.add_argument("--top", help="Module to simulate (default: the netlist top)")
+    parser.add_argument("--stimulus", nargs="+", default=[], metavar="FILE",
+                        help="VCD dumps or vector files (default: every input combination)")
+    parser.add_argument("--columns", nargs="+", default=DEFAULT_COLUMNS, help="Ports of the vector file columns")
+    parser.add_argument("--scope", help="VCD scope holding the input ports (default: shallowest matching)")
+    parser.add_argument("--word", type=int, default=WORD_PATTERNS, help="Patterns per simulation word")
+    parser.add_argument("--undetected", action="store_true", help="List undetected faults")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = []
+    for path in args.netlists:
+        start = time.perf_counter()
+        try:
+            sim = FaultSimulator(load_netlist(path), args.top)
+            if args.stimulus:
+                vectors = load_stimulus(args.stimulus, list(sim.inputs), args.columns, args.scope)
+                patterns = sim.patterns(vectors)
+                applied = len(vectors)
+            else:
+                patterns = exhaustive_patterns(sim)
+                applied = len(patterns)
+            coverage = sim.coverage(sim.simulate(patterns, word_patterns=args.word))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error: {path}: {e}")
+            sys.exit(1)
+        elapsed = time.perf_counter() - start
+        print(f"{path}: {sim.name}, {coverage['faults']} faults ({coverage['collapsed_faults']} collapsed), "
+              f"{applied} vectors ({len(patterns)} unique) -> {coverage['coverage']:.1f}% coverage "
+              f"({coverage['detected']}/{coverage['faults']}) in {elapsed * 1e3:.1f} ms")
+        if args.undetected:
+            for name in coverage['undetected']:
+                print(f"    undetected: {name}")
+        results.append({'netlist': path, 'module': sim.name, 'vectors': applied,
+                        'patterns': len(patterns), 'seconds': elapsed, **coverage})
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
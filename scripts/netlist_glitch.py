@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Timed Glitch and Hazard Simulation
+
+Event-driven gate-level simulation of input transitions on a synthesized
+Yosys JSON netlist, with per-cell delays from a netlist_timing DelayModel.
+The zero-delay simulators (netlist_sim, netlist_fault) only see settled
+values; this one follows every intermediate transition, so it counts the
+glitches each net makes on its way to the new value and finds the input
+transitions that cause hazards at the outputs.
+
+Each pattern is one input transition: the design is settled at the "before"
+vector and the inputs switch to the "after" vector at time 0. All patterns
+are simulated together, one bit per pattern in each net's word (as in
+netlist_fault), and events carry the word of patterns in which a net
+changes. Output changes are scheduled after the delay of the driving cell:
+
+- Transport delay passes every pulse through.
+- Inertial delay (the default) drops pulses shorter than the cell delay: a
+  scheduled change is cancelled in every pattern where the cell's inputs
+  change it back before the change matures.
+
+Changes within one time step (through zero-delay cells) are merged, so
+zero-width pulses are not counted. A net toggling more often than its
+settled change is glitching; an observed net (output or flip-flop data
+input) toggling twice with no settled change has a static hazard, three or
+more times a dynamic hazard. Flip-flops hold their reset value of 0.
+
+With up to MAX_TRANSITION_BITS switching input bits every transition
+between two input vectors is simulated; larger designs use random samples.
+Inputs outside the columns (clk_i, reset_n_i) are held as the benches
+drive them (netlist_atpg.HELD_INPUTS).
+
+Usage:
+    python scripts/netlist_glitch.py NETLIST.json [...] [--model asic|fpga|unit|liberty] [--transport]
+"""
+
+import sys
+import json
+import time
+import heapq
+import argparse
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from netlist_atpg import HELD_INPUTS
+from netlist_fault import DEFAULT_COLUMNS, CompiledNetlist
+from netlist_graph import FIRST_NET, NetlistGraph, load_netlist
+from netlist_logic import WordBuilder
+from netlist_sim import exhaustive_words, random_words
+from netlist_timing import DELAY_MODELS, DelayModel, asic_delay_model
+
+# Switching input bits up to which every transition is simulated
+MAX_TRANSITION_BITS = 8
+
+# Random transitions simulated for larger designs
+SAMPLE_TRANSITIONS = 4096
+
+# Hazard-prone transitions listed per design by default
+HAZARD_LIMIT = 10
+
+
+class GlitchSimulator(CompiledNetlist):
+    """A flattened netlist with per-net delays for timed parallel-pattern simulation."""
+
+    __slots__ = ('model', 'inertial', 'columns', 'held', 'net_delay')
+
+    def __init__(self, graph: NetlistGraph, top: Optional[str] = None, model: Optional[DelayModel] = None,
+                 inertial: bool = True, columns: Optional[Sequence[str]] = None):
+        super().__init__(graph, top)
+        self.model = model or asic_delay_model()
+        self.inertial = inertial
+        if columns is None:
+            columns = DEFAULT_COLUMNS if set(DEFAULT_COLUMNS) <= self.inputs.keys() else list(self.inputs)
+        missing = [port for port in columns if port not in self.inputs]
+        if missing:
+            raise ValueError(f"{self.name} has no input port {', '.join(missing)}")
+        self.columns = list(columns)
+        self.held = {port: HELD_INPUTS.get(port, 0) for port in self.inputs if port not in self.columns}
+
+        fanout = [0] * self.net_count
+        for _, _, inputs, _ in self.cells + self.state_cells:
+            for nets in inputs.values():
+                for net in nets:
+                    fanout[net] += 1
+
+        # Delay of the cell driving each net
+        self.net_delay = [0.0] * self.net_count
+        for type_name, params, _, outputs in self.cells:
+            for nets in outputs.values():
+                for net in nets:
+                    self.net_delay[net] = self.model.cell_delay(type_name, params, fanout[net])
+
+    @property
+    def column_bits(self) -> int:
+        return sum(len(self.inputs[port]) for port in self.columns)
+
+    def settle(self, words: Sequence[int], mask: int) -> List[int]:
+        """Settled net words for column words (column bits in column order); flip-flops hold 0."""
+        values = [0] * self.net_count
+        values[1] = mask
+        column = iter(words)
+        for port, nets in self.inputs.items():
+            for i, net in enumerate(nets):
+                if port in self.held:
+                    values[net] = mask if (self.held[port] >> i) & 1 else 0
+                else:
+                    values[net] = next(column)
+        values[0] = values[2] = values[3] = 0
+        builder = WordBuilder(mask)
+        for position in range(len(self.cells)):
+            for net, word in self._evaluate(builder, position, values.__getitem__).items():
+                values[net] = word
+        return values
+
+    def simulate(self, before: Sequence[int], after: Sequence[int], mask: int) -> Dict:
+        """Timed simulation of the transitions from the before to the after column words."""
+        builder = WordBuilder(mask)
+        values = self.settle(before, mask)
+        initial = list(values)
+        computed = list(values)  # Latest value each cell computed for its output nets
+        toggles = [0] * self.net_count
+        once = {net: 0 for net in self.observed}
+        twice = dict(once)
+
+        # Pending events per net, in time order: [time, value word, valid patterns]
+        pending: Dict[int, deque] = {}
+        queue: List[Tuple[float, int, int]] = []
+        sequence = 0
+        position = 0
+        for port, nets in self.inputs.items():
+            if port in self.held:
+                continue
+            for net in nets:
+                word = after[position]
+                position += 1
+                if net >= FIRST_NET and word != values[net]:
+                    pending.setdefault(net, deque()).append([0.0, word, mask])
+                    heapq.heappush(queue, (0.0, sequence, net))
+                    sequence += 1
+
+        events = 0
+        settle_time = 0.0
+        while queue:
+            now = queue[0][0]
+            start: Dict[int, int] = {}
+            # Delta cycles: zero-delay cells schedule further events at the same time
+            while queue and queue[0][0] == now:
+                dirty = set()
+                while queue and queue[0][0] == now:
+                    _, _, net = heapq.heappop(queue)
+                    _, word, valid = pending[net].popleft()
+                    events += 1
+                    new = values[net] ^ ((values[net] ^ word) & valid)
+                    if new != values[net]:
+                        start.setdefault(net, values[net])
+                        values[net] = new
+                        dirty.update(self.sinks.get(net, ()))
+                for position in sorted(dirty):
+                    for net, word in self._evaluate(builder, position, values.__getitem__).items():
+                        changed = word ^ computed[net]
+                        if not changed:
+                            continue
+                        computed[net] = word
+                        delay = self.net_delay[net]
+                        scheduled = pending.setdefault(net, deque())
+                        if self.inertial and delay > 0:
+                            # Changes back before a pending change matures cancel it
+                            for event in scheduled:
+                                event[2] &= ~changed
+                        scheduled.append([now + delay, word, changed])
+                        heapq.heappush(queue, (now + delay, sequence, net))
+                        sequence += 1
+
+            # Net changes over the whole time step
+            for net, old in start.items():
+                changed = old ^ values[net]
+                if not changed:
+                    continue
+                settle_time = now
+                toggles[net] += bin(changed).count('1')
+                if net in once:
+                    twice[net] |= once[net] & changed
+                    once[net] |= changed
+
+        final = values
+        settled = [bin(initial[net] ^ final[net]).count('1') for net in range(self.net_count)]
+        hazards = {}
+        for net in self.observed:
+            switched = initial[net] ^ final[net]
+            hazards[net] = {'static': twice[net] & ~switched & mask, 'dynamic': twice[net] & switched}
+        return {
+            'toggles': toggles,
+            'settled': settled,
+            'hazards': hazards,
+            'settle_time': settle_time,
+            'events': events,
+        }
+
+    def transition_words(self, samples: int = SAMPLE_TRANSITIONS,
+                         seed: Optional[int] = None) -> Tuple[List[int], List[int], int, bool]:
+        """Before and after column words covering every transition, or random samples; mask, exhaustive."""
+        bits = self.column_bits
+        if bits <= MAX_TRANSITION_BITS:
+            words, mask = exhaustive_words(2 * bits)
+            return words[bits:], words[:bits], mask, True
+        words, mask = random_words(2 * bits, samples, seed)
+        return words[:bits], words[bits:], mask, False
+
+    def format_vector(self, words: Sequence[int], pattern: int) -> str:
+        """Column values of one pattern, one binary field per column."""
+        fields = []
+        position = 0
+        for port in self.columns:
+            width = len(self.inputs[port])
+            value = sum(((words[position + i] >> pattern) & 1) << i for i in range(width))
+            fields.append(format(value, f'0{width}b'))
+            position += width
+        return ' '.join(fields)
+
+
+def analyze_glitches(sim: GlitchSimulator, samples: int = SAMPLE_TRANSITIONS, seed: Optional[int] = None,
+                     limit: int = HAZARD_LIMIT) -> Dict:
+    """Glitch transitions per net and hazard-prone input transitions of a design."""
+    before, after, mask, exhaustive = sim.transition_words(samples, seed)
+    result = sim.simulate(before, after, mask)
+    switching = 0
+    for old, new in zip(before, after):
+        switching |= old ^ new
+
+    net_glitches = {}
+    for net in range(FIRST_NET, sim.net_count):
+        extra = result['toggles'][net] - result['settled'][net]
+        if extra:
+            net_glitches[sim.net_name(net)] = extra
+
+    # Observed nets with a hazard in each transition
+    hazards = {}
+    prone: Dict[int, List[str]] = {}
+    for net in sorted(result['hazards'], key=sim.net_name):
+        kinds = result['hazards'][net]
+        name = sim.net_name(net)
+        hazards[name] = {kind: bin(word).count('1') for kind, word in kinds.items()}
+        for kind, word in kinds.items():
+            while word:
+                low = word & -word
+                prone.setdefault(low.bit_length() - 1, []).append(f"{name} {kind}")
+                word ^= low
+    listed = [{'before': sim.format_vector(before, pattern), 'after': sim.format_vector(after, pattern),
+               'hazards': prone[pattern]} for pattern in sorted(prone)[:limit]]
+    return {
+        'module': sim.name,
+        'model': type(sim.model).__name__,
+        'inertial': sim.inertial,
+        'columns': sim.columns,
+        'exhaustive': exhaustive,
+        'transitions': bin(switching).count('1'),
+        'toggles': sum(result['toggles']),
+        'glitches': sum(net_glitches.values()),
+        'net_glitches': net_glitches,
+        'hazards': hazards,
+        'hazard_transitions': len(prone),
+        'hazard_examples': listed,
+        'settle_time': result['settle_time'],
+        'events': result['events'],
+    }
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Timed glitch and hazard simulation of Yosys JSON netlists")
+    parser.add_argument("netlists", nargs="+", help="Yosys write_json netlists")
+    parser.add_argument("--top", help="Module to simulate (default: the netlist top)")
+    parser.add_argument("--model", choices=sorted(DELAY_MODELS), default='asic', help="Cell delay model")
+    parser.add_argument("--transport", action="store_true", help="Transport instead of inertial delays")
+    parser.add_argument("--columns", nargs="+", help=f"Switching input ports (default: {' '.join(DEFAULT_COLUMNS)})")
+    parser.add_argument("--samples", type=int, default=SAMPLE_TRANSITIONS,
+                        help=f"Random transitions above {MAX_TRANSITION_BITS} switching input bits")
+    parser.add_argument("--seed", type=int, help="Random seed for sampled transitions")
+    parser.add_argument("--hazards", type=int, default=HAZARD_LIMIT, help="Hazard-prone transitions to list")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = []
+    for path in args.netlists:
+        start = time.perf_counter()
+        try:
+            sim = GlitchSimulator(load_netlist(path), args.top, DELAY_MODELS[args.model](),
+                                  not args.transport, args.columns)
+            result = analyze_glitches(sim, args.samples, args.seed, args.hazards)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error: {path}: {e}")
+            sys.exit(1)
+        elapsed = time.perf_counter() - start
+        kind = "all" if result['exhaustive'] else "sampled"
+        print(f"{path}: {sim.name}, {result['transitions']} transitions ({kind}), {result['toggles']} toggles, "
+              f"{result['glitches']} glitch transitions, {result['hazard_transitions']} hazard-prone transitions, "
+              f"settled by {result['settle_time']:g} {sim.model.unit} in {elapsed * 1e3:.1f} ms")
+        for name, count in sorted(result['net_glitches'].items(), key=lambda item: (-item[1], item[0])):
+            print(f"  {name}: {count} glitch transitions")
+        for name, counts in result['hazards'].items():
+            if counts['static'] or counts['dynamic']:
+                print(f"  {name}: {counts['static']} static, {counts['dynamic']} dynamic hazards")
+        for example in result['hazard_examples']:
+            print(f"  {' '.join(sim.columns)}: {example['before']} -> {example['after']}: "
+                  f"{', '.join(example['hazards'])}")
+        results.append({'netlist': path, 'seconds': elapsed, **result})
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
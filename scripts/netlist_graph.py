@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+"""
+Compact Netlist Graph
+
+Loads the structured netlists Yosys writes with write_json
+(flow/yosys/*_synth.json, flow/fpga/*_fpga.json) once into a compact,
+array-backed graph shared by the gate-level and FPGA analyzers.
+
+Per module, cells carry an integer type code (interned per netlist) and nets
+are dense integers: 0-3 are the constants 0, 1, x and z, ports and wires
+follow. Connectivity is stored in CSR form - cell fanin (input nets), cell
+fanout (output nets) and net sinks are offset arrays into flat typed arrays,
+each net has one driver cell entry - so traversals are linear-time and the
+memory cost is a few bytes per pin rather than per-object dictionaries.
+
+load_netlist builds the graph cell by cell from a JSON stream
+(netlist_stream), so the parsed JSON document is never held in memory. It
+also reads the binary netlist stores written by netlist_store, which
+memory-map these arrays instead of parsing JSON.
+
+Usage:
+    python scripts/netlist_graph.py NETLIST.json [...]
+"""
+
+import os
+import sys
+import copy
+import argparse
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from netlist_scanner import scan_netlist
+from netlist_stream import iter_netlist
+
+# Constant bits in Yosys JSON connections map to the first net ids
+CONSTANT_BITS = {'0': 0, '1': 1, 'x': 2, 'z': 3}
+FIRST_NET = 4
+
+# Output pins of cells whose port directions are not recorded (blackboxes)
+OUTPUT_PINS = frozenset(('Y', 'Q', 'O', 'Z', 'X', 'CO', 'QN'))
+
+# Yosys gate families ($_DFF_PN0_ -> DFF) that are merged under one name
+GATE_FAMILY_ALIASES = {
+    'DFFE': 'DFF', 'SDFF': 'DFF', 'SDFFE': 'DFF', 'SDFFCE': 'DFF', 'DFFSR': 'DFF',
+    'DFFSRE': 'DFF', 'ALDFF': 'DFF', 'ALDFFE': 'DFF', 'DLATCH': 'LATCH', 'DLATCHSR': 'LATCH',
+}
+
+# Word-level and vendor cells that hold state
+SEQUENTIAL_TYPES = frozenset((
+    '$dff', '$dffe', '$adff', '$adffe', '$sdff', '$sdffe', '$sdffce', '$dffsr', '$dffsre',
+    '$aldff', '$aldffe', '$dlatch', '$adlatch', '$dlatchsr', '$sr', '$mem', '$mem_v2',
+))
+SEQUENTIAL_PREFIXES = ('FD', 'LD')
+
+
+def gate_family(type_name: str) -> Optional[str]:
+    """Family of a Yosys internal gate cell ($_AND_ -> AND, $_DFF_P_ -> DFF), else None."""
+    if not type_name.startswith('$_'):
+        return None
+    base = type_name[2:].split('_', 1)[0]
+    return GATE_FAMILY_ALIASES.get(base, base)
+
+
+def is_sequential(type_name: str) -> bool:
+    """True for flip-flop, latch and memory cells."""
+    return (gate_family(type_name) in ('DFF', 'LATCH', 'SR') or type_name in SEQUENTIAL_TYPES
+            or type_name.startswith(SEQUENTIAL_PREFIXES))
+
+
+def _attr_flag(attributes: Dict, key: str) -> bool:
+    value = attributes.get(key)
+    if isinstance(value, str):
+        return value.strip('0') != ''
+    return bool(value)
+
+
+class Module:
+    """One module definition: cells, nets and CSR connectivity."""
+
+    __slots__ = ('graph', 'name', 'attributes', 'ports', '_netnames', 'net_count',
+                 'cell_names', 'cell_type', '_cell_params',
+                 'fanin_start', 'fanin_net', 'fanin_pin',
+                 'fanout_start', 'fanout_net', 'fanout_pin',
+                 'net_driver', 'sink_start', 'sink_cell', '_order', '_bit_index')
+
+    def __init__(self, graph: 'NetlistGraph', name: str, data: Optional[Dict] = None):
+        """Build from a Yosys JSON module dict, or empty to be filled by add_* and finish()."""
+        self.graph = graph
+        self.name = name
+        self.attributes: Dict = {}
+        self._order = None
+        self._bit_index: Dict[int, int] = {}  # Yosys bit -> net id, while building
+
+        # Ports: name -> (direction, nets)
+        self.ports: Dict[str, Tuple[str, List[int]]] = {}
+        self._netnames: Dict[str, List[int]] = {}
+        self.cell_names: List[str] = []
+        self.cell_type = array('H')
+        self._cell_params: Dict[int, Dict] = {}
+        self.fanin_start, self.fanin_net, self.fanin_pin = array('I', [0]), array('I'), array('H')
+        self.fanout_start, self.fanout_net, self.fanout_pin = array('I', [0]), array('I'), array('H')
+
+        if data is not None:
+            self.attributes = data.get('attributes', {})
+            for port, info in data.get('ports', {}).items():
+                self.add_port(port, info)
+            for cell_name, cell in data.get('cells', {}).items():
+                self.add_cell(cell_name, cell)
+            for net_name, info in data.get('netnames', {}).items():
+                self.add_netname(net_name, info)
+            self.finish()
+
+    def _nets(self, bits) -> List[int]:
+        bit_index = self._bit_index
+        ids = []
+        for bit in bits:
+            if isinstance(bit, str):
+                ids.append(CONSTANT_BITS.get(bit, 2))
+                continue
+            net = bit_index.get(bit)
+            if net is None:
+                net = bit_index[bit] = FIRST_NET + len(bit_index)
+            ids.append(net)
+        return ids
+
+    def add_port(self, port: str, info: Dict):
+        self.ports[port] = (info.get('direction', 'input'), self._nets(info.get('bits', [])))
+
+    def add_cell(self, cell_name: str, cell: Dict):
+        type_name = cell.get('type', '')
+        index = len(self.cell_names)
+        self.cell_names.append(cell_name)
+        self.cell_type.append(self.graph.intern_type(type_name))
+        if cell.get('parameters'):
+            self._cell_params[index] = cell['parameters']
+
+        directions = cell.get('port_directions', {})
+        connections = cell.get('connections', {})
+        pins = connections.keys()
+        if type_name.startswith('$_'):
+            pins = sorted(pins)  # Gate pins in A, B, C, ..., S order
+        for pin in pins:
+            direction = directions.get(pin) or ('output' if pin in OUTPUT_PINS else 'input')
+            pin_code = self.graph.intern_pin(pin)
+            if direction == 'output':
+                for net in self._nets(connections[pin]):
+                    self.fanout_net.append(net)
+                    self.fanout_pin.append(pin_code)
+            else:
+                for net in self._nets(connections[pin]):
+                    self.fanin_net.append(net)
+                    self.fanin_pin.append(pin_code)
+        self.fanin_start.append(len(self.fanin_net))
+        self.fanout_start.append(len(self.fanout_net))
+
+    def add_netname(self, net_name: str, info: Dict):
+        self._netnames[net_name] = self._nets(info.get('bits', []))
+
+    def finish(self):
+        """Number the nets and build the net drivers and sinks once every cell is added."""
+        self.net_count = FIRST_NET + len(self._bit_index)
+        self._bit_index = None
+
+        # Net drivers and net sinks (CSR over nets)
+        self.net_driver = array('i', [-1]) * self.net_count
+        for cell in range(len(self.cell_names)):
+            for i in range(self.fanout_start[cell], self.fanout_start[cell + 1]):
+                net = self.fanout_net[i]
+                if self.net_driver[net] < 0:
+                    self.net_driver[net] = cell
+
+        counts = array('I', [0]) * (self.net_count + 1)
+        for net in self.fanin_net:
+            counts[net + 1] += 1
+        for net in range(self.net_count):
+            counts[net + 1] += counts[net]
+        self.sink_start = counts
+        self.sink_cell = array('I', [0]) * len(self.fanin_net)
+        fill = array('I', counts[:-1])
+        for cell in range(len(self.cell_names)):
+            for i in range(self.fanin_start[cell], self.fanin_start[cell + 1]):
+                net = self.fanin_net[i]
+                self.sink_cell[fill[net]] = cell
+                fill[net] += 1
+
+    @property
+    def netnames(self) -> Dict[str, List[int]]:
+        """Nets of each named wire; a store-backed module decodes them on first use."""
+        if callable(self._netnames):
+            self._netnames = self._netnames()
+        return self._netnames
+
+    @property
+    def cell_params(self) -> Dict[int, Dict]:
+        """Parameters of the cells that have any, by cell index."""
+        if callable(self._cell_params):
+            self._cell_params = self._cell_params()
+        return self._cell_params
+
+    @property
+    def cell_count(self) -> int:
+        return len(self.cell_names)
+
+    @property
+    def is_blackbox(self) -> bool:
+        return _attr_flag(self.attributes, 'blackbox')
+
+    @property
+    def is_top(self) -> bool:
+        return _attr_flag(self.attributes, 'top')
+
+    def type_name(self, cell: int) -> str:
+        return self.graph.type_names[self.cell_type[cell]]
+
+    def inputs(self, cell: int) -> array:
+        """Input nets of a cell, in pin order."""
+        return self.fanin_net[self.fanin_start[cell]:self.fanin_start[cell + 1]]
+
+    def outputs(self, cell: int) -> array:
+        """Output nets of a cell, in pin order."""
+        return self.fanout_net[self.fanout_start[cell]:self.fanout_start[cell + 1]]
+
+    def sinks(self, net: int) -> array:
+        """Cells reading a net."""
+        return self.sink_cell[self.sink_start[net]:self.sink_start[net + 1]]
+
+    def port_nets(self, direction: str) -> Dict[str, List[int]]:
+        """Nets of the module ports with the given direction."""
+        return {port: bits for port, (dir_, bits) in self.ports.items() if dir_ == direction}
+
+    def type_counts(self) -> Dict[str, int]:
+        """Number of cells of each type in this module definition."""
+        counts = array('I', [0]) * len(self.graph.type_names)
+        for code in self.cell_type:
+            counts[code] += 1
+        return {self.graph.type_names[code]: n for code, n in enumerate(counts) if n}
+
+    def topological_order(self) -> array:
+        """Cell indices in dependency order; state-holding cells start new paths.
+
+        Raises ValueError on a combinational loop.
+        """
+        if self._order is not None:
+            return self._order
+
+        sequential = self.graph.sequential_codes()
+        comb = [code not in sequential for code in self.cell_type]
+        driver, fanin_start, fanin_net = self.net_driver, self.fanin_start, self.fanin_net
+        pending = [0] * self.cell_count
+        for cell in range(self.cell_count):
+            if comb[cell]:
+                for i in range(fanin_start[cell], fanin_start[cell + 1]):
+                    source = driver[fanin_net[i]]
+                    if source >= 0 and comb[source]:
+                        pending[cell] += 1
+
+        order = array('I', (cell for cell in range(self.cell_count) if pending[cell] == 0))
+        position = 0
+        while position < len(order):
+            cell = order[position]
+            position += 1
+            if not comb[cell]:
+                continue  # Sinks of state-holding cells never waited on them
+            for i in range(self.fanout_start[cell], self.fanout_start[cell + 1]):
+                net = self.fanout_net[i]
+                if driver[net] != cell:
+                    continue  # Only the net's recorded driver releases its sinks
+                for j in range(self.sink_start[net], self.sink_start[net + 1]):
+                    sink = self.sink_cell[j]
+                    if comb[sink]:
+                        pending[sink] -= 1
+                        if pending[sink] == 0:
+                            order.append(sink)
+
+        if len(order) != self.cell_count:
+            raise ValueError(f"{self.name}: combinational loop through "
+                             f"{self.cell_count - len(order)} cells")
+        self._order = order
+        return order
+
+    def logic_depth(self) -> int:
+        """Longest chain of combinational cells between state or port boundaries."""
+        sequential = self.graph.sequential_codes()
+        level = array('I', [0]) * self.cell_count
+        deepest = 0
+        for cell in self.topological_order():
+            if self.cell_type[cell] in sequential:
+                continue
+            depth = 0
+            for net in self.inputs(cell):
+                source = self.net_driver[net]
+                if source >= 0 and self.cell_type[source] not in sequential:
+                    depth = max(depth, level[source])
+            level[cell] = depth + 1
+            deepest = max(deepest, depth + 1)
+        return deepest
+
+
+class NetlistGraph:
+    """All modules of a Yosys JSON netlist with shared type and pin tables."""
+
+    __slots__ = ('path', 'creator', 'modules', 'type_names', 'type_codes', 'pin_names', 'pin_codes',
+                 '_sequential')
+
+    def __init__(self, data: Dict, path: str = ''):
+        """Build from a parsed Yosys JSON document (see stream_netlist to read a file)."""
+        self.path = path
+        self.creator = data.get('creator', '')
+        self.type_names: List[str] = []
+        self.type_codes: Dict[str, int] = {}
+        self.pin_names: List[str] = []
+        self.pin_codes: Dict[str, int] = {}
+        self._sequential = None
+        self.modules: Dict[str, Module] = {}
+        for name, module in data.get('modules', {}).items():
+            self.modules[name] = Module(self, name, module)
+
+    def derive(self, path: Optional[str] = None) -> 'NetlistGraph':
+        """A graph over the same modules that new modules can be added to without changing this one.
+
+        Module arrays are shared, not copied; each module gets its own
+        attributes, so flags such as top can be changed on the derived graph.
+        """
+        graph = NetlistGraph({}, self.path if path is None else path)
+        graph.creator = self.creator
+        graph.type_names = list(self.type_names)
+        graph.type_codes = dict(self.type_codes)
+        graph.pin_names = list(self.pin_names)
+        graph.pin_codes = dict(self.pin_codes)
+        for name, module in self.modules.items():
+            module = copy.copy(module)
+            module.graph = graph
+            module.attributes = dict(module.attributes)
+            graph.modules[name] = module
+        return graph
+
+    def intern_type(self, type_name: str) -> int:
+        code = self.type_codes.get(type_name)
+        if code is None:
+            code = self.type_codes[type_name] = len(self.type_names)
+            self.type_names.append(type_name)
+        return code
+
+    def intern_pin(self, pin: str) -> int:
+        code = self.pin_codes.get(pin)
+        if code is None:
+            code = self.pin_codes[pin] = len(self.pin_names)
+            self.pin_names.append(pin)
+        return code
+
+    def sequential_codes(self) -> frozenset:
+        """Type codes of state-holding cells."""
+        if self._sequential is None or self._sequential[0] != len(self.type_names):
+            codes = frozenset(code for code, name in enumerate(self.type_names) if is_sequential(name))
+            self._sequential = (len(self.type_names), codes)
+        return self._sequential[1]
+
+    @property
+    def top(self) -> Optional[Module]:
+        """The top module: marked top, else the one no other module instantiates."""
+        for module in self.modules.values():
+            if module.is_top:
+                return module
+        instantiated = {module.type_name(cell) for module in self.modules.values()
+                        for cell in range(module.cell_count)}
+        roots = [m for name, m in self.modules.items() if name not in instantiated and not m.is_blackbox]
+        return roots[0] if roots else next(iter(self.modules.values()), None)
+
+    def cell_type_counts(self) -> Dict[str, int]:
+        """Cells per type summed over every module definition (each counted once)."""
+        totals: Dict[str, int] = {}
+        for module in self.modules.values():
+            for type_name, count in module.type_counts().items():
+                totals[type_name] = totals.get(type_name, 0) + count
+        return totals
+
+    def module_type_counts(self) -> Dict[str, Dict[str, int]]:
+        """Cell counts per type of every non-blackbox module definition."""
+        return {name: module.type_counts() for name, module in self.modules.items()
+                if not module.is_blackbox}
+
+    def instance_counts(self) -> Dict[str, int]:
+        """Instances of user modules defined in this netlist (hierarchical cells)."""
+        defined = {name for name, module in self.modules.items() if not module.is_blackbox}
+        return {type_name: count for type_name, count in self.cell_type_counts().items()
+                if type_name in defined}
+
+    def iter_cells(self) -> Iterator[Tuple[Module, int]]:
+        for module in self.modules.values():
+            for cell in range(module.cell_count):
+                yield module, cell
+
+
+def stream_netlist(path: str, name: Optional[str] = None) -> NetlistGraph:
+    """Build the graph of a Yosys JSON netlist in one streaming pass, a cell at a time."""
+    graph = NetlistGraph({}, name or path)
+    module = None
+    for module_name, section, entry, value in iter_netlist(path):
+        if module_name is None:
+            if section == 'creator':
+                graph.creator = value
+            continue
+        if module is None or module.name != module_name:
+            if module is not None:
+                module.finish()
+            module = graph.modules[module_name] = Module(graph, module_name)
+        if section == 'cells':
+            module.add_cell(entry, value)
+        elif section == 'ports':
+            module.add_port(entry, value)
+        elif section == 'netnames':
+            module.add_netname(entry, value)
+        elif section == 'attributes':
+            module.attributes = value
+    if module is not None:
+        module.finish()
+    return graph
+
+
+# Graphs loaded in this process, keyed by path and validated by mtime/size
+_GRAPH_CACHE: Dict[str, Tuple[Tuple[int, int], NetlistGraph]] = {}
+
+
+def load_netlist(path: str) -> NetlistGraph:
+    """Load a Yosys JSON netlist or a netlist store once per process and return its graph."""
+    import netlist_store  # Deferred: netlist_store builds on this module
+    real = os.path.realpath(path)
+    stat = os.stat(real)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _GRAPH_CACHE.get(real)
+    if cached and cached[0] == key:
+        return cached[1]
+    with open(real, 'rb') as f:
+        binary = f.read(len(netlist_store.MAGIC)) == netlist_store.MAGIC
+    if binary:
+        graph = netlist_store.open_store(real, path)
+    else:
+        graph = stream_netlist(real, path)
+    _GRAPH_CACHE[real] = (key, graph)
+    return graph
+
+
+# Stale JSON netlists already reported in this process
+_STALE_WARNED = set()
+
+# Staleness of JSON netlists checked in this process, keyed by path and validated by both files' mtime/size
+_SIBLING_CHECKED: Dict[str, Tuple[Tuple[int, int, int, int], bool]] = {}
+
+
+def sibling_json(netlist_file: str) -> Optional[str]:
+    """The write_json netlist next to a write_verilog netlist, if present and not stale.
+
+    The synthesis scripts write both netlists from the same design, so the
+    JSON netlist is used whenever its cell counts per module and type match
+    the Verilog netlist's (file times are not compared: a checkout or copy
+    does not preserve their order). A JSON netlist that differs is left from
+    an earlier run; it is not used, and a warning (once per file) says which
+    report sections are skipped.
+    """
+    json_file = os.path.splitext(netlist_file)[0] + '.json'
+    if not os.path.exists(json_file):
+        return None
+    if not os.path.exists(netlist_file):
+        return json_file
+    netlist_stat, json_stat = os.stat(netlist_file), os.stat(json_file)
+    state = (netlist_stat.st_mtime_ns, netlist_stat.st_size, json_stat.st_mtime_ns, json_stat.st_size)
+    real = os.path.realpath(json_file)
+    cached = _SIBLING_CHECKED.get(real)
+    if cached and cached[0] == state:
+        current = cached[1]
+    else:
+        current = scan_netlist(netlist_file) == load_netlist(json_file).module_type_counts()
+        _SIBLING_CHECKED[real] = (state, current)
+    if not current:
+        if json_file not in _STALE_WARNED:
+            _STALE_WARNED.add(json_file)
+            print(f"Warning: {json_file} does not match {netlist_file} and is not used: skipping LUT mapping, "
+                  f"timing, carry chain, glitch, power and AIG sections (re-run synthesis)")
+        return None
+    return json_file
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Summarize Yosys JSON netlists through the compact graph")
+    parser.add_argument("netlists", nargs="+", help="Yosys write_json netlists or netlist stores")
+    args = parser.parse_args()
+
+    for path in args.netlists:
+        try:
+            graph = load_netlist(path)
+        except (OSError, ValueError) as e:
+            print(f"Error: {path}: {e}")
+            sys.exit(1)
+        top = graph.top
+        print(f"{path}: {len(graph.modules)} modules, top {top.name if top else '-'}")
+        for module in graph.modules.values():
+            try:
+                depth = module.logic_depth()
+            except ValueError as e:
+                depth = str(e)
+            types = ", ".join(f"{name} x{count}" for name, count in sorted(module.type_counts().items()))
+            print(f"   {module.name:32} cells={module.cell_count:<6} nets={module.net_count - FIRST_NET:<6} "
+                  f"depth={depth}")
+            if types:
+                print(f"      {types}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Netlist Hierarchy Resolver
+
+Resolves hierarchical netlists into per-module leaf-cell statistics without
+flattening them. Input is the cell count table of every module definition
+(module -> cell type -> count), as produced by netlist_graph (Yosys JSON) or
+netlist_scanner (Verilog). Each module is resolved once, bottom-up: its own
+leaf cells plus, for every instance of another defined module, that module's
+resolved counts times the number of instances. The work is linear in the
+size of the count tables however deep or wide the hierarchy is, and counts
+of large hierarchies (e.g. a 64-bit ripple of full_adder_half_adder) are
+exact integers.
+
+Usage:
+    python scripts/netlist_hierarchy.py NETLIST.json|NETLIST.v [...] [--module NAME]
+"""
+
+import sys
+import argparse
+from typing import Dict, Optional, Tuple
+
+CellCounts = Dict[str, int]
+
+
+def find_top(modules: Dict[str, CellCounts]) -> Optional[str]:
+    """The first defined module that no other module instantiates."""
+    instantiated = {cell_type for cells in modules.values() for cell_type in cells}
+    for name in modules:
+        if name not in instantiated:
+            return name
+    return next(iter(modules), None)
+
+
+def resolve_hierarchy(modules: Dict[str, CellCounts]) -> Dict[str, CellCounts]:
+    """Leaf-cell counts of every module with submodule instances expanded.
+
+    Cell types that are keys of modules are treated as submodules; all
+    others are leaf cells. Each definition is resolved once and memoized.
+    Raises ValueError on a recursive instantiation.
+    """
+    resolved: Dict[str, CellCounts] = {}
+    in_progress = set()
+
+    for root in modules:
+        if root in resolved:
+            continue
+        # Iterative post-order walk so deep hierarchies do not hit the recursion limit
+        stack = [(root, False)]
+        while stack:
+            name, children_done = stack.pop()
+            if name in resolved:
+                continue
+            if children_done:
+                leaves: CellCounts = {}
+                for cell_type, count in modules[name].items():
+                    if cell_type in modules:
+                        for leaf, leaf_count in resolved[cell_type].items():
+                            leaves[leaf] = leaves.get(leaf, 0) + count * leaf_count
+                    else:
+                        leaves[cell_type] = leaves.get(cell_type, 0) + count
+                resolved[name] = leaves
+                in_progress.discard(name)
+                continue
+            if name in in_progress:
+                raise ValueError(f"module '{name}' instantiates itself")
+            in_progress.add(name)
+            stack.append((name, True))
+            for cell_type in modules[name]:
+                if cell_type in modules and cell_type not in resolved:
+                    if cell_type in in_progress:
+                        raise ValueError(f"module '{cell_type}' instantiates itself")
+                    stack.append((cell_type, False))
+
+    return resolved
+
+
+def design_counts(modules: Dict[str, CellCounts], top: Optional[str] = None) -> CellCounts:
+    """Leaf-cell counts of the whole design rooted at top (default: the detected top)."""
+    if not modules:
+        return {}
+    top = top or find_top(modules)
+    return resolve_hierarchy(modules)[top]
+
+
+def load_module_counts(path: str) -> Tuple[Dict[str, CellCounts], Optional[str]]:
+    """Per-module cell counts and top module of a Yosys JSON or Verilog netlist.
+
+    A Verilog netlist is read through the Yosys JSON netlist next to it when
+    that one is up to date, and scanned otherwise.
+    """
+    from netlist_graph import load_netlist, sibling_json
+    json_file = path if path.endswith('.json') else sibling_json(path)
+    if json_file:
+        graph = load_netlist(json_file)
+        top = graph.top
+        return graph.module_type_counts(), top.name if top else None
+    from netlist_scanner import scan_netlist
+    modules = scan_netlist(path)
+    return modules, find_top(modules)
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Resolve per-module leaf-cell statistics of hierarchical netlists")
+    parser.add_argument("netlists", nargs="+", help="Yosys JSON or Verilog netlists")
+    parser.add_argument("--module", help="Only report this module")
+    args = parser.parse_args()
+
+    for path in args.netlists:
+        try:
+            modules, top = load_module_counts(path)
+            resolved = resolve_hierarchy(modules)
+        except (OSError, ValueError) as e:
+            print(f"Error: {path}: {e}")
+            sys.exit(1)
+        print(f"{path}: {len(modules)} modules, top {top}")
+        for name, leaves in resolved.items():
+            if args.module and name != args.module:
+                continue
+            marker = " (top)" if name == top else ""
+            print(f"   {name}{marker}: {sum(leaves.values())} leaf cells")
+            for cell_type, count in sorted(leaves.items()):
+                print(f"      {cell_type:30} {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Netlist Cell Semantics
+
+Describes the Boolean function of every supported netlist cell once, over an
+abstract LogicBuilder, so that formal engines (BDDs, SAT/CNF encodings,
+and-inverter graphs) build a design from the same definitions instead of
+re-implementing each cell type. WordBuilder evaluates the same
+definitions bit-parallel over integer words, for random simulation, fault
+simulation and LUT truth tables.
+
+Supported cells: the Yosys internal gates ($_AND_, $_MUX_, ...), $lut and
+Xilinx LUT1-LUT6, vendor buffers and inverters, and the word-level cells
+Yosys leaves in RTL netlists after prep ($not, $and, $or, $xor, $xnor,
+$reduce_*, $logic_*, $eq, $ne, $add, $sub, $neg, $mux), so that RTL and
+synthesized netlists can be compared. Designs are flattened with the
+simulator's flatten/levelize; flip-flop and latch outputs become free
+inputs, and x/z constants read as 0, as in simulation.
+"""
+
+import random
+from typing import Dict, List, Optional, Tuple
+
+from netlist_graph import NetlistGraph, gate_family
+from netlist_sim import (LUT_PRIMITIVES, VENDOR_BUFFERS, VENDOR_INVERTERS, flatten, levelize,
+                         param_int)
+
+
+class LogicBuilder:
+    """Boolean operations over one representation of signals.
+
+    Subclasses provide zero, one, new_input, not_, and_ and xor; the other
+    operations default to compositions of those.
+    """
+
+    zero = None
+    one = None
+
+    def new_input(self):
+        raise NotImplementedError
+
+    def not_(self, a):
+        raise NotImplementedError
+
+    def and_(self, a, b):
+        raise NotImplementedError
+
+    def xor(self, a, b):
+        raise NotImplementedError
+
+    def or_(self, a, b):
+        return self.not_(self.and_(self.not_(a), self.not_(b)))
+
+    def xnor(self, a, b):
+        return self.not_(self.xor(a, b))
+
+    def mux(self, select, high, low):
+        """select ? high : low"""
+        if high == low:
+            return high
+        return self.or_(self.and_(select, high), self.and_(self.not_(select), low))
+
+    def lut(self, table: int, inputs: List):
+        """Truth table lookup with inputs[0] as the least significant index bit."""
+        def build(offset: int, k: int):
+            if k == 0:
+                return self.one if (table >> offset) & 1 else self.zero
+            low = build(offset, k - 1)
+            high = build(offset + (1 << (k - 1)), k - 1)
+            return self.mux(inputs[k - 1], high, low)
+
+        return build(0, len(inputs))
+
+    def reduce_and(self, bits: List):
+        result = self.one
+        for bit in bits:
+            result = self.and_(result, bit)
+        return result
+
+    def reduce_or(self, bits: List):
+        result = self.zero
+        for bit in bits:
+            result = self.or_(result, bit)
+        return result
+
+    def reduce_xor(self, bits: List):
+        result = self.zero
+        for bit in bits:
+            result = self.xor(result, bit)
+        return result
+
+    def add(self, a: List, b: List, carry) -> List:
+        """Ripple sum of two equal-width operands."""
+        total = []
+        for x, y in zip(a, b):
+            half = self.xor(x, y)
+            total.append(self.xor(half, carry))
+            carry = self.or_(self.and_(x, y), self.and_(half, carry))
+        return total
+
+
+class WordBuilder(LogicBuilder):
+    """Bit-parallel logic: signals are words with one pattern per bit under an all-ones mask.
+
+    Inputs come from rng as random words when one is given; otherwise
+    callers supply the input words themselves (exhaustive truth tables,
+    fault-simulation patterns).
+    """
+
+    def __init__(self, mask: int, rng: Optional[random.Random] = None):
+        self.zero = 0
+        self.one = mask
+        self.rng = rng
+
+    def new_input(self) -> int:
+        if self.rng is None:
+            raise ValueError("WordBuilder inputs are supplied by the caller without an rng")
+        return self.rng.getrandbits(self.one.bit_length())
+
+    def not_(self, a: int) -> int:
+        return a ^ self.one
+
+    def and_(self, a: int, b: int) -> int:
+        return a & b
+
+    def or_(self, a: int, b: int) -> int:
+        return a | b
+
+    def xor(self, a: int, b: int) -> int:
+        return a ^ b
+
+
+def _gate(b: LogicBuilder, family: str, pins: Dict):
+    """Output of a single-bit Yosys internal gate."""
+    A, B, C, D, S = (pins.get(p, b.zero) for p in 'ABCDS')
+    if family == 'BUF':
+        return A
+    if family == 'NOT':
+        return b.not_(A)
+    if family == 'AND':
+        return b.and_(A, B)
+    if family == 'NAND':
+        return b.not_(b.and_(A, B))
+    if family == 'OR':
+        return b.or_(A, B)
+    if family == 'NOR':
+        return b.not_(b.or_(A, B))
+    if family == 'XOR':
+        return b.xor(A, B)
+    if family == 'XNOR':
+        return b.xnor(A, B)
+    if family == 'ANDNOT':
+        return b.and_(A, b.not_(B))
+    if family == 'ORNOT':
+        return b.or_(A, b.not_(B))
+    if family == 'MUX':
+        return b.mux(S, B, A)
+    if family == 'NMUX':
+        return b.not_(b.mux(S, B, A))
+    if family == 'AOI3':
+        return b.not_(b.or_(b.and_(A, B), C))
+    if family == 'OAI3':
+        return b.not_(b.and_(b.or_(A, B), C))
+    if family == 'AOI4':
+        return b.not_(b.or_(b.and_(A, B), b.and_(C, D)))
+    if family == 'OAI4':
+        return b.not_(b.and_(b.or_(A, B), b.or_(C, D)))
+    return None
+
+
+def _extend(b: LogicBuilder, bits: List, width: int, signed: bool) -> List:
+    """Operand truncated or extended (zero or sign) to width bits."""
+    if len(bits) >= width:
+        return bits[:width]
+    fill = bits[-1] if signed and bits else b.zero
+    return bits + [fill] * (width - len(bits))
+
+
+def cell_outputs(b: LogicBuilder, type_name: str, params: Dict, inputs: Dict[str, List]) -> Dict[str, List]:
+    """Output signals of one leaf cell (pin -> bits, bit 0 first) for its input signals.
+
+    Raises ValueError for cell types without a Boolean definition here.
+    """
+    family = gate_family(type_name)
+    if family is not None:
+        output = _gate(b, family, {pin: bits[0] for pin, bits in inputs.items() if bits})
+        if output is not None:
+            return {'Y': [output]}
+
+    if type_name == '$lut':
+        return {'Y': [b.lut(param_int(params.get('LUT', 0)), inputs.get('A', []))]}
+    if type_name in LUT_PRIMITIVES:
+        pins = [inputs.get(f'I{i}', [b.zero])[0] for i in range(LUT_PRIMITIVES[type_name])]
+        return {'O': [b.lut(param_int(params.get('INIT', 0)), pins)]}
+    if type_name in VENDOR_BUFFERS:
+        return {'O': inputs.get('I', [b.zero])[:1]}
+    if type_name in VENDOR_INVERTERS:
+        return {'O': [b.not_(inputs.get('I', [b.zero])[0])]}
+
+    # Word-level cells (RTL netlists after prep)
+    A, B = inputs.get('A', []), inputs.get('B', [])
+    width = param_int(params.get('Y_WIDTH', 1))
+    a_signed = bool(param_int(params.get('A_SIGNED', 0)))
+    both_signed = a_signed and bool(param_int(params.get('B_SIGNED', 0)))
+
+    if type_name in ('$not', '$pos', '$neg'):
+        a = _extend(b, A, width, a_signed)
+        if type_name == '$pos':
+            return {'Y': a}
+        inverted = [b.not_(bit) for bit in a]
+        if type_name == '$not':
+            return {'Y': inverted}
+        return {'Y': b.add(inverted, [b.zero] * width, b.one)}
+    if type_name in ('$and', '$or', '$xor', '$xnor'):
+        op = {'$and': b.and_, '$or': b.or_, '$xor': b.xor, '$xnor': b.xnor}[type_name]
+        a, bb = _extend(b, A, width, both_signed), _extend(b, B, width, both_signed)
+        return {'Y': [op(x, y) for x, y in zip(a, bb)]}
+    if type_name in ('$add', '$sub'):
+        a, bb = _extend(b, A, width, both_signed), _extend(b, B, width, both_signed)
+        if type_name == '$sub':
+            return {'Y': b.add(a, [b.not_(bit) for bit in bb], b.one)}
+        return {'Y': b.add(a, bb, b.zero)}
+    if type_name in ('$reduce_and', '$reduce_or', '$reduce_xor', '$reduce_xnor', '$reduce_bool',
+                     '$logic_not', '$logic_and', '$logic_or', '$eq', '$ne', '$eqx', '$nex'):
+        if type_name == '$reduce_and':
+            bit = b.reduce_and(A)
+        elif type_name in ('$reduce_or', '$reduce_bool'):
+            bit = b.reduce_or(A)
+        elif type_name == '$reduce_xor':
+            bit = b.reduce_xor(A)
+        elif type_name == '$reduce_xnor':
+            bit = b.not_(b.reduce_xor(A))
+        elif type_name == '$logic_not':
+            bit = b.not_(b.reduce_or(A))
+        elif type_name == '$logic_and':
+            bit = b.and_(b.reduce_or(A), b.reduce_or(B))
+        elif type_name == '$logic_or':
+            bit = b.or_(b.reduce_or(A), b.reduce_or(B))
+        else:
+            size = max(len(A), len(B))
+            a, bb = _extend(b, A, size, both_signed), _extend(b, B, size, both_signed)
+            bit = b.reduce_and([b.xnor(x, y) for x, y in zip(a, bb)])
+            if type_name in ('$ne', '$nex'):
+                bit = b.not_(bit)
+        return {'Y': [bit] + [b.zero] * (width - 1)}
+    if type_name == '$mux':
+        select = inputs.get('S', [b.zero])[0]
+        return {'Y': [b.mux(select, y, x) for x, y in zip(A, B)]}
+
+    raise ValueError(f"unsupported cell type '{type_name}'")
+
+
+def build_design(b: LogicBuilder, graph: NetlistGraph, top: Optional[str] = None,
+                 inputs: Optional[Dict[str, List]] = None) -> Tuple[Dict[str, List], Dict[str, List]]:
+    """Build a design with a builder; returns its input and output port signals.
+
+    inputs gives signals for some input ports (bit 0 first); other input
+    bits, and the outputs of state-holding cells, become new builder inputs.
+    """
+    module = graph.modules[top] if top else graph.top
+    if module is None:
+        raise ValueError("netlist has no modules")
+    cells, net_count = flatten(graph, module)
+    order, state_nets = levelize(cells, net_count, module.name)
+
+    values: List = [None] * net_count
+    values[0], values[1], values[2], values[3] = b.zero, b.one, b.zero, b.zero
+    port_signals: Dict[str, List] = {}
+    for port, nets in module.port_nets('input').items():
+        given = (inputs or {}).get(port, [])
+        signals = [given[i] if i < len(given) else b.new_input() for i in range(len(nets))]
+        port_signals[port] = signals
+        for net, signal in zip(nets, signals):
+            values[net] = signal
+    for net in state_nets:
+        values[net] = b.new_input()
+
+    def read(nets: List[int]) -> List:
+        return [b.zero if values[net] is None else values[net] for net in nets]
+
+    for index in order:
+        type_name, params, cell_inputs, cell_outputs_ = cells[index]
+        results = cell_outputs(b, type_name, params, {pin: read(nets) for pin, nets in cell_inputs.items()})
+        for pin, nets in cell_outputs_.items():
+            for net, signal in zip(nets, results.get(pin, [])):
+                values[net] = signal
+
+    outputs = {port: read(nets) for port, nets in module.port_nets('output').items()}
+    return port_signals, outputs
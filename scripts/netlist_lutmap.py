@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Cut-Enumeration K-LUT Mapper
+
+Estimates the LUTs an FPGA flow needs for a synthesized netlist by mapping
+it onto K-input LUTs, instead of charging one LUT per gate. The netlist is
+flattened and levelized once (netlist_sim); buffers are folded into their
+drivers and constants into the LUTs reading them. Every gate output is a
+node, and the mapper enumerates priority cuts over the nodes in topological
+order: the K-feasible cuts of a node are merged from the cuts of its fanins,
+dominated cuts are dropped and only the CUTS_PER_NODE best are kept, so
+enumeration is linear in the size of the design.
+
+The first pass picks for each node the cut of least depth (then least area
+flow), which gives the minimum LUT depth; area-recovery passes then pick the
+cut of least area flow among those that keep every node on time (in area
+mode, without the depth bound). The LUT count is the number of nodes in the
+cover reached from the outputs.
+
+K is configurable: 6 for Xilinx 7-series LUT6, 4 for iCE40 LUT4. The mapped
+design can be written as a Yosys JSON netlist of $lut cells (truth tables
+computed through netlist_logic), which the simulator, equivalence checker and
+timing analysis read like any other netlist.
+
+Usage:
+    python scripts/netlist_lutmap.py NETLIST.json [--k 6 | --arch xilinx|ice40] [--area] [--write OUT.json]
+"""
+
+import sys
+import json
+import time
+import argparse
+import itertools
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from netlist_graph import FIRST_NET, NetlistGraph, gate_family, is_sequential, load_netlist
+from netlist_logic import WordBuilder, cell_outputs
+from netlist_sim import VENDOR_BUFFERS, LeafCell, exhaustive_words, flatten, levelize
+
+# LUT inputs per architecture
+LUT_SIZES = {'xilinx': 6, 'ice40': 4}
+DEFAULT_K = LUT_SIZES['xilinx']
+
+# Priority cuts kept per node
+CUTS_PER_NODE = 8
+
+# Area-recovery passes after the depth-oriented pass
+AREA_PASSES = 2
+
+Cut = FrozenSet[int]
+
+# Default for dict.get over the leaves of a cut
+_ZEROS = itertools.repeat(0)
+
+
+class LutMapping:
+    """K-LUT cover of one design: LUT roots with their leaves, LUT count and depth."""
+
+    __slots__ = ('name', 'k', 'module', 'cells', 'alias', 'nodes', 'node_cell', 'fanins', 'fanout',
+                 'cuts', 'best', 'depth', 'flow', 'roots', 'luts')
+
+    def __init__(self, graph: NetlistGraph, top: Optional[str] = None, k: int = DEFAULT_K,
+                 cuts_per_node: int = CUTS_PER_NODE, area: bool = False):
+        module = graph.modules[top] if top else graph.top
+        if module is None:
+            raise ValueError("netlist has no modules")
+        if k < 2:
+            raise ValueError("LUTs need at least 2 inputs")
+        self.name = module.name
+        self.k = k
+        self.module = module
+        self.cells, net_count = flatten(graph, module)
+        order, _ = levelize(self.cells, net_count, module.name)
+
+        # Nodes: outputs of combinational cells, in topological order; buffers alias their input
+        self.alias = list(range(net_count))
+        self.nodes: List[int] = []
+        self.node_cell: Dict[int, int] = {}
+        self.fanins: Dict[int, Tuple[int, ...]] = {}
+        for index in order:
+            type_name, _, inputs, outputs = self.cells[index]
+            out_nets = [net for nets in outputs.values() for net in nets]
+            in_nets = [self.alias[net] for nets in inputs.values() for net in nets]
+            if gate_family(type_name) == 'BUF' or type_name in VENDOR_BUFFERS:
+                for net in out_nets:
+                    self.alias[net] = in_nets[0] if in_nets else 0
+                continue
+            if len(out_nets) != 1:
+                raise ValueError(f"cannot map {type_name} cell with {len(out_nets)} output bits")
+            fanins = tuple(dict.fromkeys(net for net in in_nets if net >= FIRST_NET))
+            if len(fanins) > k:
+                raise ValueError(f"{type_name} cell has {len(fanins)} inputs, more than K={k}")
+            self.nodes.append(out_nets[0])
+            self.node_cell[out_nets[0]] = index
+            self.fanins[out_nets[0]] = fanins
+
+        # Mapping roots: output ports and state-holding cell inputs
+        roots = [net for nets in module.port_nets('output').values() for net in nets]
+        for type_name, _, inputs, _ in self.cells:
+            if is_sequential(type_name):
+                roots.extend(net for nets in inputs.values() for net in nets)
+        self.roots = [self.alias[net] for net in roots if self.alias[net] in self.node_cell]
+
+        self.fanout = dict.fromkeys(self.nodes, 0)
+        for fanins in self.fanins.values():
+            for net in fanins:
+                if net in self.fanout:
+                    self.fanout[net] += 1
+        for net in self.roots:
+            self.fanout[net] += 1
+
+        self.cuts: Dict[int, List[Cut]] = {}
+        self.best: Dict[int, Cut] = {}
+        self.depth: Dict[int, int] = {}
+        self.flow: Dict[int, float] = {}
+        self._enumerate(cuts_per_node)
+        self.luts = self._cover()
+
+        # Area recovery under the depth of the depth-oriented mapping (no bound for area mode)
+        target = float('inf') if area else self.lut_depth
+        for _ in range(AREA_PASSES):
+            previous = dict(self.best)
+            self._recover_area(self._required(target))
+            luts = self._cover()
+            if self._cover_depth(luts) > target or len(luts) >= len(self.luts):
+                self.best = previous
+                self._update_costs()
+                break
+            self.luts = luts
+
+    def _cost(self, cut: Cut) -> Tuple[int, float]:
+        """Depth and area flow of a node implemented by one LUT over a cut (inputs cost nothing)."""
+        return (1 + max(map(self.depth.get, cut, _ZEROS), default=0),
+                1.0 + sum(map(self.flow.get, cut, _ZEROS)))
+
+    def _set_best(self, node: int, cut: Cut, cost: Tuple[int, float]):
+        self.best[node] = cut
+        # Area flow is shared among the fanouts of the node
+        self.depth[node], self.flow[node] = cost[0], cost[1] / max(self.fanout[node], 1)
+
+    def _enumerate(self, cuts_per_node: int):
+        """Priority cuts of every node, best (least depth, then area flow) first."""
+        k = self.k
+        for node in self.nodes:
+            partial: List[Cut] = [frozenset()]
+            for fanin in self.fanins[node]:
+                options = self.cuts.get(fanin, []) + [frozenset((fanin,))]
+                merged = set()
+                for p in partial:
+                    for c in options:
+                        cut = p | c
+                        if len(cut) <= k:
+                            merged.add(cut)
+                partial = sorted(merged, key=len)[:4 * cuts_per_node] if len(merged) > 4 * cuts_per_node \
+                    else list(merged)
+            costs = {cut: self._cost(cut) for cut in partial}
+            ranked = sorted(partial, key=lambda cut: (*costs[cut], len(cut)))
+            kept: List[Cut] = []
+            for cut in ranked:
+                # A subset never ranks worse, so dominating cuts are already kept
+                if not any(other <= cut for other in kept):
+                    kept.append(cut)
+                    if len(kept) == cuts_per_node:
+                        break
+            self.cuts[node] = kept
+            self._set_best(node, kept[0], costs[kept[0]])
+
+    def _update_costs(self):
+        for node in self.nodes:
+            self._set_best(node, self.best[node], self._cost(self.best[node]))
+
+    def _required(self, target: int) -> Dict[int, float]:
+        """Latest LUT level of each node in the current cover that meets the target depth."""
+        required = {node: float('inf') for node in self.nodes}
+        for net in self.roots:
+            required[net] = target
+        for node in reversed(self.nodes):
+            if node in self.luts:
+                for leaf in self.best[node]:
+                    if leaf in required:
+                        required[leaf] = min(required[leaf], required[node] - 1)
+        return required
+
+    def _recover_area(self, required: Dict[int, float]):
+        """Pick the least area-flow cut of each node that meets its required level."""
+        for node in self.nodes:
+            choices = [(self._cost(cut), cut) for cut in self.cuts[node]]
+            on_time = [choice for choice in choices if choice[0][0] <= required[node]] or choices
+            cost, cut = min(on_time, key=lambda choice: (choice[0][1], choice[0][0], len(choice[1])))
+            self._set_best(node, cut, cost)
+
+    def _cover(self) -> Dict[int, Cut]:
+        """LUTs (root net -> leaves) needed to implement the mapping roots."""
+        luts: Dict[int, Cut] = {}
+        stack = list(self.roots)
+        while stack:
+            node = stack.pop()
+            if node in luts:
+                continue
+            luts[node] = self.best[node]
+            stack.extend(leaf for leaf in luts[node] if leaf in self.node_cell and leaf not in luts)
+        return luts
+
+    def _cover_depth(self, luts: Dict[int, Cut]) -> int:
+        levels: Dict[int, int] = {}
+        for node in self.nodes:
+            if node in luts:
+                levels[node] = 1 + max((levels.get(leaf, 0) for leaf in luts[node]), default=0)
+        return max(levels.values(), default=0)
+
+    @property
+    def lut_count(self) -> int:
+        return len(self.luts)
+
+    @property
+    def lut_depth(self) -> int:
+        return self._cover_depth(self.luts)
+
+    def lut_sizes(self) -> Dict[int, int]:
+        """Number of LUTs per input count."""
+        sizes: Dict[int, int] = {}
+        for leaves in self.luts.values():
+            sizes[len(leaves)] = sizes.get(len(leaves), 0) + 1
+        return dict(sorted(sizes.items()))
+
+    def truth_table(self, root: int, leaves: List[int]) -> int:
+        """Truth table of a node over leaves (leaves[0] is the LSB of the table index)."""
+        words, mask = exhaustive_words(len(leaves))
+        builder = WordBuilder(mask)
+        values = {0: 0, 1: mask, 2: 0, 3: 0}
+        values.update(zip(leaves, words))
+
+        # Cone between the leaves and the root, evaluated in topological order
+        cone = set()
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node in values or node in cone:
+                continue
+            cone.add(node)
+            stack.extend(self.fanins[node])
+        for node in self.nodes:
+            if node in cone:
+                type_name, params, inputs, outputs = self.cells[self.node_cell[node]]
+                signals = {pin: [values.get(self.alias[net], 0) for net in nets] for pin, nets in inputs.items()}
+                results = cell_outputs(builder, type_name, params, signals)
+                pin = next(iter(outputs))
+                values[node] = results[pin][0]
+        return values[root]
+
+    def lut_cells(self) -> List[LeafCell]:
+        """The cover as $lut cells (LUT parameter and WIDTH as in Yosys)."""
+        cells = []
+        for root, cut in self.luts.items():
+            leaves = sorted(cut)
+            table = self.truth_table(root, leaves)
+            cells.append(('$lut', {'LUT': table, 'WIDTH': len(leaves)}, {'A': leaves}, {'Y': [root]}))
+        return cells
+
+    def to_json(self) -> Dict:
+        """The mapped design as a Yosys JSON netlist of $lut and state-holding cells."""
+        def bits(nets: List[int]) -> List:
+            return [str(self.alias[net]) if self.alias[net] < 2 else self.alias[net] for net in nets]
+
+        def binary(value: int, width: int) -> str:
+            return format(value, f'0{width}b')
+
+        cells = {}
+        for index, (type_name, params, inputs, outputs) in enumerate(self.lut_cells()):
+            cells[f"lut{index}"] = {
+                'type': type_name,
+                'parameters': {'LUT': binary(params['LUT'], 1 << params['WIDTH']),
+                               'WIDTH': binary(params['WIDTH'], 32)},
+                'port_directions': {'A': 'input', 'Y': 'output'},
+                'connections': {'A': bits(inputs['A']), 'Y': bits(outputs['Y'])},
+            }
+        for index, (type_name, params, inputs, outputs) in enumerate(self.cells):
+            if is_sequential(type_name):
+                directions = {**{pin: 'input' for pin in inputs}, **{pin: 'output' for pin in outputs}}
+                cells[f"state{index}"] = {
+                    'type': type_name,
+                    'parameters': {name: value if isinstance(value, str) else binary(value, 32)
+                                   for name, value in params.items()},
+                    'port_directions': directions,
+                    'connections': {pin: bits(nets) for pin, nets in {**inputs, **outputs}.items()},
+                }
+        ports = {name: {'direction': direction, 'bits': bits(nets)}
+                 for name, (direction, nets) in self.module.ports.items()}
+        return {
+            'creator': f"netlist_lutmap.py (K={self.k})",
+            'modules': {self.name: {'attributes': {'top': '00000000000000000000000000000001'},
+                                    'ports': ports, 'cells': cells, 'netnames': {}}},
+        }
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Map Yosys JSON netlists onto K-input LUTs")
+    parser.add_argument("netlists", nargs="+", help="Yosys write_json netlists")
+    parser.add_argument("--top", help="Module to map (default: the netlist top)")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--k", type=int, help=f"LUT inputs (default: {DEFAULT_K})")
+    group.add_argument("--arch", choices=sorted(LUT_SIZES), help="Target LUT architecture")
+    parser.add_argument("--cuts", type=int, default=CUTS_PER_NODE, help="Priority cuts kept per node")
+    parser.add_argument("--area", action="store_true", help="Minimize LUTs instead of LUT depth")
+    parser.add_argument("--write", metavar="OUT.json", help="Write the mapped netlist (one input netlist)")
+    args = parser.parse_args()
+
+    if args.write and len(args.netlists) != 1:
+        parser.error("--write needs exactly one netlist")
+    k = args.k or LUT_SIZES.get(args.arch, DEFAULT_K)
+    for path in args.netlists:
+        start = time.perf_counter()
+        try:
+            mapping = LutMapping(load_netlist(path), args.top, k, args.cuts, args.area)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error: {path}: {e}")
+            sys.exit(1)
+        elapsed = time.perf_counter() - start
+        sizes = ", ".join(f"{count} LUT{size}" for size, count in mapping.lut_sizes().items())
+        print(f"{path}: {mapping.name}, {len(mapping.nodes)} gates -> {mapping.lut_count} LUTs "
+              f"(K={k}), depth {mapping.lut_depth} [{sizes}] in {elapsed * 1e3:.1f} ms")
+        if args.write:
+            with open(args.write, 'w') as f:
+                json.dump(mapping.to_json(), f, indent=2)
+            print(f"Mapped netlist written to {args.write}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Activity-Based Power Estimation
+
+Estimates dynamic and leakage power of a synthesized Yosys JSON netlist per
+net and per design. Dynamic power of a net is its toggle rate times the
+switching energy 0.5 * C * V^2 of its load: the input pin capacitance of
+every cell reading it, plus OUTPUT_LOAD_FF on output ports. Leakage is
+summed over all cells. Capacitance, leakage and supply voltage come from a
+pluggable PowerModel: a generic gate cost table (ASIC_*) or a Liberty
+library (liberty_reader; smallest cell per gate family, as in the timing
+model).
+
+Switching activity comes from either source:
+
+- Simulation: VCD dumps of the SV or cocotb benches, or SV bench vector
+  files, are streamed step by step (netlist_fault.vcd_steps) and simulated
+  WORD_PATTERNS steps at a time, one bit per step in each net's word; a
+  net's toggles are the bit changes between consecutive steps. Memory use
+  does not grow with the length of the dump, so hour-long simulations can be
+  annotated. The rate divides by the dumped time span (vector files: one
+  step per --period).
+- Statistics: each net's signal probability p is measured by simulating
+  every combination of the switching inputs (random samples above
+  MAX_EXHAUSTIVE_INPUTS bits), and with temporally independent inputs
+  applied once per clock period it toggles 2p(1-p) times per cycle.
+
+Activity is zero-delay: glitches (netlist_glitch) are not included.
+Inputs outside the columns (clk_i, reset_n_i) are held as the benches drive
+them in statistical mode, and flip-flops are evaluated as scanned (outputs
+at 0), as in netlist_fault.
+
+Usage:
+    python scripts/netlist_power.py NETLIST.json [...] [--stimulus WAVE.vcd|VECTORS.txt ...]
+                                    [--model asic|liberty] [--period NS] [--nets N]
+"""
+
+import sys
+import json
+import time
+import argparse
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from liberty_reader import DEFAULT_LIBRARY, load_liberty
+from netlist_atpg import HELD_INPUTS
+from netlist_fault import (DEFAULT_COLUMNS, MAX_EXHAUSTIVE_INPUTS, WORD_PATTERNS, FaultSimulator, vcd_steps,
+                           vector_file)
+from netlist_graph import FIRST_NET, NetlistGraph, gate_family, load_netlist
+from netlist_sim import exhaustive_words, flatten, random_words
+from vcd_reader import VCDFile
+
+# Generic static CMOS switching model: input pin capacitance (fF) and leakage (nW) per gate family
+ASIC_PIN_CAP_FF = {
+    'BUF': 1.0, 'NOT': 1.0, 'NAND': 1.2, 'NOR': 1.4, 'AND': 1.5, 'OR': 1.5, 'ANDNOT': 1.5, 'ORNOT': 1.5,
+    'XOR': 1.7, 'XNOR': 1.7, 'MUX': 1.8, 'NMUX': 1.8, 'AOI3': 1.4, 'OAI3': 1.4, 'AOI4': 1.5, 'OAI4': 1.5,
+    'DFF': 1.7,
+}
+ASIC_LEAKAGE_NW = {
+    'BUF': 0.015, 'NOT': 0.015, 'NAND': 0.02, 'NOR': 0.02, 'AND': 0.025, 'OR': 0.025, 'ANDNOT': 0.025,
+    'ORNOT': 0.025, 'XOR': 0.03, 'XNOR': 0.03, 'MUX': 0.03, 'NMUX': 0.03, 'AOI3': 0.025, 'OAI3': 0.025,
+    'AOI4': 0.03, 'OAI4': 0.03, 'DFF': 0.08,
+}
+ASIC_VDD = 1.2
+
+# External load on each output port bit (fF)
+OUTPUT_LOAD_FF = 5.0
+
+# Clock period (ns) for statistical activity and vector files
+CLOCK_PERIOD_NS = 10.0
+
+# Random patterns measuring signal probabilities above MAX_EXHAUSTIVE_INPUTS switching bits
+PROBABILITY_PATTERNS = 4096
+
+# Nets listed per design by default
+NET_LIMIT = 10
+
+
+class PowerModel:
+    """Input pin capacitance, cell leakage and supply voltage; subclasses override the figures."""
+
+    voltage = ASIC_VDD
+
+    def pin_capacitance(self, type_name: str, pin: str) -> float:
+        """Capacitance (fF) of one input pin."""
+        raise NotImplementedError
+
+    def leakage(self, type_name: str) -> float:
+        """Leakage power (nW) of one cell."""
+        return 0.0
+
+
+class GatePowerModel(PowerModel):
+    """Table capacitance and leakage per gate family."""
+
+    def __init__(self, capacitance: Dict[str, float], leakage: Dict[str, float], voltage: float,
+                 default_capacitance: float = 0.0, default_leakage: float = 0.0):
+        self.capacitance = capacitance
+        self._leakage = leakage
+        self.voltage = voltage
+        self.default_capacitance = default_capacitance
+        self.default_leakage = default_leakage
+
+    def pin_capacitance(self, type_name: str, pin: str) -> float:
+        return self.capacitance.get(gate_family(type_name) or type_name, self.default_capacitance)
+
+    def leakage(self, type_name: str) -> float:
+        return self._leakage.get(gate_family(type_name) or type_name, self.default_leakage)
+
+
+def asic_power_model() -> GatePowerModel:
+    """Generic static CMOS gate capacitance and leakage."""
+    return GatePowerModel(ASIC_PIN_CAP_FF, ASIC_LEAKAGE_NW, ASIC_VDD, default_capacitance=1.5,
+                          default_leakage=0.025)
+
+
+class LibertyPowerModel(PowerModel):
+    """Pin capacitance and leakage of the smallest library cell of each gate family (liberty_reader)."""
+
+    def __init__(self, library):
+        self.library = library
+        self.cells = library.gate_cells()
+        self.voltage = library.voltage or ASIC_VDD
+        self.average_capacitance = library.average_input_capacitance()
+
+    def _cell(self, type_name: str):
+        cell = self.cells.get(gate_family(type_name) or '') or self.library.cells.get(type_name)
+        if cell is None:
+            raise ValueError(f"no cell in library '{self.library.name}' for '{type_name}'")
+        return cell
+
+    def pin_capacitance(self, type_name: str, pin: str) -> float:
+        library_pin = self._cell(type_name).pins.get(pin)
+        capacitance = library_pin.capacitance if library_pin else self.average_capacitance
+        return capacitance * self.library.capacitance_pf * 1e3
+
+    def leakage(self, type_name: str) -> float:
+        return self._cell(type_name).leakage * self.library.leakage_nw
+
+
+def liberty_power_model(path: str = DEFAULT_LIBRARY) -> LibertyPowerModel:
+    """Capacitance and leakage from a Liberty library (default: the bundled generic library)."""
+    return LibertyPowerModel(load_liberty(path))
+
+
+POWER_MODELS = {'asic': asic_power_model, 'liberty': liberty_power_model}
+
+
+class PowerAnalysis:
+    """Net loads and cell leakage of one design, with activity from simulation or statistics."""
+
+    __slots__ = ('sim', 'model', 'capacitance', 'leakage', 'columns', 'held')
+
+    def __init__(self, graph: NetlistGraph, top: Optional[str] = None, model: Optional[PowerModel] = None,
+                 columns: Optional[Sequence[str]] = None):
+        self.sim = sim = FaultSimulator(graph, top)
+        self.model = model or asic_power_model()
+        if columns is None:
+            columns = DEFAULT_COLUMNS if set(DEFAULT_COLUMNS) <= sim.inputs.keys() else list(sim.inputs)
+        missing = [port for port in columns if port not in sim.inputs]
+        if missing:
+            raise ValueError(f"{sim.name} has no input port {', '.join(missing)}")
+        self.columns = list(columns)
+        self.held = {port: HELD_INPUTS.get(port, 0) for port in sim.inputs if port not in self.columns}
+
+        # Load of each net (fF) and leakage (nW) over every leaf cell, flip-flops included
+        cells, _ = flatten(graph, graph.modules[sim.name])
+        self.capacitance = [0.0] * sim.net_count
+        self.leakage = 0.0
+        for type_name, _, inputs, _ in cells:
+            self.leakage += self.model.leakage(type_name)
+            for pin, nets in inputs.items():
+                load = self.model.pin_capacitance(type_name, pin)
+                for net in nets:
+                    self.capacitance[net] += load
+        for nets in sim.outputs.values():
+            for net in nets:
+                self.capacitance[net] += OUTPUT_LOAD_FF
+
+    @property
+    def nets(self) -> List[int]:
+        """Nets with a load, in order."""
+        return [net for net in range(FIRST_NET, self.sim.net_count) if self.capacitance[net]]
+
+    def toggle_energy(self, net: int) -> float:
+        """Energy (fJ) of one transition of a net."""
+        return 0.5 * self.capacitance[net] * self.model.voltage ** 2
+
+    def count_toggles(self, vectors: Iterable[Dict[str, int]],
+                      word_patterns: int = WORD_PATTERNS) -> Tuple[List[int], int]:
+        """Toggles of every net between consecutive input vectors, streamed one word at a time; vector count."""
+        sim = self.sim
+        toggles = [0] * sim.net_count
+        last: Optional[List[int]] = None
+        count = 0
+        chunk: List[Dict[str, int]] = []
+
+        def flush():
+            nonlocal last
+            values, _ = sim.good_values(sim.patterns(chunk, unique=False))
+            top = len(chunk) - 1
+            inner = (1 << top) - 1
+            for net in range(FIRST_NET, sim.net_count):
+                word = values[net]
+                changes = bin((word ^ (word >> 1)) & inner).count('1')
+                if last is not None and last[net] != word & 1:
+                    changes += 1
+                toggles[net] += changes
+            last = [(word >> top) & 1 for word in values]
+
+        for vector in vectors:
+            chunk.append(vector)
+            count += 1
+            if len(chunk) == word_patterns:
+                flush()
+                chunk = []
+        if chunk:
+            flush()
+        return toggles, count
+
+    def probabilities(self, patterns: int = PROBABILITY_PATTERNS, seed: Optional[int] = None) -> List[float]:
+        """Signal probability of every net with the switching inputs uniformly random (exhaustive if small)."""
+        sim = self.sim
+        bits = sum(len(sim.inputs[port]) for port in self.columns)
+        if bits <= MAX_EXHAUSTIVE_INPUTS:
+            words, mask = exhaustive_words(bits)
+        else:
+            words, mask = random_words(bits, patterns, seed)
+        count = mask.bit_length()
+        column = iter(words)
+        input_words = []
+        for port, nets in sim.inputs.items():
+            for i in range(len(nets)):
+                if port in self.held:
+                    input_words.append(mask if (self.held[port] >> i) & 1 else 0)
+                else:
+                    input_words.append(next(column))
+        values = sim.evaluate_words(input_words, mask)
+        return [bin(word).count('1') / count for word in values]
+
+    def report(self, rates: Sequence[float], source: str) -> Dict:
+        """Dynamic power per net and totals from toggle rates (toggles per second)."""
+        nets = {}
+        dynamic = 0.0
+        for net in self.nets:
+            # fJ per toggle times toggles per second, in nW
+            power = rates[net] * self.toggle_energy(net) * 1e-6
+            dynamic += power
+            nets[self.sim.net_names.get(net, f'n{net}')] = {
+                'toggle_rate': rates[net],
+                'capacitance_ff': self.capacitance[net],
+                'power_nw': power,
+            }
+        return {
+            'module': self.sim.name,
+            'model': type(self.model).__name__,
+            'voltage': self.model.voltage,
+            'activity': source,
+            'dynamic_nw': dynamic,
+            'leakage_nw': self.leakage,
+            'total_nw': dynamic + self.leakage,
+            'nets': nets,
+        }
+
+    def statistical(self, period_ns: float = CLOCK_PERIOD_NS, seed: Optional[int] = None) -> Dict:
+        """Power with temporally independent random inputs applied once per clock period."""
+        frequency = 1e9 / period_ns
+        rates = [2 * p * (1 - p) * frequency for p in self.probabilities(seed=seed)]
+        return self.report(rates, f"statistical, {frequency / 1e6:g} MHz")
+
+    def simulated(self, paths: Sequence[str], period_ns: float = CLOCK_PERIOD_NS,
+                  scope: Optional[str] = None) -> Dict:
+        """Power with the toggle rates of VCD dumps and vector files, each streamed in one pass."""
+        sim = self.sim
+        toggles = [0] * sim.net_count
+        seconds = 0.0
+        steps = 0
+        for path in paths:
+            if path.endswith('.vcd'):
+                with VCDFile(path) as vcd:
+                    scale = vcd.timescale_seconds
+                span = [None, None]
+
+                def timed(stream: Iterator[Tuple[int, Dict[str, int]]]) -> Iterator[Dict[str, int]]:
+                    for step, vector in stream:
+                        if span[0] is None:
+                            span[0] = step
+                        span[1] = step
+                        yield vector
+
+                counts, count = self.count_toggles(timed(vcd_steps(path, list(sim.inputs), scope)))
+                if count > 1:
+                    seconds += (span[1] - span[0]) * scale
+            else:
+                counts, count = self.count_toggles(vector_file(path, self.columns))
+                seconds += count * period_ns * 1e-9
+            steps += count
+            toggles = [total + added for total, added in zip(toggles, counts)]
+        if not seconds:
+            raise ValueError("stimulus spans no simulated time")
+        rates = [count / seconds for count in toggles]
+        return self.report(rates, f"{steps} steps over {seconds * 1e9:g} ns")
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Activity-based power estimation of Yosys JSON netlists")
+    parser.add_argument("netlists", nargs="+", help="Yosys write_json netlists")
+    parser.add_argument("--top", help="Module to analyze (default: the netlist top)")
+    parser.add_argument("--stimulus", nargs="+", default=[], metavar="FILE",
+                        help="VCD dumps or vector files (default: statistical activity)")
+    parser.add_argument("--model", choices=sorted(POWER_MODELS), default='liberty', help="Capacitance model")
+    parser.add_argument("--liberty", default=DEFAULT_LIBRARY, help="Liberty library for --model liberty")
+    parser.add_argument("--period", type=float, default=CLOCK_PERIOD_NS,
+                        help="Clock period (ns) for statistical activity and vector files")
+    parser.add_argument("--columns", nargs="+", help=f"Switching input ports (default: {' '.join(DEFAULT_COLUMNS)})")
+    parser.add_argument("--scope", help="VCD scope holding the input ports (default: shallowest matching)")
+    parser.add_argument("--seed", type=int, help="Random seed for sampled signal probabilities")
+    parser.add_argument("--nets", type=int, default=NET_LIMIT, help="Nets listed per design")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = []
+    for path in args.netlists:
+        start = time.perf_counter()
+        try:
+            model = liberty_power_model(args.liberty) if args.model == 'liberty' else POWER_MODELS[args.model]()
+            analysis = PowerAnalysis(load_netlist(path), args.top, model, args.columns)
+            if args.stimulus:
+                result = analysis.simulated(args.stimulus, args.period, args.scope)
+            else:
+                result = analysis.statistical(args.period, args.seed)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error: {path}: {e}")
+            sys.exit(1)
+        elapsed = time.perf_counter() - start
+        print(f"{path}: {result['module']} ({result['activity']}, {result['voltage']:g} V): "
+              f"dynamic {result['dynamic_nw']:.2f} nW, leakage {result['leakage_nw']:.3f} nW, "
+              f"total {result['total_nw']:.2f} nW in {elapsed * 1e3:.1f} ms")
+        ranked = sorted(result['nets'].items(), key=lambda item: (-item[1]['power_nw'], item[0]))
+        for name, net in ranked[:args.nets]:
+            print(f"  {name:24} {net['toggle_rate'] / 1e6:9.2f} Mtoggle/s {net['capacitance_ff']:6.2f} fF "
+                  f"{net['power_nw']:8.2f} nW")
+        results.append({'netlist': path, 'seconds': elapsed, **result})
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Streaming Verilog Netlist Scanner
+
+Counts cell instances per module in structural Verilog netlists written by
+Yosys (write_verilog) in a single pass over a memory-mapped file, so netlists
+of any size are scanned in bounded memory.
+
+The scanner works one statement at a time with a single compiled pattern: it
+reads the first two words of the statement and then skips to the terminating
+';' while stepping over comments, attributes, strings and escaped
+identifiers. A statement whose first word is not a keyword and is followed
+by an instance name (or a #(...) parameter list) and a port list is an
+instance, so cell types are only ever matched in instance position - never
+inside identifiers, connections or parameter values.
+
+Usage:
+    python scripts/netlist_scanner.py NETLIST.v [...]
+"""
+
+import re
+import sys
+import mmap
+import argparse
+from typing import Dict
+
+# One statement: leading trivia, first word, second word, body up to ';'
+STATEMENT = re.compile(rb'''
+    (?:\s+|//[^\n]*|/\*.*?\*/|\(\*.*?\*\))*
+    (?P<first>\\\S+|[A-Za-z_][\w$]*)?
+    (?:\s+|/\*.*?\*/|\(\*.*?\*\))*
+    (?P<second>\#|\\\S+|[A-Za-z_][\w$]*)?
+    (?P<open>\s*[(\[])?
+    [^;"/(\\]*(?:(?:"(?:[^"\\]|\\.)*"|//[^\n]*|/\*.*?\*/|\(\*.*?\*\)|\\\S*|[/(])[^;"/(\\]*)*
+    ;
+''', re.S | re.X)
+
+# Keywords that open or close a block without a terminating ';'
+BLOCK_KEYWORDS = frozenset((
+    b'begin', b'end', b'endmodule', b'endcase', b'endgenerate', b'generate', b'else',
+    b'endfunction', b'endtask', b'endspecify', b'specify', b'endprimitive', b'endtable',
+))
+
+# Keywords that start a statement which is never an instance
+STATEMENT_KEYWORDS = frozenset((
+    b'module', b'macromodule', b'input', b'output', b'inout', b'wire', b'reg', b'logic', b'tri',
+    b'supply0', b'supply1', b'assign', b'parameter', b'localparam', b'defparam', b'always',
+    b'initial', b'integer', b'real', b'genvar', b'function', b'task', b'if', b'case', b'casex',
+    b'casez', b'for', b'while', b'repeat', b'forever', b'wait', b'disable', b'force', b'release',
+    b'deassign', b'primitive', b'table', b'time', b'event', b'signed', b'specparam',
+)) | BLOCK_KEYWORDS
+
+# Optional ': label' naming a begin/end block
+BLOCK_LABEL = re.compile(rb'(?:\s+|/\*.*?\*/)*:\s*(?:\\\S+|[A-Za-z_][\w$]*)', re.S)
+
+# Cells found outside any module statement
+NO_MODULE = ''
+
+
+def _name(token: bytes) -> str:
+    """Identifier text without the escaped-identifier backslash."""
+    return (token[1:] if token.startswith(b'\\') else token).decode(errors='replace')
+
+
+def scan_buffer(data) -> Dict[str, Dict[str, int]]:
+    """Cell instance counts per module (module -> cell type -> count) of a netlist buffer."""
+    modules: Dict[str, Dict[str, int]] = {}
+    current = modules.setdefault(NO_MODULE, {})
+    match_statement = STATEMENT.match
+    size = len(data)
+    pos = 0
+    while pos < size:
+        match = match_statement(data, pos)
+        if match is None:
+            break  # Trailing text without a statement (e.g. the last endmodule)
+        first = match.group('first')
+        if first in BLOCK_KEYWORDS:
+            # No ';' follows these; rescan right after the keyword and its label
+            pos = match.end('first')
+            label = BLOCK_LABEL.match(data, pos)
+            if label is not None:
+                pos = label.end()
+            continue
+        pos = match.end()
+        if first is None or match.group('second') is None:
+            continue
+        if first == b'module' or first == b'macromodule':
+            current = modules.setdefault(_name(match.group('second')), {})
+        elif first not in STATEMENT_KEYWORDS and match.group('second') not in STATEMENT_KEYWORDS:
+            if match.group('second') == b'#' or match.group('open') is not None:
+                cell_type = _name(first)
+                current[cell_type] = current.get(cell_type, 0) + 1
+
+    if not modules[NO_MODULE]:
+        del modules[NO_MODULE]
+    return modules
+
+
+def scan_netlist(path: str) -> Dict[str, Dict[str, int]]:
+    """Cell instance counts per module of a Verilog netlist file, in one mmap pass."""
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file
+            return {}
+        try:
+            return scan_buffer(mm)
+        finally:
+            mm.close()
+
+
+def total_counts(modules: Dict[str, Dict[str, int]]) -> Dict[str, int]:
+    """Cell counts per type summed over every module definition (each counted once)."""
+    totals: Dict[str, int] = {}
+    for cells in modules.values():
+        for cell_type, count in cells.items():
+            totals[cell_type] = totals.get(cell_type, 0) + count
+    return totals
+
+
+def instance_counts(modules: Dict[str, Dict[str, int]]) -> Dict[str, int]:
+    """Instances of modules that are defined in the same netlist (hierarchical cells)."""
+    return {cell_type: count for cell_type, count in total_counts(modules).items()
+            if cell_type in modules}
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Count cell instances per module in Verilog netlists")
+    parser.add_argument("netlists", nargs="+", help="Structural Verilog netlists")
+    args = parser.parse_args()
+
+    for path in args.netlists:
+        try:
+            modules = scan_netlist(path)
+        except OSError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"{path}: {len(modules)} modules")
+        for module, cells in modules.items():
+            print(f"   {module or '(no module)':32} {sum(cells.values())} cells")
+            for cell_type, count in sorted(cells.items()):
+                print(f"      {cell_type:30} {count}")
+
+
+if __name__ == "__main__":
+    main()
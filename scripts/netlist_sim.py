@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Bit-Parallel Netlist Simulator
+
+Evaluates synthesized Yosys JSON netlists (flow/yosys/*_synth.json,
+flow/fpga/*_fpga.json) many input patterns at a time. The netlist is
+flattened from the compact netlist graph, levelized once and compiled into
+straight-line Python, one statement per cell. Every net value is a word in
+which bit i belongs to pattern i, and each cell is evaluated with the
+bitwise operators & | ^ over the whole word.
+
+A word is any value supporting those operators: a Python int holds as many
+patterns as it has bits (a 64-bit word, or millions of patterns in one int),
+and NumPy uint64 arrays work unchanged, so the same compiled netlist runs
+64 patterns per machine word either way.
+
+Supported cells: the Yosys internal gates ($_BUF_, $_NOT_, $_AND_, $_NAND_,
+$_OR_, $_NOR_, $_XOR_, $_XNOR_, $_ANDNOT_, $_ORNOT_, $_MUX_, $_NMUX_,
+$_AOI3_, $_OAI3_, $_AOI4_, $_OAI4_), $lut and Xilinx LUT1-LUT6, and
+instances of modules defined in the netlist. Simulation is two-valued: x
+and z constants read as 0, and flip-flop and latch outputs are free state
+inputs (0 unless given).
+
+Usage:
+    python scripts/netlist_sim.py NETLIST.json [--exhaustive | --random N] [--table]
+    python scripts/netlist_sim.py NETLIST.json --compare OTHER.json
+"""
+
+import sys
+import time
+import random
+import argparse
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from netlist_graph import FIRST_NET, Module, NetlistGraph, gate_family, is_sequential, load_netlist
+
+# Gate expressions over the word names of the cell pins; m is all ones
+GATE_EXPRESSIONS = {
+    'BUF': '{A}',
+    'NOT': '{A} ^ m',
+    'AND': '{A} & {B}',
+    'NAND': '({A} & {B}) ^ m',
+    'OR': '{A} | {B}',
+    'NOR': '({A} | {B}) ^ m',
+    'XOR': '{A} ^ {B}',
+    'XNOR': '{A} ^ {B} ^ m',
+    'ANDNOT': '{A} & ({B} ^ m)',
+    'ORNOT': '{A} | ({B} ^ m)',
+    'MUX': '{A} ^ (({A} ^ {B}) & {S})',
+    'NMUX': '{A} ^ (({A} ^ {B}) & {S}) ^ m',
+    'AOI3': '(({A} & {B}) | {C}) ^ m',
+    'OAI3': '(({A} | {B}) & {C}) ^ m',
+    'AOI4': '(({A} & {B}) | ({C} & {D})) ^ m',
+    'OAI4': '(({A} | {B}) & ({C} | {D})) ^ m',
+}
+
+# Vendor single-input buffers and inverters (input pin I, output pin O)
+VENDOR_BUFFERS = frozenset(('BUF', 'IBUF', 'OBUF', 'BUFG'))
+VENDOR_INVERTERS = frozenset(('INV',))
+LUT_PRIMITIVES = {f'LUT{k}': k for k in range(1, 7)}
+
+# Statements per compiled function, which bounds compile time and memory
+CHUNK_STATEMENTS = 4096
+
+# Exhaustive simulation is limited to this many input bits
+MAX_EXHAUSTIVE_BITS = 24
+
+# One flattened leaf cell: type, parameters, input pins, output pins (pin -> nets)
+Pins = Dict[str, List[int]]
+LeafCell = Tuple[str, Dict, Pins, Pins]
+
+
+def param_int(value) -> int:
+    """Integer value of a Yosys JSON parameter (binary string, int or Verilog literal)."""
+    if isinstance(value, int):
+        return value
+    text = str(value).strip()
+    if "'" in text:
+        base = text.split("'", 1)[1].lstrip('sS')
+        radix = {'h': 16, 'H': 16, 'd': 10, 'D': 10, 'o': 8, 'O': 8, 'b': 2, 'B': 2}[base[0]]
+        digits = base[1:].replace('_', '')
+        return int(''.join('0' if c in 'xXzZ?' else c for c in digits) or '0', radix)
+    if text and set(text) <= set('01xz'):
+        return int(text.replace('x', '0').replace('z', '0'), 2)
+    return int(text)
+
+
+def cell_pins(module: Module, cell: int) -> Tuple[Pins, Pins]:
+    """Input and output pins of a cell with their nets, bit 0 first."""
+    pin_names = module.graph.pin_names
+    inputs: Pins = {}
+    for i in range(module.fanin_start[cell], module.fanin_start[cell + 1]):
+        inputs.setdefault(pin_names[module.fanin_pin[i]], []).append(module.fanin_net[i])
+    outputs: Pins = {}
+    for i in range(module.fanout_start[cell], module.fanout_start[cell + 1]):
+        outputs.setdefault(pin_names[module.fanout_pin[i]], []).append(module.fanout_net[i])
+    return inputs, outputs
+
+
+def flatten(graph: NetlistGraph, top: Module, names: Optional[List[str]] = None,
+            net_names: Optional[Dict[int, str]] = None) -> Tuple[List[LeafCell], int]:
+    """Leaf cells of the design rooted at top and the number of nets.
+
+    Nets of top keep their ids; each submodule instance gets fresh ids for
+    its internal nets and shares its port nets with the instantiating module.
+    If names is given, the hierarchical name of each leaf cell is appended;
+    if net_names is given, it is filled with the outermost name of each net.
+    """
+    defined = {name for name, module in graph.modules.items() if not module.is_blackbox}
+    cells: List[LeafCell] = []
+    net_count = top.net_count
+    # Iterative walk: (module, net map or None for top, instantiation chain, name prefix)
+    stack: List[Tuple[Module, Optional[array], Tuple[str, ...], str]] = [(top, None, (top.name,), '')]
+    while stack:
+        module, net_map, chain, prefix = stack.pop()
+        if net_names is not None:
+            for net_name, bits in module.netnames.items():
+                for j, net in enumerate(bits):
+                    if net >= FIRST_NET:
+                        label = net_name if len(bits) == 1 else f"{net_name}[{j}]"
+                        net_names.setdefault(net if net_map is None else net_map[net], prefix + label)
+        for cell in range(module.cell_count):
+            type_name = module.type_name(cell)
+            inputs, outputs = cell_pins(module, cell)
+            if net_map is not None:
+                inputs = {pin: [net_map[net] for net in nets] for pin, nets in inputs.items()}
+                outputs = {pin: [net_map[net] for net in nets] for pin, nets in outputs.items()}
+            if type_name not in defined:
+                cells.append((type_name, module.cell_params.get(cell, {}), inputs, outputs))
+                if names is not None:
+                    names.append(prefix + module.cell_names[cell])
+                continue
+            if type_name in chain:
+                raise ValueError(f"module '{type_name}' instantiates itself")
+
+            child = graph.modules[type_name]
+            child_map = array('q', range(FIRST_NET)) + array('q', [-1]) * (child.net_count - FIRST_NET)
+            connections = {**inputs, **outputs}
+            for port, (_, bits) in child.ports.items():
+                parent_nets = connections.get(port, [])
+                for j, child_net in enumerate(bits):
+                    if j < len(parent_nets):
+                        parent_net = parent_nets[j]
+                    else:
+                        parent_net = net_count  # Unconnected port bit
+                        net_count += 1
+                    if child_map[child_net] < 0:
+                        child_map[child_net] = parent_net
+                    elif child_map[child_net] != parent_net:
+                        # One child net on two port bits joins both parent nets
+                        cells.append(('$_BUF_', {}, {'A': [child_map[child_net]]}, {'Y': [parent_net]}))
+                        if names is not None:
+                            names.append(f"{prefix}{module.cell_names[cell]}.{port}")
+            for child_net in range(FIRST_NET, child.net_count):
+                if child_map[child_net] < 0:
+                    child_map[child_net] = net_count
+                    net_count += 1
+            stack.append((child, child_map, chain + (type_name,), f"{prefix}{module.cell_names[cell]}."))
+    return cells, net_count
+
+
+def _lut_expression(table: int, inputs: List[str], temps: List[int]) -> str:
+    """Mux-tree expression of a truth table over input words (inputs[0] is the LSB)."""
+    def build(offset: int, k: int) -> str:
+        if k == 0:
+            return 'm' if (table >> offset) & 1 else 'z'
+        lo = build(offset, k - 1)
+        hi = build(offset + (1 << (k - 1)), k - 1)
+        select = inputs[k - 1]
+        if lo == hi:
+            return lo
+        if lo == 'z':
+            return select if hi == 'm' else f'({select} & {hi})'
+        if hi == 'z':
+            return f'({select} ^ m)' if lo == 'm' else f'({lo} & ({select} ^ m))'
+        if hi == 'm':
+            return f'({select} | {lo})'
+        if lo == 'm':
+            return f'(({select} ^ m) | {hi})'
+        temps[0] += 1
+        t = f't{temps[0]}'
+        return f'(({t} := {lo}) ^ (({t} ^ {hi}) & {select}))'
+
+    return build(0, len(inputs))
+
+
+def _cell_statement(type_name: str, params: Dict, inputs: Pins, outputs: Pins,
+                    temps: List[int]) -> str:
+    """Python statement evaluating one leaf cell into the value list v."""
+    def word(nets: List[int]) -> str:
+        return f'v[{nets[0]}]' if nets else 'z'
+
+    family = gate_family(type_name)
+    if family in GATE_EXPRESSIONS:
+        names = {pin: word(nets) for pin, nets in inputs.items()}
+        try:
+            expression = GATE_EXPRESSIONS[family].format(**names)
+        except KeyError as e:
+            raise ValueError(f"{type_name} cell without pin {e}") from None
+        return f"{word(outputs.get('Y', []))} = {expression}"
+
+    if type_name == '$lut' or type_name in LUT_PRIMITIVES:
+        if type_name == '$lut':
+            words = [f'v[{net}]' for net in inputs.get('A', [])]
+            table, target = param_int(params.get('LUT', 0)), outputs.get('Y', [])
+        else:
+            words = [word(inputs.get(f'I{i}', [])) for i in range(LUT_PRIMITIVES[type_name])]
+            table, target = param_int(params.get('INIT', 0)), outputs.get('O', [])
+        return f"{word(target)} = {_lut_expression(table, words, temps)}"
+
+    if type_name in VENDOR_BUFFERS:
+        return f"{word(outputs.get('O', []))} = {word(inputs.get('I', []))}"
+    if type_name in VENDOR_INVERTERS:
+        return f"{word(outputs.get('O', []))} = {word(inputs.get('I', []))} ^ m"
+    raise ValueError(f"unsupported cell type '{type_name}'")
+
+
+def levelize(cells: List[LeafCell], net_count: int, name: str = '') -> Tuple[List[int], List[int]]:
+    """Combinational cells in dependency order, and the nets driven by state cells."""
+    driver = array('q', [-1]) * net_count
+    state_nets = []
+    comb = []
+    for index, (type_name, _, _, outputs) in enumerate(cells):
+        sequential = is_sequential(type_name)
+        comb.append(not sequential)
+        for nets in outputs.values():
+            if sequential:
+                state_nets.extend(nets)
+            else:
+                for net in nets:
+                    if driver[net] < 0:
+                        driver[net] = index
+
+    pending = [0] * len(cells)
+    sinks: Dict[int, List[int]] = {}
+    for index, (_, _, inputs, _) in enumerate(cells):
+        if not comb[index]:
+            continue
+        for nets in inputs.values():
+            for net in nets:
+                if driver[net] >= 0:
+                    pending[index] += 1
+                    sinks.setdefault(driver[net], []).append(index)
+
+    order = [index for index in range(len(cells)) if comb[index] and pending[index] == 0]
+    position = 0
+    while position < len(order):
+        for sink in sinks.get(order[position], ()):
+            pending[sink] -= 1
+            if pending[sink] == 0:
+                order.append(sink)
+        position += 1
+
+    if len(order) != sum(comb):
+        raise ValueError(f"{name}: combinational loop through {sum(comb) - len(order)} cells")
+    return order, state_nets
+
+
+class NetlistSimulator:
+    """A flattened, levelized netlist compiled for bit-parallel evaluation."""
+
+    __slots__ = ('name', 'inputs', 'outputs', 'state_nets', 'net_count', 'cell_count', '_functions')
+
+    def __init__(self, graph: NetlistGraph, top: Optional[str] = None):
+        module = graph.modules[top] if top else graph.top
+        if module is None:
+            raise ValueError("netlist has no modules")
+        self.name = module.name
+        self.inputs: Dict[str, List[int]] = module.port_nets('input')
+        self.outputs: Dict[str, List[int]] = module.port_nets('output')
+
+        cells, self.net_count = flatten(graph, module)
+        order, self.state_nets = levelize(cells, self.net_count, self.name)
+        self.cell_count = len(order)
+
+        statements = []
+        temps = [0]
+        for index in order:
+            statements.append(_cell_statement(*cells[index], temps))
+        self._functions = []
+        for start in range(0, len(statements), CHUNK_STATEMENTS):
+            body = "\n    ".join(statements[start:start + CHUNK_STATEMENTS])
+            namespace: Dict = {}
+            exec(compile(f"def run(v, m, z):\n    {body}\n", f"<{self.name}>", "exec"), namespace)
+            self._functions.append(namespace['run'])
+
+    @property
+    def input_bits(self) -> int:
+        return sum(len(nets) for nets in self.inputs.values())
+
+    def evaluate(self, values: Dict, mask, state: Optional[Dict[int, object]] = None) -> Dict[str, List]:
+        """Output words for input words, many patterns at once.
+
+        values maps an input port to one word per bit (bit 0 first), or to a
+        single word for a one-bit port; missing ports are 0. mask is the
+        all-ones word, which fixes the number of patterns: (1 << n) - 1 for
+        n patterns in Python ints, or a NumPy uint64 array of all ones.
+        state optionally gives words for flip-flop and latch output nets.
+        """
+        zero = mask ^ mask
+        v = [zero] * self.net_count
+        v[1] = mask
+        for port, words in values.items():
+            nets = self.inputs.get(port)
+            if nets is None:
+                raise KeyError(f"{self.name} has no input port '{port}'")
+            if not isinstance(words, (list, tuple)):
+                words = [words]
+            for net, word in zip(nets, words):
+                v[net] = word
+        if state:
+            for net, word in state.items():
+                v[net] = word
+        for run in self._functions:
+            run(v, mask, zero)
+        return {port: [v[net] for net in nets] for port, nets in self.outputs.items()}
+
+
+def load_simulator(path: str, top: Optional[str] = None) -> NetlistSimulator:
+    """Compile the netlist in a Yosys JSON file for simulation."""
+    return NetlistSimulator(load_netlist(path), top)
+
+
+def exhaustive_words(bits: int) -> Tuple[List[int], int]:
+    """Input words enumerating all 2**bits patterns (pattern p has bit i of p on input i), and the mask."""
+    if bits > MAX_EXHAUSTIVE_BITS:
+        raise ValueError(f"{bits} input bits is too many for exhaustive simulation "
+                         f"(limit {MAX_EXHAUSTIVE_BITS})")
+    patterns = 1 << bits
+    mask = (1 << patterns) - 1
+    words = []
+    for i in range(bits):
+        half = 1 << i
+        period = (1 << (2 * half)) - 1
+        # Blocks of half zeros then half ones, repeated over all patterns
+        words.append((((1 << half) - 1) << half) * (mask // period))
+    return words, mask
+
+
+def random_words(bits: int, patterns: int, seed: Optional[int] = None) -> Tuple[List[int], int]:
+    """Uniformly random input words for the given number of patterns, and the mask."""
+    rng = random.Random(seed)
+    return [rng.getrandbits(patterns) for _ in range(bits)], (1 << patterns) - 1
+
+
+def assign_inputs(inputs: Dict[str, List[int]], words: List[int]) -> Dict[str, List[int]]:
+    """Input port values from a flat list of words in port order."""
+    values = {}
+    position = 0
+    for port, nets in inputs.items():
+        values[port] = words[position:position + len(nets)]
+        position += len(nets)
+    return values
+
+
+def pattern_values(values: Dict[str, List[int]], pattern: int) -> Dict[str, int]:
+    """Integer value of each port in one pattern."""
+    return {port: sum(((word >> pattern) & 1) << bit for bit, word in enumerate(words))
+            for port, words in values.items()}
+
+
+def compare(first: NetlistSimulator, second: NetlistSimulator, patterns: Optional[int] = None,
+            seed: Optional[int] = None) -> Tuple[int, Optional[Dict[str, int]]]:
+    """Check that two netlists agree on their common outputs.
+
+    Uses every input pattern when patterns is None, else that many random
+    ones. Returns the number of patterns simulated and the input values of
+    the first mismatching pattern (None if the netlists agree).
+    """
+    if first.inputs.keys() != second.inputs.keys() or any(
+            len(first.inputs[p]) != len(second.inputs[p]) for p in first.inputs):
+        raise ValueError(f"{first.name} and {second.name} have different input ports")
+    common = [port for port in first.outputs if port in second.outputs]
+    if not common:
+        raise ValueError(f"{first.name} and {second.name} have no common output ports")
+
+    bits = first.input_bits
+    if patterns is None:
+        words, mask = exhaustive_words(bits)
+        patterns = 1 << bits
+    else:
+        words, mask = random_words(bits, patterns, seed)
+    values = assign_inputs(first.inputs, words)
+    got, expected = first.evaluate(values, mask), second.evaluate(values, mask)
+
+    diff = 0
+    for port in common:
+        for a, b in zip(got[port], expected[port]):
+            diff |= a ^ b
+    if not diff:
+        return patterns, None
+    pattern = (diff & -diff).bit_length() - 1
+    return patterns, pattern_values(values, pattern)
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Bit-parallel simulation of Yosys JSON netlists")
+    parser.add_argument("netlist", help="Yosys write_json netlist")
+    parser.add_argument("--top", help="Module to simulate (default: the netlist top)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--exhaustive", action="store_true", help="Simulate every input pattern (default)")
+    mode.add_argument("--random", type=int, metavar="N", help="Simulate N random input patterns")
+    parser.add_argument("--seed", type=int, help="Random pattern seed")
+    parser.add_argument("--table", action="store_true", help="Print the truth table (exhaustive mode)")
+    parser.add_argument("--compare", metavar="NETLIST", help="Check equivalence against another netlist")
+    args = parser.parse_args()
+
+    try:
+        sim = load_simulator(args.netlist, args.top)
+        if args.compare:
+            other = load_simulator(args.compare, args.top)
+            start = time.perf_counter()
+            patterns, mismatch = compare(sim, other, args.random, args.seed)
+            elapsed = time.perf_counter() - start
+        else:
+            if args.random:
+                words, mask = random_words(sim.input_bits, args.random, args.seed)
+            else:
+                words, mask = exhaustive_words(sim.input_bits)
+            patterns = mask.bit_length()
+            values = assign_inputs(sim.inputs, words)
+            start = time.perf_counter()
+            results = sim.evaluate(values, mask)
+            elapsed = time.perf_counter() - start
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}")
+        sys.exit(2)
+
+    rate = patterns / elapsed if elapsed > 0 else float('inf')
+    print(f"{sim.name}: {sim.cell_count} cells, {sim.input_bits} input bits, "
+          f"{patterns} patterns in {elapsed * 1000:.2f} ms ({rate / 1e6:.1f} M patterns/s)")
+
+    if args.compare:
+        if mismatch is None:
+            print(f"EQUIVALENT: {other.name} matches on {patterns} patterns")
+            return
+        inputs = ", ".join(f"{port}={value}" for port, value in mismatch.items())
+        print(f"MISMATCH: {inputs}")
+        sys.exit(1)
+
+    for port, words in results.items():
+        ones = sum(bin(word).count('1') for word in words)
+        print(f"   {port:20} {len(words)} bits, {ones} ones")
+    if args.table and not args.random:
+        ports = list(sim.inputs) + list(sim.outputs)
+        print("   " + " ".join(ports))
+        for pattern in range(patterns):
+            row = {**pattern_values(values, pattern), **pattern_values(results, pattern)}
+            print("   " + " ".join(f"{row[port]:>{len(port)}}" for port in ports))
+
+
+if __name__ == "__main__":
+    main()
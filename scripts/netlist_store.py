@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Binary Netlist Store
+
+Converts Yosys JSON netlists into a compact binary file (.nlb) holding the
+netlist_graph arrays as they are in memory, and loads them back without
+parsing: load_netlist (and so every netlist tool) accepts a store wherever
+it accepts a JSON netlist.
+
+Per module, the store holds the integer cell types, the CSR fanin, fanout
+and sink arrays, the net drivers, and the cell and wire names as string
+tables (UTF-8 text plus an offset array). Cell parameters are kept as one
+JSON section. Cell types and pin names are interned once per netlist. Each
+array is 8-byte aligned and written in native byte order. A JSON directory
+at the end of the file records the modules, ports and attributes and, per
+array, its offset, type code and length.
+
+Layout:
+    MAGIC | array section ... | JSON directory | directory length (<Q) | MAGIC
+
+The loader memory-maps the file and parses only the directory; the arrays
+are memoryviews into the mapping (no copies, pages are read on first use),
+and wire names and cell parameters are decoded when a tool first asks for
+them. A store written on a machine with the other byte order is still read,
+through byte-swapped copies.
+
+Usage:
+    python scripts/netlist_store.py convert NETLIST.json [...] [--output OUT.nlb]
+    python scripts/netlist_store.py info STORE.nlb [...]
+"""
+
+import os
+import sys
+import json
+import mmap
+import time
+import struct
+import argparse
+import tempfile
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence
+
+from netlist_graph import FIRST_NET, Module, NetlistGraph, load_netlist
+
+MAGIC = b'NETLIST1'
+FORMAT_VERSION = 1
+STORE_SUFFIX = '.nlb'
+
+# Array sections are aligned to this many bytes
+ALIGNMENT = 8
+
+# Module arrays stored as sections, with their array type codes
+MODULE_ARRAYS = (
+    ('cell_type', 'H'), ('fanin_start', 'I'), ('fanin_net', 'I'), ('fanin_pin', 'H'),
+    ('fanout_start', 'I'), ('fanout_net', 'I'), ('fanout_pin', 'H'),
+    ('net_driver', 'i'), ('sink_start', 'I'), ('sink_cell', 'I'),
+)
+
+
+class StringTable(Sequence[str]):
+    """Read-only list of strings over a UTF-8 blob and an offset array; items decode on access."""
+
+    __slots__ = ('offsets', 'blob')
+
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return bytes(self.blob[self.offsets[index]:self.offsets[index + 1]]).decode()
+
+
+class _SectionWriter:
+    """Appends aligned array and blob sections to a store and records their positions."""
+
+    __slots__ = ('out',)
+
+    def __init__(self, out):
+        self.out = out
+
+    def _align(self):
+        padding = -self.out.tell() % ALIGNMENT
+        self.out.write(b'\0' * padding)
+
+    def array(self, values, typecode: str) -> List:
+        if not isinstance(values, array) or values.typecode != typecode:
+            values = array(typecode, values)
+        self._align()
+        offset = self.out.tell()
+        self.out.write(values.tobytes())
+        return [offset, typecode, values.itemsize, len(values)]
+
+    def blob(self, data: bytes) -> List:
+        self._align()
+        offset = self.out.tell()
+        self.out.write(data)
+        return [offset, len(data)]
+
+    def strings(self, strings: Sequence[str]) -> Dict:
+        offsets = array('Q', [0])
+        parts = []
+        for string in strings:
+            encoded = string.encode()
+            parts.append(encoded)
+            offsets.append(offsets[-1] + len(encoded))
+        return {'offsets': self.array(offsets, 'Q'), 'blob': self.blob(b''.join(parts))}
+
+
+def _write_module(sections: _SectionWriter, module: Module) -> Dict:
+    entry = {
+        'name': module.name,
+        'attributes': module.attributes,
+        'ports': {port: [direction, list(nets)] for port, (direction, nets) in module.ports.items()},
+        'net_count': module.net_count,
+        'cell_names': sections.strings(module.cell_names),
+        'arrays': {field: sections.array(getattr(module, field), typecode) for field, typecode in MODULE_ARRAYS},
+    }
+    params = {str(cell): values for cell, values in module.cell_params.items()}
+    entry['cell_params'] = sections.blob(json.dumps(params, separators=(',', ':')).encode())
+
+    netnames = module.netnames
+    starts = array('I', [0])
+    bits = array('I')
+    for nets in netnames.values():
+        bits.extend(nets)
+        starts.append(len(bits))
+    entry['netnames'] = {'names': sections.strings(list(netnames)), 'starts': sections.array(starts, 'I'),
+                         'bits': sections.array(bits, 'I')}
+    return entry
+
+
+def write_store(graph: NetlistGraph, store_path: str, source: str = ''):
+    """Write a netlist graph as a binary store (atomically, through a temporary file)."""
+    directory = os.path.dirname(os.path.abspath(store_path))
+    fd, temp = tempfile.mkstemp(dir=directory, suffix=STORE_SUFFIX)
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            out.write(MAGIC)
+            sections = _SectionWriter(out)
+            modules = [_write_module(sections, module) for module in graph.modules.values()]
+            footer = json.dumps({
+                'version': FORMAT_VERSION,
+                'source': source,
+                'creator': graph.creator,
+                'byteorder': sys.byteorder,
+                'type_names': graph.type_names,
+                'pin_names': graph.pin_names,
+                'modules': modules,
+            }, separators=(',', ':')).encode()
+            out.write(footer)
+            out.write(struct.pack('<Q', len(footer)))
+            out.write(MAGIC)
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temp, 0o666 & ~umask)  # mkstemp creates the file private
+        os.replace(temp, store_path)
+    except BaseException:
+        os.unlink(temp)
+        raise
+
+
+def convert(json_path: str, store_path: Optional[str] = None) -> Dict:
+    """Convert a Yosys JSON netlist into a binary store next to it (or at store_path)."""
+    if store_path is None:
+        store_path = os.path.splitext(json_path)[0] + STORE_SUFFIX
+    graph = load_netlist(json_path)
+    write_store(graph, store_path, os.path.basename(json_path))
+    json_bytes = os.path.getsize(json_path)
+    store_bytes = os.path.getsize(store_path)
+    return {
+        'source': json_path,
+        'store': store_path,
+        'modules': len(graph.modules),
+        'cells': sum(module.cell_count for module in graph.modules.values()),
+        'json_bytes': json_bytes,
+        'store_bytes': store_bytes,
+        'ratio': round(json_bytes / store_bytes, 2) if store_bytes else 0.0,
+    }
+
+
+class _StoreReader:
+    """Views of the sections of one mapped store."""
+
+    __slots__ = ('view', 'swap')
+
+    def __init__(self, view: memoryview, swap: bool):
+        self.view = view
+        self.swap = swap
+
+    def array(self, entry: List):
+        offset, typecode, itemsize, count = entry
+        if array(typecode).itemsize != itemsize:
+            raise ValueError(f"array type '{typecode}' is {itemsize} bytes in the store")
+        data = self.view[offset:offset + itemsize * count]
+        if self.swap:
+            values = array(typecode, data.tobytes())
+            values.byteswap()
+            return values
+        return data.cast(typecode)
+
+    def blob(self, entry: List) -> memoryview:
+        offset, length = entry
+        return self.view[offset:offset + length]
+
+    def strings(self, entry: Dict) -> StringTable:
+        return StringTable(self.array(entry['offsets']), self.blob(entry['blob']))
+
+    def netnames(self, entry: Dict) -> Callable[[], Dict[str, List[int]]]:
+        def decode() -> Dict[str, List[int]]:
+            names = self.strings(entry['names'])
+            starts, bits = self.array(entry['starts']), self.array(entry['bits'])
+            return {names[i]: bits[starts[i]:starts[i + 1]].tolist() for i in range(len(names))}
+        return decode
+
+    def cell_params(self, entry: List) -> Callable[[], Dict[int, Dict]]:
+        def decode() -> Dict[int, Dict]:
+            return {int(cell): values for cell, values in json.loads(bytes(self.blob(entry))).items()}
+        return decode
+
+
+def open_store(path: str, name: Optional[str] = None) -> NetlistGraph:
+    """Memory-map a binary netlist store as a netlist graph (use load_netlist to cache it per process)."""
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise ValueError("not a netlist store") from None
+    view = memoryview(mm)
+    tail = len(MAGIC) + 8
+    if len(view) < len(MAGIC) + tail or view[:len(MAGIC)] != MAGIC or view[-len(MAGIC):] != MAGIC:
+        raise ValueError("not a netlist store")
+    (length,) = struct.unpack('<Q', view[-tail:-len(MAGIC)])
+    directory = json.loads(bytes(view[-tail - length:-tail]))
+    if directory.get('version') != FORMAT_VERSION:
+        raise ValueError(f"unsupported store version {directory.get('version')}")
+    reader = _StoreReader(view, directory['byteorder'] != sys.byteorder)
+
+    # The graph and modules are filled from the directory instead of from Yosys JSON
+    graph = NetlistGraph.__new__(NetlistGraph)
+    graph.path = name or path
+    graph.creator = directory['creator']
+    graph.type_names = directory['type_names']
+    graph.type_codes = {type_name: code for code, type_name in enumerate(graph.type_names)}
+    graph.pin_names = directory['pin_names']
+    graph.pin_codes = {pin: code for code, pin in enumerate(graph.pin_names)}
+    graph._sequential = None
+    graph.modules = {}
+    for entry in directory['modules']:
+        module = Module.__new__(Module)
+        module.graph = graph
+        module.name = entry['name']
+        module.attributes = entry['attributes']
+        module.ports = {port: (direction, nets) for port, (direction, nets) in entry['ports'].items()}
+        module.net_count = entry['net_count']
+        module.cell_names = reader.strings(entry['cell_names'])
+        for field, _ in MODULE_ARRAYS:
+            setattr(module, field, reader.array(entry['arrays'][field]))
+        module._cell_params = reader.cell_params(entry['cell_params'])
+        module._netnames = reader.netnames(entry['netnames'])
+        module._order = None
+        module._bit_index = None
+        graph.modules[module.name] = module
+    return graph
+
+
+def store_info(path: str) -> Dict:
+    """Summary of a store: source, size, modules and their cell and net counts."""
+    start = time.perf_counter()
+    graph = open_store(path)
+    elapsed = time.perf_counter() - start
+    return {
+        'store': path,
+        'store_bytes': os.path.getsize(path),
+        'load_seconds': elapsed,
+        'creator': graph.creator,
+        'modules': {name: {'cells': module.cell_count, 'nets': module.net_count - FIRST_NET}
+                    for name, module in graph.modules.items()},
+    }
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Binary memory-mapped netlist stores for Yosys JSON netlists")
+    commands = parser.add_subparsers(dest="command", required=True)
+    convert_parser = commands.add_parser("convert", help="Convert Yosys JSON netlists to stores")
+    convert_parser.add_argument("netlists", nargs="+", help="Yosys write_json netlists")
+    convert_parser.add_argument("--output", help=f"Output store (single input; default NETLIST{STORE_SUFFIX})")
+    info_parser = commands.add_parser("info", help="Show the contents of stores")
+    info_parser.add_argument("stores", nargs="+", help="Netlist stores")
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        if args.output and len(args.netlists) > 1:
+            parser.error("--output needs a single netlist")
+        for path in args.netlists:
+            start = time.perf_counter()
+            try:
+                stats = convert(path, args.output)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Error: {path}: {e}")
+                sys.exit(1)
+            print(f"{path} -> {stats['store']}: {stats['modules']} modules, {stats['cells']} cells, "
+                  f"{stats['json_bytes']} -> {stats['store_bytes']} bytes ({stats['ratio']}x) "
+                  f"in {(time.perf_counter() - start) * 1e3:.1f} ms")
+        return
+
+    for path in args.stores:
+        try:
+            info = store_info(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error: {path}: {e}")
+            sys.exit(1)
+        print(f"{path}: {info['store_bytes']} bytes, {len(info['modules'])} modules, "
+              f"opened in {info['load_seconds'] * 1e3:.2f} ms")
+        for name, counts in info['modules'].items():
+            print(f"   {name:32} cells={counts['cells']:<6} nets={counts['nets']}")
+
+
+if __name__ == "__main__":
+    main()
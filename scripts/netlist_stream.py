@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Streaming Netlist Reader
+
+Reads Yosys JSON netlists (write_json) incrementally, so netlists of big
+generated designs never have to be held in memory as one parsed document.
+
+JsonStream walks a JSON document through a fixed-size text buffer: objects
+and arrays are entered key by key (or element by element), and only the
+values the caller asks for are decoded, each with the C JSON decoder. Memory
+use is bounded by the buffer and the largest single value read (one cell),
+not by the file size.
+
+iter_netlist walks modules -> ports / cells / netnames as a stream of
+(module, section, name, value) entries, one per port, cell or net name.
+netlist_graph.load_netlist builds its compact graph from this stream cell by
+cell, so every analyzer reading netlists through it (gate_analysis.py,
+flow/fpga/*) only holds the graph arrays, not the JSON tree.
+
+Usage:
+    python scripts/netlist_stream.py NETLIST.json [...]
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Characters read per buffer refill
+CHUNK_SIZE = 1 << 20
+
+# Characters kept buffered ahead of the read position (keys must fit)
+LOOKAHEAD = 1 << 16
+
+# Largest single value read (characters) before the input is declared malformed
+MAX_VALUE_SIZE = 1 << 26
+
+# Module sections streamed entry by entry; other module keys are read whole
+STREAMED_SECTIONS = frozenset(('ports', 'cells', 'netnames', 'memories'))
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+KEY = re.compile(r'[ \t\n\r]*"((?:[^"\\]|\\.)*)"[ \t\n\r]*:[ \t\n\r]*', re.S)
+
+NetlistEntry = Tuple[Optional[str], str, str, Any]
+
+
+class JsonStream:
+    """Incremental reader of one JSON document from a text file."""
+
+    __slots__ = ('file', 'chunk_size', 'buffer', 'pos', 'consumed', 'eof', 'decoder')
+
+    def __init__(self, file, chunk_size: int = CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.consumed = 0  # Characters dropped from the front of the buffer
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    @property
+    def offset(self) -> int:
+        return self.consumed + self.pos
+
+    def _fill(self) -> bool:
+        """Append the next chunk, dropping what has been read; False at end of file."""
+        if self.eof:
+            return False
+        data = self.file.read(self.chunk_size)
+        if not data:
+            self.eof = True
+            return False
+        self.consumed += self.pos
+        self.buffer = self.buffer[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def _ensure(self):
+        """Buffer at least LOOKAHEAD characters past the read position, unless the file ends first."""
+        while len(self.buffer) - self.pos < LOOKAHEAD and self._fill():
+            pass
+
+    def _error(self, message: str) -> ValueError:
+        return ValueError(f"invalid JSON at character {self.offset}: {message}")
+
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it ('' at end of file)."""
+        while True:
+            self._ensure()
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or not self._fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def _expect(self, char: str):
+        if self.peek() != char:
+            raise self._error(f"expected '{char}'")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete value."""
+        if self.pos >= len(self.buffer) or self.buffer[self.pos] in ' \t\n\r':
+            self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if len(self.buffer) - self.pos > MAX_VALUE_SIZE or self.eof or not self._fill():
+                    raise self._error(e.msg) from None
+                continue
+            # A value ending the buffer may continue in the next chunk (a number, say)
+            if end == len(self.buffer) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def object(self) -> Iterator[str]:
+        """Keys of the next object; the caller reads (or skips) each value before the next key."""
+        self._expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            self._ensure()
+            match = KEY.match(self.buffer, self.pos)
+            if match is None:
+                raise self._error("expected an object key")
+            key = match.group(1)
+            if '\\' in key:
+                key = json.loads(f'"{key}"')
+            self.pos = match.end()
+            yield key
+            char = self.peek()
+            self.pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                raise self._error("expected ',' or '}'")
+
+    def array(self) -> Iterator[int]:
+        """Indices of the next array; the caller reads (or skips) each element."""
+        self._expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            char = self.peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise self._error("expected ',' or ']'")
+
+    def skip(self):
+        """Step over the next value without decoding it as a whole."""
+        char = self.peek()
+        if char == '{':
+            for _ in self.object():
+                self.skip()
+        elif char == '[':
+            for _ in self.array():
+                self.skip()
+        else:
+            self.value()
+
+    def end(self):
+        """Check that nothing but whitespace follows the document."""
+        if self.peek():
+            raise self._error("data after the document")
+
+
+def iter_netlist(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[NetlistEntry]:
+    """Entries of a Yosys JSON netlist in file order.
+
+    Each port, cell and net name of a module is one (module, section, name,
+    value) entry; other module keys (attributes, ...) are one entry with an
+    empty name, and top-level keys (creator) have module None.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = JsonStream(f, chunk_size)
+        for key in stream.object():
+            if key != 'modules':
+                yield None, key, '', stream.value()
+                continue
+            for module in stream.object():
+                for section in stream.object():
+                    if section in STREAMED_SECTIONS:
+                        for name in stream.object():
+                            yield module, section, name, stream.value()
+                    else:
+                        yield module, section, '', stream.value()
+        stream.end()
+
+
+def stream_counts(path: str) -> Dict[str, Dict[str, int]]:
+    """Cells per type of every module, read in one streaming pass."""
+    counts: Dict[str, Dict[str, int]] = {}
+    for module, section, _, value in iter_netlist(path):
+        if section == 'cells':
+            types = counts.setdefault(module, {})
+            type_name = value.get('type', '')
+            types[type_name] = types.get(type_name, 0) + 1
+    return counts
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Stream Yosys JSON netlists and count cells per module")
+    parser.add_argument("netlists", nargs="+", help="Yosys write_json netlists")
+    args = parser.parse_args()
+
+    for path in args.netlists:
+        start = time.perf_counter()
+        try:
+            counts = stream_counts(path)
+        except (OSError, ValueError) as e:
+            print(f"Error: {path}: {e}")
+            sys.exit(1)
+        elapsed = time.perf_counter() - start
+        print(f"{path}: {len(counts)} modules, {sum(sum(types.values()) for types in counts.values())} cells "
+              f"in {elapsed * 1e3:.1f} ms")
+        for module, types in counts.items():
+            cells = ", ".join(f"{name} x{count}" for name, count in sorted(types.items()))
+            print(f"   {module:32} {cells}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Static Timing Analysis
+
+Computes arrival times, required times, slack, logic depth and fanout over a
+synthesized Yosys JSON netlist, and lists the K most critical paths to each
+output. The netlist is flattened and levelized once (netlist_sim), then one
+forward pass computes arrival times and one backward pass required times,
+so the analysis is linear in the size of the design; the K worst paths to an
+endpoint are enumerated exactly by a best-first search bounded by the
+arrival times.
+
+Cell delays come from a pluggable DelayModel. The presets are a generic
+static CMOS gate model (ASIC_DELAYS_PS, in picoseconds, with a per-fanout
+load term), an FPGA model charging one LUT delay per LUT (flow/fpga times
+the cut-based LUT mapping of netlist_lutmap; an unmapped gate counts as one
+LUT), a unit-delay model and NLDM table delays read from a Liberty library
+(liberty_reader).
+Flip-flop outputs start paths at their clock-to-Q delay and flip-flop data
+inputs end them (required time: period minus setup).
+
+Usage:
+    python scripts/netlist_timing.py NETLIST.json [--model asic|fpga|unit|liberty] [--paths K]
+    python scripts/netlist_timing.py NETLIST.json --ripple 64
+"""
+
+import sys
+import heapq
+import itertools
+import argparse
+from typing import Dict, List, Optional, Tuple
+
+from liberty_reader import DEFAULT_LIBRARY, load_liberty
+from netlist_graph import Module, NetlistGraph, gate_family, is_sequential, load_netlist
+from netlist_sim import LUT_PRIMITIVES, flatten, levelize
+
+# Generic static CMOS gate delays (ps) before fanout load
+ASIC_DELAYS_PS = {
+    'BUF': 25, 'NOT': 15, 'NAND': 20, 'NOR': 25, 'AND': 30, 'OR': 35,
+    'ANDNOT': 30, 'ORNOT': 35, 'XOR': 45, 'XNOR': 45, 'MUX': 45, 'NMUX': 40,
+    'AOI3': 30, 'OAI3': 30, 'AOI4': 35, 'OAI4': 35,
+}
+ASIC_LOAD_PS = 5          # Per fanout pin beyond the first
+ASIC_CLK_TO_Q_PS = 80
+ASIC_SETUP_PS = 40
+
+# Xilinx 7-series LUT delay (~0.5ns per LUT level)
+LUT_DELAY_PS = 500
+FPGA_CLK_TO_Q_PS = 300
+FPGA_SETUP_PS = 100
+
+# Flip-flop pins that are not timing endpoints
+CLOCK_PINS = frozenset(('C', 'CLK', 'CK'))
+
+
+class DelayModel:
+    """Per-cell delays; subclasses override cell_delay and the sequential figures."""
+
+    unit = 'ps'
+
+    def cell_delay(self, type_name: str, params: Dict, fanout: int) -> float:
+        raise NotImplementedError
+
+    def clock_to_q(self, type_name: str) -> float:
+        return 0.0
+
+    def setup(self, type_name: str) -> float:
+        return 0.0
+
+
+class UnitDelayModel(DelayModel):
+    """Every combinational cell has delay 1: arrival times are logic levels."""
+
+    unit = 'levels'
+
+    def cell_delay(self, type_name: str, params: Dict, fanout: int) -> float:
+        return 1.0
+
+
+class GateDelayModel(DelayModel):
+    """Table delay per gate family plus a linear fanout load term."""
+
+    def __init__(self, delays: Dict[str, float], load: float = 0.0, default: float = 0.0,
+                 lut: float = 0.0, clock_to_q: float = 0.0, setup: float = 0.0):
+        self.delays = delays
+        self.load = load
+        self.default = default
+        self.lut = lut
+        self._clock_to_q = clock_to_q
+        self._setup = setup
+
+    def cell_delay(self, type_name: str, params: Dict, fanout: int) -> float:
+        if type_name == '$lut' or type_name in LUT_PRIMITIVES:
+            intrinsic = self.lut
+        else:
+            intrinsic = self.delays.get(gate_family(type_name) or type_name, self.default)
+        return intrinsic + self.load * max(fanout - 1, 0)
+
+    def clock_to_q(self, type_name: str) -> float:
+        return self._clock_to_q
+
+    def setup(self, type_name: str) -> float:
+        return self._setup
+
+
+def asic_delay_model() -> GateDelayModel:
+    """Generic static CMOS gate delays."""
+    return GateDelayModel(ASIC_DELAYS_PS, ASIC_LOAD_PS, default=40, lut=ASIC_DELAYS_PS['MUX'] * 3,
+                          clock_to_q=ASIC_CLK_TO_Q_PS, setup=ASIC_SETUP_PS)
+
+
+def fpga_delay_model() -> GateDelayModel:
+    """One LUT delay per LUT (or per unmapped gate); buffers are free."""
+    delays = dict.fromkeys(ASIC_DELAYS_PS, LUT_DELAY_PS)
+    delays['BUF'] = 0
+    return GateDelayModel(delays, default=LUT_DELAY_PS, lut=LUT_DELAY_PS,
+                          clock_to_q=FPGA_CLK_TO_Q_PS, setup=FPGA_SETUP_PS)
+
+
+class LibertyDelayModel(DelayModel):
+    """NLDM delays of the smallest library cell of each gate family (liberty_reader).
+
+    Every net is driven with the library's default input slew and loaded by
+    fanout times the average input pin capacitance.
+    """
+
+    def __init__(self, library, slew: Optional[float] = None):
+        self.library = library
+        self.cells = library.gate_cells()
+        self.slew = library.default_slew if slew is None else slew
+        self.pin_load = library.average_input_capacitance()
+
+    def _cell(self, type_name: str):
+        cell = self.cells.get(gate_family(type_name) or '') or self.library.cells.get(type_name)
+        if cell is None:
+            raise ValueError(f"no cell in library '{self.library.name}' for '{type_name}'")
+        return cell
+
+    def cell_delay(self, type_name: str, params: Dict, fanout: int) -> float:
+        delay = self._cell(type_name).delay(self.slew, self.pin_load * max(fanout, 1))
+        return round(delay * self.library.time_ps, 1)
+
+    def clock_to_q(self, type_name: str) -> float:
+        return self.cell_delay(type_name, {}, 1)
+
+    def setup(self, type_name: str) -> float:
+        return round(self._cell(type_name).setup(self.slew) * self.library.time_ps, 1)
+
+
+def liberty_delay_model(path: str = DEFAULT_LIBRARY) -> LibertyDelayModel:
+    """Delays from a Liberty library (default: the bundled generic library)."""
+    return LibertyDelayModel(load_liberty(path))
+
+
+DELAY_MODELS = {'asic': asic_delay_model, 'fpga': fpga_delay_model, 'unit': UnitDelayModel,
+                'liberty': liberty_delay_model}
+
+
+class TimingAnalysis:
+    """Arrival and required times, slack, depth and fanout of one design."""
+
+    __slots__ = ('name', 'model', 'period', 'cells', 'cell_names', 'net_names', 'driver', 'net_delay',
+                 'arrival', 'required', 'depth', 'fanout', 'endpoints', 'outputs')
+
+    def __init__(self, graph: NetlistGraph, top: Optional[str] = None, model: Optional[DelayModel] = None,
+                 period: Optional[float] = None, input_arrival: float = 0.0):
+        module = graph.modules[top] if top else graph.top
+        if module is None:
+            raise ValueError("netlist has no modules")
+        self.name = module.name
+        self.model = model or asic_delay_model()
+        self.cell_names: List[str] = []
+        self.net_names: Dict[int, str] = {}
+        self.cells, net_count = flatten(graph, module, self.cell_names, self.net_names)
+        order, _ = levelize(self.cells, net_count, module.name)
+
+        # Fanout: cell input pins reading each net
+        self.fanout = [0] * net_count
+        for _, _, inputs, _ in self.cells:
+            for nets in inputs.values():
+                for net in nets:
+                    self.fanout[net] += 1
+
+        # Forward pass: arrival time and logic depth per net
+        self.driver = [-1] * net_count
+        self.net_delay = [0.0] * net_count
+        self.arrival = [0.0] * net_count
+        self.depth = [0] * net_count
+        for nets in module.port_nets('input').values():
+            for net in nets:
+                self.arrival[net] = input_arrival
+        self.endpoints: List[Tuple[str, int, float]] = []  # (name, net, setup)
+        for index, (type_name, _, inputs, outputs) in enumerate(self.cells):
+            if is_sequential(type_name):
+                for pin, nets in outputs.items():
+                    for net in nets:
+                        self.driver[net] = index
+                        self.net_delay[net] = self.arrival[net] = self.model.clock_to_q(type_name)
+                for pin, nets in inputs.items():
+                    if pin in CLOCK_PINS:
+                        continue
+                    for bit, net in enumerate(nets):
+                        label = pin if len(nets) == 1 else f"{pin}[{bit}]"
+                        self.endpoints.append((f"{self.cell_names[index]}.{label}", net,
+                                               self.model.setup(type_name)))
+        for index in order:
+            type_name, params, inputs, outputs = self.cells[index]
+            start, levels = 0.0, 0
+            for nets in inputs.values():
+                for net in nets:
+                    start = max(start, self.arrival[net])
+                    levels = max(levels, self.depth[net])
+            for nets in outputs.values():
+                for net in nets:
+                    delay = self.model.cell_delay(type_name, params, self.fanout[net])
+                    self.driver[net] = index
+                    self.net_delay[net] = delay
+                    self.arrival[net] = start + delay
+                    self.depth[net] = levels + 1
+
+        self.outputs: Dict[str, List[int]] = module.port_nets('output')
+        for port, nets in self.outputs.items():
+            for bit, net in enumerate(nets):
+                self.endpoints.append((port if len(nets) == 1 else f"{port}[{bit}]", net, 0.0))
+
+        # Backward pass: required times from the period (default: the critical delay)
+        self.period = period if period is not None else max(
+            (self.arrival[net] + setup for _, net, setup in self.endpoints), default=0.0)
+        self.required = [float('inf')] * net_count
+        for _, net, setup in self.endpoints:
+            self.required[net] = min(self.required[net], self.period - setup)
+        for index in reversed(order):
+            _, _, inputs, outputs = self.cells[index]
+            need = float('inf')
+            for nets in outputs.values():
+                for net in nets:
+                    need = min(need, self.required[net] - self.net_delay[net])
+            for nets in inputs.values():
+                for net in nets:
+                    if need < self.required[net]:
+                        self.required[net] = need
+
+    def slack(self, net: int) -> float:
+        return self.required[net] - self.arrival[net]
+
+    @property
+    def critical_delay(self) -> float:
+        """Worst endpoint arrival plus setup."""
+        return max((self.arrival[net] + setup for _, net, setup in self.endpoints), default=0.0)
+
+    @property
+    def worst_slack(self) -> float:
+        return min((self.slack(net) for _, net, _ in self.endpoints), default=0.0)
+
+    @property
+    def logic_depth(self) -> int:
+        return max((self.depth[net] for _, net, _ in self.endpoints), default=0)
+
+    @property
+    def max_fanout(self) -> int:
+        return max(self.fanout, default=0)
+
+    def net_name(self, net: int) -> str:
+        name = self.net_names.get(net)
+        if name is None:
+            index = self.driver[net]
+            name = f"{self.cell_names[index]}.out" if index >= 0 else f"net{net}"
+        return name
+
+    def critical_paths(self, net: int, k: int = 1) -> List[Tuple[float, List[int]]]:
+        """The k longest paths ending at a net, worst first, as (delay, nets from startpoint)."""
+        paths = []
+        counter = 0
+        heap = [(-self.arrival[net], counter, net, 0.0, (net,))]
+        while heap and len(paths) < k:
+            bound, _, current, suffix, path = heapq.heappop(heap)
+            index = self.driver[current]
+            if index < 0 or is_sequential(self.cells[index][0]):
+                paths.append((-bound, list(reversed(path))))
+                continue
+            delay = self.net_delay[current]
+            seen = set()
+            for nets in self.cells[index][2].values():
+                for source in nets:
+                    if source in seen:
+                        continue
+                    seen.add(source)
+                    counter += 1
+                    heapq.heappush(heap, (-(self.arrival[source] + delay + suffix), counter, source,
+                                          suffix + delay, path + (source,)))
+        return paths
+
+    def path_report(self, nets: List[int]) -> List[str]:
+        """Report lines for one path: net, driving cell, incremental delay and arrival."""
+        lines = []
+        for net in nets:
+            index = self.driver[net]
+            cell = self.cells[index][0] if index >= 0 else 'input'
+            increment = self.net_delay[net] if index >= 0 else self.arrival[net]
+            lines.append(f"      {self.net_name(net):32} {cell:12} +{increment:<8g} {self.arrival[net]:g}")
+        return lines
+
+    def summary(self) -> Dict:
+        """Critical delay, slack, depth and fanout, plus arrival and slack per output bit."""
+        return {
+            'design': self.name,
+            'unit': self.model.unit,
+            'critical_delay': self.critical_delay,
+            'period': self.period,
+            'worst_slack': self.worst_slack,
+            'logic_depth': self.logic_depth,
+            'max_fanout': self.max_fanout,
+            'endpoints': {name: {'arrival': self.arrival[net], 'slack': self.slack(net), 'depth': self.depth[net]}
+                          for name, net, _ in self.endpoints},
+        }
+
+
+def ripple_chain_name(adder: str, width: int) -> str:
+    """Name of the module ripple_chain builds."""
+    return f"ripple_{adder}_{width}"
+
+
+def ripple_chain(path: str, width: int, top: Optional[str] = None) -> NetlistGraph:
+    """A width-bit ripple-carry adder built from the full adder in a netlist (Yosys JSON or netlist store).
+
+    The full adder must have ports a_i, b_i, cin_i, sum_o and cout_o; other
+    ports (clk_i, reset_n_i) are shared by all stages. The chain is added to
+    a graph derived from the one load_netlist returns, so the netlist is read
+    (streamed) once however many chains are built from it.
+    """
+    source = load_netlist(path)
+    adder = source.modules[top] if top else source.top
+    if adder is None or not {'a_i', 'b_i', 'cin_i', 'sum_o', 'cout_o'} <= adder.ports.keys():
+        raise ValueError("top module is not a full adder (a_i, b_i, cin_i -> sum_o, cout_o)")
+
+    bits = itertools.count(2)
+    a = [next(bits) for _ in range(width)]
+    b = [next(bits) for _ in range(width)]
+    total = [next(bits) for _ in range(width)]
+    carry = [next(bits) for _ in range(width + 1)]
+    shared = {port: {'direction': direction, 'bits': [next(bits) for _ in nets]}
+              for port, (direction, nets) in adder.ports.items()
+              if port not in ('a_i', 'b_i', 'cin_i', 'sum_o', 'cout_o')}
+    directions = {port: direction for port, (direction, _) in adder.ports.items()}
+    cells = {}
+    for i in range(width):
+        connections = {'a_i': [a[i]], 'b_i': [b[i]], 'cin_i': [carry[i]],
+                       'sum_o': [total[i]], 'cout_o': [carry[i + 1]]}
+        connections.update({port: info['bits'] for port, info in shared.items()})
+        cells[f"fa{i}"] = {'type': adder.name, 'port_directions': directions, 'connections': connections}
+
+    # The chain is the only top module, whatever the netlist marked as top
+    graph = source.derive()
+    for module in graph.modules.values():
+        module.attributes.pop('top', None)
+    chain = ripple_chain_name(adder.name, width)
+    graph.modules[chain] = Module(graph, chain, {
+        'attributes': {'top': '1'},
+        'ports': {'a_i': {'direction': 'input', 'bits': a}, 'b_i': {'direction': 'input', 'bits': b},
+                  'cin_i': {'direction': 'input', 'bits': carry[:1]}, **shared,
+                  'sum_o': {'direction': 'output', 'bits': total},
+                  'cout_o': {'direction': 'output', 'bits': carry[-1:]}},
+        'cells': cells,
+        'netnames': {'carry': {'bits': carry}},
+    })
+    return graph
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Static timing analysis of Yosys JSON netlists")
+    parser.add_argument("netlists", nargs="+", help="Yosys write_json netlists")
+    parser.add_argument("--top", help="Module to analyze (default: the netlist top)")
+    parser.add_argument("--model", choices=sorted(DELAY_MODELS), default="asic", help="Delay model")
+    parser.add_argument("--liberty", metavar="LIB", help="Liberty library for --model liberty "
+                        "(default: flow/liberty/generic_cmos.lib)")
+    parser.add_argument("--period", type=float, help="Clock period / required time (default: critical delay)")
+    parser.add_argument("--paths", type=int, default=1, metavar="K", help="Critical paths per output")
+    parser.add_argument("--ripple", type=int, metavar="N", help="Analyze an N-bit ripple chain of the full adder")
+    args = parser.parse_args()
+
+    for path in args.netlists:
+        try:
+            graph = ripple_chain(path, args.ripple, args.top) if args.ripple else load_netlist(path)
+            if args.model == 'liberty' and args.liberty:
+                model = liberty_delay_model(args.liberty)
+            else:
+                model = DELAY_MODELS[args.model]()
+            sta = TimingAnalysis(graph, None if args.ripple else args.top, model, args.period)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error: {path}: {e}")
+            sys.exit(1)
+
+        unit = sta.model.unit
+        print(f"{path}: {sta.name}, {len(sta.cells)} cells")
+        print(f"   critical delay {sta.critical_delay:g} {unit}, worst slack {sta.worst_slack:g} {unit}, "
+              f"logic depth {sta.logic_depth}, max fanout {sta.max_fanout}")
+        if unit == 'ps' and sta.critical_delay > 0:
+            print(f"   fmax {1e6 / sta.critical_delay:.0f} MHz")
+        for name, net, _ in sta.endpoints:
+            print(f"   {name:20} arrival {sta.arrival[net]:<8g} slack {sta.slack(net):<8g} depth {sta.depth[net]}")
+            if args.paths:
+                for rank, (delay, nets) in enumerate(sta.critical_paths(net, args.paths), 1):
+                    print(f"      path {rank}: {delay:g} {unit}")
+                    for line in sta.path_report(nets):
+                        print(line)
+
+
+if __name__ == "__main__":
+    main()
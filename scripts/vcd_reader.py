@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Memory-Mapped VCD Reader
+
+Reads Value Change Dump files produced by the simulation flows
+(tb/sv_tb/*.vcd, tb/cocotb/*.vcd) without loading them into memory.
+
+The file is memory-mapped and the header is parsed once. The value-change
+section is then scanned in a single streaming pass over fixed-size chunks of
+the mapping, either as a generator of changes (iter_changes) or into a compact
+per-signal change index (build_index). The index keeps typed arrays per
+signal - timestamps plus one byte per change for scalars, or a packed integer
+per change for vectors - so "value at time T", "changes in window" and
+toggle-count queries stay cheap on multi-GB dumps.
+
+Usage:
+    python scripts/vcd_reader.py FILE [--signal NAME ...] [--at T]
+                                      [--window T0 T1] [--list]
+"""
+
+import re
+import sys
+import mmap
+import argparse
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Header declarations: $keyword ... $end
+HEADER_TOKEN = re.compile(rb'\$(\w+)(.*?)\$end', re.S)
+
+# Value-change section is read in chunks of this many bytes
+CHUNK_SIZE = 1 << 23
+
+# Scalar value codes stored in the index (keyed by the value's first byte)
+SCALAR_CODES = {ord('0'): 0, ord('1'): 1, ord('x'): 2, ord('X'): 2, ord('z'): 3, ord('Z'): 3}
+SCALAR_VALUES = ('0', '1', 'x', 'z')
+
+# First bytes of vector (b/B) and real (r/R) value changes
+VECTOR_PREFIXES = frozenset(b'bBrR')
+
+TIME_UNITS = {'s': 1.0, 'ms': 1e-3, 'us': 1e-6, 'ns': 1e-9, 'ps': 1e-12, 'fs': 1e-15}
+
+
+class VCDSignal:
+    """A declared VCD variable."""
+
+    __slots__ = ('name', 'scope', 'id_code', 'width', 'var_type')
+
+    def __init__(self, name: str, scope: str, id_code: str, width: int, var_type: str):
+        self.name = name
+        self.scope = scope
+        self.id_code = id_code
+        self.width = width
+        self.var_type = var_type
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.scope}.{self.name}" if self.scope else self.name
+
+    @property
+    def is_scalar(self) -> bool:
+        return self.width == 1 and self.var_type != 'real'
+
+    @property
+    def kind(self) -> str:
+        """Storage kind of the signal's values: scalar, vector or real."""
+        return 'real' if self.var_type == 'real' else 'scalar' if self.width == 1 else 'vector'
+
+    def __repr__(self):
+        return f"VCDSignal({self.full_name!r}, id={self.id_code!r}, width={self.width})"
+
+
+def vcd_value_to_int(value: Optional[str]) -> Optional[int]:
+    """Convert a VCD value string to an integer, or None if it holds x/z."""
+    if value is None:
+        return None
+    try:
+        return int(value, 2)
+    except ValueError:
+        return None
+
+
+def decode_value(kind: str, width: int, value, special: Optional[str] = None) -> str:
+    """Format a stored change (scalar code, packed integer or float) as a VCD value string."""
+    if kind == 'scalar':
+        return SCALAR_VALUES[value]
+    if kind == 'real':
+        return repr(value)
+    if special is not None:
+        return special.rjust(width, special[0] if special[0] in 'xz' else '0')
+    return format(value, f'0{width}b')
+
+
+def find_signal(signals: Dict[str, VCDSignal], name: str, path: str) -> VCDSignal:
+    """Look up a signal by full hierarchical name or unique name suffix."""
+    if name in signals:
+        return signals[name]
+    matches = [s for full, s in signals.items() if full.endswith('.' + name)]
+    # Names that alias one id code (e.g. a port seen from tb and dut) are the same signal
+    if matches and len({s.id_code for s in matches}) == 1:
+        return matches[0]
+    if not matches:
+        raise KeyError(f"{path}: no signal named '{name}'")
+    raise KeyError(f"{path}: '{name}' is ambiguous: "
+                   + ', '.join(s.full_name for s in matches))
+
+
+class VCDFile:
+    """Memory-mapped VCD file with a parsed header."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.timescale = '1s'
+        self.signals: Dict[str, VCDSignal] = {}
+        self.by_id: Dict[str, List[VCDSignal]] = {}
+        self.scopes: List[str] = []
+        self.end_time = 0  # Last timestamp, known after a full scan
+        self._body_start = 0
+        try:
+            self._parse_header()
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def timescale_seconds(self) -> float:
+        """Duration of one VCD time unit in seconds."""
+        match = re.match(r'\s*(\d+)\s*([a-z]+)', self.timescale)
+        if not match:
+            return 1.0
+        return int(match.group(1)) * TIME_UNITS.get(match.group(2), 1.0)
+
+    def _parse_header(self):
+        scope: List[str] = []
+        for match in HEADER_TOKEN.finditer(self._mm):
+            keyword = match.group(1).decode()
+            fields = match.group(2).decode(errors='replace').split()
+            if keyword == 'scope':
+                scope.append(fields[-1])
+                self.scopes.append('.'.join(scope))
+            elif keyword == 'upscope':
+                scope.pop()
+            elif keyword == 'var':
+                var_type, width, id_code, name = fields[0], int(fields[1]), fields[2], fields[3]
+                # Keep single-bit selects (bus[2]) in the name, drop [msb:lsb] ranges
+                if len(fields) > 4 and ':' not in fields[4]:
+                    name += ''.join(fields[4:])
+                signal = VCDSignal(name, '.'.join(scope), id_code, width, var_type)
+                self.signals[signal.full_name] = signal
+                self.by_id.setdefault(id_code, []).append(signal)
+            elif keyword == 'timescale':
+                self.timescale = ''.join(fields)
+            elif keyword == 'enddefinitions':
+                self._body_start = match.end()
+                return
+        raise ValueError(f"{self.path}: missing $enddefinitions")
+
+    def find(self, name: str) -> VCDSignal:
+        """Look up a signal by full hierarchical name or unique name suffix."""
+        return find_signal(self.signals, name, self.path)
+
+    def _chunks(self) -> Iterator[List[bytes]]:
+        """Whitespace-separated tokens of the value-change section, one chunk at a time."""
+        mm, size = self._mm, len(self._mm)
+        pos, carry = self._body_start, b''
+        while pos < size:
+            chunk = carry + mm[pos:pos + CHUNK_SIZE]
+            pos += CHUNK_SIZE
+            carry = b''
+            if pos < size:
+                # Hold back a token that may continue in the next chunk
+                cut = max(chunk.rfind(c) for c in (b' ', b'\t', b'\r', b'\n'))
+                carry, chunk = chunk[cut + 1:], chunk[:cut + 1]
+            yield chunk.split()
+        if carry:
+            yield carry.split()
+
+    def _scan(self, ids: Optional[Iterable[str]] = None) -> Iterator[Tuple[int, bytes, bytes]]:
+        """Single pass over the value changes: (time, id code, value)."""
+        wanted = {i.encode() for i in ids} if ids is not None else None
+        scalar_codes, vector_prefixes = SCALAR_CODES, VECTOR_PREFIXES
+        time = 0
+        pending = None       # Value of a b/r change waiting for its id code
+        in_comment = False
+        for tokens in self._chunks():
+            for token in tokens:
+                if pending is not None:
+                    if wanted is None or token in wanted:
+                        yield time, token, pending
+                    pending = None
+                    continue
+                if in_comment:
+                    in_comment = token != b'$end'
+                    continue
+                first = token[0]
+                if first in scalar_codes:
+                    id_code = token[1:]
+                    if wanted is None or id_code in wanted:
+                        yield time, id_code, token[:1]
+                elif first == 35:  # '#'
+                    time = int(token[1:])
+                elif first in vector_prefixes:
+                    pending = token[1:]
+                elif token == b'$comment':
+                    in_comment = True
+        self.end_time = max(self.end_time, time)
+
+    def iter_changes(self, signals: Optional[Iterable[str]] = None) -> Iterator[Tuple[int, str, str]]:
+        """Stream (time, id code, value) for every change, in file order.
+
+        Memory use is constant; pass signal names to restrict the stream.
+        """
+        ids = None
+        if signals is not None:
+            ids = {self.find(name).id_code for name in signals}
+        for time, id_code, value in self._scan(ids):
+            yield time, id_code.decode(), value.decode()
+
+    def build_index(self, signals: Optional[Iterable[str]] = None) -> 'VCDIndex':
+        """Build the per-signal change index in one streaming pass."""
+        ids = None
+        if signals is not None:
+            ids = {self.find(name).id_code for name in signals}
+        return VCDIndex(self, ids)
+
+
+class VCDIndex:
+    """Compact per-signal change index over a memory-mapped VCD file.
+
+    Scalars store one code byte per change. Vectors store a packed integer
+    per change; the rare values that do not fit (x/z bits, wider than 64
+    bits) are kept aside by change position. Reals store a double.
+    """
+
+    def __init__(self, vcd: VCDFile, ids: Optional[Iterable[str]] = None):
+        self.vcd = vcd
+        self.end_time = 0
+        self._times: Dict[bytes, array] = {}
+        self._values: Dict[bytes, array] = {}
+        self._kind: Dict[bytes, str] = {}
+        self._width: Dict[bytes, int] = {}
+        self._special: Dict[bytes, Dict[int, str]] = {}
+
+        for id_code, signals in vcd.by_id.items():
+            if ids is not None and id_code not in ids:
+                continue
+            key = id_code.encode()
+            signal = signals[0]
+            kind = signal.kind
+            self._kind[key] = kind
+            self._width[key] = signal.width
+            self._times[key] = array('Q')
+            self._values[key] = array({'scalar': 'B', 'vector': 'Q', 'real': 'd'}[kind])
+            self._special[key] = {}
+
+        times, values, kinds = self._times, self._values, self._kind
+        for time, id_code, value in vcd._scan(ids):
+            kind = kinds.get(id_code)
+            if kind is None:
+                continue
+            times[id_code].append(time)
+            column = values[id_code]
+            if kind == 'scalar':
+                column.append(SCALAR_CODES.get(value[-1], 2))
+            elif kind == 'vector':
+                try:
+                    packed = int(value, 2)
+                    if packed >> 64:
+                        raise ValueError
+                except ValueError:
+                    self._special[id_code][len(column)] = value.decode()
+                    packed = 0
+                column.append(packed)
+            else:
+                column.append(float(value))
+        self.end_time = vcd.end_time
+
+    def _key(self, name: str) -> bytes:
+        key = self.vcd.find(name).id_code.encode()
+        if key not in self._times:
+            raise KeyError(f"'{name}' was not indexed")
+        return key
+
+    def _decode(self, key: bytes, i: int) -> str:
+        """Value of change i of a signal, as a VCD value string."""
+        return decode_value(self._kind[key], self._width[key], self._values[key][i],
+                            self._special[key].get(i))
+
+    def change_count(self, name: str) -> int:
+        """Number of recorded value changes of a signal."""
+        return len(self._times[self._key(name)])
+
+    def value_at(self, name: str, time: int) -> Optional[str]:
+        """Value of a signal at a time (after all changes at that time), or None."""
+        key = self._key(name)
+        i = bisect_right(self._times[key], time) - 1
+        if i < 0:
+            return None
+        return self._decode(key, i)
+
+    def changes(self, name: str, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """(time, value) for every change with start <= time <= end."""
+        key = self._key(name)
+        times = self._times[key]
+        first = bisect_left(times, start)
+        last = len(times) if end is None else bisect_right(times, end)
+        for i in range(first, last):
+            yield times[i], self._decode(key, i)
+
+    def toggle_count(self, name: str, start: int = 0, end: Optional[int] = None) -> int:
+        """Number of value transitions of a signal within [start, end]."""
+        key = self._key(name)
+        times, values, special = self._times[key], self._values[key], self._special[key]
+        first = bisect_left(times, start)
+        last = len(times) if end is None else bisect_right(times, end)
+        if special:
+            column = [special.get(i, values[i]) for i in range(max(first - 1, 0), last)]
+        else:
+            column = values[max(first - 1, 0):last]
+        return sum(1 for previous, value in zip(column, column[1:]) if value != previous)
+
+
+def vcd_summary(path: str) -> str:
+    """One-line summary of a VCD file for reports."""
+    with VCDFile(path) as vcd:
+        changes = sum(1 for _ in vcd._scan())
+        return (f"{len(vcd.signals)} signals, {changes} value changes, "
+                f"end time {vcd.end_time} ({vcd.timescale})")
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Query a VCD file through a memory-mapped change index")
+    parser.add_argument("vcd", help="VCD file")
+    parser.add_argument("--signal", nargs="+", help="Signals to query (full name or unique suffix)")
+    parser.add_argument("--at", type=int, help="Print signal values at this time")
+    parser.add_argument("--window", type=int, nargs=2, metavar=("T0", "T1"), help="Print changes in [T0, T1]")
+    parser.add_argument("--list", action="store_true", help="List declared signals")
+    args = parser.parse_args()
+
+    with VCDFile(args.vcd) as vcd:
+        if args.list:
+            for signal in vcd.signals.values():
+                print(f"{signal.full_name:50} {signal.var_type:8} width={signal.width} id={signal.id_code}")
+            return
+
+        names = args.signal or list(vcd.signals)
+        try:
+            index = vcd.build_index(names)
+        except KeyError as e:
+            print(f"Error: {e.args[0]}")
+            sys.exit(1)
+
+        print(f"File: {args.vcd}  Timescale: {vcd.timescale}  End time: {index.end_time}")
+        for name in names:
+            signal = vcd.find(name)
+            line = f"{signal.full_name:50} changes={index.change_count(name):<8} toggles={index.toggle_count(name)}"
+            if args.at is not None:
+                line += f"  @{args.at}={index.value_at(name, args.at)}"
+            print(line)
+            if args.window:
+                for time, value in index.changes(name, *args.window):
+                    print(f"    #{time} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Offline Waveform Assertion Checker
+
+Checks declarative properties against recorded VCD waveforms of the full
+adder implementations after simulation, so simulations can run at full speed
+with tracing enabled and checking can run later on other cores.
+
+A property is a Python-syntax expression over signal names, for example
+"sum_o == a_i ^ b_i ^ cin_i". Only integer constants, signal names,
+arithmetic/bitwise/boolean operators, comparisons and conditional
+expressions are accepted. Use "x ^ 1" rather than "~x" to invert a single bit.
+
+Waveforms are streamed with vcd_reader.VCDFile.iter_changes, and only the
+current value of each referenced signal is kept, so memory stays bounded
+regardless of dump length. A property is evaluated on every state that has
+been stable for at least the settle time (in VCD time units). States with
+x/z on a referenced signal are skipped unless --strict is given. Files are
+checked in parallel worker processes.
+
+Usage:
+    python scripts/waveform_checker.py WAVE.vcd [...] [--property "name: expr" ...]
+                                       [--scope SCOPE] [--settle T] [--jobs N]
+"""
+
+import os
+import ast
+import sys
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+from vcd_reader import VCDFile, vcd_value_to_int
+
+# Default properties for every full_adder* implementation
+FULL_ADDER_PROPERTIES = [
+    "sum: sum_o == a_i ^ b_i ^ cin_i",
+    "carry: cout_o == (a_i & b_i) | (cin_i & (a_i ^ b_i))",
+]
+
+ALLOWED_NODES = (
+    ast.Expression, ast.BoolOp, ast.BinOp, ast.UnaryOp, ast.Compare, ast.IfExp,
+    ast.Name, ast.Load, ast.Constant,
+    ast.And, ast.Or, ast.Not, ast.Invert, ast.USub, ast.UAdd,
+    ast.BitXor, ast.BitAnd, ast.BitOr, ast.LShift, ast.RShift,
+    ast.Add, ast.Sub, ast.Mult, ast.FloorDiv, ast.Mod,
+    ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+)
+
+
+class Property:
+    """A named boolean expression over signal values."""
+
+    __slots__ = ('name', 'expr', 'names', 'code')
+
+    def __init__(self, spec: str):
+        name, sep, expr = spec.partition(':')
+        if not sep:
+            name, expr = spec, spec
+        self.name = name.strip()
+        self.expr = expr.strip()
+
+        tree = ast.parse(self.expr, mode='eval')
+        for node in ast.walk(tree):
+            if not isinstance(node, ALLOWED_NODES):
+                raise ValueError(f"Property '{self.name}': unsupported syntax {type(node).__name__}")
+            if isinstance(node, ast.Constant) and not isinstance(node.value, int):
+                raise ValueError(f"Property '{self.name}': only integer constants are allowed")
+        self.names = sorted({node.id for node in ast.walk(tree) if isinstance(node, ast.Name)})
+        self.code = compile(tree, f"<property {self.name}>", 'eval')
+
+    def holds(self, env: Dict[str, int]) -> bool:
+        return bool(eval(self.code, {'__builtins__': {}}, env))
+
+
+def resolve_scope(vcd: VCDFile, names: Sequence[str]) -> Optional[str]:
+    """Shallowest scope that declares every referenced name."""
+    for scope in sorted(vcd.scopes, key=lambda s: s.count('.')):
+        if all(f"{scope}.{name}" in vcd.signals for name in names):
+            return scope
+    return None
+
+
+def check_file(path: str, specs: Sequence[str], scope: Optional[str] = None, settle: int = 0,
+               strict: bool = False, max_violations: int = 20) -> Dict:
+    """Stream one waveform and evaluate every property on each settled state."""
+    properties = [Property(spec) for spec in specs]
+    names = sorted({name for prop in properties for name in prop.names})
+    stats = {prop.name: {'checked': 0, 'failed': 0, 'skipped': 0} for prop in properties}
+    result = {'file': path, 'scope': None, 'states': 0, 'properties': stats,
+              'violations': [], 'error': None}
+
+    try:
+        with VCDFile(path) as vcd:
+            scope = scope or resolve_scope(vcd, names)
+            result['scope'] = scope
+            full_names = {name: f"{scope}.{name}" if scope else name for name in names}
+            id_names: Dict[str, List[str]] = {}
+            for name, full_name in full_names.items():
+                id_names.setdefault(vcd.find(full_name).id_code, []).append(name)
+
+            env: Dict[str, Optional[int]] = dict.fromkeys(names)
+
+            def evaluate(time):
+                result['states'] += 1
+                for prop in properties:
+                    counters = stats[prop.name]
+                    if not strict and any(env[name] is None for name in prop.names):
+                        counters['skipped'] += 1
+                        continue
+                    counters['checked'] += 1
+                    try:
+                        ok = prop.holds(env)
+                    except TypeError:  # x/z operand in strict mode
+                        ok = False
+                    if not ok:
+                        counters['failed'] += 1
+                        if len(result['violations']) < max_violations:
+                            result['violations'].append({
+                                'time': time, 'property': prop.name,
+                                'values': {name: env[name] for name in prop.names}})
+
+            current = None
+            for time, id_code, value in vcd.iter_changes(full_names.values()):
+                if time != current:
+                    if current is not None and time - current >= settle:
+                        evaluate(current)
+                    current = time
+                number = vcd_value_to_int(value)
+                for name in id_names[id_code]:
+                    env[name] = number
+            if current is not None:
+                evaluate(current)
+    except OSError as e:
+        result['error'] = str(e)
+    except (KeyError, ValueError) as e:
+        result['error'] = str(e.args[0] if e.args else e)
+
+    return result
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Check declarative properties on recorded VCD waveforms")
+    parser.add_argument("waves", nargs="+", help="VCD files to check")
+    parser.add_argument("--property", action="append", dest="properties", metavar="'NAME: EXPR'",
+                        help="Property to check (repeatable; default: full adder sum and carry)")
+    parser.add_argument("--scope", help="Scope holding the signals (default: shallowest matching scope)")
+    parser.add_argument("--settle", type=int, default=0,
+                        help="Minimum time a state must be stable before it is checked (VCD units)")
+    parser.add_argument("--strict", action="store_true", help="Treat x/z values as failures instead of skipping")
+    parser.add_argument("--max-violations", type=int, default=20, help="Violations recorded per file")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Files checked in parallel")
+    parser.add_argument("--json", help="Write detailed results to this JSON file")
+    args = parser.parse_args()
+
+    specs = args.properties or FULL_ADDER_PROPERTIES
+    try:
+        for spec in specs:
+            Property(spec)
+    except (SyntaxError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(2)
+
+    jobs = max(1, min(args.jobs, len(args.waves)))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(check_file, wave, specs, args.scope, args.settle, args.strict,
+                               args.max_violations) for wave in args.waves]
+        results = [future.result() for future in futures]
+
+    failed = False
+    for result in results:
+        if result['error']:
+            failed = True
+            print(f"ERROR {result['file']}: {result['error']}")
+            continue
+        file_failed = any(stats['failed'] for stats in result['properties'].values())
+        failed = failed or file_failed
+        print(f"{'FAIL' if file_failed else 'PASS'}  {result['file']}  "
+              f"(scope {result['scope']}, {result['states']} states)")
+        for name, stats in result['properties'].items():
+            print(f"      {name:16} checked={stats['checked']:<8} failed={stats['failed']:<6} "
+                  f"skipped={stats['skipped']}")
+        for violation in result['violations']:
+            values = ", ".join(f"{k}={v}" for k, v in violation['values'].items())
+            print(f"      #{violation['time']}: {violation['property']} violated ({values})")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
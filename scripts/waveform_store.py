@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Columnar Waveform Store
+
+Converts VCD waveforms from the simulation flows (tb/sv_tb/*.vcd,
+tb/cocotb/*.vcd) into a compact columnar file (.wvs) and reads them back
+without re-parsing text.
+
+Every signal (VCD id code) is stored as its own column, split into chunks of
+at most CHUNK_CHANGES value changes. A chunk holds delta-encoded timestamps
+and XOR-delta-encoded values, each packed into the smallest unsigned array
+type that fits, followed by the rare x/z (or wider than 64 bit) vector values
+as text, and the whole chunk is zlib-compressed. A JSON directory at the end
+of the file records the signals and, per chunk, its offset and time range.
+
+Layout:
+    MAGIC | chunk ... | JSON directory | directory length (<Q) | MAGIC
+
+The reader memory-maps the file and parses only the directory; chunks are
+decompressed on demand, so a query touches only the requested signals and
+the chunks overlapping the requested time range. Values are returned in the
+same form as vcd_reader.VCDIndex.
+
+Usage:
+    python scripts/waveform_store.py convert WAVE.vcd [...] [--output OUT.wvs] [--signal NAME ...]
+    python scripts/waveform_store.py info STORE.wvs
+    python scripts/waveform_store.py query STORE.wvs --signal NAME [...] [--at T] [--window T0 T1]
+"""
+
+import os
+import sys
+import json
+import mmap
+import zlib
+import struct
+import argparse
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import accumulate
+from operator import xor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from vcd_reader import SCALAR_CODES, VCDFile, VCDSignal, decode_value, find_signal
+
+MAGIC = b'WVSTORE1'
+FORMAT_VERSION = 1
+STORE_SUFFIX = '.wvs'
+
+# Value changes per chunk (the unit of decompression)
+CHUNK_CHANGES = 1 << 16
+
+# Decoded chunks kept per open store
+CACHE_CHUNKS = 64
+
+# Candidate packed-array types, smallest first
+PACK_TYPES = 'BHIQ'
+
+# In-memory value array type per signal kind
+VALUE_TYPES = {'scalar': 'B', 'vector': 'Q', 'real': 'd'}
+
+# Directory chunk entry fields
+CHUNK_FIELDS = ('offset', 'length', 'count', 'first', 'last', 'time_type', 'value_type', 'special')
+
+
+def _pack(numbers) -> Tuple[str, bytes]:
+    """Pack non-negative integers into the smallest array type that holds them."""
+    top = max(numbers, default=0)
+    for code in PACK_TYPES:
+        if top >> (8 * array(code).itemsize) == 0:
+            return code, array(code, numbers).tobytes()
+    raise ValueError("value does not fit in 64 bits")
+
+
+class _ColumnWriter:
+    """Buffers the changes of one signal and writes them out chunk by chunk."""
+
+    __slots__ = ('kind', 'width', 'times', 'values', 'special', 'chunks', 'changes')
+
+    def __init__(self, kind: str, width: int):
+        self.kind = kind
+        self.width = width
+        self.times = array('Q')
+        self.values = array(VALUE_TYPES[kind])
+        self.special: Dict[int, str] = {}
+        self.chunks: List[List] = []
+        self.changes = 0
+
+    def append(self, time: int, value: bytes):
+        self.times.append(time)
+        if self.kind == 'scalar':
+            self.values.append(SCALAR_CODES.get(value[-1], 2))
+        elif self.kind == 'vector':
+            try:
+                packed = int(value, 2)
+                if packed >> 64:
+                    raise ValueError
+            except ValueError:
+                self.special[len(self.values)] = value.decode()
+                packed = 0
+            self.values.append(packed)
+        else:
+            self.values.append(float(value))
+
+    def flush(self, out, level: int):
+        times = self.times
+        if not times:
+            return
+        first = times[0]
+        deltas = [0]
+        deltas.extend(b - a for a, b in zip(times, times[1:]))
+        values = array('Q', self.values.tobytes()) if self.kind == 'real' else self.values
+        xors = [values[0]]
+        xors.extend(a ^ b for a, b in zip(values, values[1:]))
+        time_type, time_bytes = _pack(deltas)
+        value_type, value_bytes = _pack(xors)
+        special = ''.join(f"{i} {text}\n" for i, text in self.special.items()).encode()
+
+        blob = zlib.compress(time_bytes + value_bytes + special, level)
+        self.chunks.append([out.tell(), len(blob), len(times), first, times[-1],
+                            time_type, value_type, len(special)])
+        out.write(blob)
+
+        self.changes += len(times)
+        self.times = array('Q')
+        self.values = array(VALUE_TYPES[self.kind])
+        self.special = {}
+
+
+def convert(vcd_path: str, store_path: Optional[str] = None, signals: Optional[Iterable[str]] = None,
+            chunk_changes: int = CHUNK_CHANGES, level: int = 6) -> Dict:
+    """Convert a VCD file into a columnar store in one streaming pass."""
+    if store_path is None:
+        store_path = os.path.splitext(vcd_path)[0] + STORE_SUFFIX
+
+    with VCDFile(vcd_path) as vcd, open(store_path, 'wb') as out:
+        ids = None
+        if signals is not None:
+            ids = {vcd.find(name).id_code for name in signals}
+        writers = {id_code.encode(): _ColumnWriter(group[0].kind, group[0].width)
+                   for id_code, group in vcd.by_id.items() if ids is None or id_code in ids}
+
+        out.write(MAGIC)
+        for time, id_code, value in vcd._scan(ids):
+            writer = writers.get(id_code)
+            if writer is None:
+                continue
+            writer.append(time, value)
+            if len(writer.times) >= chunk_changes:
+                writer.flush(out, level)
+        for writer in writers.values():
+            writer.flush(out, level)
+
+        directory = {
+            'version': FORMAT_VERSION,
+            'source': os.path.basename(vcd_path),
+            'timescale': vcd.timescale,
+            'end_time': vcd.end_time,
+            'byteorder': sys.byteorder,
+            'scopes': vcd.scopes,
+            'signals': [[s.name, s.scope, s.id_code, s.width, s.var_type]
+                        for s in vcd.signals.values() if s.id_code.encode() in writers],
+            'columns': {key.decode(): {'kind': w.kind, 'width': w.width, 'changes': w.changes,
+                                       'chunks': w.chunks}
+                        for key, w in writers.items()},
+        }
+        footer = json.dumps(directory, separators=(',', ':')).encode()
+        out.write(footer)
+        out.write(struct.pack('<Q', len(footer)))
+        out.write(MAGIC)
+
+    vcd_bytes = os.path.getsize(vcd_path)
+    store_bytes = os.path.getsize(store_path)
+    return {
+        'source': vcd_path,
+        'store': store_path,
+        'signals': len(writers),
+        'changes': sum(w.changes for w in writers.values()),
+        'vcd_bytes': vcd_bytes,
+        'store_bytes': store_bytes,
+        'ratio': round(vcd_bytes / store_bytes, 2) if store_bytes else 0.0,
+    }
+
+
+class WaveformStore:
+    """Memory-mapped columnar waveform store with on-demand chunk decoding."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._chunk = lru_cache(maxsize=CACHE_CHUNKS)(self._decode_chunk)
+        try:
+            self._read_directory()
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        self._chunk.cache_clear()
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read_directory(self):
+        mm, tail = self._mm, len(MAGIC) + 8
+        if len(mm) < len(MAGIC) + tail or mm[:len(MAGIC)] != MAGIC or mm[-len(MAGIC):] != MAGIC:
+            raise ValueError(f"{self.path}: not a waveform store")
+        (length,) = struct.unpack('<Q', mm[-tail:-len(MAGIC)])
+        directory = json.loads(mm[-tail - length:-tail])
+        if directory.get('version') != FORMAT_VERSION:
+            raise ValueError(f"{self.path}: unsupported store version {directory.get('version')}")
+
+        self.source = directory['source']
+        self.timescale = directory['timescale']
+        self.end_time = directory['end_time']
+        self.scopes: List[str] = directory['scopes']
+        self._swap = directory['byteorder'] != sys.byteorder
+        self.signals: Dict[str, VCDSignal] = {}
+        self.by_id: Dict[str, List[VCDSignal]] = {}
+        for name, scope, id_code, width, var_type in directory['signals']:
+            signal = VCDSignal(name, scope, id_code, width, var_type)
+            self.signals[signal.full_name] = signal
+            self.by_id.setdefault(id_code, []).append(signal)
+        self.columns: Dict[str, Dict] = directory['columns']
+        self._firsts = {id_code: [chunk[3] for chunk in column['chunks']]
+                        for id_code, column in self.columns.items()}
+
+    def find(self, name: str) -> VCDSignal:
+        """Look up a signal by full hierarchical name or unique name suffix."""
+        return find_signal(self.signals, name, self.path)
+
+    def _decode_chunk(self, id_code: str, index: int) -> Tuple[array, array, Dict[int, str]]:
+        """Decompress one chunk into (times, values, special values by position)."""
+        column = self.columns[id_code]
+        offset, length, count, first, _, time_type, value_type, _ = column['chunks'][index]
+        raw = zlib.decompress(self._mm[offset:offset + length])
+
+        deltas, xors = array(time_type), array(value_type)
+        split = deltas.itemsize * count
+        deltas.frombytes(raw[:split])
+        xors.frombytes(raw[split:split + xors.itemsize * count])
+        if self._swap:
+            deltas.byteswap()
+            xors.byteswap()
+
+        times = array('Q', accumulate(deltas, initial=first))
+        del times[0]
+        values = array('Q', accumulate(xors, xor))
+        if column['kind'] == 'real':
+            values = array('d', values.tobytes())
+        elif column['kind'] == 'scalar':
+            values = array('B', values)
+
+        special = {}
+        for line in raw[split + xors.itemsize * count:].decode().splitlines():
+            position, text = line.split(' ', 1)
+            special[int(position)] = text
+        return times, values, special
+
+    def _id(self, name: str) -> str:
+        id_code = self.find(name).id_code
+        if id_code not in self.columns:
+            raise KeyError(f"'{name}' was not stored")
+        return id_code
+
+    def column(self, name: str, start: int = 0, end: Optional[int] = None,
+               previous: bool = False) -> Tuple[array, array, Dict[int, str]]:
+        """Raw (times, values, special) of the changes with start <= time <= end.
+
+        Values are scalar codes (0, 1, x=2, z=3), packed integers or floats as
+        in vcd_reader.VCDIndex. With previous=True the last change before start
+        is included. Only chunks overlapping the window are decoded.
+        """
+        id_code = self._id(name)
+        firsts = self._firsts[id_code]
+        # Last chunk starting before the window holds the change preceding it
+        lo = max(bisect_left(firsts, start) - 1, 0)
+        hi = len(firsts) if end is None else bisect_right(firsts, end)
+
+        times = array('Q')
+        values = array(VALUE_TYPES[self.columns[id_code]['kind']])
+        special: Dict[int, str] = {}
+        for index in range(lo, hi):
+            chunk_times, chunk_values, chunk_special = self._chunk(id_code, index)
+            base = len(times)
+            times.extend(chunk_times)
+            values.extend(chunk_values)
+            for position, text in chunk_special.items():
+                special[base + position] = text
+
+        first = bisect_left(times, start)
+        last = len(times) if end is None else bisect_right(times, end)
+        if previous and first > 0:
+            first -= 1
+        special = {position - first: text for position, text in special.items() if first <= position < last}
+        return times[first:last], values[first:last], special
+
+    def change_count(self, name: str) -> int:
+        """Number of recorded value changes of a signal."""
+        return self.columns[self._id(name)]['changes']
+
+    def value_at(self, name: str, time: int) -> Optional[str]:
+        """Value of a signal at a time (after all changes at that time), or None."""
+        id_code = self._id(name)
+        index = bisect_right(self._firsts[id_code], time) - 1
+        if index < 0:
+            return None
+        times, values, special = self._chunk(id_code, index)
+        i = bisect_right(times, time) - 1
+        column = self.columns[id_code]
+        return decode_value(column['kind'], column['width'], values[i], special.get(i))
+
+    def changes(self, name: str, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """(time, value) for every change with start <= time <= end."""
+        column = self.columns[self._id(name)]
+        times, values, special = self.column(name, start, end)
+        for i, time in enumerate(times):
+            yield time, decode_value(column['kind'], column['width'], values[i], special.get(i))
+
+    def toggle_count(self, name: str, start: int = 0, end: Optional[int] = None) -> int:
+        """Number of value transitions of a signal within [start, end]."""
+        _, values, special = self.column(name, start, end, previous=True)
+        if special:
+            values = [special.get(i, value) for i, value in enumerate(values)]
+        return sum(1 for previous, value in zip(values, values[1:]) if value != previous)
+
+
+def _print_conversion(stats: Dict):
+    print(f"{stats['source']} -> {stats['store']}: {stats['signals']} signals, {stats['changes']} changes, "
+          f"{stats['vcd_bytes']} -> {stats['store_bytes']} bytes ({stats['ratio']}x)")
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Convert VCD waveforms to a columnar store and query them")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert_cmd = commands.add_parser("convert", help="Convert VCD files to .wvs stores")
+    convert_cmd.add_argument("vcds", nargs="+", help="VCD files")
+    convert_cmd.add_argument("--output", help="Output store (single input only; default: <vcd>.wvs)")
+    convert_cmd.add_argument("--signal", nargs="+", help="Only store these signals")
+    convert_cmd.add_argument("--chunk-changes", type=int, default=CHUNK_CHANGES, help="Value changes per chunk")
+    convert_cmd.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Files converted in parallel")
+
+    info_cmd = commands.add_parser("info", help="Show the contents of a store")
+    info_cmd.add_argument("store", help="Waveform store")
+
+    query_cmd = commands.add_parser("query", help="Query signals in a store")
+    query_cmd.add_argument("store", help="Waveform store")
+    query_cmd.add_argument("--signal", nargs="+", help="Signals to query (full name or unique suffix)")
+    query_cmd.add_argument("--at", type=int, help="Print signal values at this time")
+    query_cmd.add_argument("--window", type=int, nargs=2, metavar=("T0", "T1"), help="Print changes in [T0, T1]")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "convert":
+            if args.output and len(args.vcds) > 1:
+                parser.error("--output needs a single input file")
+            jobs = max(1, min(args.jobs, len(args.vcds)))
+            if jobs == 1:
+                results = [convert(vcd, args.output, args.signal, args.chunk_changes) for vcd in args.vcds]
+            else:
+                with ProcessPoolExecutor(max_workers=jobs) as pool:
+                    futures = [pool.submit(convert, vcd, None, args.signal, args.chunk_changes)
+                               for vcd in args.vcds]
+                    results = [future.result() for future in futures]
+            for stats in results:
+                _print_conversion(stats)
+            return
+
+        with WaveformStore(args.store) as store:
+            if args.command == "info":
+                print(f"Store: {args.store}  Source: {store.source}  Timescale: {store.timescale}  "
+                      f"End time: {store.end_time}")
+                for signal in store.signals.values():
+                    column = store.columns[signal.id_code]
+                    print(f"{signal.full_name:50} {signal.var_type:8} width={signal.width} "
+                          f"changes={column['changes']} chunks={len(column['chunks'])}")
+                return
+
+            names = args.signal or list(store.signals)
+            print(f"Store: {args.store}  Timescale: {store.timescale}  End time: {store.end_time}")
+            for name in names:
+                signal = store.find(name)
+                line = f"{signal.full_name:50} changes={store.change_count(name):<8} toggles={store.toggle_count(name)}"
+                if args.at is not None:
+                    line += f"  @{args.at}={store.value_at(name, args.at)}"
+                print(line)
+                if args.window:
+                    for time, value in store.changes(name, *args.window):
+                        print(f"    #{time} {value}")
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    except KeyError as e:
+        print(f"Error: {e.args[0]}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
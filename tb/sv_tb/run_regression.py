@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Compile-Once Regression Runner for the Icarus SystemVerilog Testbenches
+=======================================================================
+Runs many plusarg-selected simulations from one compiled vvp image
+(simv.out) in parallel.  Each run selects a testbench (+TB), a test
+(+TEST), a seed (+SEED) and optionally a vector file (+VECTORS), and gets
+its own log and waveform file so concurrent runs never clobber each other.
+
+Usage:
+    python3 run_regression.py [--image simv.out] [--jobs N] [--seeds N]
+                              [--tb NAME ...] [--test NAME ...]
+                              [--vectors FILE] [--waves]
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+TESTBENCHES = ['tb_full_adder', 'tb_full_adder_simple', 'tb_full_adder_half_adder']
+TESTS = ['exhaustive', 'random']
+
+RESULT_PATTERN = re.compile(r'^Result: (PASS|FAIL) .*vectors=(\d+) errors=(\d+)', re.M)
+
+
+def build_runs(testbenches, tests, seeds, first_seed, vectors):
+    """Expand the testbench x test x seed matrix into a list of run specs."""
+    runs = []
+    for tb in testbenches:
+        for test in tests:
+            # Only the random test depends on the seed
+            test_seeds = range(first_seed, first_seed + seeds) if test == 'random' else [first_seed]
+            for seed in test_seeds:
+                runs.append({'tb': tb, 'test': test, 'seed': seed, 'vectors': vectors})
+        if vectors:
+            runs.append({'tb': tb, 'test': 'vectors', 'seed': first_seed, 'vectors': vectors})
+    return runs
+
+
+def run_one(image, run, out_dir, num_vectors, waves, vvp='vvp'):
+    """Run a single simulation from the compiled image and parse its result."""
+    name = f"{run['tb']}_{run['test']}_{run['seed']}"
+    log_file = out_dir / f"{name}.log"
+    cmd = [vvp, '-n', str(image),
+           f"+TB={run['tb']}", f"+TEST={run['test']}", f"+SEED={run['seed']}",
+           f"+NUM_VECTORS={num_vectors}"]
+    if run['vectors']:
+        cmd.append(f"+VECTORS={run['vectors']}")
+    if waves:
+        cmd.append(f"+VCD={out_dir / (name + '.vcd')}")
+    else:
+        cmd.append('+NO_VCD')
+
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    elapsed = time.perf_counter() - start
+    log_file.write_text(proc.stdout)
+
+    match = RESULT_PATTERN.search(proc.stdout)
+    passed = bool(match) and match.group(1) == 'PASS' and proc.returncode == 0
+    return {
+        'name': name,
+        'tb': run['tb'],
+        'test': run['test'],
+        'seed': run['seed'],
+        'status': 'PASS' if passed else 'FAIL',
+        'vectors': int(match.group(2)) if match else 0,
+        'errors': int(match.group(3)) if match else None,
+        'returncode': proc.returncode,
+        'seconds': round(elapsed, 3),
+        'log': str(log_file)
+    }
+
+
+def main():
+    """Run the regression matrix concurrently and summarize the results."""
+    parser = argparse.ArgumentParser(description="Compile-once regression runner for the Icarus SV testbenches")
+    parser.add_argument('--image', default='simv.out', help='Compiled vvp image (default: simv.out)')
+    parser.add_argument('--vvp', default='vvp', help='vvp executable (default: vvp)')
+    parser.add_argument('--tb', nargs='+', default=TESTBENCHES, help='Testbench modules to run')
+    parser.add_argument('--test', nargs='+', default=TESTS, help='Tests to run (exhaustive, random)')
+    parser.add_argument('--seeds', type=int, default=8, help='Number of seeds per random test (default: 8)')
+    parser.add_argument('--first-seed', type=int, default=1, help='First seed (default: 1)')
+    parser.add_argument('--num-vectors', type=int, default=100, help='Vectors per random run (default: 100)')
+    parser.add_argument('--vectors', help='Vector file; adds a vectors run per testbench')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='Concurrent simulations')
+    parser.add_argument('--out-dir', default='regress', help='Directory for logs and waveforms')
+    parser.add_argument('--waves', action='store_true', help='Dump a VCD per run')
+    args = parser.parse_args()
+
+    image = Path(args.image)
+    if not image.exists():
+        print(f"Error: {image} not found. Compile first (make {image}).")
+        sys.exit(1)
+
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    vectors = str(Path(args.vectors).resolve()) if args.vectors else None
+
+    runs = build_runs(args.tb, args.test, args.seeds, args.first_seed, vectors)
+    print(f"Running {len(runs)} simulations from {image} with {args.jobs} jobs...")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        results = list(pool.map(
+            lambda run: run_one(image, run, out_dir, args.num_vectors, args.waves, args.vvp), runs))
+    elapsed = time.perf_counter() - start
+
+    failed = [r for r in results if r['status'] != 'PASS']
+    for result in results:
+        print(f"{result['status']:4}  {result['name']:45}  vectors={result['vectors']:<6} {result['seconds']:.2f}s")
+
+    summary = {
+        'image': str(image),
+        'runs': len(results),
+        'passed': len(results) - len(failed),
+        'failed': len(failed),
+        'seconds': round(elapsed, 3),
+        'results': results
+    }
+    with open(out_dir / 'regression_summary.json', 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"\n=== Regression Summary: {summary['passed']}/{summary['runs']} passed in {elapsed:.2f}s ===")
+    print(f"Summary written to: {out_dir / 'regression_summary.json'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,23 @@ module tb_full_adder_simple;
     logic sum_o, cout_o;
     logic expected_sum, expected_cout;
     
+    // Run-time configuration (plusargs) - one compiled image serves many runs
+    //   +TB=<module>       Run only the named testbench (default: all compiled tops)
+    //   +TEST=<name>       exhaustive (default), random or vectors
+    //   +SEED=<n>          Seed for the random test (default: 1)
+    //   +NUM_VECTORS=<n>   Number of random vectors (default: 100)
+    //   +VECTORS=<path>    Vector file for the vectors test ("a b cin" per line)
+    //   +VCD=<path>        Waveform file name
+    //   +NO_VCD            Disable waveform dumping
+    string  tb_select;
+    string  test_name;
+    string  vector_file;
+    string  vcd_file;
+    integer seed;
+    integer num_vectors;
+    integer test_count;
+    integer error_count;
+    
     // Clock generation
     initial begin
         clk_i = 0;
@@ -33,27 +50,99 @@ module tb_full_adder_simple;
     
     // Test stimulus and monitoring
     initial begin
-        $display("=== Full Adder Simple (XOR/AND) Testbench ===");
-        $display("Time\ta_i\tb_i\tcin_i\tsum_o\tcout_o\tExpected sum_o\tExpected cout_o\tStatus");
-        $display("----------------------------------------------------------------------------");
-        
-        // Test all 8 possible input combinations
-        test_case(1'b0, 1'b0, 1'b0); // 0 + 0 + 0 = 0
-        test_case(1'b0, 1'b0, 1'b1); // 0 + 0 + 1 = 1
-        test_case(1'b0, 1'b1, 1'b0); // 0 + 1 + 0 = 1
-        test_case(1'b0, 1'b1, 1'b1); // 0 + 1 + 1 = 2 (carry)
-        test_case(1'b1, 1'b0, 1'b0); // 1 + 0 + 0 = 1
-        test_case(1'b1, 1'b0, 1'b1); // 1 + 0 + 1 = 2 (carry)
-        test_case(1'b1, 1'b1, 1'b0); // 1 + 1 + 0 = 2 (carry)
-        test_case(1'b1, 1'b1, 1'b1); // 1 + 1 + 1 = 3 (carry)
-        
-        // Additional delay for waveform viewing
-        #10;
-        
-        $display("=== Testbench Complete ===");
-        $finish;
+        if (!$value$plusargs("TB=%s", tb_select)) tb_select = "tb_full_adder_simple";
+        if (tb_select == "tb_full_adder_simple") begin
+            if (!$value$plusargs("TEST=%s", test_name)) test_name = "exhaustive";
+            if (!$value$plusargs("SEED=%d", seed)) seed = 1;
+            if (!$value$plusargs("NUM_VECTORS=%d", num_vectors)) num_vectors = 100;
+            if (!$value$plusargs("VECTORS=%s", vector_file)) vector_file = "";
+            if (!$value$plusargs("VCD=%s", vcd_file)) vcd_file = "full_adder_simple.vcd";
+            test_count = 0;
+            error_count = 0;
+            
+            // Generate VCD file for waveform viewing
+            if (!$test$plusargs("NO_VCD")) begin
+                $dumpfile(vcd_file);
+                $dumpvars(0, tb_full_adder_simple);
+            end
+            
+            $display("=== Full Adder Simple (XOR/AND) Testbench ===");
+            $display("Test: %s  Seed: %0d", test_name, seed);
+            $display("Time\ta_i\tb_i\tcin_i\tsum_o\tcout_o\tExpected sum_o\tExpected cout_o\tStatus");
+            $display("----------------------------------------------------------------------------");
+            
+            if (test_name == "exhaustive") begin
+                run_exhaustive();
+            end else if (test_name == "random") begin
+                run_random(num_vectors);
+            end else if (test_name == "vectors") begin
+                run_vector_file(vector_file);
+            end else begin
+                $error("Unknown test '%s' (expected exhaustive, random or vectors)", test_name);
+                error_count = error_count + 1;
+            end
+            
+            // Additional delay for waveform viewing
+            #10;
+            
+            $display("Result: %s test=%s seed=%0d vectors=%0d errors=%0d",
+                     (error_count == 0 && test_count > 0) ? "PASS" : "FAIL",
+                     test_name, seed, test_count, error_count);
+            $display("=== Testbench Complete ===");
+            $finish;
+        end
     end
     
+    // Test all 8 possible input combinations
+    task run_exhaustive();
+        begin
+            test_case(1'b0, 1'b0, 1'b0); // 0 + 0 + 0 = 0
+            test_case(1'b0, 1'b0, 1'b1); // 0 + 0 + 1 = 1
+            test_case(1'b0, 1'b1, 1'b0); // 0 + 1 + 0 = 1
+            test_case(1'b0, 1'b1, 1'b1); // 0 + 1 + 1 = 2 (carry)
+            test_case(1'b1, 1'b0, 1'b0); // 1 + 0 + 0 = 1
+            test_case(1'b1, 1'b0, 1'b1); // 1 + 0 + 1 = 2 (carry)
+            test_case(1'b1, 1'b1, 1'b0); // 1 + 1 + 0 = 2 (carry)
+            test_case(1'b1, 1'b1, 1'b1); // 1 + 1 + 1 = 3 (carry)
+        end
+    endtask
+    
+    // Apply seeded random input combinations
+    task run_random(input integer count);
+        integer i;
+        integer r;
+        begin
+            for (i = 0; i < count; i = i + 1) begin
+                r = $random(seed);
+                test_case(r[0], r[1], r[2]);
+            end
+        end
+    endtask
+    
+    // Apply input combinations read from a vector file ("a b cin" per line,
+    // lines that do not parse - e.g. '#' comments - are skipped)
+    task run_vector_file(input string path);
+        integer fd;
+        integer code;
+        reg [8*256-1:0] line;
+        logic va, vb, vc;
+        begin
+            fd = $fopen(path, "r");
+            if (fd == 0) begin
+                $error("Cannot open vector file '%s'", path);
+                error_count = error_count + 1;
+            end else begin
+                while (!$feof(fd)) begin
+                    line = 0;
+                    code = $fgets(line, fd);
+                    if (code > 0 && $sscanf(line, "%b %b %b", va, vb, vc) == 3)
+                        test_case(va, vb, vc);
+                end
+                $fclose(fd);
+            end
+        end
+    endtask
+    
     // Task to test a specific input combination
     task test_case(input logic test_a, test_b, test_cin);
         begin
@@ -75,18 +164,14 @@ module tb_full_adder_simple;
                      (sum_o === expected_sum && cout_o === expected_cout) ? "PASS" : "FAIL");
             
             // Verify outputs
+            test_count = test_count + 1;
             if (sum_o !== expected_sum || cout_o !== expected_cout) begin
+                error_count = error_count + 1;
                 $error("Test failed for a_i=%b, b_i=%b, cin_i=%b", test_a, test_b, test_cin);
                 $error("Expected: sum_o=%b, cout_o=%b", expected_sum, expected_cout);
                 $error("Got: sum_o=%b, cout_o=%b", sum_o, cout_o);
             end
         end
     endtask
-    
-    // Optional: Generate VCD file for waveform viewing
-    initial begin
-        $dumpfile("full_adder_simple.vcd");
-        $dumpvars(0, tb_full_adder_simple);
-    end
 
 endmodule 
\ No newline at end of file
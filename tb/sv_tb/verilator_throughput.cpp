@@ -0,0 +1,254 @@
+//==============================================================================
+// Verilator Multi-Threaded Throughput Harness for Full Adder Models
+//==============================================================================
+// Description: Drives a Verilated full adder implementation (built with
+//              --prefix Vdut) from several worker threads. Each thread owns an
+//              independent VerilatedContext and model instance and checks its
+//              own slice of the stimulus space (exhaustive, random or a vector
+//              file). Mismatches are aggregated and evals/second are reported
+//              per thread and in total. Coverage builds write one coverage
+//              shard per thread for scripts/coverage_merge.py.
+// Author:      Vyges Team
+// Date:        2026-10-19
+// Version:     1.0.0
+//==============================================================================
+
+#include "Vdut.h"
+#include <verilated.h>
+#if VM_COVERAGE
+#include <verilated_cov.h>
+#endif
+#include <algorithm>
+#include <chrono>
+#include <cstdint>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <fstream>
+#include <iostream>
+#include <memory>
+#include <sstream>
+#include <string>
+#include <thread>
+#include <vector>
+
+// Time stamp function required by Verilator
+double sc_time_stamp() { return 0; }
+
+namespace {
+
+// Number of mismatches recorded in detail per thread
+constexpr size_t MAX_RECORDED_MISMATCHES = 8;
+
+struct Options {
+    unsigned threads = 0;            // 0 = all hardware threads
+    uint64_t evals = 10000000;       // Total evaluations (exhaustive/random)
+    std::string mode = "exhaustive"; // exhaustive, random or vectors
+    std::string vectors;             // Vector file ("a b cin" per line)
+    uint64_t seed = 1;
+    std::string coverage_dir = ".";  // Per-thread coverage shards (coverage builds)
+};
+
+struct Mismatch {
+    uint64_t index;
+    unsigned pattern;
+    unsigned sum;
+    unsigned cout;
+};
+
+struct WorkerResult {
+    uint64_t evals = 0;
+    uint64_t mismatches = 0;
+    double seconds = 0.0;
+    std::vector<Mismatch> recorded;
+};
+
+void usage(const char* prog) {
+    std::cout << "Usage: " << prog
+              << " [--threads N] [--evals N] [--mode exhaustive|random|vectors]"
+              << " [--vectors FILE] [--seed N] [--coverage-dir DIR]" << std::endl;
+}
+
+bool parse_args(int argc, char** argv, Options& opts) {
+    for (int i = 1; i < argc; ++i) {
+        std::string arg = argv[i];
+        auto value = [&]() -> const char* { return (i + 1 < argc) ? argv[++i] : ""; };
+        if (arg == "--threads") {
+            opts.threads = static_cast<unsigned>(std::strtoul(value(), nullptr, 10));
+        } else if (arg == "--evals") {
+            opts.evals = std::strtoull(value(), nullptr, 10);
+        } else if (arg == "--mode") {
+            opts.mode = value();
+        } else if (arg == "--vectors") {
+            opts.vectors = value();
+            opts.mode = "vectors";
+        } else if (arg == "--seed") {
+            opts.seed = std::strtoull(value(), nullptr, 10);
+        } else if (arg == "--coverage-dir") {
+            opts.coverage_dir = value();
+        } else if (arg == "--help" || arg == "-h") {
+            usage(argv[0]);
+            return false;
+        } else if (arg[0] != '+') {  // Plusargs are left for the model
+            std::cerr << "Unknown argument: " << arg << std::endl;
+            usage(argv[0]);
+            return false;
+        }
+    }
+    if (opts.mode != "exhaustive" && opts.mode != "random" && opts.mode != "vectors") {
+        std::cerr << "Unknown mode: " << opts.mode << std::endl;
+        return false;
+    }
+    if (opts.mode == "vectors" && opts.vectors.empty()) {
+        std::cerr << "--mode vectors requires --vectors FILE" << std::endl;
+        return false;
+    }
+    return true;
+}
+
+// Load "a b cin" triples packed as {a, b, cin} -> bit2..bit0; other lines are skipped
+bool load_vectors(const std::string& path, std::vector<uint8_t>& patterns) {
+    std::ifstream in(path);
+    if (!in) {
+        std::cerr << "Cannot open vector file: " << path << std::endl;
+        return false;
+    }
+    std::string line;
+    while (std::getline(in, line)) {
+        std::istringstream fields(line);
+        unsigned a, b, cin;
+        if (fields >> a >> b >> cin && a <= 1 && b <= 1 && cin <= 1) {
+            patterns.push_back(static_cast<uint8_t>((a << 2) | (b << 1) | cin));
+        }
+    }
+    return true;
+}
+
+// xorshift64* - cheap, independent random stream per thread
+inline uint64_t next_random(uint64_t& state) {
+    state ^= state >> 12;
+    state ^= state << 25;
+    state ^= state >> 27;
+    return state * 0x2545F4914F6CDD1DULL;
+}
+
+void worker(unsigned tid, const Options& opts, const std::vector<uint8_t>& patterns,
+            uint64_t begin, uint64_t end, WorkerResult& result) {
+    // One context and one model per thread - no shared simulation state
+    auto contextp = std::make_unique<VerilatedContext>();
+    auto model = std::make_unique<Vdut>(contextp.get(), "dut");
+    model->clk_i = 0;
+    model->reset_n_i = 1;
+
+    const bool random_mode = opts.mode == "random";
+    const bool vector_mode = opts.mode == "vectors";
+    uint64_t rng = (opts.seed + 1) * 0x9E3779B97F4A7C15ULL ^ (static_cast<uint64_t>(tid) + 1);
+
+    auto start = std::chrono::steady_clock::now();
+    for (uint64_t i = begin; i < end; ++i) {
+        unsigned pattern;
+        if (vector_mode) {
+            pattern = patterns[i];
+        } else if (random_mode) {
+            pattern = static_cast<unsigned>(next_random(rng) >> 61);
+        } else {
+            pattern = static_cast<unsigned>(i & 7);
+        }
+        const unsigned a = (pattern >> 2) & 1;
+        const unsigned b = (pattern >> 1) & 1;
+        const unsigned cin = pattern & 1;
+
+        model->a_i = a;
+        model->b_i = b;
+        model->cin_i = cin;
+        model->eval();
+
+        const unsigned expected_sum = a ^ b ^ cin;
+        const unsigned expected_cout = (a & b) | (cin & (a ^ b));
+        if (model->sum_o != expected_sum || model->cout_o != expected_cout) {
+            ++result.mismatches;
+            if (result.recorded.size() < MAX_RECORDED_MISMATCHES) {
+                result.recorded.push_back({i, pattern, model->sum_o, model->cout_o});
+            }
+        }
+    }
+    auto stop = std::chrono::steady_clock::now();
+
+    result.evals = end - begin;
+    result.seconds = std::chrono::duration<double>(stop - start).count();
+    model->final();
+#if VM_COVERAGE
+    const std::string shard = opts.coverage_dir + "/coverage_t" + std::to_string(tid) + ".dat";
+    contextp->coveragep()->write(shard.c_str());
+#endif
+}
+
+}  // namespace
+
+int main(int argc, char** argv) {
+    Options opts;
+    if (!parse_args(argc, argv, opts)) {
+        return 2;
+    }
+
+    std::vector<uint8_t> patterns;
+    if (opts.mode == "vectors") {
+        if (!load_vectors(opts.vectors, patterns)) {
+            return 2;
+        }
+        opts.evals = patterns.size();
+    }
+
+    unsigned threads = opts.threads ? opts.threads : std::thread::hardware_concurrency();
+    threads = std::max(1u, threads);
+    if (opts.evals < threads) {
+        threads = static_cast<unsigned>(std::max<uint64_t>(1, opts.evals));
+    }
+
+    // Split the stimulus index space into contiguous per-thread slices
+    std::vector<WorkerResult> results(threads);
+    std::vector<std::thread> pool;
+    const uint64_t chunk = opts.evals / threads;
+    const uint64_t extra = opts.evals % threads;
+    uint64_t begin = 0;
+
+    auto start = std::chrono::steady_clock::now();
+    for (unsigned tid = 0; tid < threads; ++tid) {
+        const uint64_t end = begin + chunk + (tid < extra ? 1 : 0);
+        pool.emplace_back(worker, tid, std::cref(opts), std::cref(patterns), begin, end,
+                          std::ref(results[tid]));
+        begin = end;
+    }
+    for (auto& t : pool) {
+        t.join();
+    }
+    auto stop = std::chrono::steady_clock::now();
+    const double wall = std::chrono::duration<double>(stop - start).count();
+
+    // Aggregate and report
+    uint64_t total_evals = 0;
+    uint64_t total_mismatches = 0;
+    std::cout << "=== Verilator Throughput: mode=" << opts.mode << " threads=" << threads
+              << " ===" << std::endl;
+    for (unsigned tid = 0; tid < threads; ++tid) {
+        const WorkerResult& r = results[tid];
+        total_evals += r.evals;
+        total_mismatches += r.mismatches;
+        std::printf("Thread %3u: %12llu evals  %8.3f s  %14.0f evals/s  %llu mismatches\n", tid,
+                    static_cast<unsigned long long>(r.evals), r.seconds,
+                    r.seconds > 0 ? r.evals / r.seconds : 0.0,
+                    static_cast<unsigned long long>(r.mismatches));
+        for (const Mismatch& m : r.recorded) {
+            std::printf("  MISMATCH index=%llu a=%u b=%u cin=%u -> sum_o=%u cout_o=%u\n",
+                        static_cast<unsigned long long>(m.index), (m.pattern >> 2) & 1,
+                        (m.pattern >> 1) & 1, m.pattern & 1, m.sum, m.cout);
+        }
+    }
+    std::printf("Total:      %12llu evals  %8.3f s  %14.0f evals/s  %llu mismatches\n",
+                static_cast<unsigned long long>(total_evals), wall,
+                wall > 0 ? total_evals / wall : 0.0,
+                static_cast<unsigned long long>(total_mismatches));
+    std::cout << "Result: " << (total_mismatches == 0 ? "PASS" : "FAIL") << std::endl;
+
+    return total_mismatches == 0 ? 0 : 1;
+}
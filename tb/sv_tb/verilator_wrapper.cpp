@@ -12,6 +12,10 @@
 #include <verilated.h>
 #include <verilated_vcd_c.h>
 #include <iostream>
+#include <string>
+#if VM_COVERAGE
+#include <verilated_cov.h>
+#endif
 
 // Time stamp function required by Verilator
 double sc_time_stamp() { return 0; }
@@ -51,6 +55,14 @@ int main(int argc, char** argv) {
     
     // Cleanup
     tfp->close();
+    
+#if VM_COVERAGE
+    // Write this run's coverage shard (+COVERAGE_FILE=<path>, default coverage.dat)
+    std::string coverage_file = Verilated::commandArgsPlusMatch("COVERAGE_FILE=");
+    coverage_file = coverage_file.empty() ? "coverage.dat"
+                                          : coverage_file.substr(std::string("+COVERAGE_FILE=").size());
+    Verilated::threadContextp()->coveragep()->write(coverage_file.c_str());
+#endif
     delete top;
     delete tfp;
     
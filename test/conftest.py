@@ -0,0 +1,142 @@
+"""
+Shared fixtures for the netlist and waveform tool tests.
+
+The tools live in scripts/ and import each other by module name, so the
+directory is put on sys.path as the flow scripts do.
+"""
+
+import sys
+import json
+import copy
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+# Synthesized full adder netlists checked into the repository
+ASIC_NETLISTS = sorted((ROOT / "flow" / "yosys").glob("full_adder_*_synth.json"))
+FPGA_NETLISTS = sorted((ROOT / "flow" / "fpga").glob("full_adder_*_fpga.json"))
+ADDER_NETLIST = ROOT / "flow" / "yosys" / "full_adder_simple_synth.json"
+ADDER = "full_adder_simple"
+
+
+def run_script(script, *args):
+    """Standard output of a scripts/ command line tool, which must exit with status 0."""
+    result = subprocess.run([sys.executable, str(ROOT / "scripts" / script), *map(str, args)],
+                            capture_output=True, text=True, check=True)
+    return result.stdout
+
+
+def copy_tree(destination, *directories):
+    """Copy repository directories as a fresh checkout would, without file times or build outputs."""
+    for directory in directories:
+        shutil.copytree(ROOT / directory, destination / directory, copy_function=shutil.copy,
+                        ignore=shutil.ignore_patterns('__pycache__', '*.idx'))
+    return destination
+
+
+def ripple_netlist_data(width, adder_path=ADDER_NETLIST):
+    """Yosys JSON document of a width-bit ripple adder module (marked top) over the full adder."""
+    with open(adder_path) as f:
+        data = json.load(f)
+    adder_name, adder = next(iter(data['modules'].items()))
+    adder.get('attributes', {}).pop('top', None)
+    directions = {port: info['direction'] for port, info in adder['ports'].items()}
+    a = list(range(2, 2 + width))
+    b = list(range(2 + width, 2 + 2 * width))
+    total = list(range(2 + 2 * width, 2 + 3 * width))
+    carry = list(range(2 + 3 * width, 3 + 4 * width))
+    shared = {'clk_i': [3 + 4 * width], 'reset_n_i': [4 + 4 * width]}
+    cells = {}
+    for i in range(width):
+        connections = {'a_i': [a[i]], 'b_i': [b[i]], 'cin_i': [carry[i]], 'sum_o': [total[i]],
+                       'cout_o': [carry[i + 1]], **shared}
+        cells[f"stage{i}"] = {'type': adder_name, 'port_directions': copy.deepcopy(directions),
+                              'connections': connections}
+    data['modules'][f"rca{width}"] = {
+        'attributes': {'top': '00000000000000000000000000000001'},
+        'ports': {'clk_i': {'direction': 'input', 'bits': shared['clk_i']},
+                  'reset_n_i': {'direction': 'input', 'bits': shared['reset_n_i']},
+                  'a': {'direction': 'input', 'bits': a}, 'b': {'direction': 'input', 'bits': b},
+                  'cin': {'direction': 'input', 'bits': carry[:1]},
+                  'sum': {'direction': 'output', 'bits': total},
+                  'cout': {'direction': 'output', 'bits': carry[-1:]}},
+        'cells': cells,
+        'netnames': {'carry': {'bits': carry}},
+    }
+    return data
+
+
+@pytest.fixture
+def ripple8_json(tmp_path):
+    """An 8-bit ripple adder netlist whose own top module is the ripple, not the full adder."""
+    path = tmp_path / "rca8.json"
+    path.write_text(json.dumps(ripple_netlist_data(8)))
+    return str(path)
+
+
+# Signals of write_random_vcd: (scope, name, id code, width, var type);
+# 'a' is also seen from the dut scope
+VCD_SIGNALS = [
+    ('tb', 'clk', '!', 1, 'wire'),
+    ('tb', 'a', '"', 1, 'wire'),
+    ('tb.dut', 'a', '"', 1, 'wire'),
+    ('tb', 'bus', '#', 8, 'reg'),
+    ('tb', 'wide', '$%', 70, 'reg'),
+    ('tb', 'level', '&', 64, 'real'),
+    ('tb', 'y', "'", 1, 'wire'),
+]
+
+
+def _random_value(rng, width, var_type):
+    """A value as written to the dump and as the reader reports it."""
+    if var_type == 'real':
+        value = rng.choice((0.0, 1.5, -2.25, 3e-9))
+        return f'r{value!r}', repr(value)
+    if width == 1:
+        value = rng.choice('01xz' if rng.random() < 0.2 else '01')
+        return value, value
+    if rng.random() < 0.1:
+        value = rng.choice('xz') * width
+        return f'b{value}', value
+    value = rng.getrandbits(width)
+    # Leading zeros may be dropped in a dump
+    return f'b{value:b}', format(value, f'0{width}b')
+
+
+def write_random_vcd(path, rng, steps):
+    """A random dump and the changes it holds: {full name: [(time, value)]}."""
+    lines = ['$date today $end', '$timescale 10ps $end']
+    for scope in ('tb', 'dut'):
+        lines.append(f'$scope module {scope} $end')
+        for signal_scope, name, id_code, width, var_type in VCD_SIGNALS:
+            if signal_scope.split('.')[-1] == scope:
+                select = ' [7:0]' if width == 8 else ''
+                lines.append(f'$var {var_type} {width} {id_code} {name}{select} $end')
+    lines += ['$upscope $end', '$upscope $end', '$enddefinitions $end']
+
+    unique = [s for s in VCD_SIGNALS if s[0] == 'tb']
+    expected = {f'{s[0]}.{s[1]}': [] for s in unique}
+    lines.append('$dumpvars')
+    for scope, name, id_code, width, var_type in unique:
+        written, value = _random_value(rng, width, var_type)
+        lines.append(f'{written} {id_code}' if written[0] in 'br' else f'{written}{id_code}')
+        expected[f'{scope}.{name}'].append((0, value))
+    lines.append('$end')
+
+    time = 0
+    for _ in range(steps):
+        time += rng.choice((1, 5, 10))
+        lines.append(f'#{time}')
+        if rng.random() < 0.05:
+            lines.append('$comment 1! b1010 # #99 $end')
+        for scope, name, id_code, width, var_type in rng.sample(unique, rng.randint(1, 3)):
+            written, value = _random_value(rng, width, var_type)
+            lines.append(f'{written} {id_code}' if written[0] in 'br' else f'{written}{id_code}')
+            expected[f'{scope}.{name}'].append((time, value))
+    path.write_text('\n'.join(lines) + '\n')
+    return expected, time
@@ -0,0 +1,129 @@
+"""Tests for the content-addressed analysis cache (analysis_cache) and its readers."""
+
+import os
+import sys
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from conftest import ROOT, copy_tree
+from analysis_cache import AnalysisCache, analyzer_version, default_cache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AnalysisCache(tmp_path / 'cache')
+
+
+def test_hit_and_miss_follow_input_content(cache, tmp_path):
+    netlist = tmp_path / 'netlist.json'
+    netlist.write_text('{"modules": {}}')
+    calls = []
+
+    def analyze():
+        calls.append(netlist.read_text())
+        return {'chars': len(calls[-1])}
+
+    first = cache.cached('count', [netlist], analyze, 'v1')
+    assert cache.cached('count', [netlist], analyze, 'v1') == first
+    assert (len(calls), cache.hits) == (1, 1)
+
+    netlist.write_text('{"modules": {"top": {}}}')
+    assert cache.cached('count', [netlist], analyze, 'v1') == {'chars': len(calls[-1])}
+    cache.cached('count', [netlist], analyze, 'v2')
+    cache.cached('count', [netlist], analyze, 'v2', params=16)
+    assert len(calls) == 4
+
+
+def test_none_result_is_cached(cache, tmp_path):
+    calls = []
+    for _ in range(3):
+        assert cache.cached('nothing', [], lambda: calls.append(1)) is None
+    assert len(calls) == 1
+
+
+def test_disabled_cache_always_computes(monkeypatch):
+    monkeypatch.setenv('ANALYSIS_CACHE', '0')
+    cache = default_cache()
+    cache.put('x', 'key', 1)
+    assert cache.get('x', 'key') is None
+    assert cache.cached('x', [], lambda: 2) == 2
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    for name in 'abc':
+        cache.put('entry', AnalysisCache.key('entry', '', [], name), name * 1000)
+    oldest, newer, newest = cache.entries()
+    os.utime(oldest['path'], (newest['used'] + 10, newest['used'] + 10))  # Used again
+    cache.evict(oldest['bytes'] + newest['bytes'])
+    assert {entry['key'] for entry in cache.entries()} == {oldest['key'], newest['key']}
+
+
+def test_analyzer_version_covers_listed_modules(tmp_path):
+    analyzer = tmp_path / 'analyzer.py'
+    analyzer.write_text('x = 1\n')
+    version = analyzer_version(analyzer, ['netlist_graph'])
+    assert version != analyzer_version(analyzer, ['netlist_graph', 'netlist_store'])
+    analyzer.write_text('x = 2\n')
+    assert version != analyzer_version(analyzer, ['netlist_graph'])
+    with pytest.raises(ValueError):
+        analyzer_version(analyzer, ['no_such_module'])
+
+
+@pytest.mark.parametrize('analyzer, run', [
+    ('flow/yosys/gate_analysis.py', "gate_analysis.analyze_gates('full_adder_simple_synth.v')"),
+    ('flow/fpga/fpga_analysis.py', "fpga_analysis.analyze_fpga_resources('full_adder_simple_fpga.v')"),
+    ('flow/fpga/fpga_resource_analysis.py', "fpga_resource_analysis.estimate_lut_usage('full_adder_simple_fpga.v')"),
+])
+def test_analyzer_modules_cover_loaded_scripts(analyzer, run, tmp_path):
+    # Every scripts/ module an analysis loads must be part of its version; the
+    # analysis runs on a copy so that nothing (e.g. Liberty indexes) is written to the tree
+    path = copy_tree(tmp_path, 'scripts', str(Path(analyzer).parent), 'flow/liberty') / analyzer
+    code = (f"import sys, {path.stem}\n{run}\n"
+            f"print(' '.join(name for name, module in sys.modules.items()\n"
+            f"               if getattr(module, '__file__', None) and module.__file__.startswith({str((tmp_path / 'scripts').resolve())!r})))")
+    result = subprocess.run([sys.executable, '-c', code], cwd=path.parent, capture_output=True, text=True,
+                            check=True, env={**os.environ, 'ANALYSIS_CACHE': '0'})
+    loaded = set(result.stdout.split()) - {'analysis_cache'}
+    assert 'netlist_graph' in loaded
+    source = ROOT / analyzer
+    sys.path.insert(0, str(source.parent))
+    try:
+        declared = set(__import__(source.stem).ANALYZER_MODULES)
+    finally:
+        sys.path.remove(str(source.parent))
+    assert loaded <= declared
+
+
+def test_pages_read_results_published_for_the_report_on_disk(tmp_path, monkeypatch):
+    import generate_github_pages
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('ANALYSIS_CACHE_DIR', str(tmp_path / 'cache'))
+    report = tmp_path / 'flow' / 'yosys' / 'gate_analysis_report.md'
+    report.parent.mkdir(parents=True)
+    report.write_text("- **Primitive Gates**: 5\n- **Cell Area**: 32.98 µm²\n")
+    published = {'Simple': {'total_primitive_gates': 7, 'cell_area': 50.0}}
+    default_cache().publish('gate_analysis', report.read_text(), published)
+    assert generate_github_pages.extract_gate_analysis() == {'total_gates': '7', 'die_size': '100µm²'}
+
+    # Results restored from another run do not match this report: it is parsed instead
+    other = "- **Primitive Gates**: 9\n- **Cell Area**: 100.00 µm²\n"
+    report.write_text(other)
+    assert generate_github_pages.extract_gate_analysis() == {'total_gates': '9', 'die_size': '200µm²'}
+
+
+def test_pages_read_test_counts_published_for_the_report(tmp_path, monkeypatch):
+    import generate_github_pages
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('ANALYSIS_CACHE_DIR', str(tmp_path / 'cache'))
+    report = tmp_path / 'test_harness_report.md'
+    report.write_text("- **Total Test Cases**: 18\n- **Passed**: 17\n- **Failed**: 1\n")
+    assert generate_github_pages.extract_test_data() == {'total_tests': '18', 'passed_tests': '17',
+                                                         'success_rate': '94.4'}
+    default_cache().publish('test_results', report.read_text(),
+                            {'total_tests': 20, 'pass_count': 20, 'fail_count': 0, 'success_rate': 100.0})
+    assert generate_github_pages.extract_test_data() == {'total_tests': '20', 'passed_tests': '20',
+                                                         'success_rate': '100.0'}
@@ -0,0 +1,88 @@
+"""Tests for the parallel Verilator coverage merge tool (coverage_merge)."""
+
+import json
+import random
+
+from conftest import run_script
+from coverage_merge import (COVERAGE_HEADER, find_shards, iter_points, merge_shards, parallel_merge,
+                            summarize, write_coverage)
+
+
+def key(**fields):
+    """A coverage point key in Verilator's \\x01name\\x02value encoding."""
+    return b''.join(b'\x01' + name.encode() + b'\x02' + value.encode() for name, value in fields.items())
+
+
+POINTS = [
+    key(f='full_adder.v', l='10', page='v_line/full_adder', o='block', S='10-12', h='TOP.dut'),
+    key(f='full_adder.v', l='14', page='v_line/full_adder', o='block', h='TOP.dut'),
+    key(f='full_adder.v', l='10', page='v_branch/full_adder', o='if', h='TOP.dut'),
+    key(f='full_adder.v', l='3', page='v_toggle/full_adder', o='a_i:0->1', h='TOP.dut'),
+    key(f='full_adder.v', l='3', page='v_toggle/full_adder', o='a_i:1->0', h='TOP.dut'),
+    key(f='tb.v', l='20', page='v_toggle/tb', o='clk:0->1', h='TOP'),
+    key(f='tb.v', l='30', o='user_cover'),
+]
+
+
+def write_shard(path, counts):
+    with open(path, 'wb') as f:
+        f.write(COVERAGE_HEADER)
+        f.write(b"# comment lines and blank lines are skipped\n\n")
+        for point, count in counts.items():
+            f.write(b"C '" + point + b"' " + str(count).encode() + b"\n")
+
+
+def test_merge_sums_every_point(tmp_path):
+    rng = random.Random(2)
+    expected = {}
+    shards = []
+    for i in range(6):
+        counts = {point: rng.choice((0, 0, 1, 5)) for point in rng.sample(POINTS, 4)}
+        for point, count in counts.items():
+            expected[point] = expected.get(point, 0) + count
+        shards.append(tmp_path / f'shard{i}.dat')
+        write_shard(shards[-1], counts)
+
+    assert merge_shards(shards) == expected
+    assert parallel_merge(shards, 3) == expected
+
+    output = tmp_path / 'merged.dat'
+    write_coverage(expected, output)
+    assert output.read_bytes().startswith(COVERAGE_HEADER)
+    assert dict(iter_points(output)) == expected
+
+
+def test_summary():
+    counts = [3, 0, 0, 2, 0, 1, 4]
+    summary = summarize(dict(zip(POINTS, counts)), 2)
+    assert summary['shards_merged'] == 2
+    assert summary['points'] == len(POINTS)
+    assert summary['types'] == {
+        'branch': {'points': 1, 'covered': 0, 'percent': 0.0},
+        'line': {'points': 2, 'covered': 1, 'percent': 50.0},
+        'toggle': {'points': 3, 'covered': 2, 'percent': 66.67},
+        'user': {'points': 1, 'covered': 1, 'percent': 100.0},
+    }
+    # The S range covers lines 10-12; line 14 is never reached
+    assert summary['files']['full_adder.v']['hits'] == {'10': 3, '11': 3, '12': 3, '14': 0}
+    assert summary['line_coverage'] == 75.0
+    assert summary['toggle_coverage'] == 66.67
+    assert summary['toggles']['TOP.dut'] == {'points': 2, 'covered': 1, 'percent': 50.0}
+    assert summary['uncovered_toggles'] == ['TOP.dut.a_i:1->0']
+
+
+def test_command_line(tmp_path):
+    shard_dir = tmp_path / 'shards'
+    (shard_dir / 'thread1').mkdir(parents=True)
+    write_shard(shard_dir / 'coverage.dat', {POINTS[0]: 1, POINTS[3]: 2})
+    write_shard(shard_dir / 'thread1' / 'coverage.dat', {POINTS[0]: 4, POINTS[4]: 1})
+    (shard_dir / 'notes.txt').write_text('not a shard')
+    output, summary = shard_dir / 'merged.dat', tmp_path / 'summary.json'
+    write_shard(output, {POINTS[0]: 100})  # An earlier merge output is not an input
+
+    assert find_shards([str(shard_dir)], exclude=[str(output)]) == \
+        [shard_dir / 'coverage.dat', shard_dir / 'thread1' / 'coverage.dat']
+    stdout = run_script('coverage_merge.py', shard_dir, '--output', output, '--summary', summary, '--jobs', 2)
+    assert 'Merged 2 shards (3 points)' in stdout
+    assert dict(iter_points(output)) == {POINTS[0]: 5, POINTS[3]: 2, POINTS[4]: 1}
+    assert json.loads(summary.read_text())['toggle_coverage'] == 100.0
@@ -0,0 +1,26 @@
+"""Tests for the FPGA primitive counts of flow/fpga/fpga_analysis.py."""
+
+import sys
+import json
+
+import pytest
+
+from conftest import ROOT
+
+sys.path.insert(0, str(ROOT / "flow" / "fpga"))
+from fpga_analysis import module_counts_json
+
+
+@pytest.mark.parametrize('width', ['00000000000000000000000000000100', 4, "32'd4"])
+def test_generic_luts_counted_by_width(tmp_path, width):
+    netlist = tmp_path / 'lut.json'
+    netlist.write_text(json.dumps({'modules': {'top': {
+        'attributes': {'top': 1},
+        'ports': {'a': {'direction': 'input', 'bits': [2, 3, 4, 5]}, 'y': {'direction': 'output', 'bits': [6]}},
+        'cells': {'lut': {'type': '$lut', 'parameters': {'WIDTH': width, 'LUT': '0110100110010110'},
+                          'port_directions': {'A': 'input', 'Y': 'output'},
+                          'connections': {'A': [2, 3, 4, 5], 'Y': [6]}}},
+    }}}))
+    modules, top = module_counts_json(str(netlist))
+    assert (modules, top) == ({'top': {'LUT4': 1}}, 'top')
+
@@ -0,0 +1,51 @@
+"""Tests for the LUT estimates of flow/fpga/fpga_resource_analysis.py."""
+
+import os
+import sys
+import subprocess
+
+from conftest import ROOT, copy_tree
+
+sys.path.insert(0, str(ROOT / "flow" / "fpga"))
+import fpga_resource_analysis
+from netlist_graph import load_netlist
+from netlist_lutmap import LutMapping
+
+HALF_ADDER_NETLIST = ROOT / "flow" / "fpga" / "full_adder_half_adder_fpga.v"
+
+
+def test_each_module_is_mapped_once(monkeypatch):
+    mapped = []
+
+    def counting_mapping(graph, top=None, k=6):
+        mapped.append((top, k))
+        return LutMapping(graph, top, k)
+
+    monkeypatch.setattr(fpga_resource_analysis, 'LutMapping', counting_mapping)
+    usage = fpga_resource_analysis.estimate_lut_usage(str(HALF_ADDER_NETLIST))
+    assert sorted(mapped, key=repr) == sorted([(None, 6), (None, 4), ('half_adder', 6)], key=repr)
+
+    graph = load_netlist(str(HALF_ADDER_NETLIST.with_suffix('.json')))
+    assert usage['module_instances'] == {'half_adder': 2}
+    assert usage['module_luts'] == {'half_adder': LutMapping(graph, 'half_adder', 6).lut_count}
+    assert usage['estimated_luts'] == LutMapping(graph, k=6).lut_count
+    assert usage['lut4']['luts'] == LutMapping(graph, k=4).lut_count
+
+
+def test_top_mapping_is_reused_for_the_top_module():
+    mapping, lut4, module_luts = fpga_resource_analysis.map_luts(str(HALF_ADDER_NETLIST), ['full_adder_half_adder'])
+    assert mapping.name == 'full_adder_half_adder'
+    assert module_luts == {'full_adder_half_adder': mapping.lut_count}
+    assert (mapping.k, lut4.k) == (6, 4)
+
+
+def test_report_reproduces_from_a_fresh_checkout(tmp_path):
+    # A checkout does not preserve file times: make every JSON netlist older than its Verilog twin
+    copy_tree(tmp_path, 'scripts', 'flow/fpga', 'flow/liberty')
+    fpga = tmp_path / 'flow' / 'fpga'
+    for netlist in fpga.glob('*_fpga.v'):
+        os.utime(netlist.with_suffix('.json'), (1, 1))
+    subprocess.run([sys.executable, 'fpga_resource_analysis.py'], cwd=fpga, capture_output=True, check=True,
+                   env={**os.environ, 'ANALYSIS_CACHE': '0'})
+    committed = ROOT / 'flow' / 'fpga' / 'fpga_resource_analysis_report.md'
+    assert (fpga / 'fpga_resource_analysis_report.md').read_text() == committed.read_text()
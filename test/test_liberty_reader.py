@@ -0,0 +1,84 @@
+"""Tests for the Liberty library reader and its cell index cache (liberty_reader)."""
+
+import shutil
+
+import pytest
+
+import liberty_reader
+from liberty_reader import DEFAULT_LIBRARY, evaluate_function, load_liberty
+
+SMALL_LIBRARY = r"""
+/* A load-major template, a bus pin, comments and a continued line */
+library (small) {
+  time_unit : "1ps";
+  capacitive_load_unit (1, ff);
+  leakage_power_unit : "1pW";
+  lu_table_template (load_slew) {
+    variable_1 : total_output_net_capacitance;
+    variable_2 : input_net_transition;
+    index_1 ("1, 3");
+    index_2 ("10, 30");
+  }
+  cell (MAJ3) {  // majority
+    area : 4;
+    cell_leakage_power : 500;
+    bus (A) { pin (A0, A1, A2) { direction : input; capacitance : 2; } }
+    pin (Y) {
+      direction : output;
+      function : "(A0 A1) + (A1 A2) + \
+                  (A0 A2)";
+      timing () {
+        related_pin : "A0";
+        cell_rise (load_slew) { values ("100, 200", "300, 400"); }
+      }
+    }
+  }
+}
+"""
+
+
+def test_bundled_library_maps_every_gate_family():
+    cells = load_liberty(cache=False).gate_cells()
+    assert {family: cell.name for family, cell in cells.items()} == {
+        'NOT': 'INV_X1', 'BUF': 'BUF_X1', 'NAND': 'NAND2_X1', 'NOR': 'NOR2_X1', 'AND': 'AND2_X1',
+        'OR': 'OR2_X1', 'ANDNOT': 'ANDNOT2_X1', 'ORNOT': 'ORNOT2_X1', 'XOR': 'XOR2_X1', 'XNOR': 'XNOR2_X1',
+        'MUX': 'MUX2_X1', 'AOI3': 'AOI21_X1', 'OAI3': 'OAI21_X1', 'AOI4': 'AOI22_X1', 'OAI4': 'OAI22_X1',
+        'DFF': 'DFF_X1'}
+
+
+def test_units_bus_pins_and_load_major_tables(tmp_path):
+    path = tmp_path / "small.lib"
+    path.write_text(SMALL_LIBRARY)
+    library = load_liberty(str(path), cache=False)
+    assert (library.time_ps, library.capacitance_pf, library.leakage_nw) == (1.0, 1e-3, 1e-3)
+    cell = library.cells['MAJ3']
+    assert [pin.name for pin in cell.inputs] == ['A0', 'A1', 'A2']
+    table, _ = evaluate_function(cell.outputs[0].function, ['A0', 'A1', 'A2'])
+    assert table == 0b11101000
+    rise = cell.outputs[0].arcs[0].tables['cell_rise']
+    # Transposed to slew rows: the table is indexed (slew, load)
+    assert (rise.slews, rise.loads) == ((10.0, 30.0), (1.0, 3.0))
+    assert rise.lookup(10, 1) == 100 and rise.lookup(30, 1) == 200 and rise.lookup(10, 3) == 300
+    assert rise.lookup(20, 2) == pytest.approx(250)
+    assert rise.lookup(50, 1) == pytest.approx(300)  # Linear extrapolation
+
+
+def test_index_is_reused_until_the_library_changes(tmp_path, monkeypatch):
+    path = tmp_path / "generic.lib"
+    shutil.copy(DEFAULT_LIBRARY, path)
+    first = load_liberty(str(path))
+    assert (tmp_path / "generic.lib.idx").exists()
+
+    # A new process (empty in-memory cache) loads the index without parsing
+    monkeypatch.setattr(liberty_reader, '_LIBRARY_CACHE', {})
+    parses = []
+    parse = liberty_reader.parse_liberty
+    monkeypatch.setattr(liberty_reader, 'parse_liberty', lambda text: parses.append(1) or parse(text))
+    second = load_liberty(str(path))
+    assert not parses
+    assert sorted(second.cells) == sorted(first.cells)
+    assert second.cells['NAND2_X1'].delay(0.1, 0.01) == first.cells['NAND2_X1'].delay(0.1, 0.01)
+
+    path.write_text(path.read_text().replace("area : 2.66;", "area : 3.5;"))
+    assert load_liberty(str(path)).cells['INV_X1'].area == 3.5
+    assert parses
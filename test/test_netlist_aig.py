@@ -0,0 +1,122 @@
+"""Tests for AIG conversion and AIGER export (netlist_aig)."""
+
+import json
+
+import pytest
+
+from conftest import ASIC_NETLISTS, FPGA_NETLISTS, ripple_netlist_data
+from netlist_aig import Aig, netlist_aig
+from netlist_graph import load_netlist
+from netlist_sim import NetlistSimulator, assign_inputs, exhaustive_words
+
+
+def literal_word(words, lit, mask):
+    return words[lit >> 1] ^ mask if lit & 1 else words[lit >> 1]
+
+
+def read_aiger(data):
+    """Header, input literals, output literals, AND gates and symbols of an aag or aig file."""
+    lines = data.split(b'\n')
+    kind, *counts = lines[0].split()
+    _, inputs, latches, outputs, ands = map(int, counts)
+    assert latches == 0
+    position = 1
+    if kind == b'aag':
+        input_lits = [int(lines[position + i]) for i in range(inputs)]
+        position += inputs
+    else:
+        input_lits = [2 * (i + 1) for i in range(inputs)]
+    output_lits = [int(lines[position + i]) for i in range(outputs)]
+    position += outputs
+    gates = []
+    if kind == b'aag':
+        for i in range(ands):
+            gates.append(tuple(map(int, lines[position + i].split())))
+        rest = b'\n'.join(lines[position + ands:])
+    else:
+        body = b'\n'.join(lines[position:])
+        offset = 0
+        for i in range(ands):
+            lhs = 2 * (inputs + 1 + i)
+            deltas = []
+            for _ in range(2):
+                delta, shift = 0, 0
+                while True:
+                    byte = body[offset]
+                    offset += 1
+                    delta |= (byte & 0x7F) << shift
+                    shift += 7
+                    if byte < 0x80:
+                        break
+                deltas.append(delta)
+            left = lhs - deltas[0]
+            gates.append((lhs, left, left - deltas[1]))
+        rest = body[offset:]
+    symbols = dict(line.split(b' ', 1) for line in rest.split(b'\n') if line[:1] in (b'i', b'o'))
+    return input_lits, output_lits, gates, {key.decode(): value.decode() for key, value in symbols.items()}
+
+
+@pytest.mark.parametrize("path", [*ASIC_NETLISTS, *FPGA_NETLISTS], ids=lambda p: p.stem)
+def test_aig_simulation_matches_netlist(path):
+    graph = load_netlist(str(path))
+    design = netlist_aig(graph, keep_inputs=True)
+    sim = NetlistSimulator(graph)
+    words, mask = exhaustive_words(sim.input_bits)
+    expected = [word for words in sim.evaluate(assign_inputs(sim.inputs, words), mask).values() for word in words]
+    node_words = design.aig.simulate(words, mask)
+    assert [literal_word(node_words, lit, mask) for lit in design.outputs] == expected
+
+
+def test_ripple_aig_drops_unused_inputs(tmp_path):
+    path = tmp_path / "rca4.json"
+    path.write_text(json.dumps(ripple_netlist_data(4)))
+    design = netlist_aig(load_netlist(str(path)))
+    assert design.dropped == ['clk_i', 'reset_n_i']
+    assert design.input_names[:2] == ['a[0]', 'a[1]']
+    assert design.output_names == ['sum[0]', 'sum[1]', 'sum[2]', 'sum[3]', 'cout']
+    assert design.depth > netlist_aig(load_netlist(str(ASIC_NETLISTS[0]))).depth
+
+
+@pytest.mark.parametrize("binary", [True, False])
+@pytest.mark.parametrize("path", ASIC_NETLISTS, ids=lambda p: p.stem)
+def test_aiger_round_trip(path, binary):
+    design = netlist_aig(load_netlist(str(path)))
+    aig = design.aig
+    input_lits, output_lits, gates, symbols = read_aiger(design.to_aiger(binary))
+    assert input_lits == [2 * node for node in aig.inputs]
+    assert output_lits == design.outputs
+    assert gates == [(2 * node, aig.left[node], aig.right[node])
+                     for node in range(len(aig.inputs) + 1, aig.node_count)]
+    assert all(lhs > left >= right for lhs, left, right in gates)
+    assert [symbols[f"i{i}"] for i in range(len(input_lits))] == design.input_names
+    assert [symbols[f"o{i}"] for i in range(len(output_lits))] == design.output_names
+
+
+def test_structural_hashing_and_constant_folding():
+    aig = Aig()
+    a, b = aig.new_input(), aig.new_input()
+    assert aig.and_(a, b) == aig.and_(b, a)
+    assert aig.and_count == 1
+    assert aig.and_(a, aig.not_(a)) == aig.zero
+    assert aig.and_(a, aig.one) == a and aig.and_(a, a) == a
+    assert aig.xor(a, a) == aig.zero and aig.xor(a, aig.not_(a)) == aig.one
+
+
+def test_flip_flops_are_cut_as_scan_inputs_and_outputs(tmp_path):
+    path = tmp_path / "toggle.json"
+    path.write_text(json.dumps({'modules': {'toggle': {
+        'attributes': {'top': '00000000000000000000000000000001'},
+        'ports': {'clk': {'direction': 'input', 'bits': [2]}, 't': {'direction': 'input', 'bits': [3]},
+                  'q': {'direction': 'output', 'bits': [4]}},
+        'cells': {
+            'ff': {'type': '$_DFF_P_', 'port_directions': {'C': 'input', 'D': 'input', 'Q': 'output'},
+                   'connections': {'C': [2], 'D': [5], 'Q': [4]}},
+            'x': {'type': '$_XOR_', 'port_directions': {'A': 'input', 'B': 'input', 'Y': 'output'},
+                  'connections': {'A': [3], 'B': [4], 'Y': [5]}}},
+        'netnames': {}}}}))
+    design = netlist_aig(load_netlist(str(path)))
+    assert design.input_names == ['t', 'ff.Q'] and design.dropped == ['clk']
+    assert design.output_names == ['q', 'ff.D']
+    words, mask = exhaustive_words(2)
+    node_words = design.aig.simulate(words, mask)
+    assert literal_word(node_words, design.outputs[1], mask) == words[0] ^ words[1]
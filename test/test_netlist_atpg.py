@@ -0,0 +1,62 @@
+"""Tests for SAT-based ATPG and test compaction (netlist_atpg)."""
+
+import json
+
+import pytest
+
+from conftest import ASIC_NETLISTS
+from netlist_atpg import HELD_INPUTS, format_vectors, run_atpg
+from netlist_fault import FaultSimulator, exhaustive_patterns, vector_file
+from netlist_graph import load_netlist
+
+
+def replay(sim, result, tmp_path):
+    """Coverage of the exported vector file, replayed with the held inputs as the benches drive them."""
+    path = tmp_path / "vectors.txt"
+    path.write_text(format_vectors(sim, result))
+    vectors = [{**HELD_INPUTS, **vector} for vector in vector_file(str(path), result['columns'])]
+    assert len(vectors) == len(result['patterns'])
+    return sim.coverage(sim.simulate(sim.patterns(vectors)))
+
+
+@pytest.mark.parametrize("path", ASIC_NETLISTS, ids=lambda p: p.stem)
+def test_compact_vectors_detect_every_fault(path, tmp_path):
+    sim = FaultSimulator(load_netlist(str(path)))
+    result = run_atpg(sim)
+    assert result['coverage'] == 100.0 and not result['redundant'] and not result['aborted']
+    assert len(result['patterns']) <= result['generated'] < 2 ** 3
+    assert replay(sim, result, tmp_path)['coverage'] == 100.0
+
+
+def test_static_compaction_keeps_needed_vectors(ripple8_json, tmp_path):
+    sim = FaultSimulator(load_netlist(ripple8_json))
+    result = run_atpg(sim)
+    assert result['coverage'] == 100.0
+    # Every kept vector is needed: dropping any one loses a fault
+    for index in range(len(result['patterns'])):
+        others = result['patterns'][:index] + result['patterns'][index + 1:]
+        assert len(sim.simulate(others)) < len(sim.simulate(result['patterns']))
+    assert replay(sim, result, tmp_path)['coverage'] == 100.0
+
+
+def test_redundant_faults_are_proven(tmp_path):
+    # y = a | (a & b): the AND gate never changes y, so its faults are untestable
+    path = tmp_path / "redundant.json"
+    path.write_text(json.dumps({'modules': {'redundant': {
+        'attributes': {'top': '00000000000000000000000000000001'},
+        'ports': {'a': {'direction': 'input', 'bits': [2]}, 'b': {'direction': 'input', 'bits': [3]},
+                  'y': {'direction': 'output', 'bits': [5]}},
+        'cells': {
+            'and': {'type': '$_AND_', 'port_directions': {'A': 'input', 'B': 'input', 'Y': 'output'},
+                    'connections': {'A': [2], 'B': [3], 'Y': [4]}},
+            'or': {'type': '$_OR_', 'port_directions': {'A': 'input', 'B': 'input', 'Y': 'output'},
+                   'connections': {'A': [2], 'B': [4], 'Y': [5]}}},
+        'netnames': {'ab': {'bits': [4]}}}}}))
+    sim = FaultSimulator(load_netlist(str(path)))
+    result = run_atpg(sim)
+    assert 'ab/SA0' in result['redundant']
+    assert set(result['undetected']) == set(result['redundant'])
+    assert result['coverage'] < 100.0 == result['test_coverage']
+    # No input combination detects a redundant fault
+    exhaustive = sim.simulate(exhaustive_patterns(sim))
+    assert not any(sim.fault_name(fault) in result['redundant'] for fault in exhaustive)
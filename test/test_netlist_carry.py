@@ -0,0 +1,30 @@
+"""Tests for carry-chain inference and the carry chain versus LUT-only sweep (netlist_carry)."""
+
+from conftest import ADDER, ADDER_NETLIST
+from netlist_carry import design_chain_widths, find_adders, find_carry_chains, width_sweep
+from netlist_graph import load_netlist
+from netlist_timing import ripple_chain, ripple_chain_name
+
+
+def test_finds_full_adder_and_chain(ripple8_json):
+    graph = load_netlist(ripple8_json)
+    assert set(find_adders(graph)) == {ADDER}
+    assert [len(chain) for chain in find_carry_chains(graph)['rca8']] == [8]
+    assert design_chain_widths(graph) == {8: 1}
+
+
+def test_ripple_chain_is_the_only_top(ripple8_json):
+    graph = ripple_chain(ripple8_json, 16, ADDER)
+    assert [name for name, module in graph.modules.items() if module.is_top] == [ripple_chain_name(ADDER, 16)]
+    assert graph.top.name == ripple_chain_name(ADDER, 16)
+
+
+def test_sweep_maps_each_width_when_netlist_has_a_top(ripple8_json):
+    # The sweep must map the generated chains, not the 8-bit design the netlist marks as top
+    rows = width_sweep(ripple8_json, [4, 16, 64], adder=ADDER)
+    assert rows == width_sweep(str(ADDER_NETLIST), [4, 16, 64])
+    luts = [row['lut']['luts'] for row in rows]
+    depths = [row['lut']['depth'] for row in rows]
+    assert luts[0] < luts[1] < luts[2]
+    assert depths[0] < depths[1] < depths[2]
+    assert rows[-1]['chain_faster']
@@ -0,0 +1,66 @@
+"""Tests for the canonical-hash structural netlist diff (netlist_diff)."""
+
+import sys
+import json
+import subprocess
+
+from conftest import ADDER, ROOT, ripple_netlist_data
+from netlist_diff import NetlistSignature, diff_signatures
+from netlist_graph import load_netlist
+
+
+def write(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+def renamed(data):
+    """The same design with other cell and net names, cells reordered and commutative inputs swapped."""
+    data = json.loads(json.dumps(data))
+    for module in data['modules'].values():
+        cells = list(module['cells'].items())[::-1]
+        module['cells'] = {f"renamed{i}": cell for i, (_, cell) in enumerate(cells)}
+        for cell in module['cells'].values():
+            if cell['type'] in ('$_AND_', '$_OR_', '$_XNOR_'):
+                connections = cell['connections']
+                connections['A'], connections['B'] = connections['B'], connections['A']
+        module['netnames'] = {f"net_{name}": net for name, net in module.get('netnames', {}).items()}
+    return data
+
+
+def diff(old_path, new_path):
+    return diff_signatures(NetlistSignature(load_netlist(old_path)), NetlistSignature(load_netlist(new_path)))
+
+
+def test_renamed_design_is_identical(tmp_path):
+    data = ripple_netlist_data(4)
+    result = diff(write(tmp_path, "old.json", data), write(tmp_path, "new.json", renamed(data)))
+    assert result['identical']
+    assert result['old_fingerprint'] == result['new_fingerprint']
+    assert result['matched_cells'] == 4 * len(data['modules'][ADDER]['cells'])
+
+
+def test_changed_gate_is_located(tmp_path):
+    data = ripple_netlist_data(4)
+    changed = json.loads(json.dumps(data))
+    or_gate = next(cell for cell in changed['modules'][ADDER]['cells'].values() if cell['type'] == '$_OR_')
+    or_gate['type'] = '$_XOR_'  # Carry out = (a & b) ^ (cin & (a ^ b)), the same function
+    result = diff(write(tmp_path, "old.json", data), write(tmp_path, "new.json", changed))
+    assert not result['identical']
+    # Every carry and the sums that read it change; sum[0] does not read a carry out
+    assert 'sum[0]' not in result['changed_outputs']
+    assert {'sum[1]', 'sum[2]', 'sum[3]', 'cout'} <= set(result['changed_outputs'])
+    assert [cell['type'] for cell in result['added_cells']].count('$_XOR_') == 4
+    assert [cell['type'] for cell in result['removed_cells']].count('$_OR_') == 4
+
+
+def test_exit_status_flags_structural_changes(tmp_path):
+    data = ripple_netlist_data(2)
+    old = write(tmp_path, "old.json", data)
+    same = write(tmp_path, "same.json", renamed(data))
+    wider = write(tmp_path, "wider.json", ripple_netlist_data(3))
+    command = [sys.executable, str(ROOT / "scripts" / "netlist_diff.py")]
+    assert subprocess.run([*command, old, same], capture_output=True).returncode == 0
+    assert subprocess.run([*command, old, wider], capture_output=True).returncode == 1
+    assert subprocess.run([*command, old, str(tmp_path / "missing.json")], capture_output=True).returncode == 2
@@ -0,0 +1,85 @@
+"""Tests for BDD/SAT combinational equivalence checking (netlist_equiv)."""
+
+import json
+import itertools
+import random
+
+import pytest
+
+from conftest import ASIC_NETLISTS, FPGA_NETLISTS, ripple_netlist_data
+from netlist_equiv import SatSolver, check_equivalence
+from netlist_graph import load_netlist
+
+
+def rtl_adder(tmp_path, width, operation='$add'):
+    """An RTL-style netlist (after prep) of a width-bit a + b + cin with word-level cells."""
+    a = list(range(2, 2 + width))
+    b = list(range(2 + width, 2 + 2 * width))
+    cin = [2 + 2 * width]
+    partial = list(range(3 + 2 * width, 4 + 3 * width))
+    result = list(range(4 + 3 * width, 5 + 4 * width))
+
+    def word_cell(type_name, left, right, out):
+        return {'type': type_name,
+                'parameters': {'A_SIGNED': 0, 'B_SIGNED': 0, 'A_WIDTH': len(left), 'B_WIDTH': len(right),
+                               'Y_WIDTH': len(out)},
+                'port_directions': {'A': 'input', 'B': 'input', 'Y': 'output'},
+                'connections': {'A': left, 'B': right, 'Y': out}}
+
+    path = tmp_path / f"rtl{width}{operation.strip('$')}.json"
+    path.write_text(json.dumps({'modules': {'rtl': {
+        'attributes': {'top': 1},
+        'ports': {'a': {'direction': 'input', 'bits': a}, 'b': {'direction': 'input', 'bits': b},
+                  'cin': {'direction': 'input', 'bits': cin},
+                  'sum': {'direction': 'output', 'bits': result[:width]},
+                  'cout': {'direction': 'output', 'bits': result[width:]}},
+        'cells': {'first': word_cell(operation, a, b, partial), 'second': word_cell('$add', partial, cin, result)},
+        'netnames': {}}}}))
+    return load_netlist(str(path))
+
+
+@pytest.mark.parametrize("method", ['bdd', 'sat'])
+def test_adder_implementations_are_equivalent(method):
+    graphs = [load_netlist(str(path)) for path in [*ASIC_NETLISTS, *FPGA_NETLISTS]]
+    for first, second in zip(graphs, graphs[1:]):
+        result = check_equivalence(first, second, method=method, simulation_patterns=0)
+        assert result['equivalent'] and result['method'] == method and result['outputs'] == 2
+
+
+@pytest.mark.parametrize("method", ['bdd', 'sat'])
+def test_rtl_matches_the_gate_level_ripple(tmp_path, method):
+    path = tmp_path / "rca8.json"
+    path.write_text(json.dumps(ripple_netlist_data(8)))
+    result = check_equivalence(rtl_adder(tmp_path, 8), load_netlist(str(path)), method=method,
+                               simulation_patterns=0)
+    assert result['equivalent'] and result['outputs'] == 9
+
+
+@pytest.mark.parametrize("method", ['bdd', 'sat'])
+def test_counterexample_distinguishes_the_designs(tmp_path, method):
+    result = check_equivalence(rtl_adder(tmp_path, 4, '$sub'), rtl_adder(tmp_path, 4), method=method,
+                               simulation_patterns=0)
+    assert not result['equivalent']
+    values = result['counterexample']
+    a, b, cin = values.get('a', 0), values.get('b', 0), values.get('cin', 0)
+    assert (a - b + cin) % 32 != (a + b + cin) % 32
+    assert check_equivalence(rtl_adder(tmp_path, 4, '$sub'), rtl_adder(tmp_path, 4))['method'] == 'simulation'
+
+
+def test_sat_solver_agrees_with_brute_force():
+    rng = random.Random(5)
+    for _ in range(40):
+        variables = 8
+        clauses = [[rng.choice((1, -1)) * rng.randint(1, variables) for _ in range(3)] for _ in range(36)]
+        satisfiable = any(all(any((lit > 0) == bool(assignment[abs(lit) - 1]) for lit in clause)
+                              for clause in clauses)
+                          for assignment in itertools.product((0, 1), repeat=variables))
+        solver = SatSolver()
+        literals = [2 * solver.new_var() for _ in range(variables)]
+        added = all(solver.add_clause([literals[abs(lit) - 1] ^ (lit < 0) for lit in clause])
+                    for clause in clauses)
+        result = added and solver.solve()
+        assert bool(result) == satisfiable
+        if result:
+            assert all(any(solver.model_value(literals[abs(lit) - 1] ^ (lit < 0)) == 1 for lit in clause)
+                       for clause in clauses)
@@ -0,0 +1,69 @@
+"""Tests for parallel-pattern stuck-at fault simulation (netlist_fault)."""
+
+import json
+
+import pytest
+
+from conftest import ASIC_NETLISTS, ripple_netlist_data
+from netlist_fault import FaultSimulator, exhaustive_patterns
+from netlist_graph import FIRST_NET, load_netlist
+from netlist_logic import WordBuilder
+
+
+def brute_force_detect(sim, fault, patterns):
+    """Patterns detecting a fault, by re-evaluating the whole design with the fault injected."""
+    site, value = fault
+    good, mask = sim.good_values(patterns)
+    values = [0] * sim.net_count
+    values[1] = mask
+    input_nets = [net for nets in sim.inputs.values() for net in nets]
+    for net, word in zip(input_nets, sim._input_words(patterns)):
+        if net >= FIRST_NET:
+            values[net] = word
+    stuck = mask if value else 0
+    values[site] = stuck
+    builder = WordBuilder(mask)
+    for position in range(len(sim.cells)):
+        for net, word in sim._evaluate(builder, position, values.__getitem__).items():
+            values[net] = stuck if net == site else word
+    detected = 0
+    for net in sim.observed:
+        detected |= values[net] ^ good[net]
+    return detected
+
+
+@pytest.fixture(params=[*ASIC_NETLISTS, 'rca2'], ids=lambda p: getattr(p, 'stem', p))
+def simulator(request, tmp_path):
+    path = request.param
+    if path == 'rca2':
+        path = tmp_path / "rca2.json"
+        path.write_text(json.dumps(ripple_netlist_data(2)))
+    return FaultSimulator(load_netlist(str(path)))
+
+
+def test_detection_matches_brute_force_injection(simulator):
+    patterns = exhaustive_patterns(simulator)
+    good, mask = simulator.good_values(patterns)
+    for fault in simulator.representative:
+        assert simulator.detect(fault, good, mask) == brute_force_detect(simulator, fault, patterns), \
+            simulator.fault_name(fault)
+
+
+def test_collapsed_faults_are_equivalent(simulator):
+    patterns = exhaustive_patterns(simulator)
+    good, mask = simulator.good_values(patterns)
+    for fault, root in simulator.representative.items():
+        assert simulator.detect(fault, good, mask) == simulator.detect(root, good, mask)
+
+
+def test_exhaustive_patterns_cover_the_adder(simulator):
+    patterns = exhaustive_patterns(simulator)
+    detected = simulator.simulate(patterns, word_patterns=8)
+    coverage = simulator.coverage(detected)
+    assert coverage['detected_collapsed'] + len(coverage['undetected']) == coverage['collapsed_faults']
+    assert coverage['collapsed_faults'] < coverage['faults']
+    # First detecting pattern: no earlier pattern detects the fault
+    good, mask = simulator.good_values(patterns)
+    for fault, first in detected.items():
+        hits = simulator.detect(fault, good, mask)
+        assert hits & -hits == 1 << first
@@ -0,0 +1,44 @@
+"""Tests for timed glitch and hazard simulation (netlist_glitch)."""
+
+import pytest
+
+from conftest import ASIC_NETLISTS
+from netlist_fault import FaultSimulator
+from netlist_glitch import GlitchSimulator, analyze_glitches
+from netlist_graph import load_netlist
+from netlist_timing import DELAY_MODELS
+
+
+@pytest.mark.parametrize("model", ['asic', 'unit'])
+@pytest.mark.parametrize("path", ASIC_NETLISTS, ids=lambda p: p.stem)
+def test_transitions_settle_to_the_zero_delay_values(path, model):
+    graph = load_netlist(str(path))
+    sim = GlitchSimulator(graph, model=DELAY_MODELS[model]())
+    before, after, mask, exhaustive = sim.transition_words()
+    assert exhaustive
+    settled = [bin(old ^ new).count('1') for old, new in zip(sim.settle(before, mask), sim.settle(after, mask))]
+    inertial = sim.simulate(before, after, mask)
+    transport = GlitchSimulator(graph, model=DELAY_MODELS[model](), inertial=False).simulate(before, after, mask)
+    for result in (inertial, transport):
+        assert result['settled'] == settled
+        # Every extra toggle is one half of a pulse
+        assert all(t >= s and (t - s) % 2 == 0 for t, s in zip(result['toggles'], settled))
+    assert sum(inertial['toggles']) <= sum(transport['toggles'])
+
+
+@pytest.mark.parametrize("path", ASIC_NETLISTS, ids=lambda p: p.stem)
+def test_settled_values_match_fault_free_simulation(path):
+    graph = load_netlist(str(path))
+    glitch, fault = GlitchSimulator(graph), FaultSimulator(graph)
+    before, _, mask, _ = glitch.transition_words()
+    good = glitch.settle(before, mask)
+    inputs = [good[net] for nets in glitch.inputs.values() for net in nets]
+    assert fault.evaluate_words(inputs, mask) == good
+
+
+def test_unit_delays_count_levels():
+    sim = GlitchSimulator(load_netlist(str(ASIC_NETLISTS[0])), model=DELAY_MODELS['unit']())
+    result = analyze_glitches(sim)
+    assert result['exhaustive'] and result['transitions'] > 0
+    assert 0 < result['settle_time'] <= len(sim.cells)
+    assert result['glitches'] == sum(result['net_glitches'].values())
@@ -0,0 +1,83 @@
+"""Tests for the compact netlist graph (netlist_graph)."""
+
+import os
+import json
+import shutil
+
+import pytest
+
+from conftest import ADDER, ADDER_NETLIST, ASIC_NETLISTS, FPGA_NETLISTS
+from netlist_graph import FIRST_NET, NetlistGraph, gate_family, is_sequential, load_netlist, sibling_json
+
+
+def test_gate_families():
+    assert gate_family('$_AND_') == 'AND'
+    assert gate_family('$_DFF_PN0_') == 'DFF'
+    assert gate_family('$_DLATCH_P_') == 'LATCH'
+    assert gate_family('LUT4') is None
+    assert is_sequential('$_DFF_P_') and is_sequential('FDRE') and not is_sequential('$_XOR_')
+
+
+@pytest.mark.parametrize('netlist', ASIC_NETLISTS + FPGA_NETLISTS, ids=lambda path: path.name)
+def test_cell_counts_match_json(netlist):
+    with open(netlist) as f:
+        data = json.load(f)
+    graph = load_netlist(str(netlist))
+    for name, module in data['modules'].items():
+        types = {}
+        for cell in module['cells'].values():
+            types[cell['type']] = types.get(cell['type'], 0) + 1
+        assert graph.modules[name].type_counts() == types
+
+
+def test_connectivity(ripple8_json):
+    graph = load_netlist(ripple8_json)
+    top = graph.top
+    assert top.name == 'rca8' and top.cell_count == 8
+    assert graph.instance_counts() == {ADDER: 8}
+    carry = top.netnames['carry']
+    for stage in range(8):
+        # Stage i drives carry[i + 1], which stage i + 1 reads
+        assert top.net_driver[carry[stage + 1]] == stage
+        if stage < 7:
+            assert stage + 1 in top.sinks(carry[stage + 1])
+    assert all(net >= FIRST_NET for net in carry)
+    assert len(top.topological_order()) == 8
+
+
+def test_combinational_loop_is_reported():
+    graph = NetlistGraph({'modules': {'loop': {'cells': {
+        'a': {'type': '$_NOT_', 'connections': {'A': [3], 'Y': [2]}},
+        'b': {'type': '$_NOT_', 'connections': {'A': [2], 'Y': [3]}},
+    }}}})
+    with pytest.raises(ValueError, match="combinational loop"):
+        graph.modules['loop'].topological_order()
+
+
+def test_derived_graph_leaves_source_unchanged(ripple8_json):
+    graph = load_netlist(ripple8_json)
+    derived = graph.derive()
+    derived.modules['rca8'].attributes.pop('top')
+    assert graph.top.name == 'rca8'
+    assert derived.modules[ADDER].type_counts() == graph.modules[ADDER].type_counts()
+
+
+def test_sibling_json(tmp_path, capsys):
+    netlist = tmp_path / 'adder_synth.v'
+    json_file = tmp_path / 'adder_synth.json'
+    shutil.copy(ADDER_NETLIST.with_suffix('.v'), netlist)
+    assert sibling_json(str(netlist)) is None
+    shutil.copy(ADDER_NETLIST, json_file)
+    assert sibling_json(str(netlist)) == str(json_file)
+
+    # File times do not matter: a checkout may leave the JSON netlist older
+    os.utime(json_file, (1, 1))
+    assert sibling_json(str(netlist)) == str(json_file)
+
+    # A JSON netlist whose cells differ from the Verilog one is skipped, with one warning
+    netlist.write_text('module adder; endmodule\n')
+    assert sibling_json(str(netlist)) is None
+    assert sibling_json(str(netlist)) is None
+    warning = capsys.readouterr().out
+    assert warning.count('Warning:') == 1 and str(json_file) in warning and 'LUT mapping' in warning
+
@@ -0,0 +1,48 @@
+"""Tests for bottom-up hierarchy resolution (netlist_hierarchy)."""
+
+import json
+from collections import Counter
+
+import pytest
+
+from conftest import ROOT, ripple_netlist_data
+from netlist_graph import load_netlist
+from netlist_hierarchy import design_counts, find_top, load_module_counts, resolve_hierarchy
+from netlist_sim import flatten
+
+
+def test_counts_match_the_flattened_design(tmp_path):
+    path = tmp_path / "rca32.json"
+    path.write_text(json.dumps(ripple_netlist_data(32)))
+    modules, top = load_module_counts(str(path))
+    assert top == 'rca32' and find_top(modules) == 'rca32'
+    graph = load_netlist(str(path))
+    cells, _ = flatten(graph, graph.top)
+    assert design_counts(modules, top) == dict(Counter(cell[0] for cell in cells))
+
+
+def test_deep_hierarchies_resolve_exactly():
+    # level i instantiates level i - 1 twice: 2**depth leaf cells, far past the recursion limit
+    depth = 5000
+    modules = {'level0': {'$_AND_': 1, '$_DFF_P_': 1}}
+    modules.update({f'level{i}': {f'level{i - 1}': 2, '$_NOT_': 1} for i in range(1, depth + 1)})
+    counts = design_counts(modules)
+    assert find_top(modules) == f'level{depth}'
+    assert counts == {'$_AND_': 2 ** depth, '$_DFF_P_': 2 ** depth, '$_NOT_': 2 ** depth - 1}
+
+
+def test_recursive_instantiation_is_rejected():
+    with pytest.raises(ValueError, match="instantiates itself"):
+        resolve_hierarchy({'a': {'b': 1}, 'b': {'c': 2}, 'c': {'a': 1, '$_OR_': 1}})
+
+
+@pytest.mark.parametrize("netlist", ["flow/yosys/full_adder_half_adder_synth.v",
+                                     "flow/fpga/full_adder_half_adder_fpga.v"])
+def test_verilog_and_json_netlists_agree(netlist, monkeypatch):
+    path = str(ROOT / netlist)
+    from_json = load_module_counts(path)
+    # Without the sibling JSON netlist the Verilog one is scanned
+    monkeypatch.setattr('netlist_graph.sibling_json', lambda _: None)
+    assert load_module_counts(path) == from_json
+    modules, top = from_json
+    assert resolve_hierarchy(modules)[top] == design_counts(modules)
@@ -0,0 +1,87 @@
+"""Tests for the shared netlist cell semantics (netlist_logic)."""
+
+import random
+
+import pytest
+
+from conftest import ASIC_NETLISTS
+from netlist_graph import load_netlist
+from netlist_logic import WordBuilder, build_design, cell_outputs
+
+WIDTH = 3
+PATTERNS = 1 << (2 * WIDTH + 1)
+MASK = (1 << WIDTH) - 1
+
+
+def pattern_words(first_bit, count):
+    """Words giving bits first_bit.. of the pattern index, one pattern per word bit."""
+    return [sum(1 << p for p in range(PATTERNS) if p >> (first_bit + i) & 1) for i in range(count)]
+
+
+def signed(value, width=WIDTH):
+    return value - (1 << width) if value >> (width - 1) & 1 else value
+
+
+def reference(type_name, a, b, s, sign):
+    """Python value of a word-level cell, before truncation to the output width."""
+    if sign:
+        a, b = signed(a), signed(b)
+    return {
+        '$not': ~a, '$pos': a, '$neg': -a,
+        '$and': a & b, '$or': a | b, '$xor': a ^ b, '$xnor': ~(a ^ b),
+        '$add': a + b, '$sub': a - b,
+        '$reduce_and': a & MASK == MASK, '$reduce_or': a != 0, '$reduce_bool': a != 0,
+        '$reduce_xor': bin(a & MASK).count('1') & 1, '$reduce_xnor': ~bin(a & MASK).count('1') & 1,
+        '$logic_not': a == 0, '$logic_and': a != 0 and b != 0, '$logic_or': a != 0 or b != 0,
+        '$eq': a == b, '$ne': a != b, '$eqx': a == b, '$nex': a != b,
+        '$mux': b if s else a,
+    }[type_name]
+
+
+@pytest.mark.parametrize('type_name', ['$not', '$pos', '$neg', '$and', '$or', '$xor', '$xnor', '$add', '$sub',
+                                       '$reduce_and', '$reduce_or', '$reduce_bool', '$reduce_xor',
+                                       '$reduce_xnor', '$logic_not', '$logic_and', '$logic_or',
+                                       '$eq', '$ne', '$eqx', '$nex', '$mux'])
+@pytest.mark.parametrize('sign', [0, 1], ids=['unsigned', 'signed'])
+def test_word_cells_match_integer_arithmetic(type_name, sign):
+    b = WordBuilder((1 << PATTERNS) - 1)
+    width = 1 if type_name.startswith(('$reduce', '$logic', '$eq', '$ne')) else WIDTH + 2
+    if type_name == '$mux':
+        width = WIDTH
+    params = {'A_SIGNED': sign, 'B_SIGNED': sign, 'Y_WIDTH': width}
+    inputs = {'A': pattern_words(0, WIDTH), 'B': pattern_words(WIDTH, WIDTH), 'S': pattern_words(2 * WIDTH, 1)}
+    outputs = cell_outputs(b, type_name, params, inputs)['Y']
+    assert len(outputs) == width
+    for p in range(PATTERNS):
+        got = sum((word >> p & 1) << k for k, word in enumerate(outputs))
+        expected = reference(type_name, p & MASK, p >> WIDTH & MASK, p >> (2 * WIDTH) & 1, sign)
+        assert got == int(expected) & ((1 << width) - 1), p
+
+
+def test_gate_and_lut_cells():
+    b = WordBuilder(0b1111)
+    a, c = 0b1100, 0b1010
+    assert cell_outputs(b, '$_NAND_', {}, {'A': [a], 'B': [c]}) == {'Y': [0b0111]}
+    assert cell_outputs(b, '$_MUX_', {}, {'A': [a], 'B': [c], 'S': [0b0011]}) == {'Y': [0b1110]}
+    # LUT2 INIT 0b0110 is an XOR of its inputs
+    assert cell_outputs(b, 'LUT2', {'INIT': 0b0110}, {'I0': [a], 'I1': [c]}) == {'O': [a ^ c]}
+    assert cell_outputs(b, '$lut', {'LUT': '1000'}, {'A': [a, c]}) == {'Y': [a & c]}
+    with pytest.raises(ValueError, match='unsupported cell type'):
+        cell_outputs(b, '$mem', {}, {})
+
+
+def test_word_builder_inputs():
+    with pytest.raises(ValueError):
+        WordBuilder(0xff).new_input()
+    assert WordBuilder(0xff, random.Random(1)).new_input() >> 8 == 0
+
+
+@pytest.mark.parametrize('path', ASIC_NETLISTS, ids=lambda p: p.stem)
+def test_build_design_adds(path):
+    b = WordBuilder(0xff)
+    given = {'a_i': [0b11110000], 'b_i': [0b11001100], 'cin_i': [0b10101010]}
+    inputs, outputs = build_design(b, load_netlist(str(path)), inputs=dict(given, clk_i=[0], reset_n_i=[b.one]))
+    assert all(inputs[port] == words for port, words in given.items())
+    for p in range(8):
+        total = sum(given[port][0] >> p & 1 for port in given)
+        assert (outputs['sum_o'][0] >> p & 1, outputs['cout_o'][0] >> p & 1) == (total & 1, total >> 1)
@@ -0,0 +1,48 @@
+"""Tests for K-LUT technology mapping (netlist_lutmap)."""
+
+import json
+
+import pytest
+
+from conftest import ASIC_NETLISTS
+from netlist_equiv import check_equivalence
+from netlist_graph import load_netlist
+from netlist_lutmap import LutMapping
+
+
+def mapped_netlist(mapping, tmp_path):
+    path = tmp_path / f"{mapping.name}_lut{mapping.k}.json"
+    path.write_text(json.dumps(mapping.to_json()))
+    return load_netlist(str(path))
+
+
+@pytest.mark.parametrize("k", [4, 6])
+@pytest.mark.parametrize("path", ASIC_NETLISTS, ids=lambda p: p.stem)
+def test_mapped_netlist_is_equivalent(path, k, tmp_path):
+    graph = load_netlist(str(path))
+    mapping = LutMapping(graph, k=k)
+    assert all(len(leaves) <= k for leaves in mapping.luts.values())
+    mapped = mapped_netlist(mapping, tmp_path)
+    for method in ('bdd', 'sat'):
+        result = check_equivalence(graph, mapped, method=method, simulation_patterns=0)
+        assert result['equivalent'] and result['method'] == method
+
+
+def test_ripple_mapping_is_equivalent(ripple8_json, tmp_path):
+    graph = load_netlist(ripple8_json)
+    mapping = LutMapping(graph, k=6)
+    assert check_equivalence(graph, mapped_netlist(mapping, tmp_path))['equivalent']
+
+
+def test_corrupted_lut_is_caught(ripple8_json, tmp_path):
+    graph = load_netlist(ripple8_json)
+    data = LutMapping(graph, k=4).to_json()
+    cell = next(iter(next(iter(data['modules'].values()))['cells'].values()))
+    table = cell['parameters']['LUT']
+    cell['parameters']['LUT'] = table[:-1] + ('0' if table[-1] == '1' else '1')
+    path = tmp_path / "corrupted.json"
+    path.write_text(json.dumps(data))
+    result = check_equivalence(graph, load_netlist(str(path)))
+    assert not result['equivalent'] and result['method'] == 'simulation'
+    result = check_equivalence(graph, load_netlist(str(path)), method='sat', simulation_patterns=0)
+    assert not result['equivalent'] and result['counterexample'] is not None
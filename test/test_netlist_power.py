@@ -0,0 +1,63 @@
+"""Tests for activity-based power estimation (netlist_power)."""
+
+import random
+
+import pytest
+
+from conftest import ADDER_NETLIST, ASIC_NETLISTS
+from netlist_graph import FIRST_NET, gate_family, load_netlist
+from netlist_power import ASIC_LEAKAGE_NW, PowerAnalysis
+from netlist_sim import flatten
+
+
+@pytest.fixture
+def analysis():
+    return PowerAnalysis(load_netlist(str(ADDER_NETLIST)))
+
+
+def random_vectors(count, seed=3):
+    rng = random.Random(seed)
+    return [{'reset_n_i': 1, 'a_i': rng.getrandbits(1), 'b_i': rng.getrandbits(1), 'cin_i': rng.getrandbits(1)}
+            for _ in range(count)]
+
+
+def test_streamed_toggles_match_step_by_step_simulation(analysis):
+    sim = analysis.sim
+    vectors = random_vectors(50)
+    steps = [sim.good_values(sim.patterns([vector]))[0] for vector in vectors]
+    expected = [sum(before[net] != after[net] for before, after in zip(steps, steps[1:]))
+                for net in range(sim.net_count)]
+    # Words of 7 patterns put word boundaries between steps
+    for word_patterns in (7, 256):
+        toggles, count = analysis.count_toggles(vectors, word_patterns)
+        assert count == len(vectors)
+        assert toggles[FIRST_NET:] == expected[FIRST_NET:]
+
+
+@pytest.mark.parametrize("path", ASIC_NETLISTS, ids=lambda p: p.stem)
+def test_statistical_activity_of_an_adder(path):
+    analysis = PowerAnalysis(load_netlist(str(path)))
+    sim = analysis.sim
+    probabilities = analysis.probabilities()
+    (sum_net,), (carry_net,) = sim.outputs['sum_o'], sim.outputs['cout_o']
+    assert probabilities[sum_net] == 0.5 and probabilities[carry_net] == 0.5
+    report = analysis.statistical(period_ns=10.0)
+    assert report['nets'][sim.net_name(sum_net)]['toggle_rate'] == pytest.approx(0.5e8)
+    assert report['dynamic_nw'] == pytest.approx(sum(net['power_nw'] for net in report['nets'].values()))
+    assert report['total_nw'] == pytest.approx(report['dynamic_nw'] + report['leakage_nw'])
+
+
+def test_leakage_and_loads_cover_every_cell(analysis):
+    graph = load_netlist(str(ADDER_NETLIST))
+    cells, _ = flatten(graph, graph.top)
+    assert analysis.leakage == pytest.approx(sum(ASIC_LEAKAGE_NW[gate_family(cell[0])] for cell in cells))
+    assert all(analysis.capacitance[net] > 0 for nets in analysis.sim.outputs.values() for net in nets)
+
+
+def test_vector_file_rates_divide_by_the_period(analysis, tmp_path):
+    path = tmp_path / "vectors.txt"
+    path.write_text("# a b cin\n0 0 0\n1 0 0\n1 1 0\n1 1 1\n")
+    report = analysis.simulated([str(path)], period_ns=10.0)
+    assert report['activity'] == "4 steps over 40 ns"
+    # sum_o goes 0 1 0 1: three toggles in 40 ns
+    assert report['nets']['sum_o']['toggle_rate'] == pytest.approx(3 / 40e-9)
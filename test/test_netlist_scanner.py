@@ -0,0 +1,55 @@
+"""Tests for the streaming Verilog netlist scanner (netlist_scanner)."""
+
+import pytest
+
+from conftest import ROOT
+from netlist_graph import load_netlist
+from netlist_scanner import instance_counts, scan_buffer, scan_netlist, total_counts
+
+VERILOG_NETLISTS = sorted((ROOT / "flow" / "yosys").glob("full_adder_*_synth.v")) + \
+    sorted((ROOT / "flow" / "fpga").glob("full_adder_*_fpga.v"))
+
+TRICKY = rb"""
+// LUT4 fake (a, b); in a comment
+/* $_AND_ also_fake (a); */
+module \top$mod (a, b, y);
+  input [3:0] a; input b; output y;
+  wire \odd;name ;
+  (* src = "x.v:1; LUT6 no (a);" *)
+  \$_AND_  g1 (.A(a[0]), .B(b), .Y(\odd;name ));
+  LUT4 #(.INIT(16'h8000)) lut (.I0(a[0]), .I1(a[1]), .I2(a[2]), .I3(a[3]), .O(y));
+  \$_OR_ \g2[0]  (.A(ff_LUT4), .B(LUT6_out), .Y(y));
+  assign y = module_like;
+  sub u0 (.x(a[0]));
+  sub u1 (a[1]);
+  generate
+    begin : blk
+      \$_NOT_  inv (.A(b), .Y(y));
+    end
+  endgenerate
+endmodule
+module sub (x);
+  input x;
+  \$_BUF_  b0 (.A(x), .Y());
+endmodule
+"""
+
+
+def test_only_instance_positions_are_counted():
+    modules = scan_buffer(TRICKY)
+    assert modules == {'top$mod': {'$_AND_': 1, 'LUT4': 1, '$_OR_': 1, 'sub': 2, '$_NOT_': 1},
+                       'sub': {'$_BUF_': 1}}
+    assert instance_counts(modules) == {'sub': 2}
+    assert total_counts(modules)['$_BUF_'] == 1
+
+
+@pytest.mark.parametrize("path", VERILOG_NETLISTS, ids=lambda p: p.stem)
+def test_scan_matches_the_json_netlist(path):
+    graph = load_netlist(str(path.with_suffix('.json')))
+    assert scan_netlist(str(path)) == graph.module_type_counts()
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty.v"
+    path.write_bytes(b"")
+    assert scan_netlist(str(path)) == {}
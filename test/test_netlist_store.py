@@ -0,0 +1,57 @@
+"""Tests for the memory-mapped binary netlist store (netlist_store)."""
+
+import pytest
+
+from conftest import ADDER_NETLIST, ASIC_NETLISTS, FPGA_NETLISTS, run_script
+from netlist_graph import load_netlist
+from netlist_store import MODULE_ARRAYS, convert, open_store
+
+
+def module_state(module):
+    return {
+        'attributes': module.attributes,
+        'ports': module.ports,
+        'net_count': module.net_count,
+        'cell_names': list(module.cell_names),
+        'cell_types': [module.type_name(cell) for cell in range(module.cell_count)],
+        'cell_params': module.cell_params,
+        'netnames': module.netnames,
+        'arrays': {field: list(getattr(module, field)) for field, _ in MODULE_ARRAYS},
+    }
+
+
+@pytest.mark.parametrize('netlist', ASIC_NETLISTS + FPGA_NETLISTS, ids=lambda path: path.name)
+def test_store_round_trip(netlist, tmp_path):
+    store = tmp_path / 'netlist.nlb'
+    convert(str(netlist), str(store))
+    original = load_netlist(str(netlist))
+    stored = open_store(str(store))
+    assert stored.creator == original.creator
+    assert list(stored.modules) == list(original.modules)
+    for name, module in original.modules.items():
+        assert module_state(stored.modules[name]) == module_state(module)
+    assert load_netlist(str(store)).top.name == original.top.name
+
+
+def test_open_store_rejects_json():
+    with pytest.raises(ValueError, match="not a netlist store"):
+        open_store(str(ADDER_NETLIST))
+
+
+@pytest.fixture
+def adder_store(tmp_path):
+    store = tmp_path / 'adder.nlb'
+    convert(str(ADDER_NETLIST), str(store))
+    return store
+
+
+def test_timing_ripple_cli_reads_store(adder_store):
+    expected = run_script('netlist_timing.py', ADDER_NETLIST, '--ripple', 8, '--paths', 1)
+    output = run_script('netlist_timing.py', adder_store, '--ripple', 8, '--paths', 1)
+    assert output == expected.replace(str(ADDER_NETLIST), str(adder_store))
+
+
+def test_carry_cli_reads_store(adder_store):
+    expected = run_script('netlist_carry.py', ADDER_NETLIST, '--widths', 4, 16)
+    assert run_script('netlist_carry.py', adder_store, '--widths', 4, 16) == expected
+    assert 'Carry chain is faster' in expected
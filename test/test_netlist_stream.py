@@ -0,0 +1,67 @@
+"""Tests for streaming Yosys JSON ingestion (netlist_stream)."""
+
+import json
+
+import pytest
+
+import netlist_stream
+from conftest import ASIC_NETLISTS, FPGA_NETLISTS, ripple_netlist_data
+from netlist_stream import iter_netlist, stream_counts
+
+
+def rebuild(path, chunk_size):
+    """The document json.load would return, rebuilt from the stream entries."""
+    document = {}
+    for module, section, name, value in iter_netlist(path, chunk_size):
+        if module is None:
+            document[section] = value
+            continue
+        entry = document.setdefault('modules', {}).setdefault(module, {})
+        if section in netlist_stream.STREAMED_SECTIONS:
+            entry.setdefault(section, {})[name] = value
+        else:
+            entry[section] = value
+    return document
+
+
+@pytest.fixture
+def tricky_json(tmp_path):
+    """A netlist with escaped and non-ASCII names, a memories section and long values."""
+    data = ripple_netlist_data(4)
+    module = data['modules']['rca4']
+    module['netnames']['es\\caped "q" é'] = {'bits': [2], 'attributes': {'src': 'x' * 300}}
+    module['memories'] = {'ram': {'width': 8, 'size': 16}}
+    module['attributes']['big'] = 12345678901234567890
+    path = tmp_path / "tricky.json"
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_stream_equals_json_load(tricky_json, monkeypatch, chunk_size):
+    # A short lookahead makes values, keys and numbers straddle buffer refills
+    monkeypatch.setattr(netlist_stream, 'LOOKAHEAD', 64)
+    for path in [*ASIC_NETLISTS, *FPGA_NETLISTS, tricky_json]:
+        with open(path, encoding='utf-8') as f:
+            expected = json.load(f)
+        assert rebuild(str(path), chunk_size) == expected
+
+
+def test_counts_match_json_load(ripple8_json):
+    with open(ripple8_json) as f:
+        data = json.load(f)
+    expected = {}
+    for name, module in data['modules'].items():
+        for cell in module.get('cells', {}).values():
+            expected.setdefault(name, {}).setdefault(cell['type'], 0)
+            expected[name][cell['type']] += 1
+    assert stream_counts(ripple8_json) == expected
+
+
+@pytest.mark.parametrize("text", ['{"modules": {"m": {"cells": {"a": 1,}}}}', '{"modules": {}} {}',
+                                  '{"modules": {"m": [1, 2'])
+def test_malformed_json_is_rejected(tmp_path, text):
+    path = tmp_path / "bad.json"
+    path.write_text(text)
+    with pytest.raises(ValueError):
+        list(iter_netlist(str(path), chunk_size=3))
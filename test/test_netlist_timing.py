@@ -0,0 +1,68 @@
+"""Tests for static timing analysis (netlist_timing)."""
+
+import json
+
+import pytest
+
+from conftest import ADDER, ASIC_NETLISTS
+from netlist_graph import is_sequential, load_netlist
+from netlist_timing import (ASIC_CLK_TO_Q_PS, ASIC_SETUP_PS, DELAY_MODELS, TimingAnalysis, ripple_chain,
+                            ripple_chain_name)
+
+
+def all_paths(sta, net):
+    """Every path ending at a net as (delay, nets from startpoint), by exhaustive search."""
+    index = sta.driver[net]
+    if index < 0 or is_sequential(sta.cells[index][0]):
+        return [(sta.arrival[net], [net])]
+    sources = dict.fromkeys(source for nets in sta.cells[index][2].values() for source in nets)
+    return [(delay + sta.net_delay[net], path + [net]) for source in sources for delay, path in all_paths(sta, source)]
+
+
+@pytest.mark.parametrize("model", ['asic', 'unit'])
+@pytest.mark.parametrize("path", ASIC_NETLISTS, ids=lambda p: p.stem)
+def test_critical_paths_match_exhaustive_enumeration(path, model):
+    sta = TimingAnalysis(load_netlist(str(path)), model=DELAY_MODELS[model]())
+    for _, net, _ in sta.endpoints:
+        expected = sorted((delay for delay, _ in all_paths(sta, net)), reverse=True)
+        paths = sta.critical_paths(net, k=len(expected) + 1)
+        assert [delay for delay, _ in paths] == pytest.approx(expected)
+        assert paths[0][0] == pytest.approx(sta.arrival[net])
+        for delay, nets in paths:
+            assert nets[-1] == net and sta.driver[nets[0]] < 0
+
+
+@pytest.mark.parametrize("path", ASIC_NETLISTS, ids=lambda p: p.stem)
+def test_slack_against_the_period(path):
+    graph = load_netlist(str(path))
+    sta = TimingAnalysis(graph)
+    assert sta.worst_slack == pytest.approx(0.0)
+    assert all(sta.slack(net) >= -1e-9 for net in range(len(sta.arrival)) if sta.required[net] != float('inf'))
+    relaxed = TimingAnalysis(graph, period=sta.critical_delay + 100)
+    assert relaxed.worst_slack == pytest.approx(100)
+
+
+def test_ripple_delay_grows_linearly_with_width(ripple8_json):
+    depths = [TimingAnalysis(ripple_chain(ripple8_json, width, ADDER), ripple_chain_name(ADDER, width),
+                             model=DELAY_MODELS['unit']()).logic_depth for width in (4, 8, 16)]
+    assert depths[2] - depths[1] == 2 * (depths[1] - depths[0]) > 0
+
+
+def test_flip_flops_start_and_end_paths(tmp_path):
+    path = tmp_path / "toggle.json"
+    path.write_text(json.dumps({'modules': {'toggle': {
+        'attributes': {'top': '00000000000000000000000000000001'},
+        'ports': {'clk': {'direction': 'input', 'bits': [2]}, 't': {'direction': 'input', 'bits': [3]},
+                  'q': {'direction': 'output', 'bits': [4]}},
+        'cells': {
+            'ff': {'type': '$_DFF_P_', 'port_directions': {'C': 'input', 'D': 'input', 'Q': 'output'},
+                   'connections': {'C': [2], 'D': [5], 'Q': [4]}},
+            'x': {'type': '$_XOR_', 'port_directions': {'A': 'input', 'B': 'input', 'Y': 'output'},
+                  'connections': {'A': [3], 'B': [4], 'Y': [5]}}},
+        'netnames': {}}}}))
+    sta = TimingAnalysis(load_netlist(str(path)))
+    endpoints = {name: net for name, net, _ in sta.endpoints}
+    assert set(endpoints) == {'ff.D', 'q'}
+    assert sta.arrival[endpoints['q']] == ASIC_CLK_TO_Q_PS
+    assert sta.critical_delay == pytest.approx(sta.arrival[endpoints['ff.D']] + ASIC_SETUP_PS)
+    assert sta.arrival[endpoints['ff.D']] > ASIC_CLK_TO_Q_PS
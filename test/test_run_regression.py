@@ -0,0 +1,67 @@
+"""Tests for the compile-once SV regression runner (tb/sv_tb/run_regression.py)."""
+
+import sys
+import json
+import subprocess
+
+import pytest
+
+from conftest import ROOT
+
+sys.path.insert(0, str(ROOT / "tb" / "sv_tb"))
+
+from run_regression import build_runs, run_one  # noqa: E402
+
+# Stand-in for vvp that echoes its plusargs and fails seed 3
+FAKE_VVP = f"""#!{sys.executable}
+import sys
+args = dict(arg[1:].split('=', 1) for arg in sys.argv[3:] if '=' in arg)
+print(' '.join(sys.argv[1:]))
+errors = 1 if args['SEED'] == '3' else 0
+print(f"Result: {{'FAIL' if errors else 'PASS'}} tb={{args['TB']}} vectors={{args['NUM_VECTORS']}} errors={{errors}}")
+sys.exit(errors)
+"""
+
+
+@pytest.fixture
+def fake_vvp(tmp_path):
+    path = tmp_path / "vvp"
+    path.write_text(FAKE_VVP)
+    path.chmod(0o755)
+    return str(path)
+
+
+def test_run_matrix():
+    runs = build_runs(['tb_a', 'tb_b'], ['exhaustive', 'random'], 3, 5, None)
+    assert [(run['tb'], run['test'], run['seed']) for run in runs] == [
+        ('tb_a', 'exhaustive', 5), ('tb_a', 'random', 5), ('tb_a', 'random', 6), ('tb_a', 'random', 7),
+        ('tb_b', 'exhaustive', 5), ('tb_b', 'random', 5), ('tb_b', 'random', 6), ('tb_b', 'random', 7)]
+    with_vectors = build_runs(['tb_a'], ['random'], 1, 1, '/v.txt')
+    assert [(run['test'], run['vectors']) for run in with_vectors] == [('random', '/v.txt'), ('vectors', '/v.txt')]
+
+
+def test_run_one_parses_the_result(tmp_path, fake_vvp):
+    run = {'tb': 'tb_a', 'test': 'random', 'seed': 2, 'vectors': '/v.txt'}
+    result = run_one('simv.out', run, tmp_path, 40, True, fake_vvp)
+    assert (result['name'], result['status'], result['vectors'], result['errors']) == \
+        ('tb_a_random_2', 'PASS', 40, 0)
+    log = (tmp_path / 'tb_a_random_2.log').read_text()
+    assert '+VECTORS=/v.txt' in log and f"+VCD={tmp_path / 'tb_a_random_2.vcd'}" in log
+
+    failed = run_one('simv.out', dict(run, seed=3), tmp_path, 40, False, fake_vvp)
+    assert (failed['status'], failed['errors'], failed['returncode']) == ('FAIL', 1, 1)
+    assert '+NO_VCD' in (tmp_path / 'tb_a_random_3.log').read_text()
+
+
+def test_command_line(tmp_path, fake_vvp):
+    image = tmp_path / 'simv.out'
+    image.write_text('')
+    command = [sys.executable, str(ROOT / 'tb' / 'sv_tb' / 'run_regression.py'), '--image', str(image),
+               '--vvp', fake_vvp, '--tb', 'tb_a', '--out-dir', str(tmp_path / 'regress'), '--jobs', '4']
+    assert subprocess.run([*command, '--seeds', '2'], capture_output=True).returncode == 0
+    assert subprocess.run([*command, '--seeds', '3'], capture_output=True).returncode == 1
+    summary = json.loads((tmp_path / 'regress' / 'regression_summary.json').read_text())
+    assert (summary['runs'], summary['passed'], summary['failed']) == (4, 3, 1)
+
+    missing = subprocess.run([*command[:2], '--image', str(tmp_path / 'none.out')], capture_output=True)
+    assert missing.returncode == 1
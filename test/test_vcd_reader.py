@@ -0,0 +1,88 @@
+"""Tests for the memory-mapped streaming VCD reader (vcd_reader)."""
+
+import random
+from bisect import bisect_left, bisect_right
+
+import pytest
+
+import vcd_reader
+from conftest import write_random_vcd
+from vcd_reader import VCDFile, vcd_value_to_int
+
+FULL_NAMES = ['tb.clk', 'tb.a', 'tb.bus', 'tb.wide', 'tb.level', 'tb.y']
+
+
+@pytest.fixture
+def dump(tmp_path):
+    path = tmp_path / 'random.vcd'
+    expected, end_time = write_random_vcd(path, random.Random(3), 500)
+    return path, expected, end_time
+
+
+@pytest.mark.parametrize('chunk_size', [16, 1 << 23])
+def test_index_matches_the_dump(dump, monkeypatch, chunk_size):
+    path, expected, end_time = dump
+    monkeypatch.setattr(vcd_reader, 'CHUNK_SIZE', chunk_size)
+    rng = random.Random(5)
+    with VCDFile(str(path)) as vcd:
+        assert vcd.timescale == '10ps'
+        assert vcd.timescale_seconds == pytest.approx(1e-11)
+        index = vcd.build_index()
+        assert index.end_time == end_time
+        for name in FULL_NAMES:
+            changes = expected[name]
+            times = [time for time, _ in changes]
+            assert index.change_count(name) == len(changes)
+            assert list(index.changes(name)) == changes
+            for _ in range(50):
+                start = rng.randint(0, end_time)
+                end = rng.randint(start, end_time)
+                at = bisect_right(times, start) - 1
+                assert index.value_at(name, start) == changes[at][1]
+                first, last = bisect_left(times, start), bisect_right(times, end)
+                assert list(index.changes(name, start, end)) == changes[first:last]
+                window = [value for _, value in changes[max(first - 1, 0):last]]
+                assert index.toggle_count(name, start, end) == \
+                    sum(1 for previous, value in zip(window, window[1:]) if value != previous)
+
+
+def test_streamed_changes_and_selection(dump, monkeypatch):
+    path, expected, _ = dump
+    monkeypatch.setattr(vcd_reader, 'CHUNK_SIZE', 7)
+    with VCDFile(str(path)) as vcd:
+        streamed = list(vcd.iter_changes())
+        assert len(streamed) == sum(len(changes) for changes in expected.values())
+        assert [time for time, _, _ in streamed] == sorted(time for time, _, _ in streamed)
+
+        # 'a' names one id code from two scopes; 'bus' is a unique suffix
+        assert vcd.find('a').id_code == '"'
+        selected = list(vcd.iter_changes(['a', 'bus']))
+        assert {id_code for _, id_code, _ in selected} == {'"', '#'}
+        index = vcd.build_index(['clk'])
+        assert index.change_count('tb.clk') == len(expected['tb.clk'])
+        with pytest.raises(KeyError):
+            index.value_at('y', 0)
+        with pytest.raises(KeyError):
+            vcd.find('missing')
+
+
+def test_ambiguous_names_and_missing_header(tmp_path):
+    path = tmp_path / 'two.vcd'
+    path.write_text('$scope module a $end $var wire 1 ! x $end $upscope $end\n'
+                    '$scope module b $end $var wire 1 " x $end $upscope $end\n'
+                    '$enddefinitions $end\n#0\n1!\n0"\n')
+    with VCDFile(str(path)) as vcd:
+        with pytest.raises(KeyError, match='ambiguous'):
+            vcd.find('x')
+        assert vcd.build_index().value_at('b.x', 0) == '0'
+
+    broken = tmp_path / 'broken.vcd'
+    broken.write_text('$timescale 1ns $end\n#0\n')
+    with pytest.raises(ValueError, match='enddefinitions'):
+        VCDFile(str(broken))
+
+
+def test_value_to_int():
+    assert vcd_value_to_int('1010') == 10
+    assert vcd_value_to_int('1x') is None
+    assert vcd_value_to_int(None) is None
@@ -0,0 +1,95 @@
+"""Tests for the offline waveform property checker (waveform_checker)."""
+
+import sys
+import subprocess
+
+import pytest
+
+from conftest import ROOT
+from waveform_checker import FULL_ADDER_PROPERTIES, Property, check_file
+
+PORTS = (('a_i', '!'), ('b_i', '"'), ('cin_i', '#'), ('sum_o', '$'), ('cout_o', '%'))
+
+
+def write_adder_vcd(path, bug=None, period=10, delay=1):
+    """Exhaustive full adder run whose outputs follow the inputs after a delay.
+
+    bug is the input pattern (a, b, cin) whose sum is inverted. Ports are
+    declared in tb and in tb.dut under the same id codes.
+    """
+    lines = ['$timescale 1ns $end', '$scope module tb $end']
+    lines += [f'$var wire 1 {code} {name} $end' for name, code in PORTS]
+    lines += ['$scope module dut $end']
+    lines += [f'$var wire 1 {code} {name} $end' for name, code in PORTS]
+    lines += ['$upscope $end', '$upscope $end', '$enddefinitions $end',
+              '#0', '$dumpvars', 'x$', 'x%', '0!', '0"', '0#', '$end']
+    for pattern in range(8):
+        a, b, cin = pattern >> 2 & 1, pattern >> 1 & 1, pattern & 1
+        time = pattern * period
+        lines += [f'#{time}', f'{a}!', f'{b}"', f'{cin}#']
+        total, carry = a ^ b ^ cin, (a & b) | (cin & (a ^ b))
+        if (a, b, cin) == bug:
+            total ^= 1
+        lines += [f'#{time + delay}', f'{total}$', f'{carry}%']
+    path.write_text('\n'.join(lines) + '\n')
+
+
+def test_correct_adder_passes_on_settled_states(tmp_path):
+    path = tmp_path / 'adder.vcd'
+    write_adder_vcd(path)
+    result = check_file(str(path), FULL_ADDER_PROPERTIES, settle=2)
+    assert result['error'] is None
+    assert result['scope'] == 'tb'
+    # One settled state per pattern; the x outputs at #0 last only 1ns
+    assert result['states'] == 8
+    for stats in result['properties'].values():
+        assert stats == {'checked': 8, 'failed': 0, 'skipped': 0}
+
+
+def test_unsettled_states_and_unknown_values(tmp_path):
+    path = tmp_path / 'adder.vcd'
+    write_adder_vcd(path)
+    result = check_file(str(path), FULL_ADDER_PROPERTIES)
+    # Each input change is seen with the previous outputs for 1ns
+    assert result['states'] == 16
+    assert result['properties']['sum']['skipped'] == 1
+    assert result['properties']['sum']['failed'] > 0
+    assert all(violation['time'] % 10 == 0 for violation in result['violations'])
+
+    strict = check_file(str(path), FULL_ADDER_PROPERTIES, strict=True)
+    assert strict['properties']['sum']['skipped'] == 0
+    assert strict['properties']['sum']['failed'] == result['properties']['sum']['failed'] + 1
+
+
+def test_bug_is_reported_with_its_values(tmp_path):
+    path = tmp_path / 'buggy.vcd'
+    write_adder_vcd(path, bug=(1, 0, 1))
+    result = check_file(str(path), FULL_ADDER_PROPERTIES, scope='tb.dut', settle=2)
+    assert result['scope'] == 'tb.dut'
+    assert result['properties']['sum']['failed'] == 1
+    assert result['properties']['carry']['failed'] == 0
+    assert result['violations'] == [{'time': 51, 'property': 'sum',
+                                     'values': {'a_i': 1, 'b_i': 0, 'cin_i': 1, 'sum_o': 1}}]
+
+
+def test_property_syntax():
+    prop = Property('carry: (a & b) | (c & (a ^ b))')
+    assert (prop.name, prop.names) == ('carry', ['a', 'b', 'c'])
+    assert prop.holds({'a': 1, 'b': 1, 'c': 0})
+    assert Property('x == 1').name == 'x == 1'
+    for spec in ('bad: __import__("os")', 'bad: a.b', 'bad: a == "1"', 'bad: [a][0]'):
+        with pytest.raises(ValueError):
+            Property(spec)
+
+
+def test_errors_and_exit_codes(tmp_path):
+    assert check_file(str(tmp_path / 'missing.vcd'), FULL_ADDER_PROPERTIES)['error']
+    good, buggy = tmp_path / 'good.vcd', tmp_path / 'buggy.vcd'
+    write_adder_vcd(good)
+    write_adder_vcd(buggy, bug=(0, 0, 0))
+    assert check_file(str(good), ['z: nope == 0'])['error']
+
+    command = [sys.executable, str(ROOT / 'scripts' / 'waveform_checker.py'), '--settle', '2', '--jobs', '2']
+    assert subprocess.run([*command, good], capture_output=True).returncode == 0
+    assert subprocess.run([*command, good, buggy], capture_output=True).returncode == 1
+    assert subprocess.run([*command, good, '--property', 'bad: a.b'], capture_output=True).returncode == 2
@@ -0,0 +1,64 @@
+"""Tests for the columnar chunked waveform store (waveform_store)."""
+
+import random
+
+import pytest
+
+from conftest import write_random_vcd
+from vcd_reader import VCDFile
+from waveform_store import WaveformStore, convert
+
+FULL_NAMES = ['tb.clk', 'tb.a', 'tb.bus', 'tb.wide', 'tb.level', 'tb.y']
+
+
+@pytest.fixture
+def dump(tmp_path):
+    path = tmp_path / 'random.vcd'
+    _, end_time = write_random_vcd(path, random.Random(11), 800)
+    return path, end_time
+
+
+@pytest.mark.parametrize('chunk_changes', [1, 5, 1 << 16])
+def test_store_answers_like_the_vcd_index(dump, tmp_path, chunk_changes):
+    path, end_time = dump
+    store_path = tmp_path / f'random{chunk_changes}.wvs'
+    stats = convert(str(path), str(store_path), chunk_changes=chunk_changes)
+    rng = random.Random(chunk_changes)
+    with VCDFile(str(path)) as vcd, WaveformStore(str(store_path)) as store:
+        index = vcd.build_index()
+        assert stats['changes'] == sum(index.change_count(name) for name in FULL_NAMES)
+        assert (store.timescale, store.end_time, store.scopes) == (vcd.timescale, end_time, vcd.scopes)
+        assert store.find('a').id_code == vcd.find('a').id_code
+        for name in FULL_NAMES:
+            assert store.change_count(name) == index.change_count(name)
+            assert list(store.changes(name)) == list(index.changes(name))
+            for _ in range(40):
+                start = rng.randint(0, end_time)
+                end = rng.randint(start, end_time)
+                assert store.value_at(name, start) == index.value_at(name, start)
+                assert list(store.changes(name, start, end)) == list(index.changes(name, start, end))
+                assert store.toggle_count(name, start, end) == index.toggle_count(name, start, end)
+
+
+def test_selected_signals_only(dump, tmp_path):
+    path, _ = dump
+    store_path = tmp_path / 'bus.wvs'
+    stats = convert(str(path), str(store_path), signals=['bus'])
+    assert stats['signals'] == 1
+    with WaveformStore(str(store_path)) as store:
+        assert list(store.signals) == ['tb.bus']
+        assert store.value_at('bus', 0) is not None
+        with pytest.raises(KeyError):
+            store.find('clk')
+
+
+def test_default_output_and_invalid_store(dump, tmp_path):
+    path, _ = dump
+    stats = convert(str(path))
+    assert stats['store'] == str(tmp_path / 'random.wvs')
+    assert stats['store_bytes'] < stats['vcd_bytes']
+
+    bogus = tmp_path / 'bogus.wvs'
+    bogus.write_bytes(b'not a waveform store at all')
+    with pytest.raises(ValueError, match='not a waveform store'):
+        WaveformStore(str(bogus))